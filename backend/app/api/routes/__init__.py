@@ -2,4 +2,6 @@
 from . import stocks
 from . import technical
 from . import auth
-from . import dashboard
\ No newline at end of file
+from . import dashboard
+from . import jobs
+from . import snapshot
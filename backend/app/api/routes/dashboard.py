@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
@@ -6,7 +7,8 @@ import random
 from fastapi.responses import JSONResponse
 import math
 
-from app.db.session import get_db
+from app.core import serialization
+from app.db.session import get_db, get_read_db, get_async_db
 from app.models.user import User
 from app.models.user_favorite import UserFavorite
 from app.models.prediction_history import PredictionHistory
@@ -19,10 +21,15 @@ from app.schemas.dashboard import (
     DashboardFavorites,
     DashboardPrediction,
     ModelComparisonItem,
-    ModelComparison
+    ModelComparison,
+    ModelAccuracy
 )
+from app.repositories import PredictionRepository
+from app.services.prediction_history_service import PredictionHistoryService
 
 router = APIRouter()
+history_service = PredictionHistoryService()
+prediction_repository = PredictionRepository()
 
 # Demo kullanıcı ID'si (gerçek uygulamada bu JWT token'dan alınacak)
 DEMO_USER_ID = 1
@@ -75,7 +82,7 @@ def remove_favorite(symbol: str, db: Session = Depends(get_db)):
 
 # Son tahminler endpoint'i
 @router.get("/latest-predictions", response_model=List[DashboardPrediction])
-async def get_latest_predictions(limit: int = Query(5, ge=1, le=20), db: Session = Depends(get_db)):
+async def get_latest_predictions(limit: int = Query(5, ge=1, le=20), db: AsyncSession = Depends(get_async_db)):
     """
     En son yapılan tahminleri döndürür.
     """
@@ -98,7 +105,7 @@ async def get_latest_predictions(limit: int = Query(5, ge=1, le=20), db: Session
 
 # Tahmin geçmişi endpoint'i
 @router.get("/prediction-history", response_model=List[DashboardPrediction])
-async def get_prediction_history(limit: int = Query(10, ge=1, le=50), symbol: Optional[str] = None, db: Session = Depends(get_db)):
+async def get_prediction_history(limit: int = Query(10, ge=1, le=50), symbol: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     """
     Tahmin geçmişini döndürür. İsteğe bağlı olarak belirli bir sembol için filtrelenebilir.
     """
@@ -127,15 +134,12 @@ async def get_prediction_history(limit: int = Query(10, ge=1, le=50), symbol: Op
 
 # Tahmin geçmişi endpoint'i (veritabanı verilerine dayalı)
 @router.get("/real-prediction-history", response_model=List[DashboardPrediction])
-async def get_real_prediction_history(limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_db)):
+async def get_real_prediction_history(limit: int = Query(20, ge=1, le=100), db: AsyncSession = Depends(get_async_db)):
     """
     Gerçek veritabanından tahmin_stocks tablosundan tahmin geçmişini döndürür.
     """
-    from app.models.prediction_stock import PredictionStock
-    from app.models.base_stock import BaseStock
-    
     # Tahmin verilerini veritabanından çek
-    predictions = db.query(PredictionStock).order_by(PredictionStock.updated_at.desc()).limit(limit).all()
+    predictions = await prediction_repository.get_recent_async(db, limit)
     
     history = []
     
@@ -156,8 +160,13 @@ async def get_real_prediction_history(limit: int = Query(20, ge=1, le=100), db:
             predicted_price = prediction.attention_predicted_price
             accuracy = 100 - (prediction.attention_mse * 100) if prediction.attention_mse and prediction.attention_mse < 1 else None
         else:
-            predicted_price = prediction.lstm_predicted_price
-            accuracy = None
+            # Hızlı model katmanı, küme ve ensemble: modelin ilk ufuk tahmini, yoksa ensemble tahmini
+            prediction_data = prediction.prediction_data or {}
+            if isinstance(prediction_data, (str, bytes)):
+                prediction_data = serialization.loads(prediction_data)
+            horizon = (prediction_data.get("predictions") or {}).get(best_model) or []
+            predicted_price = float(horizon[0]) if horizon else prediction.ensemble_predicted_price
+            accuracy = 100 - (prediction.best_mse * 100) if prediction.best_mse and prediction.best_mse < 1 else None
         
         # Tahmin tarihini belirleme
         prediction_date = prediction.prediction_date if prediction.prediction_date else prediction.updated_at
@@ -176,9 +185,21 @@ async def get_real_prediction_history(limit: int = Query(20, ge=1, le=100), db:
     
     return history
 
+# Gerçekleşen tahminlere göre model doğruluğu endpoint'i
+@router.get("/model-accuracy", response_model=List[ModelAccuracy])
+def get_model_accuracy(
+    window_days: int = Query(30, ge=1, le=365),
+    symbol: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Son `window_days` gün içinde vadesi dolan tahminlerin model bazlı doğruluğunu döndürür.
+    """
+    return history_service.rolling_accuracy(db, window_days=window_days, symbol=symbol)
+
 # Model karşılaştırma endpoint'i
 @router.get("/model-comparison", response_model=ModelComparison)
-async def get_model_comparison(db: Session = Depends(get_db)):
+async def get_model_comparison(db: AsyncSession = Depends(get_async_db)):
     """
     Farklı modellerin karşılaştırmasını döndürür.
     """
@@ -229,7 +250,7 @@ async def get_model_comparison(db: Session = Depends(get_db)):
 
 # Teknik göstergeler endpoint'i
 @router.get("/technical-indicators/{symbol}")
-async def get_technical_indicators(symbol: str, db: Session = Depends(get_db)):
+async def get_technical_indicators(symbol: str, db: AsyncSession = Depends(get_async_db)):
     """
     Belirli bir sembol için teknik göstergeleri döndürür.
     """
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import List, Optional
+from sqlalchemy.orm import Session
+import logging
+
+from app.db.session import get_db
+from app.models.prediction_job import JOB_TYPE_PREDICT, JOB_TYPE_REFRESH_MARKET, JOB_TYPE_BACKTEST, JOB_TYPE_CLUSTER, JOB_TYPE_TUNE, JOB_TYPE_FEATURES, JOB_TYPE_ARCHIVE
+from app.services.job_service import JobService
+from app.schemas import JobCreate, JobResponse
+
+router = APIRouter()
+job_service = JobService()
+logger = logging.getLogger(__name__)
+
+SUPPORTED_JOB_TYPES = [JOB_TYPE_PREDICT, JOB_TYPE_REFRESH_MARKET, JOB_TYPE_BACKTEST, JOB_TYPE_CLUSTER, JOB_TYPE_TUNE, JOB_TYPE_FEATURES,
+                       JOB_TYPE_ARCHIVE]
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_job(job_in: JobCreate, response: Response, db: Session = Depends(get_db)):
+    """
+    Yeni bir arka plan işini kuyruğa ekler ve hemen döner.
+    İşin durumu GET /api/jobs/{id} ile takip edilir.
+    """
+    if job_in.job_type not in SUPPORTED_JOB_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Desteklenmeyen iş tipi: {job_in.job_type}. Geçerli tipler: {', '.join(SUPPORTED_JOB_TYPES)}"
+        )
+
+    if job_in.job_type == JOB_TYPE_PREDICT:
+        params = {
+            "symbols": job_in.symbols,
+            "model_type": job_in.model_type,
+            "days": job_in.days,
+            "force": job_in.force,
+            "retrain": job_in.retrain
+        }
+    elif job_in.job_type == JOB_TYPE_BACKTEST:
+        params = {
+            "symbols": job_in.symbols,
+            "configs": job_in.configs,
+            "days": job_in.days,
+            "folds": job_in.folds,
+            "horizons": job_in.horizons
+        }
+    elif job_in.job_type in (JOB_TYPE_CLUSTER, JOB_TYPE_FEATURES):
+        params = {"symbols": job_in.symbols, "days": job_in.days}
+    elif job_in.job_type == JOB_TYPE_TUNE:
+        params = {"symbols": job_in.symbols, "model_type": job_in.model_type, "days": job_in.days}
+    elif job_in.job_type == JOB_TYPE_ARCHIVE:
+        params = {}
+    else:
+        params = {"run_predictions": job_in.run_predictions, "days": job_in.days}
+
+    job = job_service.submit_job(db, job_in.job_type, params)
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job
+
+@router.get("", response_model=List[JobResponse])
+def list_jobs(
+    db: Session = Depends(get_db),
+    status_filter: Optional[str] = Query(None, alias="status", description="İş durumu: pending, running, completed, failed"),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Son işleri listeler
+    """
+    return job_service.list_jobs(db, status=status_filter, limit=limit)
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    İşin durumunu ve sembol bazlı ilerlemesini döndürür
+    """
+    job = job_service.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"#{job_id} numaralı iş bulunamadı")
+    return job
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app.db.session import get_async_db
+from app.repositories import SnapshotRepository
+from app.repositories.snapshot_repository import SNAPSHOT_SORTS
+from app.services.snapshot_service import SnapshotService
+
+router = APIRouter()
+snapshot_repository = SnapshotRepository()
+logger = logging.getLogger(__name__)
+
+@router.get("")
+async def get_snapshot(
+    symbols: Optional[List[str]] = Query(None, description="Yalnızca bu semboller"),
+    selected_only: bool = Query(False, description="Yalnızca filtreleri geçen (seçili) hisseler"),
+    min_rsi: Optional[float] = Query(None, description="Minimum RSI"),
+    max_rsi: Optional[float] = Query(None, description="Maksimum RSI"),
+    min_rel_volume: Optional[float] = Query(None, description="Minimum bağıl hacim"),
+    sector: Optional[str] = Query(None, description="Sektör"),
+    has_prediction: Optional[bool] = Query(None, description="Tahmini olan / olmayan hisseler"),
+    sort: str = Query("symbol", description=f"Sıralama: {', '.join(SNAPSHOT_SORTS)}"),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="En fazla döndürülecek hisse sayısı"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Piyasanın tamamının veya filtrelenmiş bir alt kümesinin dashboard kartlarını
+    tek sorguyla döndürür. Her eleman `stock` (BaseStockResponse), `technical`
+    (TechnicalStockResponse) ve `prediction` (PredictionStockResponse) bölümlerini
+    içerir; henüz hesaplanmamış bölümler null'dır.
+
+    Bölümler işlem hattı aşamaları sonunda önceden JSON'a çevrildiği için yanıt
+    yeniden kodlanmadan birleştirilir.
+    """
+    if sort not in SNAPSHOT_SORTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Geçersiz sıralama: {sort}. Geçerli değerler: {', '.join(SNAPSHOT_SORTS)}"
+        )
+
+    rows = await snapshot_repository.get_payload_rows_async(
+        db,
+        symbols=symbols,
+        selected_only=selected_only,
+        min_rsi=min_rsi,
+        max_rsi=max_rsi,
+        min_rel_volume=min_rel_volume,
+        sector=sector,
+        has_prediction=has_prediction,
+        sort=sort,
+        limit=limit
+    )
+    return Response(content=SnapshotService.render(rows), media_type="application/json")
@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from typing import List, Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import logging
-import time
 from datetime import datetime, timedelta
 import numpy as np
 import ta
 
-from app.db.session import get_db
-from app.models.base_stock import BaseStock
+from app.db.session import get_db, get_async_db, SessionLocal
 from app.models.prediction_stock import PredictionStock
+from app.models.prediction_job import PredictionJob, JOB_TYPE_PREDICT, JOB_TYPE_REFRESH_MARKET
+from app.repositories import StockRepository, PredictionRepository, PredictionArchiveRepository
 from app.services.base_stock_service import BaseStockService
 from app.services.prediction_service import PredictionService
+from app.services.job_service import JobService
+from app.schemas.converters import convert_to_response
 from app.schemas import (
     BaseStockResponse, 
     PredictionStockResponse,
+    PredictionArchiveResponse,
     StockFilterParams,
     HourlyPredictionResponse,
     HourlyModelPrediction,
@@ -24,37 +30,33 @@ from app.schemas import (
 router = APIRouter()
 base_service = BaseStockService()
 prediction_service = PredictionService()
+job_service = JobService()
+stock_repository = StockRepository()
+prediction_repository = PredictionRepository()
+archive_repository = PredictionArchiveRepository()
 logger = logging.getLogger(__name__)
 
-# BaseStock modelini BaseStockResponse'a dönüştüren yardımcı fonksiyon
-def convert_to_response(stock: BaseStock) -> BaseStockResponse:
+def mark_job_accepted(response: Response, job: PredictionJob) -> None:
     """
-    BaseStock modelini BaseStockResponse şemasına dönüştürür
+    Yanıtı 202 Accepted olarak işaretler ve iş takip adresini başlıklara ekler.
+    Yanıt gövdesinde son tamamlanmış sonuçlar döndürülmeye devam eder.
     """
-    return BaseStockResponse(
-        id=stock.id,
-        symbol=stock.symbol,
-        name=stock.name,
-        last_price=stock.last_price,
-        open_price=stock.open_price if hasattr(stock, 'open_price') else None,
-        high_price=stock.high_price if hasattr(stock, 'high_price') else None,
-        low_price=stock.low_price if hasattr(stock, 'low_price') else None,
-        previous_close=stock.previous_close if hasattr(stock, 'previous_close') else None,
-        daily_change=stock.change_percent,  # change_percent'i daily_change olarak eşleştir
-        daily_volume=stock.volume,
-        relative_volume=stock.relative_volume,
-        rsi=stock.rsi,
-        pivot=stock.pivot_pp,
-        r1=stock.pivot_r1,
-        r2=stock.pivot_r2,
-        s1=stock.pivot_s1,
-        s2=stock.pivot_s2,
-        passed_rsi_filter=stock.passed_rsi_filter if hasattr(stock, 'passed_rsi_filter') else False,
-        passed_volume_filter=stock.passed_volume_filter if hasattr(stock, 'passed_volume_filter') else False,
-        passed_pivot_filter=stock.passed_pivot_filter if hasattr(stock, 'passed_pivot_filter') else False,
-        is_selected=stock.is_selected,
-        last_updated=stock.updated_at
-    )
+    response.status_code = status.HTTP_202_ACCEPTED
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    response.headers["X-Job-Id"] = str(job.id)
+
+def submit_job_in_new_session(job_type: str, params: Dict[str, Any]) -> PredictionJob:
+    """
+    Async endpoint'lerden iş eklemek için kendi senkron oturumunu açar (thread havuzunda çağrılır)
+    """
+    db = SessionLocal()
+    try:
+        job = job_service.submit_job(db, job_type, params)
+        db.refresh(job)
+        db.expunge(job)
+        return job
+    finally:
+        db.close()
 
 @router.get("/symbols", response_model=List[str])
 def get_symbols():
@@ -65,12 +67,16 @@ def get_symbols():
 
 @router.get("/filtered-symbols", response_model=List[str])
 def get_filtered_symbols(
+    response: Response,
     db: Session = Depends(get_db), 
     refresh: bool = Query(False, description="Verileri yeniden çek ve hesapla")
 ):
     """
     Filtreleme kriterlerini geçen hisselerin sembollerini döndürür.
     
+    refresh=True ise piyasa yenileme işi kuyruğa eklenir ve istek 202 ile hemen döner;
+    yanıtta son tamamlanmış filtreleme sonucu yer alır.
+    
     Args:
         db: Veritabanı oturumu
         refresh: Verileri yeniden çekip filtreleme işlemi yapılsın mı
@@ -79,19 +85,14 @@ def get_filtered_symbols(
         List[str]: Filtreleme kriterlerini geçen hisse sembolleri listesi
     """
     try:
-        # Eğer refresh parametresi True ise, hisseleri yeniden işle
+        # Eğer refresh parametresi True ise, piyasa yenileme işini kuyruğa ekle
         if refresh:
-            logger.info("Tüm hisseler yeniden işleniyor ve filtreleniyor...")
-            start_time = time.time()
-            base_service.process_all_stocks(db)
-            elapsed_time = time.time() - start_time
-            logger.info(f"Hisse işleme tamamlandı. Süre: {elapsed_time:.2f} saniye")
-        
-        # Seçilen (filtreleri geçen) hisseleri getir
-        selected_stocks = base_service.get_selected_stocks(db)
+            job = job_service.submit_job(db, JOB_TYPE_REFRESH_MARKET, {"run_predictions": False, "days": 45})
+            mark_job_accepted(response, job)
+            logger.info(f"Piyasa yenileme işi kuyruğa eklendi: #{job.id}")
         
-        # Sembolleri çıkar
-        symbols = [stock.symbol for stock in selected_stocks]
+        # Seçilen (filtreleri geçen) hisselerin sembolleri
+        symbols = stock_repository.get_selected_symbols(db)
         
         logger.info(f"Filtreleme kriterlerini geçen {len(symbols)} hisse bulundu")
         if symbols:
@@ -106,77 +107,73 @@ def get_filtered_symbols(
         )
 
 @router.get("/filtered-predictions", response_model=List[PredictionStockResponse])
-def get_filtered_predictions(
-    db: Session = Depends(get_db),
+async def get_filtered_predictions(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     run_predictions: bool = Query(False, description="Filtrelenmiş hisseler için tahmin yap")
 ):
     """
     Filtreleme kriterlerini geçen hisselerin tahminlerini döndürür.
     
+    Tahminler istek içinde hesaplanmaz. run_predictions=True ise veya bazı hisselerin
+    tahmini yoksa tahmin işi kuyruğa eklenir ve istek 202 ile döner; yanıtta son
+    tamamlanmış tahminler yer alır. Okumalar async oturumla yapılır; iş ekleme
+    senkron oturumla thread havuzunda çalışır.
+    
     Args:
-        db: Veritabanı oturumu
+        db: Async veritabanı oturumu
         run_predictions: Tahminlerin yeniden hesaplanıp hesaplanmayacağı
         
     Returns:
         List[PredictionStockResponse]: Filtrelenen hisselerin tahmin sonuçları listesi
     """
     try:
-        # Seçilen (filtreleri geçen) hisseleri getir
-        selected_stocks = base_service.get_selected_stocks(db)
+        # Seçilen (filtreleri geçen) hisselerin sembolleri
+        symbols = await stock_repository.get_selected_symbols_async(db)
         
-        if not selected_stocks:
+        if not symbols:
             logger.warning("Filtreleme kriterlerini geçen hisse bulunamadı")
             return []
         
-        # Sembolleri çıkar
-        symbols = [stock.symbol for stock in selected_stocks]
         logger.info(f"Filtreleme kriterlerini geçen {len(symbols)} hisse için tahminler getiriliyor")
         
-        # run_predictions=True ise, tüm tahminleri yeniden hesapla
+        # Mevcut (son tamamlanmış) tahminleri hisseleriyle birlikte sembol sayısından bağımsız sorgu sayısıyla getir
+        records = await prediction_repository.get_predictions_for_symbols_async(db, symbols)
+        responses = prediction_service.build_prediction_responses(records)
+        
+        predictions = []
+        symbols_requiring_prediction = []
+        for symbol in symbols:
+            prediction = responses.get(symbol)
+            if prediction:
+                predictions.append(prediction)
+            else:
+                # Tahmin yoksa, tahmin yapılacak semboller listesine ekle
+                symbols_requiring_prediction.append(symbol)
+        
         if run_predictions:
-            # Tahminleri yeniden hesapla
-            logger.info(f"Filtrelenen {len(symbols)} hisse için tahminler yeniden hesaplanıyor...")
-            predictions = prediction_service.predict_with_hourly_data(db, symbols)
-            logger.info(f"Toplam {len(predictions)} hisse için tahminler hesaplandı")
-            return predictions
-        # run_predictions=False ise (varsayılan), mevcut tahminleri getir ve eksikleri hesapla
-        else:
-            # Mevcut tahminleri getir
-            predictions = []
-            symbols_requiring_prediction = []
-            stocks_requiring_prediction = {}
-
-            # Önce mevcut tahminleri kontrol et
-            for stock in selected_stocks:
-                symbol = stock.symbol
-                prediction = prediction_service.get_prediction_by_symbol(db, symbol)
-                if prediction:
-                    predictions.append(prediction)
-                else:
-                    # Tahmin yoksa, tahmin yapılacak semboller listesine ekle
-                    symbols_requiring_prediction.append(symbol)
-                    stocks_requiring_prediction[symbol] = stock
-            
-            # Eğer tahmin yapılması gereken hisseler varsa
-            if symbols_requiring_prediction:
-                logger.info(f"{len(symbols_requiring_prediction)} hisse için veritabanında tahmin bulunamadı, tahminler hesaplanıyor...")
-                
-                # Her bir hisse için tahmin yap
-                for symbol in symbols_requiring_prediction:
-                    stock = stocks_requiring_prediction[symbol]
-                    try:
-                        # Hisse için tahmin yap
-                        new_prediction = prediction_service.predict_stock(db, stock, "all")
-                        if new_prediction:
-                            predictions.append(new_prediction)
-                            logger.info(f"{symbol} için tahmin başarıyla yapıldı.")
-                        else:
-                            logger.warning(f"{symbol} için tahmin yapılamadı.")
-                    except Exception as e:
-                        logger.error(f"{symbol} için tahmin yapılırken hata: {str(e)}")
-            
-            logger.info(f"Toplam {len(predictions)}/{len(symbols)} hisse için tahminler bulundu/yapıldı")
-            return predictions
+            # Tüm seçili hisseler için tahminleri yeniden hesaplama işi
+            logger.info(f"Filtrelenen {len(symbols)} hisse için tahmin işi kuyruğa ekleniyor...")
+            job = await run_in_threadpool(submit_job_in_new_session, JOB_TYPE_PREDICT, {
+                "symbols": symbols,
+                "model_type": "all",
+                "days": 45,
+                "force": True
+            })
+            mark_job_accepted(response, job)
+        elif symbols_requiring_prediction:
+            # Sadece tahmini olmayan hisseler için iş
+            logger.info(f"{len(symbols_requiring_prediction)} hisse için veritabanında tahmin bulunamadı, tahmin işi kuyruğa ekleniyor...")
+            job = await run_in_threadpool(submit_job_in_new_session, JOB_TYPE_PREDICT, {
+                "symbols": symbols_requiring_prediction,
+                "model_type": "all",
+                "days": 45,
+                "force": False
+            })
+            mark_job_accepted(response, job)
+        
+        logger.info(f"Toplam {len(predictions)}/{len(symbols)} hisse için tahmin bulundu")
+        return predictions
     except Exception as e:
         logger.error(f"Filtrelenmiş tahminleri alma hatası: {str(e)}")
         raise HTTPException(
@@ -186,6 +183,7 @@ def get_filtered_predictions(
 
 @router.get("/filtered", response_model=List[BaseStockResponse])
 def get_filtered_stocks(
+    response: Response,
     db: Session = Depends(get_db),
     params: StockFilterParams = Depends(),
     refresh: bool = Query(False, description="Verileri yeniden çek ve hesapla")
@@ -194,11 +192,12 @@ def get_filtered_stocks(
     Belirli filtre kriterlerine uyan hisse senetlerini döndürür
     """
     if refresh:
-        # Hisseleri yeniden çek ve filtrele
-        base_service.process_stocks(db)
+        # Hisseleri yeniden çekme ve filtreleme işini kuyruğa ekle
+        job = job_service.submit_job(db, JOB_TYPE_REFRESH_MARKET, {"run_predictions": False, "days": 45})
+        mark_job_accepted(response, job)
     
     # Filtre parametrelerine göre hisseleri getir
-    stocks = base_service.get_filtered_stocks(
+    stocks = stock_repository.get_filtered(
         db=db,
         min_rsi=params.min_rsi,
         max_rsi=params.max_rsi,
@@ -207,11 +206,12 @@ def get_filtered_stocks(
         limit=params.limit
     )
     
-    return stocks
+    return [convert_to_response(stock) for stock in stocks]
 
 @router.get("/prediction/{symbol}", response_model=PredictionStockResponse)
 def get_prediction(
     symbol: str, 
+    response: Response,
     db: Session = Depends(get_db), 
     refresh: bool = Query(False),
     model_type: str = Query("all", description="Model tipi: 'lstm', 'gru', 'attention' veya 'all'")
@@ -219,29 +219,63 @@ def get_prediction(
     """
     Belirli bir hisse senedi için tahmin bilgilerini döndürür.
     Üç farklı model kullanılabilir: LSTM, GRU ve Attention.
+    
+    refresh=True ise tahmin işi kuyruğa eklenir ve istek 202 ile döner;
+    mevcut bir tahmin varsa yanıtta o döndürülür.
     """
     # Eğer /predictions ile karışma olursa özel işlem yap
     if symbol.lower() == "predictions":
         raise HTTPException(status_code=400, detail="Geçersiz sembol. Tüm tahminleri görüntülemek için /api/stocks/predictions endpoint'ini kullanın.")
     
-    stock = db.query(BaseStock).filter(BaseStock.symbol == symbol).first()
-    if not stock:
+    # Mevcut (son tamamlanmış) tahmini hissesiyle birlikte al; tahmin yoksa hissenin varlığını denetle
+    prediction = prediction_service.get_prediction_by_symbol(db, symbol)
+    if not prediction and not stock_repository.get_by_symbol(db, symbol):
         raise HTTPException(status_code=404, detail=f"{symbol} sembolü bulunamadı")
     
-    # Eğer yenileme isteniyorsa veya hisse için tahmin henüz yapılmamışsa
-    if refresh:
-        prediction = prediction_service.predict_stock(db, stock, model_type)
+    # Eğer yenileme isteniyorsa veya hisse için tahmin henüz yapılmamışsa tahmin işini kuyruğa ekle
+    if refresh or not prediction:
+        job = job_service.submit_job(db, JOB_TYPE_PREDICT, {
+            "symbols": [symbol],
+            "model_type": model_type,
+            "days": 45,
+            "force": refresh
+        })
+        
         if not prediction:
-            raise HTTPException(status_code=500, detail=f"{symbol} için tahmin yapılamadı")
-        return prediction
-    
-    # Mevcut tahminleri döndür
-    prediction = prediction_service.get_prediction_by_symbol(db, symbol)
-    if not prediction:
-        raise HTTPException(status_code=404, detail=f"{symbol} için tahmin bulunamadı")
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={
+                    "message": f"{symbol} için tahmin işi kuyruğa eklendi",
+                    "job_id": job.id,
+                    "status_url": f"/api/jobs/{job.id}"
+                },
+                headers={"Location": f"/api/jobs/{job.id}", "X-Job-Id": str(job.id)}
+            )
+        
+        mark_job_accepted(response, job)
     
     return prediction
 
+@router.get("/prediction/{symbol}/archive", response_model=List[PredictionArchiveResponse])
+async def get_prediction_archive(
+    symbol: str,
+    start: Optional[datetime] = Query(None, description="Başlangıç (dahil)"),
+    end: Optional[datetime] = Query(None, description="Bitiş (hariç)"),
+    granularity: Optional[str] = Query(None, description="Yalnızca 'raw' (gün içi) veya '1d' (sıkıştırılmış) satırlar"),
+    limit: int = Query(500, ge=1, le=10000, description="En fazla döndürülecek tahmin sayısı"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Sembolün geçmiş tahminlerini en yeniden eskiye döndürür. Son tahminler her
+    çalıştırma için bir satır, saklama işinin sıkıştırdığı eski günler günün son
+    tahmini olarak (samples: o gün yapılan tahmin sayısı) döner.
+    """
+    if granularity not in (None, "raw", "1d"):
+        raise HTTPException(status_code=400, detail="Geçersiz çözünürlük. Geçerli değerler: raw, 1d")
+    
+    return await archive_repository.get_range_async(db, symbol, start=start, end=end,
+                                                    granularity=granularity, limit=limit)
+
 @router.get("/saatlik-data/{symbol}")
 def get_hourly_data(
     symbol: str, 
@@ -571,16 +605,13 @@ def get_model_features(
         }
 
 @router.get("/{symbol}", response_model=BaseStockResponse)
-def get_stock(symbol: str, db: Session = Depends(get_db)):
+async def get_stock(symbol: str, db: AsyncSession = Depends(get_async_db)):
     """
     Belirli bir sembol için temel hisse bilgilerini döndürür
     """
-    stock = db.query(BaseStock).filter(BaseStock.symbol == symbol).first()
+    stock = await stock_repository.get_by_symbol_async(db, symbol)
     if not stock:
         raise HTTPException(status_code=404, detail=f"{symbol} sembolü bulunamadı")
     
     # BaseStockResponse formatına dönüştür
     return convert_to_response(stock)
-
-# Her sembol isteği arasında bekle
-time.sleep(3)  # 3 saniye bekle
\ No newline at end of file
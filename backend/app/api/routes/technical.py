@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import logging
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, get_async_db
 from app.models.base_stock import BaseStock
-from app.models.technical_stock import TechnicalStock
+from app.repositories import TechnicalRepository
 from app.services.technical_service import TechnicalService
+from app.schemas.converters import convert_to_technical_response
 from app.schemas import (
     TechnicalStockResponse,
     BaseStockResponse
@@ -14,49 +16,9 @@ from app.schemas import (
 
 router = APIRouter()
 technical_service = TechnicalService()
+technical_repository = TechnicalRepository()
 logger = logging.getLogger(__name__)
 
-# TechnicalStock modelini TechnicalStockResponse'a dönüştüren yardımcı fonksiyon
-def convert_to_technical_response(technical: TechnicalStock) -> TechnicalStockResponse:
-    """
-    TechnicalStock modelini TechnicalStockResponse şemasına dönüştürür
-    """
-    return TechnicalStockResponse(
-        id=technical.id,
-        base_stock_id=technical.base_stock_id,
-        symbol=technical.base_stock.symbol if technical.base_stock else None,
-        # Teknik göstergeler
-        macd=technical.macd,
-        macd_signal=technical.macd_signal,
-        macd_hist=technical.macd_hist,
-        adx=technical.adx,
-        dmi_plus=technical.dmi_plus,
-        dmi_minus=technical.dmi_minus,
-        stoch_k=technical.stoch_k,
-        stoch_d=technical.stoch_d,
-        cci=technical.cci,
-        mfi=technical.mfi,
-        bb_upper=technical.bb_upper,
-        bb_middle=technical.bb_middle,
-        bb_lower=technical.bb_lower,
-        atr=technical.atr,
-        sma_50=technical.sma_50,
-        sma_200=technical.sma_200,
-        ema_20=technical.ema_20,
-        # Destek ve direnç seviyeleri
-        support_levels=technical.support_levels,
-        resistance_levels=technical.resistance_levels,
-        # Fibonacci seviyeleri
-        fib_retracement=technical.fib_retracement,
-        # Teknik analize dayalı sinyaller
-        trend_signals=technical.trend_signals,
-        momentum_signals=technical.momentum_signals,
-        volatility_signals=technical.volatility_signals,
-        # Zaman damgaları
-        created_at=technical.created_at,
-        updated_at=technical.updated_at
-    )
-
 @router.post("/analyze", response_model=Dict[str, Any])
 def analyze_technical(
     db: Session = Depends(get_db),
@@ -88,11 +50,8 @@ def analyze_technical(
                 }
             
             # Bulunan hisseleri analiz et
-            results = []
-            for stock in stocks:
-                technical = technical_service.analyze_stock(db, stock)
-                if technical:
-                    results.append(convert_to_technical_response(technical))
+            results = [convert_to_technical_response(technical)
+                       for technical in technical_service.analyze_stocks(db, stocks)]
             
             return {
                 "success": True,
@@ -120,18 +79,18 @@ def analyze_technical(
         }
 
 @router.get("/all", response_model=List[TechnicalStockResponse])
-def get_all_technical(db: Session = Depends(get_db)):
+async def get_all_technical(db: AsyncSession = Depends(get_async_db)):
     """
     Tüm teknik analiz sonuçlarını döndürür
     
     Returns:
         List[TechnicalStockResponse]: Teknik analiz sonuçlarının listesi
     """
-    technical_stocks = technical_service.get_all_technical_stocks(db)
+    technical_stocks = await technical_repository.get_all_with_stock_async(db)
     return [convert_to_technical_response(ts) for ts in technical_stocks]
 
 @router.get("/{symbol}", response_model=TechnicalStockResponse)
-def get_technical_by_symbol(symbol: str, db: Session = Depends(get_db)):
+def get_technical_by_symbol(symbol: str, db: Session = Depends(get_read_db)):
     """
     Belirli bir hisse senedi için teknik analiz sonuçlarını döndürür
     
@@ -152,7 +111,7 @@ def get_technical_by_symbol(symbol: str, db: Session = Depends(get_db)):
     return convert_to_technical_response(technical)
 
 @router.get("/signals/trend", response_model=List[Dict[str, Any]])
-def get_trend_signals(db: Session = Depends(get_db)):
+def get_trend_signals(db: Session = Depends(get_read_db)):
     """
     Trend sinyallerine göre filtrelenmiş teknik analiz sonuçlarını döndürür
     
@@ -178,7 +137,7 @@ def get_trend_signals(db: Session = Depends(get_db)):
     return trend_signals
 
 @router.get("/signals/momentum", response_model=List[Dict[str, Any]])
-def get_momentum_signals(db: Session = Depends(get_db)):
+def get_momentum_signals(db: Session = Depends(get_read_db)):
     """
     Momentum sinyallerine göre filtrelenmiş teknik analiz sonuçlarını döndürür
     
@@ -211,7 +170,7 @@ def get_momentum_signals(db: Session = Depends(get_db)):
     return momentum_signals
 
 @router.get("/support-resistance/{symbol}", response_model=Dict[str, Any])
-def get_support_resistance(symbol: str, db: Session = Depends(get_db)):
+def get_support_resistance(symbol: str, db: Session = Depends(get_read_db)):
     """
     Belirli bir hisse için destek ve direnç seviyelerini döndürür
     
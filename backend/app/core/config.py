@@ -15,12 +15,148 @@ class Settings(BaseSettings):
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost", "http://localhost:3000", "http://localhost:80"]
     
     # Veritabanı ayarları
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/bist_tahmin_db")
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./stock_prediction.db")
+    DATABASE_READ_URL: str = os.getenv("DATABASE_READ_URL", "")  # Salt okunur oturumlar için replika (boşsa birincil)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Saniye
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Saniye
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    # Başlangıçta Alembic revizyonlarını uygula (false ise yalnızca create_all)
+    DB_MIGRATE_ON_STARTUP: bool = os.getenv("DB_MIGRATE_ON_STARTUP", "true").lower() == "true"
     
     # Uygulama modu
     ENV: str = os.getenv("ENVIRONMENT", "development")
     DEBUG: bool = ENV == "development"
-    
+
+    # Süreç rolü: 'api' (TensorFlow yüklemeyen, yalnızca okuma yapan API),
+    # 'worker' (eğitim/tahmin işleri ve zamanlayıcı) veya 'all' (geliştirme için hepsi tek süreçte)
+    PROCESS_ROLE: str = os.getenv("PROCESS_ROLE", "all")
+
+    # Arka plan iş kuyruğu ayarları
+    JOB_POLL_INTERVAL_SECONDS: int = int(os.getenv("JOB_POLL_INTERVAL_SECONDS", "5"))
+    JOB_STALE_TIMEOUT_SECONDS: int = int(os.getenv("JOB_STALE_TIMEOUT_SECONDS", "1800"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+    # Temel hisse güncellemesi: satırlar parça başına tek bir upsert ifadesiyle yazılır
+    BASE_STOCK_UPSERT_CHUNK_SIZE: int = int(os.getenv("BASE_STOCK_UPSERT_CHUNK_SIZE", "200"))
+
+    # Saatlik/günlük barların price_bars tablosuna (PostgreSQL'de COPY ile) kalıcı yazılması;
+    # vadesi dolan tahminler bu barlarla çözümlendiğinden varsayılan olarak açıktır
+    BAR_STORE_ENABLED: bool = os.getenv("BAR_STORE_ENABLED", "true").lower() == "true"
+
+    # Sembol bazlı eğitim süre sınırları
+    SUPERVISED_TRAINING: bool = os.getenv("SUPERVISED_TRAINING", "true").lower() == "true"
+    SYMBOL_TIME_BUDGET_SECONDS: int = int(os.getenv("SYMBOL_TIME_BUDGET_SECONDS", "300"))
+    SYMBOL_HARD_TIMEOUT_GRACE_SECONDS: int = int(os.getenv("SYMBOL_HARD_TIMEOUT_GRACE_SECONDS", "60"))
+    TRAINING_WORKER_MAX_TASKS: int = int(os.getenv("TRAINING_WORKER_MAX_TASKS", "20"))
+
+    # Bir sembolün derin modelleri aynı veri seti üzerinde eşzamanlı eğitilir
+    CONCURRENT_TRAINING: bool = os.getenv("CONCURRENT_TRAINING", "true").lower() == "true"
+    # TensorFlow iş parçacığı havuzları (0: TensorFlow varsayılanı); op içi havuz eşzamanlı 3 model arasında paylaşılır
+    TF_INTRA_OP_THREADS: int = int(os.getenv("TF_INTRA_OP_THREADS", str(max(1, (os.cpu_count() or 3) // 3))))
+    TF_INTER_OP_THREADS: int = int(os.getenv("TF_INTER_OP_THREADS", "3"))
+
+    # Derlenmiş model şablonları: aynı mimari ve girdi boyutu için model bir kez oluşturulur
+    MODEL_TEMPLATES_ENABLED: bool = os.getenv("MODEL_TEMPLATES_ENABLED", "true").lower() == "true"
+    MODEL_TEMPLATE_CLEAR_EVERY: int = int(os.getenv("MODEL_TEMPLATE_CLEAR_EVERY", "50"))  # Kaç eğitimde bir Keras oturumu temizlenir
+    MODEL_TEMPLATE_MAX_IDLE: int = int(os.getenv("MODEL_TEMPLATE_MAX_IDLE", "2"))
+
+    # Monte Carlo dropout tahmin aralıkları
+    MC_DROPOUT_SAMPLES: int = int(os.getenv("MC_DROPOUT_SAMPLES", "100"))
+    MC_DROPOUT_QUANTILES: str = os.getenv("MC_DROPOUT_QUANTILES", "0.05,0.5,0.95")  # Virgülle ayrılmış
+
+    # Model kaskadı: hızlı modeller yeterliyse derin modeller eğitilmez
+    CASCADE_ENABLED: bool = os.getenv("CASCADE_ENABLED", "true").lower() == "true"
+    CASCADE_MAX_VALIDATION_MAE: float = float(os.getenv("CASCADE_MAX_VALIDATION_MAE", "0.05"))
+    CASCADE_MAX_DISAGREEMENT: float = float(os.getenv("CASCADE_MAX_DISAGREEMENT", "0.02"))
+    BASELINE_SEASON_LENGTH: int = int(os.getenv("BASELINE_SEASON_LENGTH", "8"))
+    BASELINE_LAGS: int = int(os.getenv("BASELINE_LAGS", "5"))
+
+    # Walk-forward backtest ayarları
+    BACKTEST_MAX_WORKERS: int = int(os.getenv("BACKTEST_MAX_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+    BACKTEST_FOLDS: int = int(os.getenv("BACKTEST_FOLDS", "5"))
+    BACKTEST_HORIZONS: str = os.getenv("BACKTEST_HORIZONS", "1,4,8")  # Saatlik bar cinsinden, virgülle ayrılmış
+    BACKTEST_TEST_SIZE: int = int(os.getenv("BACKTEST_TEST_SIZE", "24"))
+    BACKTEST_INTERVAL_COVERAGE: float = float(os.getenv("BACKTEST_INTERVAL_COVERAGE", "0.8"))
+
+    # Eğitim veri seti önbelleği (içerik adresli, memmap .npy dosyaları)
+    FEATURE_CACHE_ENABLED: bool = os.getenv("FEATURE_CACHE_ENABLED", "true").lower() == "true"
+    FEATURE_CACHE_DIR: str = os.getenv("FEATURE_CACHE_DIR", "./cache/features")
+    FEATURE_CACHE_MEMORY_ENTRIES: int = int(os.getenv("FEATURE_CACHE_MEMORY_ENTRIES", "32"))
+    FEATURE_CACHE_TTL_DAYS: int = int(os.getenv("FEATURE_CACHE_TTL_DAYS", "7"))
+
+    # Tahmin doğruluğu takibi
+    PREDICTION_ACCURACY_WINDOW_DAYS: int = int(os.getenv("PREDICTION_ACCURACY_WINDOW_DAYS", "30"))
+
+    # Davranışa göre sembol kümeleri ve küme başına ortak model
+    CLUSTER_ROUTING_ENABLED: bool = os.getenv("CLUSTER_ROUTING_ENABLED", "true").lower() == "true"
+    CLUSTER_COUNT: int = int(os.getenv("CLUSTER_COUNT", "6"))
+    CLUSTER_MIN_SIZE: int = int(os.getenv("CLUSTER_MIN_SIZE", "3"))  # Küme başına ortalama en az sembol
+    CLUSTER_CORRELATION_COMPONENTS: int = int(os.getenv("CLUSTER_CORRELATION_COMPONENTS", "3"))
+    CLUSTER_MODEL_TYPE: str = os.getenv("CLUSTER_MODEL_TYPE", "lstm")
+    CLUSTER_MAX_MEMBERS: int = int(os.getenv("CLUSTER_MAX_MEMBERS", "30"))
+    CLUSTER_MODEL_DIR: str = os.getenv("CLUSTER_MODEL_DIR", "./cache/cluster_models")  # Küme işinde eğitilen ortak modeller
+    CLUSTER_CACHE_SECONDS: int = int(os.getenv("CLUSTER_CACHE_SECONDS", "300"))
+
+    # Hiperparametre araması (ardışık yarılama): her turda yapılandırmaların 1/eta'sı kalır
+    TUNED_CONFIGS_ENABLED: bool = os.getenv("TUNED_CONFIGS_ENABLED", "true").lower() == "true"
+    TUNING_TRIALS: int = int(os.getenv("TUNING_TRIALS", "9"))
+    TUNING_ETA: int = int(os.getenv("TUNING_ETA", "3"))
+    TUNING_MAX_WORKERS: int = int(os.getenv("TUNING_MAX_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+    TUNING_MAX_MEMBERS: int = int(os.getenv("TUNING_MAX_MEMBERS", "5"))  # Küme aramasında kullanılan en fazla üye
+    TUNING_SEED: int = int(os.getenv("TUNING_SEED", "42"))
+    TUNED_CONFIG_CACHE_SECONDS: int = int(os.getenv("TUNED_CONFIG_CACHE_SECONDS", "300"))
+
+    # Permütasyon önemiyle özellik budama
+    FEATURE_PRUNING_ENABLED: bool = os.getenv("FEATURE_PRUNING_ENABLED", "true").lower() == "true"
+    FEATURE_IMPORTANCE_MODEL_TYPE: str = os.getenv("FEATURE_IMPORTANCE_MODEL_TYPE", "gru")
+    FEATURE_IMPORTANCE_EPOCHS: int = int(os.getenv("FEATURE_IMPORTANCE_EPOCHS", "20"))
+    FEATURE_IMPORTANCE_REPEATS: int = int(os.getenv("FEATURE_IMPORTANCE_REPEATS", "3"))
+    FEATURE_IMPORTANCE_MAX_SYMBOLS: int = int(os.getenv("FEATURE_IMPORTANCE_MAX_SYMBOLS", "20"))
+    FEATURE_IMPORTANCE_MAX_SAMPLES: int = int(os.getenv("FEATURE_IMPORTANCE_MAX_SAMPLES", "256"))  # Sembol başına doğrulama penceresi
+    FEATURE_IMPORTANCE_BATCH_SIZE: int = int(os.getenv("FEATURE_IMPORTANCE_BATCH_SIZE", "1024"))
+    FEATURE_PRUNE_MIN_IMPORTANCE: float = float(os.getenv("FEATURE_PRUNE_MIN_IMPORTANCE", "0.01"))  # Göreli MSE artışı
+    FEATURE_MIN_COUNT: int = int(os.getenv("FEATURE_MIN_COUNT", "5"))
+    FEATURE_SET_CACHE_SECONDS: int = int(os.getenv("FEATURE_SET_CACHE_SECONDS", "300"))
+
+    # Veri kayması (drift) kontrolü: kayma yoksa süresi dolan tahminler yeniden eğitilmez
+    DRIFT_GATING_ENABLED: bool = os.getenv("DRIFT_GATING_ENABLED", "true").lower() == "true"
+    DRIFT_BINS: int = int(os.getenv("DRIFT_BINS", "10"))
+    DRIFT_RECENT_BARS: int = int(os.getenv("DRIFT_RECENT_BARS", "80"))  # Yaklaşık 10 işlem günü
+    DRIFT_PSI_THRESHOLD: float = float(os.getenv("DRIFT_PSI_THRESHOLD", "0.25"))
+    DRIFT_KS_THRESHOLD: float = float(os.getenv("DRIFT_KS_THRESHOLD", "0.3"))
+    DRIFT_MAX_OUT_OF_RANGE: float = float(os.getenv("DRIFT_MAX_OUT_OF_RANGE", "0.2"))
+    DRIFT_ERROR_RATIO: float = float(os.getenv("DRIFT_ERROR_RATIO", "1.5"))
+    DRIFT_MIN_OUTCOMES: int = int(os.getenv("DRIFT_MIN_OUTCOMES", "3"))
+    DRIFT_MAX_MODEL_AGE_DAYS: int = int(os.getenv("DRIFT_MAX_MODEL_AGE_DAYS", "7"))
+    SYMBOL_MODEL_DIR: str = os.getenv("SYMBOL_MODEL_DIR", "./cache/symbol_models")  # Drift yoksa yeniden kullanılan sembol modelleri
+
+    # Gerçekleşen hatalara göre ensemble ağırlıkları
+    ENSEMBLE_DECAY: float = float(os.getenv("ENSEMBLE_DECAY", "0.9"))  # EWMA azalma katsayısı
+    ENSEMBLE_TEMPERATURE: float = float(os.getenv("ENSEMBLE_TEMPERATURE", "0.01"))  # Hata farkı ölçeği (oran)
+    ENSEMBLE_MIN_OBSERVATIONS: int = int(os.getenv("ENSEMBLE_MIN_OBSERVATIONS", "5"))
+    ENSEMBLE_PRUNING_ENABLED: bool = os.getenv("ENSEMBLE_PRUNING_ENABLED", "true").lower() == "true"
+    ENSEMBLE_MIN_WEIGHT: float = float(os.getenv("ENSEMBLE_MIN_WEIGHT", "0.05"))
+    ENSEMBLE_REEXPLORE_DAYS: int = int(os.getenv("ENSEMBLE_REEXPLORE_DAYS", "7"))
+
+    # Write-behind: hesaplama sonuçları arka plandaki yazıcı tarafından toplu olarak kaydedilir
+    WRITE_BEHIND_ENABLED: bool = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    WRITE_BEHIND_BATCH_SIZE: int = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "50"))
+    WRITE_BEHIND_MAX_DELAY_SECONDS: float = float(os.getenv("WRITE_BEHIND_MAX_DELAY_SECONDS", "2.0"))  # Eksik parti en fazla bu kadar bekler
+    WRITE_BEHIND_MAX_PENDING: int = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "200"))  # Dolunca hesaplama bekler (geri basınç)
+    WRITE_BEHIND_MAX_RETRIES: int = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "3"))
+    WRITE_BEHIND_RETRY_BACKOFF_SECONDS: float = float(os.getenv("WRITE_BEHIND_RETRY_BACKOFF_SECONDS", "0.5"))
+    WRITE_BEHIND_CRASH_SAFE: bool = os.getenv("WRITE_BEHIND_CRASH_SAFE", "true").lower() == "true"
+    WRITE_BEHIND_JOURNAL_DIR: str = os.getenv("WRITE_BEHIND_JOURNAL_DIR", "./cache/write_behind")
+
+    # Yalnızca ekleme yapılan tahmin arşivi (prediction_archive)
+    PREDICTION_ARCHIVE_ENABLED: bool = os.getenv("PREDICTION_ARCHIVE_ENABLED", "true").lower() == "true"
+    PREDICTION_ARCHIVE_RAW_DAYS: int = int(os.getenv("PREDICTION_ARCHIVE_RAW_DAYS", "30"))  # Daha eski gün içi tahminler günlüğe sıkıştırılır
+    PREDICTION_ARCHIVE_RETENTION_DAYS: int = int(os.getenv("PREDICTION_ARCHIVE_RETENTION_DAYS", "730"))  # 0: süresiz saklanır
+
     model_config = {
         "case_sensitive": True,
         "env_file": ".env",
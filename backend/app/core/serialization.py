@@ -0,0 +1,42 @@
+import json
+from typing import Any, Union
+
+import orjson
+
+# NumPy dizileri/skalerleri doğrudan, sözlüklerdeki sayı anahtarları metin olarak yazılır
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _default(value: Any) -> Any:
+    """
+    orjson'un doğrudan desteklemediği tipler (pandas Timestamp, NumPy dışı dizi benzerleri)
+    """
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"JSON'a dönüştürülemeyen tip: {type(value).__name__}")
+
+def dumps_bytes(value: Any) -> bytes:
+    """
+    Değeri orjson ile JSON'a dönüştürür. NaN ve sonsuz değerler null yazılır
+    (PostgreSQL JSONB bu değerleri kabul etmez).
+    """
+    return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+
+def dumps(value: Any) -> str:
+    """
+    `dumps_bytes` sonucunu metin olarak döndürür (SQLAlchemy JSON sütunları için)
+    """
+    return dumps_bytes(value).decode()
+
+def loads(value: Union[str, bytes]) -> Any:
+    """
+    JSON metnini çözer. Eski kayıtlarda bulunabilen NaN / Infinity değerleri
+    orjson kabul etmediği için bu durumda standart kütüphaneye düşülür.
+    """
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return json.loads(value)
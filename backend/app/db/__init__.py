@@ -1,3 +1,2 @@
 # Veritabanı paketi başlatma dosyası
-from .database import Base, engine
-from .session import get_db 
\ No newline at end of file
+from .session import Base, engine, get_db, get_read_db
@@ -1,30 +1,4 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+# Geriye dönük uyumluluk: motor, oturum ve model tabanı app.db.session'da tek yerden oluşturulur
+from app.db.session import Base, engine, read_engine, SessionLocal, ReadSessionLocal, get_db, get_read_db
 
-load_dotenv()
-
-# Veritabanı bağlantı URL'si
-SQLALCHEMY_DATABASE_URL = os.getenv(
-    "DATABASE_URL",
-    "postgresql://postgres:postgres@db:5432/bist_tahmin_db"
-)
-
-# SQLAlchemy engine oluştur
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-
-# SessionLocal sınıfı oluştur
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Base sınıfı oluştur
-Base = declarative_base()
-
-# Veritabanı bağlantı dependency'si
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+__all__ = ["Base", "engine", "read_engine", "SessionLocal", "ReadSessionLocal", "get_db", "get_read_db"]
@@ -0,0 +1,92 @@
+import logging
+import os
+from typing import List, Optional
+
+import sqlalchemy as sa
+from alembic import command, op
+from alembic.config import Config
+from sqlalchemy.engine import Engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+def alembic_config() -> Config:
+    """
+    backend/alembic.ini yapılandırmasını, çalışma dizininden bağımsız betik konumuyla döndürür
+    """
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    return config
+
+def run_migrations(engine: Optional[Engine] = None, revision: str = "head"):
+    """
+    Şemayı verilen revizyona yükseltir. API ve worker süreçleri başlangıçta
+    çağırır; PostgreSQL'de eşzamanlı yükseltmeler danışma kilidiyle sıraya girer.
+
+    Args:
+        engine: Veritabanı motoru (varsayılan: uygulama motoru)
+        revision: Hedef revizyon
+    """
+    if engine is None:
+        from app.db.session import engine
+
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+    logger.info(f"Veritabanı şeması güncel ({revision})")
+
+# Revizyonlar, tabloları create_all ile oluşturulmuş mevcut veritabanlarında da
+# çalışabilmek için aşağıdaki varlık kontrollü yardımcıları kullanır. SQL betiği
+# üretilirken (--sql) veritabanı incelenemez; oluşturma ve silme komutları koşulsuz yazılır.
+
+def is_offline() -> bool:
+    return op.get_context().as_sql
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+def has_table(table: str) -> bool:
+    if is_offline():
+        return False
+    return _inspector().has_table(table)
+
+def has_column(table: str, column: str) -> bool:
+    if is_offline():
+        return False
+    return any(c["name"] == column for c in _inspector().get_columns(table))
+
+def has_index(table: str, name: str) -> bool:
+    if is_offline():
+        return False
+    return any(i["name"] == name for i in _inspector().get_indexes(table))
+
+def create_table_if_missing(table: str, *elements, **kwargs) -> bool:
+    """
+    Tablo yoksa oluşturur
+
+    Returns:
+        bool: Tablo bu çağrıda oluşturulduysa True
+    """
+    if has_table(table):
+        return False
+    op.create_table(table, *elements, **kwargs)
+    return True
+
+def add_column_if_missing(table: str, column: sa.Column):
+    if not has_column(table, column.name):
+        op.add_column(table, column)
+
+def drop_column_if_exists(table: str, column: str):
+    if is_offline() or (has_table(table) and has_column(table, column)):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column)
+
+def create_index_if_missing(name: str, table: str, columns: List, **kwargs):
+    if not has_index(table, name):
+        op.create_index(name, table, columns, **kwargs)
+
+def drop_index_if_exists(name: str, table: str):
+    if is_offline() or (has_table(table) and has_index(table, name)):
+        op.drop_index(name, table_name=table)
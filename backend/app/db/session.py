@@ -1,30 +1,209 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-import os
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
-from typing import Generator
-from .database import SessionLocal
 
 # .env dosyasını yükle
 load_dotenv()
 
-# Veritabanı URL'sini oluştur
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./stock_prediction.db")
+from app.core.config import settings
+from app.core import serialization
+
+class PoolMetrics:
+    """
+    Bağlantı havuzu olaylarını sayan ölçüm nesnesi.
+
+    Yeni fiziksel bağlantı sayısı (connects) havuzun bağlantı tekrar kurma
+    sıklığını (churn), `exhausted` ise tüm bağlantılar (pool_size + max_overflow)
+    kullanımdayken yapılan alma denemelerini gösterir.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self.counters = {
+            "connects": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "invalidations": 0,
+            "exhausted": 0,
+            "peak_checked_out": 0
+        }
+        self.total_hold_seconds = 0.0
+
+    def attach(self, engine: Engine):
+        pool = engine.pool
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self._increment("connects")
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info["checked_out_at"] = time.perf_counter()
+            checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+            limit = self._limit(pool)
+            with self._lock:
+                self.counters["checkouts"] += 1
+                self.counters["peak_checked_out"] = max(self.counters["peak_checked_out"], checked_out)
+                if limit is not None and checked_out >= limit:
+                    self.counters["exhausted"] += 1
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            started = connection_record.info.pop("checked_out_at", None)
+            with self._lock:
+                self.counters["checkins"] += 1
+                if started is not None:
+                    self.total_hold_seconds += time.perf_counter() - started
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self._increment("invalidations")
+
+        self.engine = engine
+
+    @staticmethod
+    def _limit(pool) -> Optional[int]:
+        size = getattr(pool, "size", None)
+        if not callable(size):
+            return None
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        return None if max_overflow < 0 else size() + max_overflow
+
+    def _increment(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Sayaçları ve havuzun anlık durumunu döndürür
+        """
+        pool = self.engine.pool
+        with self._lock:
+            data = dict(self.counters)
+            checkins = data["checkins"]
+            data["avg_hold_ms"] = round(self.total_hold_seconds / checkins * 1000, 3) if checkins else 0.0
+
+        data["pool"] = type(pool).__name__
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                data[name] = method()
+        return data
+
+def _enable_sqlite_pragmas(engine: Engine):
+    """
+    Geliştirme ortamındaki SQLite için WAL kipi ve bekleme süresini ayarlar
+    """
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if settings.SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+def create_db_engine(url: str, name: str = "primary", use_async: bool = False):
+    """
+    Ayarlardaki havuz yapılandırmasıyla veritabanı motoru oluşturur ve havuz
+    ölçümlerini bağlar.
+
+    Args:
+        url: Veritabanı URL'si
+        name: Ölçümlerde kullanılan motor adı
+        use_async: True ise asyncpg / aiosqlite sürücüsüyle AsyncEngine oluşturulur
+
+    Returns:
+        Engine veya AsyncEngine: Yapılandırılmış motor
+    """
+    factory = create_async_engine if use_async else create_engine
+    if use_async:
+        url = async_url(url)
+
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+        # Bellek içi SQLite tek bağlantılı havuz kullanır
+        if ":memory:" in url or url.rstrip("/").endswith("sqlite:"):
+            options = {"connect_args": options["connect_args"]}
+        # aiosqlite varsayılan olarak her istekte yeni bağlantı açar; senkron motor gibi havuz kullan
+        if use_async:
+            options["poolclass"] = AsyncAdaptedQueuePool
+    # JSON / JSONB sütunları orjson ile yazılır ve okunur (NumPy değerleri dönüştürmeden)
+    options["json_serializer"] = serialization.dumps
+    options["json_deserializer"] = serialization.loads
+    engine = factory(url, **options)
 
-# SQLite için:
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL, connect_args={"check_same_thread": False}
-    )
-# PostgreSQL veya diğer veritabanları için:
-else:
-    engine = create_engine(DATABASE_URL)
+    sync_engine = engine.sync_engine if use_async else engine
+    if url.startswith("sqlite"):
+        _enable_sqlite_pragmas(sync_engine)
 
-# Oturum oluşturucuyu tanımla
+    metrics = PoolMetrics(name)
+    metrics.attach(sync_engine)
+    pool_metrics[name] = metrics
+    return engine
+
+def async_url(url: str) -> str:
+    """
+    Senkron veritabanı URL'sini async sürücülü karşılığına çevirir
+    """
+    scheme, rest = url.split("://", 1)
+    if scheme in ("postgresql", "postgresql+psycopg2", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if scheme in ("sqlite", "sqlite+pysqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+# Motor adı -> havuz ölçümleri
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+# Birincil (yazma) motoru
+engine = create_db_engine(settings.DATABASE_URL)
+
+# Salt okunur oturumlar için replika motoru (tanımlı değilse birincil motor kullanılır)
+read_engine = create_db_engine(settings.DATABASE_READ_URL, "replica") if settings.DATABASE_READ_URL else engine
+
+# Oturum oluşturucular
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async okuma motoru ilk kullanımda oluşturulur (worker ve toplu işler senkron motoru kullanır)
+_async_sessionmaker: Optional[async_sessionmaker] = None
+_async_lock = threading.Lock()
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """
+    Salt okunur async oturum oluşturucusunu döndürür. Motor replika tanımlıysa
+    DATABASE_READ_URL'e, değilse DATABASE_URL'e bağlanır.
+    """
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        with _async_lock:
+            if _async_sessionmaker is None:
+                async_engine: AsyncEngine = create_db_engine(
+                    settings.DATABASE_READ_URL or settings.DATABASE_URL, "async", use_async=True
+                )
+                _async_sessionmaker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    return _async_sessionmaker
 
-# Model tabanını oluştur
+# Tüm modeller için tek model tabanı
 Base = declarative_base()
 
 def get_db() -> Generator:
@@ -36,4 +215,30 @@ def get_db() -> Generator:
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def get_read_db() -> Generator:
+    """
+    Yalnızca okuma yapan endpoint'ler için oturum. DATABASE_READ_URL tanımlıysa
+    replikaya yönlendirilir; replika gecikmesi kabul edilemeyen okumalar get_db kullanmalıdır.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yoğun okunan async endpoint'ler için oturum. İstek sırasında Starlette'in
+    thread havuzundan bir işçi tutmaz; ilişkiler tembel yüklenemeyeceği için
+    sorgular gereken ilişkileri `selectinload` ile birlikte yüklemelidir.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Tüm motorların havuz ölçümlerini döndürür
+    """
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
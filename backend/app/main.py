@@ -1,13 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
 
 from app.api.routes import stocks
 from app.api.routes import technical
 from app.api.routes import auth
 from app.api.routes import dashboard
-from app.db.session import engine, Base
+from app.api.routes import jobs
+from app.api.routes import snapshot
+from app.db.session import engine, Base, get_pool_metrics
+from app.db.migrations import run_migrations
 from app.services.scheduler_service import SchedulerService
+from app.services.ml_loader import PROCESS_ROLE_API
 from app.core.config import settings
 
 # Günlük ayarları
@@ -20,17 +25,23 @@ logger = logging.getLogger(__name__)
 # Global zamanlayıcı değişkeni
 scheduler_service = None
 
-# Veritabanı tablolarını oluştur
+# Veritabanı şemasını oluştur / güncelle
 def create_tables():
     logger.info("Veritabanı tablolarını oluşturma başlatılıyor...")
-    Base.metadata.create_all(bind=engine)
+    if settings.DB_MIGRATE_ON_STARTUP:
+        # Alembic revizyonları: mevcut tablolara eklenen sütun ve indeksleri de uygular
+        run_migrations(engine)
+    else:
+        Base.metadata.create_all(bind=engine)
     logger.info("Veritabanı tabloları oluşturuldu.")
 
 # FastAPI uygulaması
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Borsa Tahmin ve Analiz Uygulaması API",
-    version="1.0.0"
+    version="1.0.0",
+    # Yanıtlar orjson ile yazılır (NumPy değerleri ve datetime doğrudan desteklenir)
+    default_response_class=ORJSONResponse
 )
 
 # CORS ayarları - frontend'den gelen isteklere izin ver
@@ -47,15 +58,23 @@ app.include_router(stocks.router, prefix="/api/stocks", tags=["stocks"])
 app.include_router(technical.router, prefix="/api/technical", tags=["technical"])
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(snapshot.router, prefix="/api/snapshot", tags=["snapshot"])
 
 # Uygulama başlatıldığında
 @app.on_event("startup")
 async def startup_event():
     global scheduler_service
     
-    logger.info("Uygulama başlatılıyor...")
+    logger.info(f"Uygulama başlatılıyor... (rol: {settings.PROCESS_ROLE})")
     create_tables()
     
+    # Yalnızca okuma yapan API süreçlerinde zamanlayıcı worker'da çalışır
+    if settings.PROCESS_ROLE == PROCESS_ROLE_API:
+        logger.info("API rolünde zamanlayıcı başlatılmıyor.")
+        logger.info("Uygulama başlatıldı!")
+        return
+    
     # Zamanlayıcı servisini başlat
     scheduler_service = SchedulerService()
     scheduler_started = scheduler_service.start()
@@ -86,6 +105,11 @@ async def shutdown_event():
 async def root():
     return {"message": "Borsa Tahmin ve Analiz Uygulaması API'sine Hoş Geldiniz!"}
 
+# Veritabanı bağlantı havuzu ölçümleri
+@app.get("/api/db/pool", tags=["root"])
+def db_pool_metrics():
+    return get_pool_metrics()
+
 # Not: Aşağıdaki router'lar yorum satırına alınmış, ihtiyaç duyulursa aktif hale getirilebilir
 # from app.api import stocks, predictions, analysis
 # app.include_router(stocks.router, prefix="/api/stocks", tags=["stocks"])
@@ -1,6 +1,19 @@
 # Models başlatma dosyası
 from app.models.base_stock import BaseStock
 from app.models.prediction_stock import PredictionStock
+from app.models.technical_stock import TechnicalStock
+from app.models.prediction_job import PredictionJob
+from app.models.prediction_history import PredictionHistory
+from app.models.model_weight import ModelWeight
+from app.models.drift_reference import DriftReference
+from app.models.symbol_cluster import SymbolCluster
+from app.models.tuned_config import TunedConfig
+from app.models.feature_set import FeatureSet
+from app.models.price_bar import PriceBar
+from app.models.stock_snapshot import StockSnapshot
+from app.models.prediction_archive import PredictionArchive
+from app.models.user import User
+from app.models.user_favorite import UserFavorite
 
 # Bu modelleri dışarıya açıyoruz, böylece doğrudan from models import X şeklinde import edilebilir
-__all__ = ["BaseStock", "PredictionStock"] 
\ No newline at end of file
+__all__ = ["BaseStock", "PredictionStock", "TechnicalStock", "PredictionJob", "PredictionHistory", "ModelWeight", "DriftReference", "SymbolCluster", "TunedConfig", "FeatureSet", "PriceBar", "StockSnapshot", "PredictionArchive", "User", "UserFavorite"] 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -53,5 +53,15 @@ class BaseStock(Base):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
+    __table_args__ = (
+        # Seçili hisse sorguları (is_selected == True) için yalnızca seçili satırları içeren kısmi indeks
+        Index(
+            "ix_base_stocks_selected",
+            "symbol",
+            postgresql_where=is_selected == True,
+            sqlite_where=is_selected == True,
+        ),
+    )
+    
     def __repr__(self):
         return f"<BaseStock(symbol='{self.symbol}', last_price={self.last_price}, rsi={self.rsi})>" 
\ No newline at end of file
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON
+from datetime import datetime
+
+from app.db.session import Base
+
+class DriftReference(Base):
+    """
+    Bir sembolün son eğitimindeki özellik dağılımları ve hata seviyesi.
+    Yeniden eğitim kararı, güncel veriler bu referansla karşılaştırılarak verilir.
+    """
+    __tablename__ = "drift_references"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, unique=True, index=True, nullable=False)
+    trained_at = Column(DateTime, nullable=False)
+
+    # Özellik başına yüzdelik sınırları ve referans oranları (özellik x kutu)
+    feature_columns = Column(JSON)
+    bin_edges = Column(JSON)
+    proportions = Column(JSON)
+
+    # Eğitim verisindeki fiyat aralığı (ölçekleyici aralığı dışına çıkışı izlemek için)
+    price_min = Column(Float)
+    price_max = Column(Float)
+
+    # Eğitim anındaki gerçekleşen ortalama mutlak yüzde hata
+    reference_error = Column(Float, nullable=True)
+    rows = Column(Integer)
+
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<DriftReference(symbol='{self.symbol}', trained_at='{self.trained_at}')>"
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, Float, DateTime, JSON
+from datetime import datetime
+
+from app.db.session import Base
+
+class FeatureSet(Base):
+    """
+    Permütasyon önemi analiziyle seçilen üretim özellik seti.
+    Her analiz yeni bir sürüm oluşturur; tahminler hangi sürümle eğitildiklerini
+    `feature_set_version` alanında taşır.
+    """
+    __tablename__ = "feature_sets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, unique=True, index=True, nullable=False)
+
+    # Tutulan ve budanan özellikler
+    columns = Column(JSON, nullable=False)
+    dropped = Column(JSON)
+
+    # Özellik -> semboller üzerinden ortalama göreli hata artışı
+    importances = Column(JSON)
+
+    # Analiz özeti
+    symbols = Column(Integer, default=0)
+    baseline_loss = Column(Float, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):
+        return f"<FeatureSet(version={self.version}, columns={len(self.columns or [])})>"
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from datetime import datetime
+
+from app.db.session import Base
+
+class ModelWeight(Base):
+    """
+    Sembol ve model bazında, gerçekleşen tahmin hatalarından hesaplanan ensemble ağırlığı.
+    Hata üssel olarak azalan ortalama (EWMA) ile güncellenir.
+    """
+    __tablename__ = "model_weights"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, nullable=False, index=True)
+    model_name = Column(String, nullable=False)
+
+    # Üssel ağırlıklı ortalama mutlak yüzde hata
+    ewma_error = Column(Float, nullable=True)
+    weight = Column(Float, nullable=True)
+    observations = Column(Integer, default=0)
+
+    # En son işlenen çözümlenmiş tahmin ve en son eğitim zamanı
+    last_resolved_at = Column(DateTime, nullable=True)
+    last_trained_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        UniqueConstraint("symbol", "model_name", name="uq_model_weights_symbol_model"),
+    )
+
+    def __repr__(self):
+        return f"<ModelWeight(symbol='{self.symbol}', model_name='{self.model_name}', weight={self.weight})>"
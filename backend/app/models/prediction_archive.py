@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.session import Base
+
+# Arşiv satırı çözünürlükleri
+ARCHIVE_GRANULARITY_RAW = "raw"    # Her tahmin çalıştırması
+ARCHIVE_GRANULARITY_DAILY = "1d"   # Sıkıştırılmış: sembol başına günün son tahmini
+
+class PredictionArchive(Base):
+    """
+    Yalnızca ekleme yapılan tahmin arşivi. Her tahmin çalıştırması bir satır
+    ekler; prediction_stocks yalnızca sembolün son tahminini tutar.
+
+    PostgreSQL'de tablo `created_at` üzerinden aylık bölümlenir (bölümler yazma
+    sırasında `PredictionArchiveService` tarafından oluşturulur). Eski gün içi
+    satırlar saklama işiyle günlük satırlara sıkıştırılır, saklama süresini
+    aşan bölümler silinir.
+    """
+    __tablename__ = "prediction_archive"
+
+    symbol = Column(String, primary_key=True)
+    created_at = Column(DateTime, primary_key=True)  # Tahminin yapıldığı an
+
+    granularity = Column(String(4), nullable=False, default=ARCHIVE_GRANULARITY_RAW)
+    samples = Column(Integer, nullable=False, default=1)  # Sıkıştırılan satır sayısı
+
+    current_price = Column(Float)
+    prediction_date = Column(DateTime)  # Tahminin vadesi
+    best_model = Column(String)
+    model_tier = Column(String)
+    feature_set_version = Column(Integer)
+
+    lstm_predicted_price = Column(Float)
+    gru_predicted_price = Column(Float)
+    attention_predicted_price = Column(Float)
+    ensemble_predicted_price = Column(Float)
+    interval_lower = Column(Float)
+    interval_upper = Column(Float)
+
+    # Model adı -> tahmin ufku boyunca fiyatlar, model adı -> ağırlık
+    predictions = Column(JSON().with_variant(JSONB(), "postgresql"))
+    model_weights = Column(JSON().with_variant(JSONB(), "postgresql"))
+
+    __table_args__ = (
+        # Sıkıştırma ve saklama taramaları için (PostgreSQL'de bölüm budamasıyla birlikte)
+        Index("ix_prediction_archive_created_at", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    def __repr__(self):
+        return f"<PredictionArchive(symbol='{self.symbol}', created_at={self.created_at}, granularity='{self.granularity}')>"
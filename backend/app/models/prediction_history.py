@@ -1,19 +1,43 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Index
 from sqlalchemy.sql import func
-from app.db.database import Base
+from app.db.session import Base
 
 class PredictionHistory(Base):
+    """
+    Her tahminin oluşturulduğu andaki anlık görüntüsü. Tahmin vadesi dolduğunda
+    gerçekleşen fiyat ile çözümlenir ve model bazlı doğruluk bu tablodan hesaplanır.
+    """
     __tablename__ = "prediction_history"
 
     id = Column(Integer, primary_key=True, index=True)
     symbol = Column(String, nullable=False)
-    prediction_date = Column(DateTime, nullable=False)
+    prediction_date = Column(DateTime, nullable=False)  # Tahminin vadesi (hangi tarih için yapıldığı)
     prediction_price = Column(Float, nullable=False)
+    base_price = Column(Float, nullable=True)  # Tahmin yapıldığı andaki fiyat (yön başarısı için)
     actual_price = Column(Float, nullable=True)  # Gerçekleşen değer (tahmin doğrulama için)
     model_used = Column(String, nullable=False)  # 'lstm', 'gru', etc.
+    model_tier = Column(String, nullable=True)  # 'baseline' veya 'deep'
     is_successful = Column(Boolean, nullable=True)  # Tahmin başarılı mı?
     accuracy_percent = Column(Float, nullable=True)  # Tahmin doğruluk yüzdesi
+    resolved_at = Column(DateTime, nullable=True)  # Gerçekleşen fiyat ile çözümlenme zamanı
     created_at = Column(DateTime, default=func.now())
     
     # Bir tahmin birden çok kullanıcı tarafından görüntülenebilir, 
-    # bu nedenle kullanıcı referansına ihtiyaç yok 
\ No newline at end of file
+    # bu nedenle kullanıcı referansına ihtiyaç yok
+
+    __table_args__ = (
+        # Vadesi dolmuş, henüz çözümlenmemiş tahminlerin toplu güncellemesi için
+        Index(
+            "ix_prediction_history_unresolved",
+            "prediction_date",
+            postgresql_where=resolved_at.is_(None),
+            sqlite_where=resolved_at.is_(None),
+        ),
+        # Model bazlı kayan pencere doğruluğu için
+        Index("ix_prediction_history_model_resolved", "model_used", "resolved_at"),
+        # Sembol geçmişi sorguları için
+        Index("ix_prediction_history_symbol_date", "symbol", "prediction_date"),
+    )
+
+    def __repr__(self):
+        return f"<PredictionHistory(symbol='{self.symbol}', model_used='{self.model_used}', prediction_date={self.prediction_date})>"
@@ -0,0 +1,68 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Index
+from datetime import datetime
+
+from app.db.session import Base
+
+# İş tipleri
+JOB_TYPE_PREDICT = "predict"                # Belirli (veya seçili) hisseler için tahmin
+JOB_TYPE_REFRESH_MARKET = "refresh_market"  # Tüm piyasanın yeniden işlenmesi ve filtrelenmesi
+JOB_TYPE_BACKTEST = "backtest"              # Model yapılandırmalarının walk-forward değerlendirmesi
+JOB_TYPE_CLUSTER = "cluster"                # Sembollerin davranışa göre yeniden kümelenmesi
+JOB_TYPE_TUNE = "tune"                      # Sembol/küme bazında hiperparametre araması
+JOB_TYPE_FEATURES = "feature_importance"    # Permütasyon önemiyle üretim özellik setinin budanması
+JOB_TYPE_ARCHIVE = "compact_archive"        # Tahmin arşivinin sıkıştırılması ve saklama süresinin uygulanması
+
+# İş durumları
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_COMPLETED = "completed"
+JOB_STATUS_FAILED = "failed"
+
+# Sembol bazlı ilerleme durumları
+ITEM_STATUS_PENDING = "pending"
+ITEM_STATUS_RUNNING = "running"
+ITEM_STATUS_DONE = "done"
+ITEM_STATUS_FAILED = "failed"
+ITEM_STATUS_SKIPPED = "skipped"
+
+class PredictionJob(Base):
+    """
+    Arka planda çalıştırılan tahmin ve piyasa yenileme işlerini içeren model.
+    Kuyruk olarak veritabanı kullanılır, harici bir mesaj aracısına ihtiyaç yoktur.
+    """
+    __tablename__ = "prediction_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, default=JOB_STATUS_PENDING, index=True)
+
+    # İş parametreleri (semboller, model tipi, gün sayısı vb.)
+    params = Column(JSON)
+
+    # Sembol bazlı ilerleme: {"THYAO": "done", "ASELS": "running", ...}
+    progress = Column(JSON)
+    total_items = Column(Integer, default=0)
+    completed_items = Column(Integer, default=0)
+    failed_items = Column(Integer, default=0)
+
+    # Sonuç özeti ve hata bilgisi
+    result = Column(JSON)
+    error = Column(Text, nullable=True)
+
+    # İşi alan worker bilgileri
+    worker_id = Column(String, nullable=True)
+    attempts = Column(Integer, default=0)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    # Zaman damgaları
+    created_at = Column(DateTime, default=datetime.now)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Worker'ın sıradaki bekleyen işi alması (status = pending, created_at sırasıyla) için
+        Index("ix_prediction_jobs_status_created", "status", "created_at", "id"),
+    )
+
+    def __repr__(self):
+        return f"<PredictionJob(id={self.id}, job_type='{self.job_type}', status='{self.status}')>"
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -15,8 +16,8 @@ class PredictionStock(Base):
     base_stock_id = Column(Integer, ForeignKey("base_stocks.id"), unique=True)
     symbol = Column(String, unique=True, index=True)
     
-    # JSON formatında saklanacak tahmin verileri
-    prediction_data = Column(Text)
+    # Tahmin verileri (PostgreSQL'de JSONB, diğer veritabanlarında JSON)
+    prediction_data = Column(JSON().with_variant(JSONB(), "postgresql"))
     
     # Son güncelleme zamanı
     last_updated = Column(DateTime, default=datetime.now)
@@ -47,8 +48,17 @@ class PredictionStock(Base):
     prediction_date = Column(DateTime)
     volatility = Column(Float)
     
+    # Ağırlıklı ensemble tahmini ve model ağırlıkları
+    ensemble_predicted_price = Column(Float)
+    model_weights = Column(JSON)
+    
+    # Monte Carlo dropout tahmin aralığı (ensemble, ilk ufuk adımı)
+    interval_lower = Column(Float)
+    interval_upper = Column(Float)
+    
     # Model detayları
     features_used = Column(JSON)  # Kullanılan özellikler
+    feature_set_version = Column(Integer, nullable=True)  # Budanmış özellik seti sürümü (budama yoksa boş)
     training_window = Column(Integer)  # Eğitim penceresi
     prediction_window = Column(Integer)  # Tahmin penceresi
     
@@ -57,9 +67,19 @@ class PredictionStock(Base):
     best_mse = Column(Float)
     best_mae = Column(Float)
     
+    # Tahmini üreten model katmanı: 'baseline' (hızlı modeller) veya 'deep' (LSTM/GRU/Attention)
+    model_tier = Column(String, default="deep")
+    
     # Zaman damgaları
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
+    __table_args__ = (
+        # Son güncellenen tahminler (updated_at azalan sırada) için
+        Index("ix_prediction_stocks_updated_at", "updated_at"),
+        # Tarih aralığı filtreleri (prediction_date >= ...) için
+        Index("ix_prediction_stocks_prediction_date", "prediction_date"),
+    )
+    
     def __repr__(self):
         return f"<PredictionStock(symbol={self.symbol}, best_model={self.best_model})>" 
\ No newline at end of file
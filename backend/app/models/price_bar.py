@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Float, DateTime
+
+from app.db.session import Base
+
+class PriceBar(Base):
+    """
+    Saatlik ve günlük OHLCV barları.
+
+    PostgreSQL'de tablo `ts` üzerinden aylık bölümlenir (bölümler yazma sırasında
+    `BarStore` tarafından oluşturulur). Yazma ve okuma ORM nesneleriyle değil,
+    `app.services.bar_store.BarStore` üzerinden toplu yapılır.
+    """
+    __tablename__ = "price_bars"
+    __table_args__ = {"postgresql_partition_by": "RANGE (ts)"}
+
+    symbol = Column(String, primary_key=True)
+    timeframe = Column(String(4), primary_key=True)  # "1h" veya "1d"
+    ts = Column(DateTime, primary_key=True)  # Saat dilimsiz UTC
+
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"<PriceBar(symbol='{self.symbol}', timeframe='{self.timeframe}', ts={self.ts}, close={self.close})>"
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, Index
+from datetime import datetime
+
+from app.db.session import Base
+
+class StockSnapshot(Base):
+    """
+    Dashboard için hisse başına tek satırlık okuma modeli.
+
+    Hisse, teknik analiz ve tahmin bölümleri API yanıt şemalarıyla (BaseStockResponse,
+    TechnicalStockResponse, PredictionStockResponse) önceden JSON'a çevrilmiş olarak
+    saklanır; her işlem hattı aşaması sonunda yalnızca kendi bölümünü günceller.
+    Filtrelenen alanlar tipli sütunlarda tutulur.
+    """
+    __tablename__ = "stock_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, unique=True, index=True, nullable=False)
+
+    # Filtre ve sıralama alanları
+    is_selected = Column(Boolean, default=False)
+    sector = Column(String, nullable=True)
+    last_price = Column(Float, nullable=True)
+    change_percent = Column(Float, nullable=True)
+    rsi = Column(Float, nullable=True)
+    relative_volume = Column(Float, nullable=True)
+    best_model = Column(String, nullable=True)
+    predicted_change_percent = Column(Float, nullable=True)  # En iyi modelin beklenen değişimi
+
+    # Önceden JSON'a çevrilmiş bölümler (bölüm henüz hesaplanmadıysa NULL)
+    stock_json = Column(Text, nullable=True)
+    technical_json = Column(Text, nullable=True)
+    prediction_json = Column(Text, nullable=True)
+
+    stock_updated_at = Column(DateTime, nullable=True)
+    technical_updated_at = Column(DateTime, nullable=True)
+    prediction_updated_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        # Dashboard'un varsayılan görünümü: seçili hisseler, sembol sırasıyla
+        Index(
+            "ix_stock_snapshots_selected",
+            "symbol",
+            postgresql_where=is_selected == True,
+            sqlite_where=is_selected == True,
+        ),
+    )
+
+    def __repr__(self):
+        return f"<StockSnapshot(symbol='{self.symbol}', is_selected={self.is_selected})>"
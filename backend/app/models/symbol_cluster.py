@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from datetime import datetime
+
+from app.db.session import Base
+
+class SymbolCluster(Base):
+    """
+    Sembollerin getiri, volatilite ve hacim davranışına göre atandığı küme.
+    Atamalar haftalık olarak yeniden hesaplanır; aynı kümedeki semboller tek bir
+    ortak modelle tahmin edilir.
+    """
+    __tablename__ = "symbol_clusters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, unique=True, index=True, nullable=False)
+    cluster_id = Column(Integer, nullable=False)
+
+    # Kümelemede kullanılan davranış özellikleri (volatilite, ortalama getiri, hacim oynaklığı, ortalama korelasyon)
+    features = Column(JSON)
+
+    # Aynı hesaplamada oluşturulan tüm atamalar aynı zaman damgasını taşır
+    computed_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    __table_args__ = (
+        Index("ix_symbol_clusters_cluster", "cluster_id"),
+    )
+
+    def __repr__(self):
+        return f"<SymbolCluster(symbol='{self.symbol}', cluster_id={self.cluster_id})>"
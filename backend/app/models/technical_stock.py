@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -52,5 +52,10 @@ class TechnicalStock(Base):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
+    __table_args__ = (
+        # Son güncellenen teknik analizler (updated_at azalan sırada) için
+        Index("ix_technical_stocks_updated_at", "updated_at"),
+    )
+    
     def __repr__(self):
         return f"<TechnicalStock(base_stock_id={self.base_stock_id})>" 
\ No newline at end of file
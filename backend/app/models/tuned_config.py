@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, UniqueConstraint
+from datetime import datetime
+
+from app.db.session import Base
+
+class TunedConfig(Base):
+    """
+    Hiperparametre aramasında kazanan eğitim yapılandırması.
+    Sembol veya küme bazında, model tipi başına bir kayıt tutulur; üretim eğitimleri
+    önce sembolün, yoksa kümesinin yapılandırmasını kullanır.
+    """
+    __tablename__ = "tuned_configs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Kapsam: 'symbol' (anahtar sembol adı) veya 'cluster' (anahtar küme numarası)
+    scope = Column(String, nullable=False)
+    scope_key = Column(String, nullable=False)
+    model_type = Column(String, nullable=False)
+
+    # Kazanan hiperparametreler
+    sequence_length = Column(Integer, nullable=False)
+    epochs = Column(Integer, nullable=False)
+    batch_size = Column(Integer, nullable=False)
+    learning_rate = Column(Float, nullable=False)
+
+    # Arama özeti: doğrulama hatası, denenen yapılandırma sayısı, toplam epoch ve tur bilgileri
+    val_loss = Column(Float, nullable=True)
+    trials = Column(Integer, default=0)
+    total_epochs = Column(Integer, default=0)
+    search = Column(JSON)
+
+    tuned_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("scope", "scope_key", "model_type", name="uq_tuned_configs_scope_model"),
+    )
+
+    def __repr__(self):
+        return f"<TunedConfig(scope='{self.scope}', scope_key='{self.scope_key}', model_type='{self.model_type}')>"
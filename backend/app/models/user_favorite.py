@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
-from app.db.database import Base
+from app.db.session import Base
 
 class UserFavorite(Base):
     __tablename__ = "user_favorites"
@@ -10,7 +10,8 @@ class UserFavorite(Base):
     symbol = Column(String, nullable=False)
     created_at = Column(DateTime, default=func.now())
     
-    # User_id ve symbol birlikte benzersiz olmalı
+    # User_id ve symbol birlikte benzersiz olmalı; (user_id, symbol) aramaları da bu indeksi kullanır
     __table_args__ = (
+        Index("uq_user_favorites_user_symbol", "user_id", "symbol", unique=True),
         {'sqlite_autoincrement': True},
-    ) 
\ No newline at end of file
+    )
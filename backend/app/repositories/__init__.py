@@ -0,0 +1,15 @@
+# Repositories başlatma dosyası
+from app.repositories.stock_repository import StockRepository
+from app.repositories.prediction_repository import PredictionRepository
+from app.repositories.technical_repository import TechnicalRepository
+from app.repositories.snapshot_repository import SnapshotRepository
+from app.repositories.prediction_archive_repository import PredictionArchiveRepository
+
+# Dışa aktarılacak depoları belirt
+__all__ = [
+    "StockRepository",
+    "PredictionRepository",
+    "TechnicalRepository",
+    "SnapshotRepository",
+    "PredictionArchiveRepository"
+]
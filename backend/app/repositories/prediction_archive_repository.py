@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models.prediction_archive import PredictionArchive
+
+class PredictionArchiveRepository:
+    """
+    PredictionArchive okumaları. Sembol aralık sorguları (symbol, created_at)
+    birincil anahtarını kullanır; PostgreSQL'de aralık dışındaki aylık bölümler
+    taranmaz.
+    """
+
+    def range_query(self, symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    granularity: Optional[str] = None, limit: Optional[int] = None) -> Select:
+        """
+        Sembolün [start, end) aralığındaki arşiv satırlarını en yeniden eskiye seçen sorgu
+        """
+        query = select(PredictionArchive).where(PredictionArchive.symbol == symbol)
+        if start is not None:
+            query = query.where(PredictionArchive.created_at >= start)
+        if end is not None:
+            query = query.where(PredictionArchive.created_at < end)
+        if granularity:
+            query = query.where(PredictionArchive.granularity == granularity)
+        query = query.order_by(desc(PredictionArchive.created_at))
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    def get_range(self, db: Session, symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  granularity: Optional[str] = None, limit: Optional[int] = None) -> List[PredictionArchive]:
+        """
+        Sembolün tahmin geçmişini tek sorguyla getirir
+
+        Args:
+            db: Veritabanı oturumu
+            symbol: Hisse sembolü
+            start: Başlangıç (dahil)
+            end: Bitiş (hariç)
+            granularity: Yalnızca bu çözünürlükteki satırlar ('raw' veya '1d')
+            limit: En fazla satır sayısı
+
+        Returns:
+            List[PredictionArchive]: En yeniden eskiye arşiv satırları
+        """
+        return list(db.scalars(self.range_query(symbol, start, end, granularity, limit)).all())
+
+    async def get_range_async(self, db: AsyncSession, symbol: str, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None, granularity: Optional[str] = None,
+                              limit: Optional[int] = None) -> List[PredictionArchive]:
+        return list((await db.scalars(self.range_query(symbol, start, end, granularity, limit))).all())
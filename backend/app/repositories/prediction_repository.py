@@ -0,0 +1,66 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.sql import Select
+
+from app.models.prediction_stock import PredictionStock
+
+class PredictionRepository:
+    """
+    PredictionStock okumaları. İlişkili BaseStock kayıtları sorguyla birlikte
+    yüklenir; dönen nesnelerde `base_stock` erişimi ek sorgu çalıştırmaz.
+    """
+
+    def for_symbols_query(self, symbols: Sequence[str]) -> Select:
+        return (
+            select(PredictionStock)
+            .options(selectinload(PredictionStock.base_stock))
+            .where(PredictionStock.symbol.in_(list(symbols)))
+        )
+
+    def by_symbol_query(self, symbol: str) -> Select:
+        return (
+            select(PredictionStock)
+            .options(joinedload(PredictionStock.base_stock))
+            .where(PredictionStock.symbol == symbol)
+        )
+
+    def recent_query(self, limit: int) -> Select:
+        return select(PredictionStock).order_by(desc(PredictionStock.updated_at)).limit(limit)
+
+    def get_predictions_for_symbols(self, db: Session, symbols: Sequence[str]) -> List[PredictionStock]:
+        """
+        Sembol listesinin tahminlerini tek seferde getirir (tahmin + hisse için iki sorgu)
+
+        Args:
+            db: Veritabanı oturumu
+            symbols: Hisse sembolleri
+
+        Returns:
+            List[PredictionStock]: Tahmini bulunan sembollerin kayıtları (sıra garanti edilmez)
+        """
+        if not symbols:
+            return []
+        return list(db.scalars(self.for_symbols_query(symbols)).all())
+
+    async def get_predictions_for_symbols_async(self, db: AsyncSession, symbols: Sequence[str]) -> List[PredictionStock]:
+        if not symbols:
+            return []
+        return list((await db.scalars(self.for_symbols_query(symbols))).all())
+
+    def get_by_symbol(self, db: Session, symbol: str) -> Optional[PredictionStock]:
+        """
+        Sembolün tahminini hissesiyle birlikte tek sorguda getirir
+        """
+        return db.scalars(self.by_symbol_query(symbol)).first()
+
+    def get_recent(self, db: Session, limit: int) -> List[PredictionStock]:
+        """
+        Son güncellenen tahminleri döndürür
+        """
+        return list(db.scalars(self.recent_query(limit)).all())
+
+    async def get_recent_async(self, db: AsyncSession, limit: int) -> List[PredictionStock]:
+        return list((await db.scalars(self.recent_query(limit))).all())
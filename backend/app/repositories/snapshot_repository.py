@@ -0,0 +1,67 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models.stock_snapshot import StockSnapshot
+
+# /api/snapshot sıralama seçenekleri -> sütun (PostgreSQL'de DESC varsayılan olarak NULL'ları başa koyar)
+SNAPSHOT_SORTS = {
+    "symbol": StockSnapshot.symbol,
+    "relative_volume": desc(StockSnapshot.relative_volume).nulls_last(),
+    "change_percent": desc(StockSnapshot.change_percent).nulls_last(),
+    "predicted_change_percent": desc(StockSnapshot.predicted_change_percent).nulls_last(),
+}
+
+class SnapshotRepository:
+    """
+    StockSnapshot okumaları. Dashboard yanıtı tek sorguyla, yalnızca önceden
+    JSON'a çevrilmiş bölümler okunarak oluşturulur.
+    """
+
+    def payload_query(self, symbols: Optional[Sequence[str]] = None, selected_only: bool = False,
+                      min_rsi: Optional[float] = None, max_rsi: Optional[float] = None,
+                      min_rel_volume: Optional[float] = None, sector: Optional[str] = None,
+                      has_prediction: Optional[bool] = None, sort: str = "symbol",
+                      limit: Optional[int] = None) -> Select:
+        """
+        Filtrelere uyan anlık görüntülerin sembol ve JSON bölümlerini seçen sorgu
+        """
+        query = select(
+            StockSnapshot.symbol,
+            StockSnapshot.stock_json,
+            StockSnapshot.technical_json,
+            StockSnapshot.prediction_json,
+            StockSnapshot.updated_at
+        )
+        if symbols:
+            query = query.where(StockSnapshot.symbol.in_(list(symbols)))
+        if selected_only:
+            query = query.where(StockSnapshot.is_selected == True)
+        if min_rsi is not None:
+            query = query.where(StockSnapshot.rsi >= min_rsi)
+        if max_rsi is not None:
+            query = query.where(StockSnapshot.rsi <= max_rsi)
+        if min_rel_volume is not None:
+            query = query.where(StockSnapshot.relative_volume >= min_rel_volume)
+        if sector:
+            query = query.where(StockSnapshot.sector == sector)
+        if has_prediction is not None:
+            query = query.where(
+                StockSnapshot.prediction_json.isnot(None) if has_prediction else StockSnapshot.prediction_json.is_(None)
+            )
+        query = query.order_by(SNAPSHOT_SORTS.get(sort, StockSnapshot.symbol))
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    def get_payload_rows(self, db: Session, **filters) -> List:
+        return list(db.execute(self.payload_query(**filters)).all())
+
+    async def get_payload_rows_async(self, db: AsyncSession, **filters) -> List:
+        return list((await db.execute(self.payload_query(**filters))).all())
+
+    def by_symbols_query(self, symbols: Sequence[str]) -> Select:
+        return select(StockSnapshot).where(StockSnapshot.symbol.in_(list(symbols)))
@@ -0,0 +1,73 @@
+from typing import List, Optional
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models.base_stock import BaseStock
+
+class StockRepository:
+    """
+    BaseStock okumaları. Her yöntem sonuç sayısından bağımsız olarak tek sorgu çalıştırır.
+
+    Sorgular `*_query` yöntemleriyle oluşturulur; senkron oturumlar için düz,
+    AsyncSession için `_async` sonekli yöntemler aynı sorguyu çalıştırır.
+    """
+
+    def by_symbol_query(self, symbol: str) -> Select:
+        return select(BaseStock).where(BaseStock.symbol == symbol)
+
+    def selected_symbols_query(self) -> Select:
+        return select(BaseStock.symbol).where(BaseStock.is_selected == True).order_by(BaseStock.symbol)
+
+    def filtered_query(self, min_rsi: float, max_rsi: float, min_rel_volume: float,
+                       pivot_cross: bool, limit: int) -> Select:
+        """
+        RSI aralığında, bağıl hacmi eşiğin üzerinde (ve istenirse pivotu yukarı geçmiş)
+        hisseleri bağıl hacme göre azalan sırada seçen sorgu
+        """
+        query = select(BaseStock).where(
+            BaseStock.rsi >= min_rsi,
+            BaseStock.rsi <= max_rsi,
+            BaseStock.relative_volume >= min_rel_volume
+        )
+        if pivot_cross:
+            query = query.where(BaseStock.crossed_pivot == True)
+        return query.order_by(desc(BaseStock.relative_volume)).limit(limit)
+
+    def get_by_symbol(self, db: Session, symbol: str) -> Optional[BaseStock]:
+        """
+        Sembole göre hisseyi döndürür
+        """
+        return db.scalars(self.by_symbol_query(symbol)).first()
+
+    async def get_by_symbol_async(self, db: AsyncSession, symbol: str) -> Optional[BaseStock]:
+        return (await db.scalars(self.by_symbol_query(symbol))).first()
+
+    def get_selected_symbols(self, db: Session) -> List[str]:
+        """
+        Filtreleri geçen (seçilen) hisselerin sembollerini döndürür
+        """
+        return list(db.scalars(self.selected_symbols_query()).all())
+
+    async def get_selected_symbols_async(self, db: AsyncSession) -> List[str]:
+        return list((await db.scalars(self.selected_symbols_query())).all())
+
+    def get_filtered(self, db: Session, min_rsi: float, max_rsi: float, min_rel_volume: float,
+                     pivot_cross: bool, limit: int) -> List[BaseStock]:
+        """
+        Filtre parametrelerine uyan hisseleri döndürür
+
+        Args:
+            db: Veritabanı oturumu
+            min_rsi: Minimum RSI
+            max_rsi: Maksimum RSI
+            min_rel_volume: Minimum bağıl hacim
+            pivot_cross: Pivotu yukarı geçmiş olma şartı
+            limit: En fazla döndürülecek hisse sayısı
+
+        Returns:
+            List[BaseStock]: Bağıl hacme göre sıralı hisseler
+        """
+        return list(db.scalars(self.filtered_query(min_rsi, max_rsi, min_rel_volume, pivot_cross, limit)).all())
@@ -0,0 +1,49 @@
+from typing import List, Optional
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy.sql import Select
+
+from app.models.base_stock import BaseStock
+from app.models.technical_stock import TechnicalStock
+
+class TechnicalRepository:
+    """
+    TechnicalStock okumaları. İlişkili BaseStock kayıtları sorguyla birlikte
+    yüklenir; dönen nesnelerde `base_stock` erişimi ek sorgu çalıştırmaz.
+    """
+
+    def all_with_stock_query(self) -> Select:
+        return (
+            select(TechnicalStock)
+            .options(selectinload(TechnicalStock.base_stock))
+            .order_by(desc(TechnicalStock.updated_at))
+        )
+
+    def by_symbol_query(self, symbol: str) -> Select:
+        # Sembol filtresi zaten BaseStock üzerinde olduğu için ilişki aynı JOIN'den doldurulur
+        return (
+            select(TechnicalStock)
+            .join(TechnicalStock.base_stock)
+            .options(contains_eager(TechnicalStock.base_stock))
+            .where(BaseStock.symbol == symbol)
+        )
+
+    def get_all_with_stock(self, db: Session) -> List[TechnicalStock]:
+        """
+        Tüm teknik analiz sonuçlarını hisseleriyle birlikte getirir (iki sorgu)
+
+        Returns:
+            List[TechnicalStock]: Güncellenme zamanına göre azalan sırada sonuçlar
+        """
+        return list(db.scalars(self.all_with_stock_query()).all())
+
+    async def get_all_with_stock_async(self, db: AsyncSession) -> List[TechnicalStock]:
+        return list((await db.scalars(self.all_with_stock_query())).all())
+
+    def get_by_symbol(self, db: Session, symbol: str) -> Optional[TechnicalStock]:
+        """
+        Sembolün teknik analizini hissesiyle birlikte tek sorguda getirir
+        """
+        return db.scalars(self.by_symbol_query(symbol)).first()
@@ -3,8 +3,10 @@ from app.schemas.stock_filter_params import StockFilterParams
 from app.schemas.base_stock_response import BaseStockResponse
 from app.schemas.prediction_stock_response import PredictionStockResponse
 from app.schemas.technical_stock_response import TechnicalStockResponse
+from app.schemas.prediction_archive_response import PredictionArchiveResponse
 from app.schemas.hourly_prediction_response import HourlyPredictionResponse, HourlyModelPrediction, HourlyPredictionItem
 from app.schemas.user import UserBase, UserCreate, UserResponse, Token
+from app.schemas.job import JobCreate, JobResponse
 
 # Dışa aktarılacak şemaları belirt
 __all__ = [
@@ -12,11 +14,14 @@ __all__ = [
     "BaseStockResponse",
     "PredictionStockResponse",
     "TechnicalStockResponse",
+    "PredictionArchiveResponse",
     "HourlyPredictionResponse",
     "HourlyModelPrediction",
     "HourlyPredictionItem",
     "UserBase",
     "UserCreate",
     "UserResponse",
-    "Token"
+    "Token",
+    "JobCreate",
+    "JobResponse"
 ]
\ No newline at end of file
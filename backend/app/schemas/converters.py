@@ -0,0 +1,75 @@
+from app.models.base_stock import BaseStock
+from app.models.technical_stock import TechnicalStock
+from app.schemas.base_stock_response import BaseStockResponse
+from app.schemas.technical_stock_response import TechnicalStockResponse
+
+# BaseStock modelini BaseStockResponse'a dönüştüren yardımcı fonksiyon
+def convert_to_response(stock: BaseStock) -> BaseStockResponse:
+    """
+    BaseStock modelini BaseStockResponse şemasına dönüştürür
+    """
+    return BaseStockResponse(
+        id=stock.id,
+        symbol=stock.symbol,
+        name=stock.name,
+        last_price=stock.last_price,
+        open_price=stock.open_price if hasattr(stock, 'open_price') else None,
+        high_price=stock.high_price if hasattr(stock, 'high_price') else None,
+        low_price=stock.low_price if hasattr(stock, 'low_price') else None,
+        previous_close=stock.previous_close if hasattr(stock, 'previous_close') else None,
+        daily_change=stock.change_percent,  # change_percent'i daily_change olarak eşleştir
+        daily_volume=stock.volume,
+        relative_volume=stock.relative_volume,
+        rsi=stock.rsi,
+        pivot=stock.pivot_pp,
+        r1=stock.pivot_r1,
+        r2=stock.pivot_r2,
+        s1=stock.pivot_s1,
+        s2=stock.pivot_s2,
+        passed_rsi_filter=stock.passed_rsi_filter if hasattr(stock, 'passed_rsi_filter') else False,
+        passed_volume_filter=stock.passed_volume_filter if hasattr(stock, 'passed_volume_filter') else False,
+        passed_pivot_filter=stock.passed_pivot_filter if hasattr(stock, 'passed_pivot_filter') else False,
+        is_selected=stock.is_selected,
+        last_updated=stock.updated_at
+    )
+
+# TechnicalStock modelini TechnicalStockResponse'a dönüştüren yardımcı fonksiyon
+def convert_to_technical_response(technical: TechnicalStock) -> TechnicalStockResponse:
+    """
+    TechnicalStock modelini TechnicalStockResponse şemasına dönüştürür
+    """
+    return TechnicalStockResponse(
+        id=technical.id,
+        base_stock_id=technical.base_stock_id,
+        symbol=technical.base_stock.symbol if technical.base_stock else None,
+        # Teknik göstergeler
+        macd=technical.macd,
+        macd_signal=technical.macd_signal,
+        macd_hist=technical.macd_hist,
+        adx=technical.adx,
+        dmi_plus=technical.dmi_plus,
+        dmi_minus=technical.dmi_minus,
+        stoch_k=technical.stoch_k,
+        stoch_d=technical.stoch_d,
+        cci=technical.cci,
+        mfi=technical.mfi,
+        bb_upper=technical.bb_upper,
+        bb_middle=technical.bb_middle,
+        bb_lower=technical.bb_lower,
+        atr=technical.atr,
+        sma_50=technical.sma_50,
+        sma_200=technical.sma_200,
+        ema_20=technical.ema_20,
+        # Destek ve direnç seviyeleri
+        support_levels=technical.support_levels,
+        resistance_levels=technical.resistance_levels,
+        # Fibonacci seviyeleri
+        fib_retracement=technical.fib_retracement,
+        # Teknik analize dayalı sinyaller
+        trend_signals=technical.trend_signals,
+        momentum_signals=technical.momentum_signals,
+        volatility_signals=technical.volatility_signals,
+        # Zaman damgaları
+        created_at=technical.created_at,
+        updated_at=technical.updated_at
+    )
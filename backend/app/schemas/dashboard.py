@@ -26,12 +26,21 @@ class DashboardPrediction(BaseModel):
     prediction_date: str
     predicted_price: float
     actual_price: float
-    accuracy: float
+    accuracy: Optional[float] = None
     model: str
 
     class Config:
         orm_mode = True
 
+# Gerçekleşen tahminlere göre model doğruluğu
+class ModelAccuracy(BaseModel):
+    model: str
+    count: int
+    success_rate: float = Field(..., description="Yönü doğru tahmin edilen tahminlerin yüzdesi")
+    accuracy: float = Field(..., description="Ortalama fiyat doğruluğu (%)")
+    mape: float = Field(..., description="Ortalama mutlak yüzde hata")
+    window_days: int
+
 # Model karşılaştırma için şema
 class ModelComparisonItem(BaseModel):
     model_name: str
@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+
+class JobCreate(BaseModel):
+    job_type: str = Field(..., description="İş tipi: 'predict', 'refresh_market', 'backtest', 'cluster', 'tune', 'feature_importance' veya 'compact_archive'")
+    symbols: Optional[List[str]] = Field(None, description="Tahmin yapılacak semboller (boş ise tüm seçili hisseler)")
+    model_type: str = Field("all", description="Model tipi: 'lstm', 'gru', 'attention', 'baseline', 'cluster' veya 'all'")
+    days: int = Field(45, description="Kaç günlük saatlik veri kullanılacağı")
+    force: bool = Field(False, description="Güncel tahmin olsa bile yeniden hesapla (eğitim drift kontrolüne bağlıdır)")
+    retrain: bool = Field(False, description="Drift kontrolünü atlayıp derin modelleri yeniden eğit")
+    run_predictions: bool = Field(False, description="Piyasa yenilemesinden sonra seçili hisseler için tahmin işi başlat")
+
+    # Backtest parametreleri
+    configs: Optional[List[Dict[str, Any]]] = Field(None, description="Değerlendirilecek model yapılandırmaları (model_type, sequence_length, features, epochs)")
+    folds: Optional[int] = Field(None, description="Walk-forward kat sayısı")
+    horizons: Optional[List[int]] = Field(None, description="Tahmin ufukları (saatlik bar sayısı)")
+
+class JobResponse(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    params: Optional[Dict[str, Any]] = None
+
+    # Sembol bazlı ilerleme
+    progress: Optional[Dict[str, str]] = None
+    total_items: int = 0
+    completed_items: int = 0
+    failed_items: int = 0
+
+    # Sonuç ve hata bilgisi
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    # Zaman damgaları
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import List, Dict, Optional
+from datetime import datetime
+
+class PredictionArchiveResponse(BaseModel):
+    symbol: str
+    created_at: datetime
+    
+    # 'raw': tek tahmin çalıştırması, '1d': günün son tahmini (samples satır sıkıştırıldı)
+    granularity: str
+    samples: int = 1
+    
+    current_price: Optional[float] = None
+    prediction_date: Optional[datetime] = None
+    best_model: Optional[str] = None
+    model_tier: Optional[str] = None
+    feature_set_version: Optional[int] = None
+    
+    # Model tahminleri
+    lstm_predicted_price: Optional[float] = None
+    gru_predicted_price: Optional[float] = None
+    attention_predicted_price: Optional[float] = None
+    ensemble_predicted_price: Optional[float] = None
+    interval_lower: Optional[float] = None
+    interval_upper: Optional[float] = None
+    
+    predictions: Optional[Dict[str, List[float]]] = None
+    model_weights: Optional[Dict[str, float]] = None
+    
+    class Config:
+        orm_mode = True
@@ -32,13 +32,25 @@ class PredictionStockResponse(BaseModel):
     best_model: str
     best_mse: float
     best_mae: float
+    model_tier: Optional[str] = None
+    
+    # Gerçekleşen hatalara göre ağırlıklı ensemble tahmini
+    ensemble_predicted_price: Optional[float] = None
+    model_weights: Optional[Dict[str, float]] = None
+    
+    # Monte Carlo dropout tahmin aralıkları
+    interval_lower: Optional[float] = None
+    interval_upper: Optional[float] = None
+    prediction_intervals: Optional[Dict[str, Dict[str, Any]]] = None
     
     # Ortak değerler
     volatility: float
     prediction_date: datetime
+    stale: bool = False  # Tahminin vadesi geçti, yenisi henüz üretilmedi
     
     # Model detayları
     features_used: List[str]
+    feature_set_version: Optional[int] = None
     training_window: int
     prediction_window: int
     
@@ -0,0 +1,328 @@
+import logging
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import settings
+from app.models.prediction_job import ITEM_STATUS_RUNNING, ITEM_STATUS_DONE, ITEM_STATUS_FAILED
+
+# Varsayılan değerlendirilecek model yapılandırması
+DEFAULT_BACKTEST_CONFIGS = [
+    {"name": "naive", "model_type": "naive", "sequence_length": 30},
+    {"name": "ridge-seq30", "model_type": "ridge", "sequence_length": 30},
+    {"name": "gbm-seq30", "model_type": "gbm", "sequence_length": 30},
+    {"name": "lstm-seq30", "model_type": "lstm", "sequence_length": 30, "epochs": 20},
+]
+
+# Alt süreç başına önbellekler: aynı süreçte işlenen yapılandırmalar ve katlar veriyi yeniden hazırlamaz
+_prediction_service = None
+_dataset_cache: Dict[Tuple[str, int, Tuple[str, ...]], Tuple[np.ndarray, np.ndarray]] = {}
+
+def _get_prediction_service():
+    global _prediction_service
+    if _prediction_service is None:
+        from app.services.prediction_service import PredictionService
+        _prediction_service = PredictionService()
+    return _prediction_service
+
+def _backtest_symbol_task(symbol: str, configs: List[Dict[str, Any]], days: int,
+                          folds: int, horizons: List[int]) -> Dict[str, Any]:
+    """
+    Alt süreçte tek bir sembolü tüm yapılandırmalar için değerlendirir
+    """
+    service = BacktestService(max_workers=1, folds=folds, horizons=horizons)
+    return service.backtest_symbol(symbol, configs, days=days)
+
+class BacktestService:
+    """
+    Tahmin modellerini kayan başlangıç noktalarıyla (walk-forward) değerlendiren servis.
+
+    Her katta model yalnızca başlangıç noktasından önceki veriyle eğitilir ve sonraki
+    pencere üzerinde test edilir. Semboller paralel alt süreçlerde işlenir; sembolün
+    özellik matrisi bir kez hazırlanır ve tüm katlar/yapılandırmalar tarafından paylaşılır.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, folds: Optional[int] = None,
+                 horizons: Optional[List[int]] = None, test_size: Optional[int] = None):
+        """
+        Args:
+            max_workers: Paralel alt süreç sayısı (1 ise aynı süreçte çalışır)
+            folds: Walk-forward kat sayısı
+            horizons: Değerlendirilecek tahmin ufukları (saatlik bar sayısı)
+            test_size: Her katın test penceresindeki örnek sayısı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers or settings.BACKTEST_MAX_WORKERS
+        self.folds = folds or settings.BACKTEST_FOLDS
+        self.horizons = sorted(horizons or [int(h) for h in settings.BACKTEST_HORIZONS.split(",")])
+        self.test_size = test_size or settings.BACKTEST_TEST_SIZE
+        self.coverage = settings.BACKTEST_INTERVAL_COVERAGE
+
+    def load_dataset(self, symbol: str, days: int, features: Optional[List[str]] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Sembolün özellik matrisini ve kapanış fiyatlarını döndürür (süreç içinde önbelleğe alınır).
+
+        Returns:
+            Tuple: (satır, özellik) float32 özellik matrisi, kapanış fiyatları, özellik isimleri
+        """
+        prediction_service = _get_prediction_service()
+        df = prediction_service.fetch_and_prepare_dataframe(symbol, days=days)
+        if df.empty:
+            raise ValueError(f"{symbol} için veri hazırlanamadı")
+
+        feature_columns = features or prediction_service.select_best_features(df)
+        key = (symbol, days, tuple(feature_columns))
+
+        if key not in _dataset_cache:
+            target_column = 'Close' if 'Close' in df.columns else 'close'
+            values = df[feature_columns].replace([np.inf, -np.inf], np.nan).ffill().bfill().fillna(0.0)
+            _dataset_cache[key] = (values.to_numpy(dtype=np.float32), df[target_column].to_numpy(dtype=np.float64))
+
+        matrix, close = _dataset_cache[key]
+        return matrix, close, feature_columns
+
+    def _fit_predict(self, model_type: str, X_train: np.ndarray, Y_train: np.ndarray,
+                     X_val: np.ndarray, Y_val: np.ndarray, X_eval: np.ndarray, config: Dict[str, Any]) -> np.ndarray:
+        """
+        Modeli eğitir ve verilen pencereler için tüm ufuklarda getiri tahmini yapar.
+
+        Returns:
+            np.ndarray: (örnek, ufuk) getiri tahminleri
+        """
+        H = Y_train.shape[1]
+
+        if model_type == 'naive':
+            # Değişim yok: tüm ufuklarda getiri sıfır
+            return np.zeros((len(X_eval), H))
+
+        if model_type in ('ridge', 'gbm'):
+            lags = min(config.get("lags", settings.BASELINE_LAGS), X_train.shape[1])
+            F_train = X_train[:, -lags:, :].reshape(len(X_train), -1)
+            F_eval = X_eval[:, -lags:, :].reshape(len(X_eval), -1)
+
+            if model_type == 'ridge':
+                from sklearn.linear_model import Ridge
+                return Ridge(alpha=config.get("alpha", 1.0)).fit(F_train, Y_train).predict(F_eval)
+
+            from sklearn.ensemble import HistGradientBoostingRegressor
+            predictions = np.empty((len(X_eval), H))
+            for j in range(H):
+                model = HistGradientBoostingRegressor(max_iter=config.get("max_iter", 100), max_leaf_nodes=15, random_state=42)
+                predictions[:, j] = model.fit(F_train, Y_train[:, j]).predict(F_eval)
+            return predictions
+
+        if model_type in ('lstm', 'gru', 'attention'):
+            from app.services.ml_loader import load_tensorflow
+            tf = load_tensorflow()
+            prediction_service = _get_prediction_service()
+
+            # Getiriler küçük olduğundan eğitim için standartlaştırılır
+            scale = Y_train.std(axis=0) + 1e-8
+            input_shape = (X_train.shape[1], X_train.shape[2])
+
+            # Katlar arasında aynı girdi boyutu için derlenmiş şablon yeniden kullanılır
+            model = prediction_service.acquire_model(model_type, input_shape, output_size=H)
+            try:
+                model.fit(
+                    X_train, Y_train / scale,
+                    validation_data=(X_val, Y_val / scale),
+                    epochs=config.get("epochs", 20),
+                    batch_size=config.get("batch_size", 32),
+                    verbose=0,
+                    callbacks=[tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True)]
+                )
+                return model.predict(X_eval, verbose=0) * scale
+            finally:
+                prediction_service.release_model(model_type, input_shape, model, output_size=H)
+
+        raise ValueError(f"Desteklenmeyen model tipi: {model_type}")
+
+    def _empty_stats(self) -> Dict[str, Dict[str, float]]:
+        return {str(h): {"count": 0, "direction_hits": 0, "abs_error": 0.0, "abs_pct_error": 0.0, "covered": 0, "interval_width_pct": 0.0}
+                for h in self.horizons}
+
+    def backtest_symbol(self, symbol: str, configs: List[Dict[str, Any]], days: int = 90) -> Dict[str, Any]:
+        """
+        Bir sembolü verilen yapılandırmalarla walk-forward olarak değerlendirir.
+
+        Args:
+            symbol: Hisse senedi sembolü
+            configs: Model yapılandırmaları (model_type, sequence_length, features, epochs ...)
+            days: Kaç günlük saatlik veri kullanılacağı
+
+        Returns:
+            Dict: Yapılandırma adı -> ufuk bazlı toplanabilir istatistikler
+        """
+        horizons = np.array(self.horizons)
+        max_h = int(horizons.max())
+        alpha = (1.0 - self.coverage) / 2
+        results = {}
+
+        for config in configs:
+            name = config.get("name") or f"{config['model_type']}-seq{config.get('sequence_length', 30)}"
+            started = time.perf_counter()
+            stats = self._empty_stats()
+
+            matrix, close, _ = self.load_dataset(symbol, days, config.get("features"))
+            seq = int(config.get("sequence_length", 30))
+
+            # t anında biten pencere için hedef: t+h anındaki getiri
+            n_samples = len(close) - seq - max_h + 1
+            min_train = max(2 * self.test_size, 50)
+            if n_samples < min_train + self.folds * self.test_size:
+                raise ValueError(f"{symbol} için yetersiz veri: {len(close)} satır")
+
+            end_rows = np.arange(seq - 1, seq - 1 + n_samples)
+            base_close = close[end_rows]
+            returns = close[end_rows[:, None] + horizons[None, :]] / base_close[:, None] - 1.0
+
+            for k in range(self.folds):
+                origin = n_samples - (self.folds - k) * self.test_size
+                # Hedefi başlangıç noktasını geçen örnekler eğitime alınmaz (sızıntı önleme)
+                train_end = origin - max_h + 1
+                calibration_size = max(self.test_size, train_end // 10)
+                fit_end = train_end - calibration_size
+
+                # Ölçekleme yalnızca eğitim satırlarıyla yapılır
+                train_rows = matrix[:seq - 1 + fit_end + 1]
+                low = train_rows.min(axis=0)
+                span = train_rows.max(axis=0) - low
+                span[span == 0] = 1.0
+                scaled = (matrix - low) / span
+                windows = sliding_window_view(scaled, (seq, matrix.shape[1]))[:, 0]
+
+                X_fit, Y_fit = windows[:fit_end], returns[:fit_end]
+                X_cal, Y_cal = windows[fit_end:train_end], returns[fit_end:train_end]
+                X_test, Y_test = windows[origin:origin + self.test_size], returns[origin:origin + self.test_size]
+
+                predictions = self._fit_predict(
+                    config["model_type"], X_fit, Y_fit, X_cal, Y_cal,
+                    np.concatenate([X_cal, X_test]), config
+                )
+                cal_pred, test_pred = predictions[:len(X_cal)], predictions[len(X_cal):]
+
+                # Kalibrasyon: doğrulama artıklarının kantilleriyle tahmin aralığı
+                residuals = Y_cal - cal_pred
+                lower = test_pred + np.quantile(residuals, alpha, axis=0)
+                upper = test_pred + np.quantile(residuals, 1 - alpha, axis=0)
+
+                test_base = base_close[origin:origin + self.test_size, None]
+                abs_error = np.abs(test_pred - Y_test) * test_base
+
+                for j, h in enumerate(self.horizons):
+                    bucket = stats[str(h)]
+                    bucket["count"] += len(Y_test)
+                    bucket["direction_hits"] += int(np.sum(np.sign(test_pred[:, j]) == np.sign(Y_test[:, j])))
+                    bucket["abs_error"] += float(abs_error[:, j].sum())
+                    bucket["abs_pct_error"] += float(np.abs(test_pred[:, j] - Y_test[:, j]).sum() * 100)
+                    bucket["covered"] += int(np.sum((Y_test[:, j] >= lower[:, j]) & (Y_test[:, j] <= upper[:, j])))
+                    bucket["interval_width_pct"] += float((upper[:, j] - lower[:, j]).sum() * 100)
+
+            results[name] = {"config": config, "stats": stats, "seconds": time.perf_counter() - started}
+
+        return results
+
+    def _summarize(self, stats: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for horizon, bucket in stats.items():
+            count = bucket["count"] or 1
+            summary[horizon] = {
+                "samples": bucket["count"],
+                "directional_accuracy": round(bucket["direction_hits"] / count, 4),
+                "mae": round(bucket["abs_error"] / count, 4),
+                "mape": round(bucket["abs_pct_error"] / count, 4),
+                "interval_coverage": round(bucket["covered"] / count, 4),
+                "interval_width_pct": round(bucket["interval_width_pct"] / count, 4)
+            }
+        return summary
+
+    def run(self, symbols: List[str], configs: Optional[List[Dict[str, Any]]] = None, days: int = 90,
+            progress_callback: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """
+        Semboller üzerinde tüm yapılandırmaları paralel olarak değerlendirir.
+
+        Args:
+            symbols: Değerlendirilecek semboller
+            configs: Model yapılandırmaları (boş ise DEFAULT_BACKTEST_CONFIGS)
+            days: Kaç günlük saatlik veri kullanılacağı
+            progress_callback: Her sembolün durumu değiştiğinde (sembol, durum) ile çağrılır
+
+        Returns:
+            Dict: Yapılandırma bazlı, ufuk başına yön doğruluğu, MAE, MAPE ve aralık kapsama oranı
+        """
+        def report(symbol: str, status: str):
+            if progress_callback:
+                progress_callback(symbol, status)
+
+        configs = configs or DEFAULT_BACKTEST_CONFIGS
+        started = time.perf_counter()
+        totals: Dict[str, Dict[str, Any]] = {}
+        failed_symbols = []
+
+        def merge(symbol: str, symbol_results: Dict[str, Any]):
+            for name, result in symbol_results.items():
+                entry = totals.setdefault(name, {"config": result["config"], "stats": self._empty_stats(), "seconds": 0.0, "symbols": 0})
+                entry["seconds"] += result["seconds"]
+                entry["symbols"] += 1
+                for horizon, bucket in result["stats"].items():
+                    for key, value in bucket.items():
+                        entry["stats"][horizon][key] += value
+            report(symbol, ITEM_STATUS_DONE)
+
+        if self.max_workers <= 1:
+            for symbol in symbols:
+                report(symbol, ITEM_STATUS_RUNNING)
+                try:
+                    merge(symbol, self.backtest_symbol(symbol, configs, days=days))
+                except Exception as e:
+                    self.logger.error(f"{symbol} backtest hatası: {str(e)}")
+                    failed_symbols.append(symbol)
+                    report(symbol, ITEM_STATUS_FAILED)
+        else:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as executor:
+                futures = {}
+                for symbol in symbols:
+                    future = executor.submit(_backtest_symbol_task, symbol, configs, days, self.folds, self.horizons)
+                    futures[future] = symbol
+                    report(symbol, ITEM_STATUS_RUNNING)
+
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        merge(symbol, future.result())
+                    except Exception as e:
+                        self.logger.error(f"{symbol} backtest hatası: {str(e)}")
+                        self.logger.debug(traceback.format_exc())
+                        failed_symbols.append(symbol)
+                        report(symbol, ITEM_STATUS_FAILED)
+
+        summary = []
+        for name, entry in totals.items():
+            horizons = self._summarize(entry["stats"])
+            summary.append({
+                "name": name,
+                "config": entry["config"],
+                "symbols": entry["symbols"],
+                "train_seconds": round(entry["seconds"], 2),
+                "mean_mape": round(float(np.mean([h["mape"] for h in horizons.values()])), 4),
+                "horizons": horizons
+            })
+        summary.sort(key=lambda item: item["mean_mape"])
+
+        elapsed = time.perf_counter() - started
+        self.logger.info(f"Backtest tamamlandı: {len(symbols) - len(failed_symbols)}/{len(symbols)} sembol, {elapsed:.1f} saniye")
+
+        return {
+            "configs": summary,
+            "best_config": summary[0]["name"] if summary else None,
+            "horizons": self.horizons,
+            "folds": self.folds,
+            "failed_symbols": failed_symbols,
+            "elapsed_seconds": round(elapsed, 2)
+        }
@@ -0,0 +1,285 @@
+import io
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+from app.models.price_bar import PriceBar
+
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Kaynak veri sütun adları (yfinance, BaseStockService ve düzleştirilmiş MultiIndex)
+SOURCE_COLUMNS = {
+    "open": ("open", "open_price"),
+    "high": ("high", "high_price"),
+    "low": ("low", "low_price"),
+    "close": ("close", "last_price"),
+    "volume": ("volume",)
+}
+
+class BarStore:
+    """
+    OHLCV barlarını `price_bars` tablosuna toplu yazan ve aralık okumalarını
+    doğrudan NumPy dizileri olarak döndüren depo.
+
+    PostgreSQL'de barlar CSV olarak geçici bir hazırlık tablosuna `COPY` ile
+    aktarılır ve tek bir `INSERT ... ON CONFLICT DO UPDATE` ile aylık bölümlenmiş
+    tabloya taşınır; eksik aylık bölümler yazmadan önce oluşturulur. SQLite'ta
+    aynı upsert `executemany` ile yapılır. Okumalarda ORM nesnesi oluşturulmaz.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None):
+        """
+        Args:
+            engine: Veritabanı motoru (varsayılan: uygulama motoru)
+        """
+        if engine is None:
+            from app.db.session import engine
+        self.logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.table = PriceBar.__tablename__
+        self._partitions: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def dialect(self) -> str:
+        return self.engine.dialect.name
+
+    def _to_frame(self, symbol: str, df: pd.DataFrame, interval: str) -> pd.DataFrame:
+        """
+        Kaynak DataFrame'i (symbol, timeframe, ts, open, high, low, close, volume) biçimine getirir.
+        Zaman damgaları saat dilimsiz UTC'ye çevrilir, aynı zaman damgasında son satır tutulur.
+        """
+        if isinstance(df.index, pd.DatetimeIndex):
+            ts = df.index
+        else:
+            ts_column = next((c for c in df.columns if str(c).lower() in ("date", "datetime", "ts")), None)
+            if ts_column is None:
+                raise ValueError(f"{symbol} için zaman damgası bulunamadı")
+            ts = pd.DatetimeIndex(pd.to_datetime(df[ts_column]))
+        if ts.tz is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+
+        lowered = {str(c).lower(): c for c in df.columns}
+        values = {}
+        for name, candidates in SOURCE_COLUMNS.items():
+            column = next((lowered[c] for c in candidates if c in lowered), None)
+            if column is None:
+                # Düzleştirilmiş MultiIndex sütunları: "Close_THYAO.IS"
+                column = next((original for lower, original in lowered.items() if lower.startswith(f"{name}_")), None)
+            values[name] = df[column].to_numpy(dtype=np.float64) if column is not None else np.full(len(df), np.nan)
+
+        frame = pd.DataFrame(values, index=ts)
+        frame = frame[~np.isnan(frame["close"].to_numpy())]
+        for name in ("open", "high", "low"):
+            frame[name] = frame[name].fillna(frame["close"])
+        frame["volume"] = frame["volume"].fillna(0.0)
+        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+
+        frame.index.name = "ts"
+        frame = frame.reset_index()
+        frame.insert(0, "timeframe", interval)
+        frame.insert(0, "symbol", symbol)
+        return frame
+
+    def ingest(self, symbol: str, df: pd.DataFrame, interval: str = "1h") -> int:
+        """
+        Tek bir sembolün barlarını yazar
+
+        Returns:
+            int: Yazılan bar sayısı
+        """
+        return self.ingest_many({symbol: df}, interval)
+
+    def ingest_many(self, frames: Dict[str, pd.DataFrame], interval: str = "1h") -> int:
+        """
+        Birden fazla sembolün barlarını tek bir toplu yazmayla kaydeder. Aynı
+        (symbol, timeframe, ts) için mevcut bar yeni değerlerle güncellenir.
+
+        Args:
+            frames: Sembol -> OHLCV DataFrame (DatetimeIndex veya date sütunu)
+            interval: Bar aralığı ("1h" veya "1d")
+
+        Returns:
+            int: Yazılan bar sayısı
+        """
+        parts = [self._to_frame(symbol, df, interval) for symbol, df in frames.items() if df is not None and not df.empty]
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return 0
+
+        bars = pd.concat(parts, ignore_index=True)
+        started = time.perf_counter()
+        if self.dialect == "postgresql":
+            self._ingest_postgresql(bars)
+        else:
+            self._ingest_executemany(bars)
+
+        self.logger.info(
+            f"{len(frames)} sembol için {len(bars)} bar ({interval}) yazıldı - {time.perf_counter() - started:.3f} saniye"
+        )
+        return len(bars)
+
+    def _upsert_sql(self, source: str) -> str:
+        columns = ", ".join(["symbol", "timeframe", "ts"] + BAR_COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in BAR_COLUMNS)
+        return (
+            f"INSERT INTO {self.table} ({columns}) {source} "
+            f"ON CONFLICT (symbol, timeframe, ts) DO UPDATE SET {updates}"
+        )
+
+    def ensure_partitions(self, cursor, start: datetime, end: datetime):
+        """
+        [start, end] aralığını kapsayan aylık bölümleri (yoksa) oluşturur
+        """
+        for month in pd.period_range(start, end, freq="M"):
+            key = (month.year, month.month)
+            if key in self._partitions:
+                continue
+            lower = month.start_time.strftime("%Y-%m-%d")
+            upper = (month + 1).start_time.strftime("%Y-%m-%d")
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table}_y{month.year}m{month.month:02d} "
+                f"PARTITION OF {self.table} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            )
+            self._partitions.add(key)
+
+    def _ingest_postgresql(self, bars: pd.DataFrame):
+        buffer = io.StringIO()
+        bars.to_csv(buffer, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S")
+        buffer.seek(0)
+
+        staging = f"{self.table}_staging"
+        columns = ", ".join(bars.columns)
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            with self._lock:
+                self.ensure_partitions(cursor, bars["ts"].min(), bars["ts"].max())
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {self.table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute(self._upsert_sql(f"SELECT {columns} FROM {staging}"))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            # Bölüm oluşturma geri alındıysa önbellek de geçersizdir
+            self._partitions.clear()
+            raise
+        finally:
+            connection.close()
+
+    def _ingest_executemany(self, bars: pd.DataFrame):
+        # SQLAlchemy'nin SQLite DateTime biçimiyle aynı metin gösterimi
+        ts = bars["ts"].dt.strftime("%Y-%m-%d %H:%M:%S.%f")
+        rows = list(zip(
+            bars["symbol"], bars["timeframe"], ts,
+            *(bars[c].to_numpy(dtype=np.float64).tolist() for c in BAR_COLUMNS)
+        ))
+        placeholders = ", ".join(["?"] * (3 + len(BAR_COLUMNS)))
+
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.executemany(self._upsert_sql(f"VALUES ({placeholders})"), rows)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def read(self, symbol: str, interval: str = "1h", start: Optional[datetime] = None,
+             end: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """
+        Sembolün [start, end) aralığındaki barlarını zaman sırasıyla okur
+
+        Args:
+            symbol: Hisse sembolü
+            interval: Bar aralığı
+            start: Başlangıç (dahil, saat dilimsiz UTC)
+            end: Bitiş (hariç, saat dilimsiz UTC)
+
+        Returns:
+            Dict[str, np.ndarray]: "ts" (datetime64[s]) ve OHLCV sütunları (float64)
+        """
+        conditions = ["symbol = %(symbol)s", "timeframe = %(timeframe)s"]
+        params = {"symbol": symbol, "timeframe": interval}
+        if start is not None:
+            conditions.append("ts >= %(start)s")
+            params["start"] = start
+        if end is not None:
+            conditions.append("ts < %(end)s")
+            params["end"] = end
+
+        if self.dialect == "postgresql":
+            data = self._read_postgresql(conditions, params)
+        else:
+            data = self._read_fetchall(conditions, params)
+
+        if data.size == 0:
+            data = np.empty((0, 1 + len(BAR_COLUMNS)))
+        result = {"ts": data[:, 0].astype(np.int64).astype("datetime64[s]")}
+        for i, name in enumerate(BAR_COLUMNS, start=1):
+            result[name] = np.ascontiguousarray(data[:, i])
+        return result
+
+    def _read_postgresql(self, conditions, params) -> np.ndarray:
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            query = cursor.mogrify(
+                f"SELECT extract(epoch FROM ts)::bigint, {', '.join(BAR_COLUMNS)} FROM {self.table} "
+                f"WHERE {' AND '.join(conditions)} ORDER BY ts",
+                params
+            ).decode()
+            buffer = io.StringIO()
+            cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", buffer)
+            connection.commit()
+        finally:
+            connection.close()
+
+        buffer.seek(0)
+        if not buffer.getvalue():
+            return np.empty((0, 1 + len(BAR_COLUMNS)))
+        return np.loadtxt(buffer, delimiter=",", dtype=np.float64, ndmin=2)
+
+    def _read_fetchall(self, conditions, params) -> np.ndarray:
+        where = " AND ".join(conditions)
+        for name in params:
+            where = where.replace(f"%({name})s", f":{name}")
+        params = {
+            name: value.strftime("%Y-%m-%d %H:%M:%S.%f") if isinstance(value, datetime) else value
+            for name, value in params.items()
+        }
+
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"SELECT CAST(strftime('%s', ts) AS INTEGER), {', '.join(BAR_COLUMNS)} FROM {self.table} "
+                f"WHERE {where} ORDER BY ts",
+                params
+            )
+            rows = cursor.fetchall()
+        finally:
+            connection.close()
+        return np.array(rows, dtype=np.float64).reshape(-1, 1 + len(BAR_COLUMNS))
+
+    def read_frame(self, symbol: str, interval: str = "1h", start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        `read` sonucunu yfinance sütun adlarıyla (Open, High, Low, Close, Volume) DataFrame olarak döndürür
+        """
+        bars = self.read(symbol, interval, start, end)
+        return pd.DataFrame(
+            {name.capitalize(): bars[name] for name in BAR_COLUMNS},
+            index=pd.DatetimeIndex(bars["ts"], name="Datetime")
+        )
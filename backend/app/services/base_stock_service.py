@@ -4,14 +4,19 @@ import numpy as np
 import logging
 from datetime import datetime, timedelta, time
 from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Callable
 import math
 import time
 import traceback
 import json
 from requests.exceptions import ConnectionError  # URLlib3 yerine requests'in ConnectionError'unu kullanıyoruz
 
+from app.core.config import settings
 from app.models.base_stock import BaseStock
+from app.services.bar_store import BarStore
+from app.services.snapshot_service import SnapshotService
+from app.services.write_behind import WriteBehindBuffer
+from app.models.prediction_job import ITEM_STATUS_DONE, ITEM_STATUS_FAILED
 from app.db.session import get_db
 
 logger = logging.getLogger(__name__)
@@ -26,6 +31,8 @@ class BaseStockService:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.bar_store = BarStore()
+        self.snapshot_service = SnapshotService()
         # Tüm BIST sembolleri - Alfabetik olarak sıralanmış
         self.symbols = [
             "A1CAP", "ACSEL", "ADEL", "ADESE", "ADGYO", "AEFES", "AFYON", "AGHOL", "AGESA", "AGROT", 
@@ -671,9 +678,137 @@ class BaseStockService:
             
         return filter_results
     
+    @staticmethod
+    def _to_float(value, default: float = 0.0) -> float:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return default
+        return default if math.isnan(value) or math.isinf(value) else value
+
+    def build_stock_row(self, symbol: str, df: pd.DataFrame, filter_results: Dict[str, bool]) -> Optional[Dict]:
+        """
+        Hesaplanan göstergelerin son satırını base_stocks tablosunun sütunlarına eşler.
+
+        Args:
+            symbol: Hisse sembolü
+            df: Göstergeleri hesaplanmış hisse verileri
+            filter_results: Filtre sonuçları
+
+        Returns:
+            Optional[Dict]: Upsert için satır sözlüğü (veri yoksa None)
+        """
+        if df is None or df.empty:
+            self.logger.warning(f"{symbol} için veritabanı güncellemesi için veri yok")
+            return None
+
+        last_data = df.iloc[-1].to_dict()
+        last_price = self._to_float(last_data.get('last_price'))
+        pivot = self._to_float(last_data.get('pivot'))
+        previous_close = self._to_float(df['last_price'].iloc[-2]) if len(df) >= 2 and 'last_price' in df.columns else None
+        change_percent = (last_price - previous_close) / previous_close * 100 if previous_close else None
+
+        return {
+            'symbol': symbol,
+            'last_price': last_price,
+            'open_price': self._to_float(last_data.get('open_price')),
+            'high_price': self._to_float(last_data.get('high_price')),
+            'low_price': self._to_float(last_data.get('low_price')),
+            'previous_close': previous_close,
+            'volume': self._to_float(last_data.get('volume')),
+            'relative_volume': self._to_float(last_data.get('relative_volume'), 1.0),
+            'change_percent': change_percent,
+            'rsi': self._to_float(last_data.get('rsi'), 50.0),
+            'pivot_pp': pivot,
+            'pivot_r1': self._to_float(last_data.get('r1')),
+            'pivot_r2': self._to_float(last_data.get('r2')),
+            'pivot_r3': self._to_float(last_data.get('r3')),
+            'pivot_s1': self._to_float(last_data.get('s1')),
+            'pivot_s2': self._to_float(last_data.get('s2')),
+            'pivot_s3': self._to_float(last_data.get('s3')),
+            'above_pivot': bool(pivot) and last_price >= pivot,
+            'crossed_pivot': bool(filter_results.get('fibonacci_filter', False)),
+            'passed_rsi_filter': bool(filter_results.get('rsi_filter', False)),
+            'passed_volume_filter': bool(filter_results.get('volume_filter', False)),
+            'passed_pivot_filter': bool(filter_results.get('fibonacci_filter', False)),
+            'is_selected': bool(filter_results.get('is_selected', False)),
+            'updated_at': datetime.now()
+        }
+
+    def bulk_upsert_stocks(self, db: Session, rows: List[Dict], chunk_size: Optional[int] = None) -> List[BaseStock]:
+        """
+        Satırları parça başına tek bir INSERT ... ON CONFLICT (symbol) DO UPDATE ifadesiyle
+        yazar ve parça başına bir kez commit eder. PostgreSQL ve SQLite'ta yazılan satırlar
+        aynı ifadenin RETURNING sonucundan okunur; diğer veritabanlarında parça başına tek
+        bir SELECT ile mevcut kayıtlar güncellenir. Yazılan kayıtlar commit'ten önce oturumdan
+        ayrılır; commit sonrası süresi dolmadığından okunmaları yeniden SELECT gerektirmez.
+
+        Args:
+            db: Veritabanı oturumu
+            rows: build_stock_row ile üretilmiş satırlar
+            chunk_size: Parça başına satır sayısı
+
+        Returns:
+            List[BaseStock]: Yazılan kayıtlar
+        """
+        chunk_size = chunk_size or settings.BASE_STOCK_UPSERT_CHUNK_SIZE
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            dialect_insert = None
+
+        written: List[BaseStock] = []
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            chunk_written: List[BaseStock] = []
+            try:
+                if dialect_insert is not None:
+                    stmt = dialect_insert(BaseStock)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[BaseStock.symbol],
+                        set_={column: stmt.excluded[column] for column in chunk[0] if column != 'symbol'}
+                    ).returning(BaseStock)
+                    # Her satıra created_at yalnızca ekleme için verilir; çakışmada korunur
+                    params = [dict(row, created_at=row['updated_at']) for row in chunk]
+                    chunk_written.extend(db.scalars(stmt, params, execution_options={"populate_existing": True}).all())
+                else:
+                    existing = {
+                        stock.symbol: stock
+                        for stock in db.query(BaseStock).filter(BaseStock.symbol.in_([row['symbol'] for row in chunk]))
+                    }
+                    for row in chunk:
+                        stock = existing.get(row['symbol'])
+                        if stock is None:
+                            stock = BaseStock(created_at=row['updated_at'], **row)
+                            db.add(stock)
+                        else:
+                            for column, value in row.items():
+                                setattr(stock, column, value)
+                        chunk_written.append(stock)
+                    db.flush()
+                # Commit kayıtların süresini doldurmasın (yazıcı oturumu kapandıktan sonra da okunabilir)
+                for stock in chunk_written:
+                    db.expunge(stock)
+                db.commit()
+                written.extend(chunk_written)
+            except Exception as e:
+                db.rollback()
+                self.logger.error(f"{len(chunk)} hisselik toplu yazma hatası: {str(e)}")
+                self.logger.error(traceback.format_exc())
+                raise
+
+        self.logger.info(f"{len(written)} hisse {math.ceil(len(rows) / chunk_size)} toplu ifadeyle veritabanına yazıldı")
+
+        # Dashboard okuma modelinin hisse bölümü
+        self.snapshot_service.safe_update(db, self.snapshot_service.update_stocks, written)
+        return written
+
     def update_base_stock(self, db: Session, symbol: str, df: pd.DataFrame, filter_results: Dict[str, bool]) -> None:
         """
-        Hisse senedi verilerini veritabanına kaydeder veya günceller.
+        Tek bir hisse senedi verisini veritabanına kaydeder veya günceller.
         
         Args:
             db: Veritabanı oturumu
@@ -681,75 +816,43 @@ class BaseStockService:
             df: Hisse verileri
             filter_results: Filtre sonuçları
         """
-        if df is None or df.empty:
-            self.logger.warning(f"{symbol} için veritabanı güncellemesi için veri yok")
+        row = self.build_stock_row(symbol, df, filter_results)
+        if row is None:
             return
         
         try:
-            # Son veriyi al
-            last_data = df.iloc[-1].to_dict()
-            
-            # Tarih bilgisi kontrolü
-            date_col = 'date'
-            if date_col in last_data and isinstance(last_data[date_col], (pd.Timestamp, datetime)):
-                last_date = last_data[date_col]
-            else:
-                last_date = datetime.now()
-            
-            # Veritabanında bu sembol var mı diye kontrol et
-            existing_stock = db.query(BaseStock).filter(BaseStock.symbol == symbol).first()
-            
-            if existing_stock:
-                # Mevcut kaydı güncelle
-                existing_stock.last_price = float(last_data.get('last_price', 0))
-                existing_stock.open_price = float(last_data.get('open_price', 0))
-                existing_stock.high_price = float(last_data.get('high_price', 0))
-                existing_stock.low_price = float(last_data.get('low_price', 0))
-                existing_stock.volume = int(last_data.get('volume', 0))
-                existing_stock.rsi = float(last_data.get('rsi', 50))
-                existing_stock.relative_volume = float(last_data.get('relative_volume', 1.0))
-                existing_stock.pivot = float(last_data.get('pivot', 0))
-                existing_stock.r1 = float(last_data.get('r1', 0))
-                existing_stock.s1 = float(last_data.get('s1', 0))
-                existing_stock.is_selected = filter_results.get('is_selected', False)
-                existing_stock.updated_at = datetime.now()
-                
-                self.logger.info(f"{symbol} veritabanında güncellendi")
-            else:
-                # Yeni kayıt oluştur
-                new_stock = BaseStock(
-                    symbol=symbol,
-                    last_price=float(last_data.get('last_price', 0)),
-                    open_price=float(last_data.get('open_price', 0)),
-                    high_price=float(last_data.get('high_price', 0)),
-                    low_price=float(last_data.get('low_price', 0)),
-                    volume=int(last_data.get('volume', 0)),
-                    rsi=float(last_data.get('rsi', 50)),
-                    relative_volume=float(last_data.get('relative_volume', 1.0)),
-                    pivot=float(last_data.get('pivot', 0)),
-                    r1=float(last_data.get('r1', 0)),
-                    s1=float(last_data.get('s1', 0)),
-                    is_selected=filter_results.get('is_selected', False),
-                    created_at=datetime.now(),
-                    updated_at=datetime.now()
-                )
-                db.add(new_stock)
-                self.logger.info(f"{symbol} veritabanına eklendi")
-            
-            # Değişiklikleri kaydet
-            db.commit()
-            
+            self.bulk_upsert_stocks(db, [row])
         except Exception as e:
-            db.rollback()
             self.logger.error(f"{symbol} veritabanı güncelleme hatası: {str(e)}")
-            self.logger.error(traceback.format_exc())
     
-    def process_all_stocks(self, db: Session) -> List[BaseStock]:
+    def write_market_batch(self, db: Session, items: List[Dict[str, Any]]) -> List[BaseStock]:
+        """
+        Piyasa taramasının write-behind partisini yazar: günlük barlar ve hisse satırları
+        (tek toplu upsert). Hisse yazması başarısız olursa hata yükseltilir ve parti
+        yeniden denenir.
+        
+        Args:
+            db: Yazıcının veritabanı oturumu
+            items: symbol, row (build_stock_row) ve bars alanlarını içeren kayıtlar
+            
+        Returns:
+            List[BaseStock]: Yazılan kayıtlar (oturumdan ayrılmış, yazıcı kapandıktan sonra da okunabilir)
+        """
+        frames = {item["symbol"]: item["bars"] for item in items if item.get("bars") is not None}
+        if frames:
+            try:
+                self.bar_store.ingest_many(frames, interval="1d")
+            except Exception as e:
+                self.logger.warning(f"Günlük barlar kaydedilemedi: {str(e)}")
+        return self.bulk_upsert_stocks(db, [item["row"] for item in items], chunk_size=len(items))
+    
+    def process_all_stocks(self, db: Session, progress_callback: Optional[Callable[[str, str], None]] = None) -> List[BaseStock]:
         """
         Tüm BIST hisselerini işler, verileri çeker, filtreleri uygular ve veritabanını günceller.
         
         Args:
             db: Veritabanı oturumu
+            progress_callback: Her sembol işlendiğinde (sembol, durum) ile çağrılır
             
         Returns:
             List[BaseStock]: Filtreleri geçen ve seçilen hisselerin listesi
@@ -782,6 +885,50 @@ class BaseStockService:
         
         # İşlenmiş hisseler
         selected_stocks = []
+        pending_rows: List[Dict] = []
+        pending_bars: Dict[str, pd.DataFrame] = {}
+        
+        # Write-behind açıksa satırlar arka plandaki yazıcıya verilir; veri çekme ve gösterge
+        # hesabı yazma beklemeden sürer, sembol ancak commit edildikten sonra tamamlandı sayılır
+        writer = None
+        if settings.WRITE_BEHIND_ENABLED:
+            writer = WriteBehindBuffer("market", self.write_market_batch,
+                                       batch_size=settings.BASE_STOCK_UPSERT_CHUNK_SIZE,
+                                       collect_results=True)
+        
+        def drain():
+            written, failed = writer.pop_completed()
+            # Seçilenler yazıcının RETURNING ile okuduğu kayıtlardan alınır (ek sorgu yok)
+            for batch_stocks in writer.pop_results():
+                selected_stocks.extend(stock for stock in batch_stocks if stock.is_selected)
+            if progress_callback:
+                for written_symbol in written:
+                    progress_callback(written_symbol, ITEM_STATUS_DONE)
+                for failed_symbol in failed:
+                    progress_callback(failed_symbol, ITEM_STATUS_FAILED)
+        
+        def flush():
+            # Biriken satırları tek ifadeyle yaz; seçilenler RETURNING sonucundan alınır
+            if pending_bars:
+                try:
+                    self.bar_store.ingest_many(pending_bars, interval="1d")
+                except Exception as e:
+                    self.logger.warning(f"Günlük barlar kaydedilemedi: {str(e)}")
+                pending_bars.clear()
+            if not pending_rows:
+                return
+            symbols_in_chunk = [row['symbol'] for row in pending_rows]
+            try:
+                written = self.bulk_upsert_stocks(db, pending_rows)
+                status = ITEM_STATUS_DONE
+            except Exception:
+                written = []
+                status = ITEM_STATUS_FAILED
+            selected_stocks.extend(stock for stock in written if stock.is_selected)
+            pending_rows.clear()
+            if progress_callback:
+                for chunk_symbol in symbols_in_chunk:
+                    progress_callback(chunk_symbol, status)
         
         # Sembolleri daha küçük gruplara böl (2 sembol)
         batch_size = 2
@@ -803,6 +950,8 @@ class BaseStockService:
                     
                     if df.empty:
                         self.logger.warning(f"{symbol} için veri alınamadı, işlem iptal edildi.")
+                        if progress_callback:
+                            progress_callback(symbol, ITEM_STATUS_FAILED)
                         continue
                     
                     # Veri yapısını standardize et
@@ -814,34 +963,56 @@ class BaseStockService:
                         # Veriyi son gün hariç olacak şekilde kes
                         df = df.iloc[:-1]
                     
+                    bars = df if settings.BAR_STORE_ENABLED else None
+                    if bars is not None and writer is None:
+                        pending_bars[symbol] = bars
+                    
                     # Göstergeleri hesapla
                     df = self.calculate_indicators(df)
                         
                     # Filtreleri uygula
                     filter_results = self.apply_filters(df)
                     
-                    # Veritabanını güncelle
-                    self.update_base_stock(db, symbol, df, filter_results)
+                    # Satırı biriktir; veritabanına parça halinde toplu yazılır
+                    row = self.build_stock_row(symbol, df, filter_results)
+                    if row is None:
+                        if progress_callback:
+                            progress_callback(symbol, ITEM_STATUS_FAILED)
+                        continue
+                    if writer is not None:
+                        writer.put({"symbol": symbol, "row": row, "bars": bars})
+                    else:
+                        pending_rows.append(row)
                     
                     if filter_results['is_selected']:
                         success_count += 1
                         
-                        # Tüm filtrelerden geçen hisseleri seç
-                        selected_stocks.append(db.query(BaseStock).filter(BaseStock.symbol == symbol).first())
-                        selected_count += 1
-                        
                         # Log bilgisi
                         self.logger.info(f"SEÇİLDİ - {symbol}: RSI={df['rsi'].iloc[-1]:.2f}, RelVol={df['relative_volume'].iloc[-1]:.2f}, Pivot Geçişi=Evet")
                     
                     self.logger.info(f"{symbol} işlendi")
+                    if len(pending_rows) >= settings.BASE_STOCK_UPSERT_CHUNK_SIZE:
+                        flush()
                     
                 except Exception as e:
                     self.logger.error(f"{symbol} işleme hatası: {str(e)}")
                     self.logger.error(traceback.format_exc())
+                    if progress_callback:
+                        progress_callback(symbol, ITEM_STATUS_FAILED)
+                finally:
+                    if writer is not None:
+                        drain()
             
             # Grup tamamlandı mesajı
             self.logger.info(f"Grup {batch_index+1} tamamlandı. ({batch_index+1}/{len(symbol_batches)})")
         
+        if writer is not None:
+            writer.close()
+            drain()
+        else:
+            flush()
+        selected_count = len(selected_stocks)
+        
         # İşlem sonuçlarını logla
         self.logger.info(f"Toplam {processed_count}/{len(symbols)} hisse işlendi.")
         self.logger.info(f"Başarılı işlem: {success_count}")
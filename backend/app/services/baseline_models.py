@@ -0,0 +1,154 @@
+import logging
+import time
+from typing import Dict, Any, List, Tuple, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+MODEL_TIER_BASELINE = "baseline"
+MODEL_TIER_DEEP = "deep"
+
+BASELINE_MODELS = ['naive', 'seasonal_naive', 'ridge', 'gbm']
+DEEP_MODELS = ['lstm', 'gru', 'attention']
+
+class BaselineModelService:
+    """
+    Derin modellere göre milisaniyeler içinde eğitilen hızlı model katmanı.
+
+    Naive, mevsimsel naive, ridge ve gradient boosting modelleri derin modellerle
+    aynı ölçeklenmiş pencereler üzerinde eğitilir; böylece doğrulama hataları
+    doğrudan karşılaştırılabilir. Kaskad politikası yalnızca bu katmanın hatası
+    veya modeller arası ayrışma yüksek olduğunda derin modellere geçer.
+    """
+
+    def __init__(self, season_length: Optional[int] = None, lags: Optional[int] = None):
+        """
+        Args:
+            season_length: Mevsimsel naive için periyot (bir işlem günündeki saatlik bar sayısı)
+            lags: Ridge ve gradient boosting için kullanılacak son zaman adımı sayısı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.season_length = season_length or settings.BASELINE_SEASON_LENGTH
+        self.lags = lags or settings.BASELINE_LAGS
+
+    def _lagged_features(self, X: np.ndarray) -> np.ndarray:
+        """
+        (örnek, zaman, özellik) pencerelerinin son `lags` adımını düzleştirir
+        """
+        lags = min(self.lags, X.shape[1])
+        return X[:, -lags:, :].reshape(X.shape[0], -1)
+
+    def _metrics(self, y_true: np.ndarray, y_pred: np.ndarray, y_prev: np.ndarray, fit_seconds: float) -> Dict[str, float]:
+        """
+        Derin modellerle aynı anahtarlarla doğrulama metriklerini hesaplar
+        """
+        errors = y_pred - y_true
+        # Yön doğruluğu: bir önceki gerçek değere göre hareket yönü tuttu mu
+        direction_accuracy = np.mean(np.sign(y_pred - y_prev) == np.sign(y_true - y_prev))
+
+        return {
+            'mse': float(np.mean(errors ** 2)),
+            'mae': float(np.mean(np.abs(errors))),
+            'accuracy': float(direction_accuracy),
+            'fit_seconds': round(fit_seconds, 4)
+        }
+
+    def fit_predict(self, X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray, y_test: np.ndarray,
+                    X_pred: np.ndarray, recent_targets: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        """
+        Tüm hızlı modelleri eğitir, doğrulama setinde değerlendirir ve bir sonraki adımı tahmin eder.
+
+        Args:
+            X_train: Eğitim pencereleri (örnek, zaman, özellik), ölçeklenmiş
+            y_train: Eğitim hedefleri, ölçeklenmiş
+            X_test: Doğrulama pencereleri
+            y_test: Doğrulama hedefleri
+            X_pred: Tahmin penceresi (1, zaman, özellik)
+            recent_targets: Tahmin penceresinin sonuna hizalı son hedef değerleri (ölçeklenmiş)
+
+        Returns:
+            Dict: Model adı -> {'predicted_values': [...], 'metrics': {...}} (ölçeklenmiş değerler)
+        """
+        results = {}
+        y_all = np.concatenate([y_train, y_test])
+        train_size = len(y_train)
+
+        # Doğrulama örnekleri için bir önceki gerçek değer
+        y_prev = y_all[train_size - 1:-1]
+
+        # Naive: bir sonraki değer son değere eşittir
+        started = time.perf_counter()
+        results['naive'] = {
+            'predicted_values': [float(recent_targets[-1])],
+            'metrics': self._metrics(y_test, y_prev, y_prev, time.perf_counter() - started)
+        }
+
+        # Mevsimsel naive: bir önceki işlem gününün aynı saati
+        season = self.season_length
+        if train_size > season and len(recent_targets) >= season:
+            started = time.perf_counter()
+            seasonal_test = y_all[train_size - season:len(y_all) - season]
+            results['seasonal_naive'] = {
+                'predicted_values': [float(recent_targets[-season])],
+                'metrics': self._metrics(y_test, seasonal_test, y_prev, time.perf_counter() - started)
+            }
+
+        # Ridge ve gradient boosting gecikmeli özellikler üzerinde eğitilir
+        from sklearn.linear_model import Ridge
+        from sklearn.ensemble import HistGradientBoostingRegressor
+
+        F_train = self._lagged_features(X_train)
+        F_test = self._lagged_features(X_test)
+        F_pred = self._lagged_features(X_pred)
+
+        regressors = {
+            'ridge': Ridge(alpha=1.0),
+            'gbm': HistGradientBoostingRegressor(max_iter=100, learning_rate=0.1, max_leaf_nodes=15, random_state=42)
+        }
+
+        for name, regressor in regressors.items():
+            try:
+                started = time.perf_counter()
+                regressor.fit(F_train, y_train)
+                fit_seconds = time.perf_counter() - started
+
+                results[name] = {
+                    'predicted_values': regressor.predict(F_pred).astype(float).tolist(),
+                    'metrics': self._metrics(y_test, regressor.predict(F_test), y_prev, fit_seconds)
+                }
+            except Exception as e:
+                self.logger.error(f"{name} modeli eğitim hatası: {str(e)}")
+
+        return results
+
+    def should_escalate(self, metrics: Dict[str, Dict[str, float]], predictions: Dict[str, List[float]],
+                        current_price: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        Kaskad politikası: hızlı katmanın sonucu yeterli mi, derin modellere geçilmeli mi?
+
+        Args:
+            metrics: Hızlı modellerin doğrulama metrikleri (ölçeklenmiş birimlerde)
+            predictions: Hızlı modellerin fiyat tahminleri
+            current_price: Güncel fiyat (ayrışmayı yüzde olarak ölçmek için)
+
+        Returns:
+            Tuple[bool, str]: Derin modellere geçilmeli mi ve gerekçesi
+        """
+        if not metrics:
+            return True, "Hızlı modeller eğitilemedi"
+
+        # Doğrulama hatası: ölçeklenmiş MAE, fiyat aralığının oranı olarak yorumlanır
+        best_mae = min(m.get('mae', float('inf')) for m in metrics.values())
+        if best_mae > settings.CASCADE_MAX_VALIDATION_MAE:
+            return True, f"Doğrulama hatası yüksek (MAE={best_mae:.4f})"
+
+        # Ayrışma: hızlı modellerin sonraki adım tahminleri birbirinden ne kadar farklı
+        next_values = np.array([preds[0] for preds in predictions.values() if preds])
+        if len(next_values) > 1:
+            reference = current_price or float(np.mean(np.abs(next_values))) or 1.0
+            disagreement = float(np.std(next_values) / reference)
+            if disagreement > settings.CASCADE_MAX_DISAGREEMENT:
+                return True, f"Modeller arası ayrışma yüksek ({disagreement:.2%})"
+
+        return False, "Hızlı model katmanı yeterli"
@@ -0,0 +1,174 @@
+import logging
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.symbol_cluster import SymbolCluster
+
+# Ortak küme modelinin tahminleri bu adla saklanır
+CLUSTER_MODEL_NAME = "cluster"
+
+class ClusterService:
+    """
+    Sembolleri getiri, volatilite ve hacim davranışına göre kümeleyen servis.
+
+    Saatlik getiriler tek bir panelde hizalanır; korelasyon matrisi ve davranış
+    istatistikleri vektörel olarak hesaplanır, k-means ile kümeler oluşturulur.
+    Atamalar `symbol_clusters` tablosunda saklanır ve süreç içinde önbelleğe alınır.
+    """
+
+    def __init__(self, n_clusters: Optional[int] = None):
+        """
+        Args:
+            n_clusters: En fazla küme sayısı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.n_clusters = n_clusters or settings.CLUSTER_COUNT
+        self._assignments: Optional[Dict[str, SymbolCluster]] = None
+        self._loaded_at = 0.0
+
+    def behavior_features(self, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Sembol başına davranış özelliklerini ve korelasyon gömmesini hesaplar.
+
+        Args:
+            frames: Sembol -> saatlik veri (Close ve Volume sütunları)
+
+        Returns:
+            pd.DataFrame: Sembol indeksli özellik tablosu
+        """
+        close = pd.concat(
+            {symbol: df['Close' if 'Close' in df.columns else 'close'] for symbol, df in frames.items()},
+            axis=1
+        ).sort_index()
+        volume = pd.concat(
+            {symbol: df['Volume' if 'Volume' in df.columns else 'volume'] for symbol, df in frames.items()
+             if 'Volume' in df.columns or 'volume' in df.columns},
+            axis=1
+        ).reindex(columns=close.columns).sort_index()
+
+        returns = np.log(close).diff().iloc[1:]
+        volume_changes = np.log(volume.replace(0, np.nan)).diff().iloc[1:]
+
+        # Korelasyon: ortak saatlerde hizalanmış getiri paneli, eksik barlar sıfır getiri sayılır
+        panel = returns.fillna(0.0).to_numpy().T
+        corr = np.nan_to_num(np.corrcoef(panel)) if len(panel) > 1 else np.ones((1, 1))
+        n_symbols = len(close.columns)
+        avg_corr = (corr.sum(axis=1) - 1.0) / max(n_symbols - 1, 1)
+
+        features = pd.DataFrame({
+            "volatility": returns.std().to_numpy(),
+            "mean_return": returns.mean().to_numpy(),
+            "volume_volatility": volume_changes.std().to_numpy(),
+            "avg_correlation": avg_corr
+        }, index=close.columns).fillna(0.0)
+
+        # Korelasyon yapısının ilk bileşenleri (piyasa ve sektör faktörleri)
+        components = min(settings.CLUSTER_CORRELATION_COMPONENTS, n_symbols)
+        if components > 0 and n_symbols > 1:
+            eigenvalues, eigenvectors = np.linalg.eigh(corr)
+            order = np.argsort(eigenvalues)[::-1][:components]
+            loadings = eigenvectors[:, order] * np.sqrt(np.clip(eigenvalues[order], 0, None))
+            for i in range(loadings.shape[1]):
+                features[f"corr_pc{i + 1}"] = loadings[:, i]
+
+        return features
+
+    def fit(self, features: pd.DataFrame) -> Dict[str, int]:
+        """
+        Standartlaştırılmış özellikler üzerinde k-means ile küme atamalarını hesaplar
+
+        Returns:
+            Dict[str, int]: Sembol -> küme numarası
+        """
+        from sklearn.cluster import KMeans
+
+        n_symbols = len(features)
+        n_clusters = max(1, min(self.n_clusters, n_symbols // settings.CLUSTER_MIN_SIZE))
+        if n_clusters == 1:
+            return {symbol: 0 for symbol in features.index}
+
+        values = features.to_numpy(dtype=np.float64)
+        std = values.std(axis=0)
+        scaled = (values - values.mean(axis=0)) / np.where(std == 0, 1.0, std)
+
+        labels = KMeans(n_clusters=n_clusters, n_init=10, random_state=42).fit_predict(scaled)
+        return {symbol: int(label) for symbol, label in zip(features.index, labels)}
+
+    def recompute(self, db: Session, frames: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+        """
+        Küme atamalarını yeniden hesaplar ve tabloyu tek işlemde değiştirir.
+
+        Args:
+            db: Veritabanı oturumu
+            frames: Sembol -> saatlik veri
+
+        Returns:
+            Dict: Küme numarası -> semboller ve sembol sayısı
+        """
+        frames = {symbol: df for symbol, df in frames.items() if df is not None and len(df) > 1}
+        if not frames:
+            return {"symbols": 0, "clusters": {}}
+
+        started = time.perf_counter()
+        features = self.behavior_features(frames)
+        labels = self.fit(features)
+        computed_at = datetime.now()
+
+        rows = [
+            {
+                "symbol": symbol,
+                "cluster_id": labels[symbol],
+                "features": {name: round(float(value), 6) for name, value in features.loc[symbol].items()},
+                "computed_at": computed_at
+            }
+            for symbol in features.index
+        ]
+
+        db.execute(delete(SymbolCluster))
+        db.execute(insert(SymbolCluster), rows)
+        db.commit()
+        self._assignments = None
+
+        clusters: Dict[int, List[str]] = {}
+        for symbol, cluster_id in labels.items():
+            clusters.setdefault(cluster_id, []).append(symbol)
+
+        self.logger.info(f"{len(labels)} sembol {len(clusters)} kümeye ayrıldı - {time.perf_counter() - started:.2f} saniye")
+        return {"symbols": len(labels), "clusters": {str(k): sorted(v) for k, v in sorted(clusters.items())}}
+
+    def _load(self, db: Session) -> Dict[str, SymbolCluster]:
+        if self._assignments is None or time.time() - self._loaded_at > settings.CLUSTER_CACHE_SECONDS:
+            records = db.query(SymbolCluster).all()
+            for record in records:
+                db.expunge(record)
+            self._assignments = {record.symbol: record for record in records}
+            self._loaded_at = time.time()
+        return self._assignments
+
+    def get_assignment(self, db: Session, symbol: str) -> Optional[SymbolCluster]:
+        """
+        Sembolün küme atamasını önbellekten döndürür (atama yoksa None)
+        """
+        return self._load(db).get(symbol)
+
+    def get_members(self, db: Session, cluster_id: int) -> List[str]:
+        """
+        Kümedeki tüm sembolleri döndürür
+        """
+        return sorted(symbol for symbol, record in self._load(db).items() if record.cluster_id == cluster_id)
+
+    def get_clusters(self, db: Session) -> Dict[int, List[str]]:
+        """
+        Küme numarası -> küme üyeleri
+        """
+        clusters: Dict[int, List[str]] = {}
+        for symbol, record in sorted(self._load(db).items()):
+            clusters.setdefault(record.cluster_id, []).append(symbol)
+        return clusters
@@ -0,0 +1,300 @@
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.drift_reference import DriftReference
+from app.models.prediction_history import PredictionHistory
+from app.services.ensemble_service import ENSEMBLE_MODEL_NAME
+
+# Seviyesi sürekli değişen (durağan olmayan) sütunlar; dağılımları getiri üzerinden karşılaştırılır
+PRICE_LEVEL_PATTERNS = ['Open', 'High', 'Low', 'Close', 'SMA_', 'EMA_', 'BB_']
+
+# Oranlarda log(0) oluşmaması için alt sınır
+_EPSILON = 1e-4
+
+class DriftService:
+    """
+    Sembol bazında veri kayması (drift) izleme servisi.
+
+    Her eğitimde özelliklerin yüzdelik kutuları ve oranları referans olarak saklanır.
+    Gece tahmin işinde güncel veriler tüm semboller için tek bir vektörel hesapla
+    (PSI ve binlenmiş KS istatistikleri) referansla karşılaştırılır; dağılımı kaymayan,
+    fiyatı eğitim aralığında kalan ve gerçekleşen hatası kötüleşmeyen semboller
+    yeniden eğitilmez.
+    """
+
+    def __init__(self, bins: Optional[int] = None, recent_bars: Optional[int] = None):
+        """
+        Args:
+            bins: Özellik başına yüzdelik kutu sayısı
+            recent_bars: Karşılaştırmada kullanılacak son saatlik bar sayısı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.bins = bins or settings.DRIFT_BINS
+        self.recent_bars = recent_bars or settings.DRIFT_RECENT_BARS
+
+    def _drift_frame(self, df: pd.DataFrame, feature_columns: List[str]) -> np.ndarray:
+        """
+        Fiyat seviyesi sütunlarını yüzde değişime çevirir, diğer göstergeleri olduğu gibi bırakır
+        """
+        columns = []
+        for column in feature_columns:
+            values = pd.to_numeric(df[column], errors='coerce') if column in df.columns else pd.Series(np.nan, index=df.index)
+            if any(pattern in column for pattern in PRICE_LEVEL_PATTERNS):
+                values = values.pct_change()
+            columns.append(values.replace([np.inf, -np.inf], np.nan).to_numpy(dtype=np.float64))
+        return np.column_stack(columns) if columns else np.empty((len(df), 0))
+
+    def _price_column(self, df: pd.DataFrame) -> Optional[str]:
+        return 'Close' if 'Close' in df.columns else ('close' if 'close' in df.columns else None)
+
+    def _realized_errors(self, db: Session, since: Dict[str, datetime]) -> Dict[str, Dict[str, float]]:
+        """
+        Sembol bazında verilen zamandan sonra çözümlenen tahminlerin ortalama mutlak yüzde hatası
+        """
+        if not since:
+            return {}
+
+        abs_pct_error = func.abs(PredictionHistory.prediction_price - PredictionHistory.actual_price) / PredictionHistory.actual_price
+        earliest = min(since.values())
+        rows = db.execute(
+            select(PredictionHistory.symbol, PredictionHistory.resolved_at, abs_pct_error.label("error"))
+            .where(
+                PredictionHistory.symbol.in_(list(since)),
+                PredictionHistory.resolved_at >= earliest,
+                PredictionHistory.actual_price.isnot(None),
+                PredictionHistory.model_used != ENSEMBLE_MODEL_NAME
+            )
+        ).all()
+
+        errors: Dict[str, List[float]] = {}
+        for row in rows:
+            if row.resolved_at >= since[row.symbol] and row.error is not None:
+                errors.setdefault(row.symbol, []).append(float(row.error))
+
+        return {symbol: {"error": float(np.mean(values)), "count": len(values)} for symbol, values in errors.items()}
+
+    def build_reference(self, df: pd.DataFrame, feature_columns: List[str]) -> Dict[str, Any]:
+        """
+        Eğitim verisinden özellik başına yüzdelik kutu sınırlarını ve oranlarını hesaplar.
+
+        Args:
+            df: Eğitimde kullanılan DataFrame
+            feature_columns: Eğitimde kullanılan özellikler
+
+        Returns:
+            Dict: bin_edges, proportions, price_min, price_max, rows
+        """
+        values = self._drift_frame(df, feature_columns)
+        quantiles = np.linspace(0, 1, self.bins + 1)
+
+        edges = np.nanquantile(values, quantiles, axis=0).T if len(values) else np.zeros((len(feature_columns), self.bins + 1))
+        edges = np.nan_to_num(edges)
+        proportions = self._proportions(values[None, :, :], edges[None, :, :], np.zeros(len(values), dtype=int))[0]
+
+        price_column = self._price_column(df)
+        prices = df[price_column].to_numpy(dtype=np.float64) if price_column else np.array([])
+
+        return {
+            "feature_columns": list(feature_columns),
+            "bin_edges": edges.tolist(),
+            "proportions": proportions.tolist(),
+            "price_min": float(np.nanmin(prices)) if len(prices) else None,
+            "price_max": float(np.nanmax(prices)) if len(prices) else None,
+            "rows": int(len(df))
+        }
+
+    def _proportions(self, values: np.ndarray, edges: np.ndarray, symbol_index: np.ndarray) -> np.ndarray:
+        """
+        Tüm sembollerin satırlarını tek seferde kutulara dağıtır.
+
+        Args:
+            values: (1, N, F) veya birleştirilmiş satırlar (N, F) - ilk boyut yok sayılır
+            edges: (S, F, B+1) kutu sınırları
+            symbol_index: Her satırın ait olduğu sembol sırası (N,)
+
+        Returns:
+            np.ndarray: (S, F, B) kutu oranları
+        """
+        values = values.reshape(-1, edges.shape[1])
+        n_symbols, n_features, n_edges = edges.shape
+        n_bins = n_edges - 1
+
+        # Kutu sırası: iç sınırlardan kaçının aşıldığı
+        inner = edges[symbol_index][:, :, 1:-1]
+        bin_index = (values[:, :, None] >= inner).sum(axis=2)
+        valid = ~np.isnan(values)
+
+        counts = np.zeros((n_symbols, n_features, n_bins))
+        feature_index = np.broadcast_to(np.arange(n_features), values.shape)
+        np.add.at(
+            counts,
+            (np.broadcast_to(symbol_index[:, None], values.shape)[valid], feature_index[valid], bin_index[valid]),
+            1.0
+        )
+
+        totals = counts.sum(axis=2, keepdims=True)
+        return np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+
+    def save_reference(self, db: Session, symbol: str, df: pd.DataFrame, feature_columns: List[str]) -> DriftReference:
+        """
+        Eğitim sonrası sembolün drift referansını oluşturur veya günceller.
+
+        Args:
+            db: Veritabanı oturumu
+            symbol: Hisse senedi sembolü
+            df: Eğitimde kullanılan DataFrame
+            feature_columns: Eğitimde kullanılan özellikler
+
+        Returns:
+            DriftReference: Kaydedilen referans
+        """
+        now = datetime.now()
+        reference = self.build_reference(df, feature_columns)
+
+        # Eğitim anındaki hata seviyesi: son pencerede çözümlenen tahminlerin hatası
+        window_start = now - timedelta(days=settings.PREDICTION_ACCURACY_WINDOW_DAYS)
+        realized = self._realized_errors(db, {symbol: window_start}).get(symbol)
+
+        record = db.query(DriftReference).filter(DriftReference.symbol == symbol).first()
+        if record is None:
+            record = DriftReference(symbol=symbol)
+            db.add(record)
+
+        record.trained_at = now
+        record.feature_columns = reference["feature_columns"]
+        record.bin_edges = reference["bin_edges"]
+        record.proportions = reference["proportions"]
+        record.price_min = reference["price_min"]
+        record.price_max = reference["price_max"]
+        record.rows = reference["rows"]
+        record.reference_error = realized["error"] if realized else None
+
+        db.commit()
+        return record
+
+    def evaluate(self, db: Session, frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+        """
+        Güncel verileri referanslarla karşılaştırır ve yeniden eğitim gerekip gerekmediğine karar verir.
+
+        Args:
+            db: Veritabanı oturumu
+            frames: Sembol -> göstergeleri hesaplanmış güncel DataFrame
+
+        Returns:
+            Dict: Sembol -> {'drifted', 'reasons', 'psi', 'ks', 'out_of_range', 'error_ratio'}
+        """
+        if not frames:
+            return {}
+
+        references = {
+            record.symbol: record
+            for record in db.query(DriftReference).filter(DriftReference.symbol.in_(list(frames))).all()
+        }
+
+        results = {}
+        for symbol in frames:
+            if symbol not in references:
+                results[symbol] = {"drifted": True, "reasons": ["Drift referansı yok"]}
+
+        symbols = [s for s in frames if s in references and references[s].bin_edges]
+        if not symbols:
+            return results
+
+        # Özellik sayısı sembollere göre değişebilir; eksik özellikler NaN ile doldurulur
+        n_features = max(len(references[s].feature_columns) for s in symbols)
+        n_edges = self.bins + 1
+        edges = np.full((len(symbols), n_features, n_edges), np.inf)
+        reference_props = np.zeros((len(symbols), n_features, self.bins))
+        feature_mask = np.zeros((len(symbols), n_features), dtype=bool)
+
+        blocks, owners, out_of_range = [], [], np.zeros(len(symbols))
+        for i, symbol in enumerate(symbols):
+            record = references[symbol]
+            ref_edges = np.asarray(record.bin_edges, dtype=np.float64)
+            ref_props = np.asarray(record.proportions, dtype=np.float64)
+            if ref_edges.shape[1] != n_edges:
+                # Kutu sayısı değiştiyse referans geçersiz sayılır
+                results[symbol] = {"drifted": True, "reasons": ["Drift referansı güncel değil"]}
+                continue
+
+            df = frames[symbol]
+            missing = [column for column in record.feature_columns if column not in df.columns]
+            if missing:
+                results[symbol] = {"drifted": True, "reasons": [f"Özellik seti değişti ({', '.join(missing)})"]}
+                continue
+
+            f = ref_edges.shape[0]
+            edges[i, :f] = ref_edges
+            reference_props[i, :f] = ref_props
+            feature_mask[i, :f] = True
+
+            recent = self._drift_frame(df, record.feature_columns)[-self.recent_bars:]
+            block = np.full((len(recent), n_features), np.nan)
+            block[:, :f] = recent
+            blocks.append(block)
+            owners.append(np.full(len(recent), i))
+
+            price_column = self._price_column(df)
+            if price_column and record.price_min is not None and record.price_max is not None:
+                prices = df[price_column].to_numpy(dtype=np.float64)[-self.recent_bars:]
+                out_of_range[i] = np.mean((prices < record.price_min) | (prices > record.price_max)) if len(prices) else 0.0
+
+        if not blocks:
+            return results
+
+        current_props = self._proportions(np.vstack(blocks), edges, np.concatenate(owners))
+
+        # PSI ve binlenmiş KS, tüm semboller ve özellikler için tek seferde
+        current = np.clip(current_props, _EPSILON, None)
+        reference = np.clip(reference_props, _EPSILON, None)
+        psi = ((current - reference) * np.log(current / reference)).sum(axis=2)
+        ks = np.abs(np.cumsum(current_props, axis=2) - np.cumsum(reference_props, axis=2)).max(axis=2)
+        psi = np.where(feature_mask, psi, 0.0).max(axis=1)
+        ks = np.where(feature_mask, ks, 0.0).max(axis=1)
+
+        realized = self._realized_errors(db, {s: references[s].trained_at for s in symbols})
+        max_age = timedelta(days=settings.DRIFT_MAX_MODEL_AGE_DAYS)
+        now = datetime.now()
+
+        for i, symbol in enumerate(symbols):
+            if symbol in results:
+                continue
+            record = references[symbol]
+            reasons = []
+
+            if psi[i] > settings.DRIFT_PSI_THRESHOLD:
+                reasons.append(f"PSI={psi[i]:.3f}")
+            if ks[i] > settings.DRIFT_KS_THRESHOLD:
+                reasons.append(f"KS={ks[i]:.3f}")
+            if out_of_range[i] > settings.DRIFT_MAX_OUT_OF_RANGE:
+                reasons.append(f"Fiyat eğitim aralığı dışında (%{out_of_range[i] * 100:.0f})")
+
+            error_ratio = None
+            outcome = realized.get(symbol)
+            if outcome and record.reference_error:
+                error_ratio = outcome["error"] / record.reference_error
+                if outcome["count"] >= settings.DRIFT_MIN_OUTCOMES and error_ratio > settings.DRIFT_ERROR_RATIO:
+                    reasons.append(f"Hata kötüleşti (x{error_ratio:.2f})")
+
+            if now - record.trained_at > max_age:
+                reasons.append(f"Model {settings.DRIFT_MAX_MODEL_AGE_DAYS} günden eski")
+
+            results[symbol] = {
+                "drifted": bool(reasons),
+                "reasons": reasons,
+                "psi": round(float(psi[i]), 4),
+                "ks": round(float(ks[i]), 4),
+                "out_of_range": round(float(out_of_range[i]), 4),
+                "error_ratio": round(error_ratio, 4) if error_ratio is not None else None
+            }
+
+        drifted = sum(1 for r in results.values() if r["drifted"])
+        self.logger.info(f"Drift kontrolü: {len(results)} sembolden {drifted} tanesi yeniden eğitilecek")
+        return results
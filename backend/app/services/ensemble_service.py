@@ -0,0 +1,230 @@
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.model_weight import ModelWeight
+from app.models.prediction_history import PredictionHistory
+
+# Birleşik tahmin geçmişe bu adla yazılır; ağırlık hesabına katılmaz
+ENSEMBLE_MODEL_NAME = "ensemble"
+
+class EnsembleService:
+    """
+    Gerçekleşen tahmin hatalarına göre sembol bazında model ağırlıklarını yöneten servis.
+
+    Her model için mutlak yüzde hatanın üssel ağırlıklı ortalaması (EWMA) tutulur ve
+    yalnızca yeni çözümlenen tahminlerle artımlı olarak güncellenir. Ağırlıklar
+    exp(-(hata - en_iyi_hata) / sıcaklık) ile hesaplanıp normalize edilir; ağırlığı
+    eşik altına düşen derin modeller gece eğitiminde atlanır.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def update_from_outcomes(self, db: Session) -> int:
+        """
+        Son güncellemeden sonra çözümlenen tahminleri EWMA hatalarına ekler ve
+        etkilenen sembollerin ağırlıklarını yeniden hesaplar.
+
+        Args:
+            db: Veritabanı oturumu
+
+        Returns:
+            int: İşlenen çözümlenmiş tahmin sayısı
+        """
+        # Su seviyesi: en son işlenen çözümleme zamanı
+        watermark = db.execute(select(func.max(ModelWeight.last_resolved_at))).scalar()
+
+        query = (
+            select(
+                PredictionHistory.symbol,
+                PredictionHistory.model_used,
+                PredictionHistory.prediction_price,
+                PredictionHistory.actual_price,
+                PredictionHistory.resolved_at
+            )
+            .where(
+                PredictionHistory.resolved_at.isnot(None),
+                PredictionHistory.actual_price.isnot(None),
+                PredictionHistory.model_used != ENSEMBLE_MODEL_NAME
+            )
+            .order_by(PredictionHistory.resolved_at, PredictionHistory.prediction_date)
+        )
+        if watermark is not None:
+            query = query.where(PredictionHistory.resolved_at > watermark)
+
+        outcomes = db.execute(query).all()
+        if not outcomes:
+            return 0
+
+        symbols = {row.symbol for row in outcomes}
+        states = {
+            (weight.symbol, weight.model_name): weight
+            for weight in db.query(ModelWeight).filter(ModelWeight.symbol.in_(symbols)).all()
+        }
+
+        decay = settings.ENSEMBLE_DECAY
+        for row in outcomes:
+            if not row.actual_price:
+                continue
+            error = abs(row.prediction_price - row.actual_price) / abs(row.actual_price)
+
+            state = states.get((row.symbol, row.model_used))
+            if state is None:
+                state = ModelWeight(symbol=row.symbol, model_name=row.model_used, observations=0)
+                db.add(state)
+                states[(row.symbol, row.model_used)] = state
+
+            if state.ewma_error is None:
+                state.ewma_error = error
+            else:
+                state.ewma_error = decay * state.ewma_error + (1 - decay) * error
+            state.observations = (state.observations or 0) + 1
+            state.last_resolved_at = row.resolved_at
+
+        for symbol in symbols:
+            self._recompute_weights([state for (s, _), state in states.items() if s == symbol])
+
+        db.commit()
+        self.logger.info(f"{len(outcomes)} çözümlenmiş tahmin ile {len(symbols)} sembolün model ağırlıkları güncellendi")
+        return len(outcomes)
+
+    def _recompute_weights(self, states: List[ModelWeight]):
+        """
+        Bir sembolün model ağırlıklarını EWMA hatalarından yeniden hesaplar.
+        Yeterli gözlemi olmayan modellerin ağırlığı boş bırakılır.
+        """
+        rated = [s for s in states if s.ewma_error is not None and (s.observations or 0) >= settings.ENSEMBLE_MIN_OBSERVATIONS]
+        for state in states:
+            state.weight = None
+
+        if not rated:
+            return
+
+        best_error = min(s.ewma_error for s in rated)
+        temperature = settings.ENSEMBLE_TEMPERATURE
+        scores = [math.exp(-(s.ewma_error - best_error) / temperature) for s in rated]
+        total = sum(scores)
+        for state, score in zip(rated, scores):
+            state.weight = score / total
+
+    def get_weights(self, db: Session, symbol: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Sembolün model ağırlık durumlarını döndürür.
+
+        Returns:
+            Dict: Model adı -> {'weight', 'ewma_error', 'observations', 'last_trained_at'}
+        """
+        return {
+            state.model_name: {
+                "weight": state.weight,
+                "ewma_error": state.ewma_error,
+                "observations": state.observations or 0,
+                "last_trained_at": state.last_trained_at
+            }
+            for state in db.query(ModelWeight).filter(ModelWeight.symbol == symbol).all()
+        }
+
+    def active_models(self, db: Session, symbol: str, candidates: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Eğitilecek modelleri seçer. Ağırlığı ENSEMBLE_MIN_WEIGHT altına düşen modeller
+        atlanır; ancak ENSEMBLE_REEXPLORE_DAYS günde bir yeniden eğitilerek ağırlıklarını
+        geri kazanma şansı verilir.
+
+        Args:
+            db: Veritabanı oturumu
+            symbol: Hisse senedi sembolü
+            candidates: Aday model adları
+
+        Returns:
+            Tuple[List[str], List[str]]: Eğitilecek ve atlanacak modeller
+        """
+        if not settings.ENSEMBLE_PRUNING_ENABLED:
+            return list(candidates), []
+
+        states = self.get_weights(db, symbol)
+        reexplore_before = datetime.now() - timedelta(days=settings.ENSEMBLE_REEXPLORE_DAYS)
+
+        active, skipped = [], []
+        for model_name in candidates:
+            state = states.get(model_name)
+            if (state is None or state["weight"] is None or state["weight"] >= settings.ENSEMBLE_MIN_WEIGHT
+                    or state["last_trained_at"] is None or state["last_trained_at"] < reexplore_before):
+                active.append(model_name)
+            else:
+                skipped.append(model_name)
+
+        # En az bir model her zaman eğitilir
+        if not active and skipped:
+            best = max(skipped, key=lambda name: states[name]["weight"] or 0.0)
+            skipped.remove(best)
+            active.append(best)
+
+        return active, skipped
+
+    def mark_trained(self, db: Session, symbol: str, model_names: List[str]):
+        """
+        Modellerin son eğitim zamanını kaydeder (yeniden keşif aralığı için)
+        """
+        if not model_names:
+            return
+
+        now = datetime.now()
+        existing = {
+            state.model_name: state
+            for state in db.query(ModelWeight).filter(
+                ModelWeight.symbol == symbol, ModelWeight.model_name.in_(model_names)
+            ).all()
+        }
+        for model_name in model_names:
+            state = existing.get(model_name)
+            if state is None:
+                db.add(ModelWeight(symbol=symbol, model_name=model_name, observations=0, last_trained_at=now))
+            else:
+                state.last_trained_at = now
+        db.commit()
+
+    def combine(self, predictions: Dict[str, List[float]], states: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Model tahminlerini ağırlıklı olarak birleştirir.
+
+        Henüz yeterli geçmişi olmayan modellere, puanlanmış modellerin ortalama ağırlığı
+        verilir; hiç geçmiş yoksa tüm modeller eşit ağırlıklıdır.
+
+        Args:
+            predictions: Model adı -> tahmin edilen fiyatlar
+            states: get_weights çıktısı
+
+        Returns:
+            Dict: Birleşik tahminler, kullanılan ağırlıklar, ağırlıklı dağılım ve
+            ağırlığı en yüksek puanlanmış model; tahmin yoksa None
+        """
+        available = {name: values for name, values in predictions.items() if values}
+        if not available:
+            return None
+
+        rated = {name: states[name]["weight"] for name in available
+                 if name in states and states[name]["weight"] is not None}
+        prior = float(np.mean(list(rated.values()))) if rated else 1.0
+        raw = np.array([rated.get(name, prior) for name in available], dtype=float)
+        weights = raw / raw.sum() if raw.sum() > 0 else np.full(len(raw), 1.0 / len(raw))
+
+        horizon = min(len(values) for values in available.values())
+        matrix = np.array([values[:horizon] for values in available.values()], dtype=float)
+        combined = weights @ matrix
+
+        # Ağırlıklı dağılım: modellerin birleşik tahmin etrafındaki ağırlıklı standart sapması
+        dispersion = float(np.sqrt(weights @ (matrix[:, 0] - combined[0]) ** 2)) if len(available) > 1 else 0.0
+
+        return {
+            "predicted_values": combined.astype(float).tolist(),
+            "weights": {name: round(float(w), 6) for name, w in zip(available, weights)},
+            "dispersion": dispersion,
+            "leader": max(rated, key=rated.get) if rated else None
+        }
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import settings
+
+# Veri seti formatı değiştiğinde eski önbellek girdileri kullanılmasın diye artırılır
+CACHE_FORMAT_VERSION = 1
+
+class TrainingDataset:
+    """
+    Ölçeklenmiş eğitim pencereleri, tahmin penceresi ve ölçekleyici parametreleri.
+    Diziler diskteki .npy dosyalarına bellek eşlemeli (memmap) olarak bağlıdır.
+    """
+
+    def __init__(self, key: str, X: np.ndarray, y: np.ndarray, X_pred: np.ndarray, scaler_params: Dict[str, Any]):
+        self.key = key
+        self.X = X
+        self.y = y
+        self.X_pred = X_pred
+        self.scaler_params = scaler_params
+        self._scalers = None
+
+    @property
+    def feature_columns(self) -> List[str]:
+        return self.scaler_params["feature_columns"]
+
+    @property
+    def sequence_length(self) -> int:
+        return self.scaler_params["sequence_length"]
+
+    def _build_scalers(self):
+        from sklearn.preprocessing import MinMaxScaler
+
+        feature_range = tuple(self.scaler_params["feature_range"])
+        scaler_X = MinMaxScaler(feature_range=feature_range)
+        scaler_X.fit(np.array([self.scaler_params["x_min"], self.scaler_params["x_max"]]))
+        scaler_y = MinMaxScaler(feature_range=feature_range)
+        scaler_y.fit(np.array([[self.scaler_params["y_min"]], [self.scaler_params["y_max"]]]))
+        self._scalers = (scaler_X, scaler_y)
+
+    @property
+    def scaler_X(self):
+        if self._scalers is None:
+            self._build_scalers()
+        return self._scalers[0]
+
+    @property
+    def scaler_y(self):
+        if self._scalers is None:
+            self._build_scalers()
+        return self._scalers[1]
+
+class FeatureCache:
+    """
+    Eğitim veri setleri için içerik adresli önbellek.
+
+    Anahtar; ham bar penceresi, özellik listesi, pencere uzunluğu ve ölçekleyici
+    ayarlarının sha256 özetidir. Aynı veri sürümü için veri seti bir kez oluşturulur,
+    float32 .npy dosyaları olarak yazılır ve tüm model tipleri ile worker süreçleri
+    tarafından bellek eşlemeli olarak okunur.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_entries: Optional[int] = None):
+        """
+        Args:
+            cache_dir: Önbellek dosyalarının yazılacağı dizin
+            max_memory_entries: Süreç içinde açık tutulacak en fazla veri seti sayısı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir or settings.FEATURE_CACHE_DIR
+        self.max_memory_entries = max_memory_entries or settings.FEATURE_CACHE_MEMORY_ENTRIES
+        self._memory: "OrderedDict[str, TrainingDataset]" = OrderedDict()
+
+        self.metrics = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'builds': 0
+        }
+
+    def dataset_key(self, df: pd.DataFrame, feature_columns: List[str], target_column: str,
+                    sequence_length: int, scaler_config: Dict[str, Any]) -> str:
+        """
+        Veri seti girdilerinin sha256 özetini hesaplar
+        """
+        columns = list(dict.fromkeys(feature_columns + [target_column]))
+        digest = hashlib.sha256()
+        digest.update(json.dumps({
+            "version": CACHE_FORMAT_VERSION,
+            "features": feature_columns,
+            "target": target_column,
+            "sequence_length": sequence_length,
+            "scaler": scaler_config
+        }, sort_keys=True).encode())
+        digest.update(pd.util.hash_pandas_object(df.index, index=False).to_numpy().tobytes())
+        digest.update(np.ascontiguousarray(df[columns].to_numpy(dtype=np.float64)).tobytes())
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _remember(self, dataset: TrainingDataset):
+        self._memory[dataset.key] = dataset
+        self._memory.move_to_end(dataset.key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[TrainingDataset]:
+        entry_dir = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry_dir, "scaler.json")) as f:
+                scaler_params = json.load(f)
+            X = np.load(os.path.join(entry_dir, "X.npy"), mmap_mode='r')
+            y = np.load(os.path.join(entry_dir, "y.npy"), mmap_mode='r')
+            X_pred = np.load(os.path.join(entry_dir, "X_pred.npy"), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        return TrainingDataset(key, X, y, X_pred, scaler_params)
+
+    def _build(self, df: pd.DataFrame, feature_columns: List[str], target_column: str,
+               sequence_length: int, scaler_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ölçekleyicileri eğitim satırlarına göre hesaplar ve pencereleri vektörel olarak oluşturur
+        """
+        holdout = scaler_config["holdout"]
+        low, high = scaler_config["feature_range"]
+
+        features = df[feature_columns].to_numpy(dtype=np.float64)
+        target = df[target_column].to_numpy(dtype=np.float64)
+        train_features = features[:-holdout] if holdout else features
+        train_target = target[:-holdout] if holdout else target
+
+        x_min, x_max = np.nanmin(train_features, axis=0), np.nanmax(train_features, axis=0)
+        y_min, y_max = float(np.nanmin(train_target)), float(np.nanmax(train_target))
+        x_span = np.where(x_max - x_min == 0, 1.0, x_max - x_min)
+        y_span = (y_max - y_min) or 1.0
+
+        scaled = ((features - x_min) / x_span * (high - low) + low).astype(np.float32)
+        scaled_target = ((train_target - y_min) / y_span * (high - low) + low).astype(np.float32)
+
+        # t, t+1, ..., t+sequence_length-1 penceresi için hedef t+sequence_length
+        n_train = len(train_features)
+        windows = sliding_window_view(scaled[:n_train], (sequence_length, len(feature_columns)))[:, 0]
+        X = np.ascontiguousarray(windows[:n_train - sequence_length])
+        y = scaled_target[sequence_length:]
+
+        # Tahmin penceresi: tüm verinin son sequence_length satırı
+        recent = scaled[-sequence_length:]
+        if len(recent) < sequence_length:
+            padding = np.repeat(recent[:1], sequence_length - len(recent), axis=0)
+            recent = np.vstack([padding, recent])
+        X_pred = recent.reshape(1, sequence_length, len(feature_columns))
+
+        scaler_params = {
+            "feature_columns": feature_columns,
+            "target_column": target_column,
+            "sequence_length": sequence_length,
+            "feature_range": [low, high],
+            "x_min": x_min.tolist(),
+            "x_max": x_max.tolist(),
+            "y_min": y_min,
+            "y_max": y_max,
+            "rows": len(df),
+            "created_at": time.time()
+        }
+        return {"X": X, "y": y, "X_pred": X_pred, "scaler": scaler_params}
+
+    def _write(self, key: str, arrays: Dict[str, Any]):
+        """
+        Girdiyi önce geçici dizine yazar, sonra atomik olarak yerine taşır.
+        Aynı anda yazan süreçlerden yalnızca biri kazanır; diğerinin kopyası silinir.
+        """
+        entry_dir = self._entry_dir(key)
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{key[:8]}-", dir=os.path.dirname(entry_dir))
+        try:
+            for name in ("X", "y", "X_pred"):
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), arrays[name])
+            with open(os.path.join(tmp_dir, "scaler.json"), "w") as f:
+                json.dump(arrays["scaler"], f)
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Başka bir süreç aynı girdiyi önce yazdı
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def get_or_build(self, df: pd.DataFrame, feature_columns: List[str], target_column: str,
+                     sequence_length: int, holdout: int = 24, feature_range=(0.0, 1.0)) -> TrainingDataset:
+        """
+        Veri setini önbellekten döndürür; yoksa oluşturup önbelleğe yazar.
+
+        Args:
+            df: Göstergeleri hesaplanmış saatlik veri
+            feature_columns: Kullanılacak özellikler
+            target_column: Hedef sütun
+            sequence_length: Pencere uzunluğu
+            holdout: Eğitimden ayrılan son satır sayısı (ölçekleyiciler bu satırlar hariç hesaplanır)
+            feature_range: MinMax ölçekleme aralığı
+
+        Returns:
+            TrainingDataset: Ölçeklenmiş pencereler ve ölçekleyiciler
+        """
+        scaler_config = {"type": "minmax", "feature_range": list(feature_range), "holdout": holdout}
+        key = self.dataset_key(df, feature_columns, target_column, sequence_length, scaler_config)
+
+        if key in self._memory:
+            self.metrics['memory_hits'] += 1
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        dataset = self._load(key) if settings.FEATURE_CACHE_ENABLED else None
+        if dataset is not None:
+            self.metrics['disk_hits'] += 1
+        else:
+            started = time.perf_counter()
+            arrays = self._build(df, feature_columns, target_column, sequence_length, scaler_config)
+            self.metrics['builds'] += 1
+
+            if settings.FEATURE_CACHE_ENABLED:
+                self._write(key, arrays)
+                dataset = self._load(key)
+
+            if dataset is None:
+                dataset = TrainingDataset(key, arrays["X"], arrays["y"], arrays["X_pred"], arrays["scaler"])
+
+            self.logger.info(f"Veri seti oluşturuldu ({key[:12]}, {dataset.X.shape}) - {time.perf_counter() - started:.3f} saniye")
+
+        self._remember(dataset)
+        return dataset
+
+    def prune(self, max_age_days: Optional[int] = None) -> int:
+        """
+        Belirtilen günden eski önbellek girdilerini siler
+
+        Returns:
+            int: Silinen girdi sayısı
+        """
+        max_age_days = max_age_days or settings.FEATURE_CACHE_TTL_DAYS
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        for prefix in os.listdir(self.cache_dir):
+            prefix_dir = os.path.join(self.cache_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for entry in os.listdir(prefix_dir):
+                entry_dir = os.path.join(prefix_dir, entry)
+                try:
+                    if os.path.getmtime(entry_dir) < cutoff:
+                        shutil.rmtree(entry_dir, ignore_errors=True)
+                        removed += 1
+                except OSError:
+                    continue
+
+        if removed:
+            self.logger.info(f"Özellik önbelleğinden {removed} eski girdi silindi")
+        return removed
@@ -0,0 +1,257 @@
+import logging
+import time
+import traceback
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.feature_set import FeatureSet
+from app.models.prediction_job import ITEM_STATUS_RUNNING, ITEM_STATUS_DONE, ITEM_STATUS_FAILED
+
+# Budamada en az bir fiyat sütunu her zaman tutulur
+PRICE_COLUMNS = ['Close', 'close', 'Open', 'High', 'Low']
+
+class FeatureImportanceService:
+    """
+    Özelliklerin model hatasına katkısını permütasyon önemiyle ölçen ve üretim
+    özellik setini budayan servis.
+
+    Her sembol için kısa bir model eğitilir; doğrulama pencerelerinde her özellik
+    (ve tekrar) için karıştırılmış kopyalar tek bir diziye yığılıp tek bir toplu
+    tahmin çağrısıyla değerlendirilir. Semboller üzerinden ortalama önemi eşiğin
+    altında kalan özellikler budanır ve sonuç sürümlü olarak `feature_sets`
+    tablosuna yazılır.
+    """
+
+    def __init__(self, prediction_service=None):
+        """
+        Args:
+            prediction_service: Veri hazırlama ve model eğitimi için tahmin servisi
+        """
+        self.logger = logging.getLogger(__name__)
+        self.prediction_service = prediction_service
+        self._active: Optional[Dict[str, Any]] = None
+        self._loaded_at = 0.0
+
+    def load_active(self, db: Session) -> Optional[Dict[str, Any]]:
+        """
+        En son özellik seti sürümünü önbellekten döndürür (FEATURE_SET_CACHE_SECONDS süreyle)
+
+        Returns:
+            Dict: version, columns ve analiz edilen tüm özellikler (sürüm yoksa None)
+        """
+        if time.time() - self._loaded_at > settings.FEATURE_SET_CACHE_SECONDS:
+            record = db.query(FeatureSet).order_by(FeatureSet.version.desc()).first()
+            self._active = None if record is None else {
+                "version": record.version,
+                "columns": set(record.columns or []),
+                "analyzed": set(record.columns or []) | set(record.dropped or [])
+            }
+            self._loaded_at = time.time()
+        return self._active
+
+    @property
+    def active_version(self) -> Optional[int]:
+        """
+        Üretimde uygulanan özellik seti sürümü (budama kapalıysa veya sürüm yoksa None)
+        """
+        if not settings.FEATURE_PRUNING_ENABLED or self._active is None:
+            return None
+        return self._active["version"]
+
+    def apply(self, candidates: List[str]) -> List[str]:
+        """
+        Aday özelliklerden budananları çıkarır. Analizde hiç görülmemiş (sonradan eklenmiş)
+        özellikler korunur; budama sonrası 3'ten az özellik kalırsa adaylar aynen döner.
+        """
+        if self.active_version is None:
+            return candidates
+
+        kept = [c for c in candidates if c in self._active["columns"] or c not in self._active["analyzed"]]
+        return kept if len(kept) >= 3 else candidates
+
+    def permutation_importance(self, model, X: np.ndarray, y: np.ndarray, repeats: Optional[int] = None,
+                               seed: Optional[int] = None) -> Tuple[np.ndarray, float]:
+        """
+        Permütasyon önemini tek bir toplu tahmin çağrısıyla hesaplar.
+
+        Orijinal pencereler ve her (tekrar, özellik) çifti için o özelliğin örnekler
+        arasında karıştırıldığı kopyalar tek bir diziye yığılır; hata artışı bloklar
+        halinde okunur.
+
+        Args:
+            model: Eğitilmiş model
+            X: (örnek, pencere, özellik) doğrulama pencereleri
+            y: Hedef değerler
+            repeats: Özellik başına karıştırma tekrarı
+            seed: Rastgelelik tohumu
+
+        Returns:
+            Tuple[np.ndarray, float]: Özellik başına göreli MSE artışı ve karıştırmasız MSE
+        """
+        repeats = repeats or settings.FEATURE_IMPORTANCE_REPEATS
+        rng = np.random.default_rng(settings.TUNING_SEED if seed is None else seed)
+        n_samples, _, n_features = X.shape
+
+        stacked = np.repeat(X[None], 1 + repeats * n_features, axis=0)
+        for r in range(repeats):
+            order = rng.permutation(n_samples)
+            for f in range(n_features):
+                stacked[1 + r * n_features + f, :, :, f] = X[order, :, f]
+
+        predictions = model.predict(
+            stacked.reshape(-1, *X.shape[1:]),
+            batch_size=settings.FEATURE_IMPORTANCE_BATCH_SIZE,
+            verbose=0
+        ).reshape(len(stacked), n_samples, -1)
+
+        errors = ((predictions - y.reshape(1, n_samples, -1)) ** 2).mean(axis=(1, 2))
+        baseline = float(errors[0])
+        increase = (errors[1:].reshape(repeats, n_features) - baseline) / max(baseline, 1e-12)
+        return increase.mean(axis=0), baseline
+
+    def _score_symbol(self, db: Session, symbol: str, days: int) -> Optional[Tuple[List[str], np.ndarray, float]]:
+        """
+        Sembol için budanmamış özelliklerle kısa bir model eğitir ve permütasyon önemini döndürür
+        """
+        service = self.prediction_service
+        df = service.fetch_and_prepare_dataframe(symbol, days=days)
+        if df.empty:
+            return None
+
+        feature_columns = service.select_best_features(df, pruned=False)
+        if len(feature_columns) < 3:
+            return None
+
+        model_type = settings.FEATURE_IMPORTANCE_MODEL_TYPE
+        config = service.tuning_service.resolve(db, symbol, model_type)
+        target_column = 'Close' if 'Close' in df.columns else 'close'
+        dataset = service.feature_cache.get_or_build(df, feature_columns, target_column, config["sequence_length"], holdout=24)
+        if len(dataset.X) < 20:
+            return None
+
+        train_size = int(0.8 * len(dataset.X))
+        X_train, X_val = dataset.X[:train_size], np.asarray(dataset.X[train_size:])
+        y_train, y_val = dataset.y[:train_size], np.asarray(dataset.y[train_size:])
+        input_shape = (X_train.shape[1], X_train.shape[2])
+
+        model = service.acquire_model(model_type, input_shape, learning_rate=config["learning_rate"])
+        try:
+            service.train_model(
+                f"önem-{symbol}",
+                X_train, y_train,
+                X_val, y_val,
+                model_type=model_type,
+                epochs=settings.FEATURE_IMPORTANCE_EPOCHS,
+                batch_size=config["batch_size"],
+                patience=5,
+                model=model
+            )
+            samples = settings.FEATURE_IMPORTANCE_MAX_SAMPLES
+            importances, baseline = self.permutation_importance(model, X_val[-samples:], y_val[-samples:])
+        finally:
+            service.release_model(model_type, input_shape, model)
+
+        return feature_columns, importances, baseline
+
+    def prune(self, importances: Dict[str, float]) -> Tuple[List[str], List[str]]:
+        """
+        Budama politikası: ortalama önemi FEATURE_PRUNE_MIN_IMPORTANCE altındaki özellikler
+        çıkarılır; en az FEATURE_MIN_COUNT özellik ve bir fiyat sütunu her zaman tutulur.
+
+        Returns:
+            Tuple[List[str], List[str]]: Önem sırasına göre tutulan ve budanan özellikler
+        """
+        ranked = sorted(importances, key=importances.get, reverse=True)
+        kept = [f for f in ranked if importances[f] >= settings.FEATURE_PRUNE_MIN_IMPORTANCE]
+        if len(kept) < settings.FEATURE_MIN_COUNT:
+            kept = ranked[:settings.FEATURE_MIN_COUNT]
+
+        if not any(f in PRICE_COLUMNS for f in kept):
+            price = next((f for f in ranked if f in PRICE_COLUMNS), None)
+            if price:
+                kept.append(price)
+
+        dropped = [f for f in ranked if f not in kept]
+        return kept, dropped
+
+    def analyze(self, db: Session, symbols: List[str], days: int = 45,
+                progress_callback: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """
+        Semboller üzerinde permütasyon önemini hesaplar, budama politikasını uygular ve
+        yeni özellik seti sürümünü kaydeder.
+
+        Args:
+            db: Veritabanı oturumu
+            symbols: Analiz edilecek semboller (en fazla FEATURE_IMPORTANCE_MAX_SYMBOLS)
+            days: Kaç günlük saatlik veri kullanılacağı
+            progress_callback: Her sembolün durumu değiştiğinde (sembol, durum) ile çağrılır
+
+        Returns:
+            Dict: Sürüm, tutulan/budanan özellikler, özellik önemleri ve girdi genişliği
+        """
+        def report(symbol: str, status: str):
+            if progress_callback:
+                progress_callback(symbol, status)
+
+        started = time.perf_counter()
+        scores: Dict[str, List[float]] = {}
+        baselines = []
+        scored = 0
+
+        for symbol in symbols[:settings.FEATURE_IMPORTANCE_MAX_SYMBOLS]:
+            report(symbol, ITEM_STATUS_RUNNING)
+            try:
+                result = self._score_symbol(db, symbol, days)
+            except Exception as e:
+                self.logger.error(f"{symbol} özellik önemi hatası: {str(e)}")
+                self.logger.debug(traceback.format_exc())
+                result = None
+
+            if result is None:
+                report(symbol, ITEM_STATUS_FAILED)
+                continue
+
+            feature_columns, importances, baseline = result
+            for column, value in zip(feature_columns, importances):
+                scores.setdefault(column, []).append(float(value))
+            baselines.append(baseline)
+            scored += 1
+            report(symbol, ITEM_STATUS_DONE)
+
+        if not scored:
+            return {"success": False, "message": "Hiçbir sembol için önem hesaplanamadı"}
+
+        importances = {column: round(float(np.mean(values)), 6) for column, values in scores.items()}
+        kept, dropped = self.prune(importances)
+
+        version = (db.query(func.max(FeatureSet.version)).scalar() or 0) + 1
+        db.add(FeatureSet(
+            version=version,
+            columns=kept,
+            dropped=dropped,
+            importances=importances,
+            symbols=scored,
+            baseline_loss=float(np.mean(baselines)),
+            created_at=datetime.now()
+        ))
+        db.commit()
+        self._loaded_at = 0.0
+
+        self.logger.info(
+            f"Özellik seti v{version}: {len(importances)} özellikten {len(kept)} tutuldu, {len(dropped)} budandı "
+            f"({scored} sembol, {time.perf_counter() - started:.1f} saniye)"
+        )
+        return {
+            "success": True,
+            "version": version,
+            "columns": kept,
+            "dropped": dropped,
+            "importances": importances,
+            "symbols": scored,
+            "input_width": {"before": len(importances), "after": len(kept)}
+        }
@@ -0,0 +1,259 @@
+import logging
+import traceback
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.prediction_job import (
+    PredictionJob,
+    JOB_STATUS_PENDING,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_COMPLETED,
+    JOB_STATUS_FAILED,
+    ITEM_STATUS_PENDING,
+    ITEM_STATUS_DONE,
+    ITEM_STATUS_FAILED,
+    ITEM_STATUS_SKIPPED,
+)
+
+class JobService:
+    """
+    Veritabanı tabanlı iş kuyruğunu yöneten servis.
+
+    İşler HTTP isteği içinde çalıştırılmaz; kuyruğa eklenir ve ayrı worker
+    süreçleri tarafından alınarak çalıştırılır.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def submit_job(self, db: Session, job_type: str, params: Optional[Dict[str, Any]] = None) -> PredictionJob:
+        """
+        Yeni bir işi kuyruğa ekler. Aynı parametrelerle bekleyen veya çalışan bir iş varsa
+        yenisi oluşturulmaz, mevcut iş döndürülür.
+
+        Args:
+            db: Veritabanı oturumu
+            job_type: İş tipi
+            params: İş parametreleri
+
+        Returns:
+            PredictionJob: Kuyruğa eklenen (veya zaten kuyrukta olan) iş
+        """
+        params = params or {}
+
+        existing_job = self.find_active_job(db, job_type, params)
+        if existing_job:
+            self.logger.info(f"Aynı parametrelerle aktif iş bulundu, yeni iş oluşturulmadı (iş #{existing_job.id})")
+            return existing_job
+
+        symbols = params.get("symbols") or []
+        job = PredictionJob(
+            job_type=job_type,
+            status=JOB_STATUS_PENDING,
+            params=params,
+            progress={symbol: ITEM_STATUS_PENDING for symbol in symbols},
+            total_items=len(symbols),
+            completed_items=0,
+            failed_items=0,
+            attempts=0,
+            created_at=datetime.now()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self.logger.info(f"İş kuyruğa eklendi: #{job.id} ({job_type}, {len(symbols)} sembol)")
+        return job
+
+    def find_active_job(self, db: Session, job_type: str, params: Dict[str, Any]) -> Optional[PredictionJob]:
+        """
+        Aynı tip ve parametrelerle bekleyen veya çalışan işi bulur.
+        """
+        active_jobs = db.query(PredictionJob).filter(
+            PredictionJob.job_type == job_type,
+            PredictionJob.status.in_([JOB_STATUS_PENDING, JOB_STATUS_RUNNING])
+        ).all()
+
+        for job in active_jobs:
+            if (job.params or {}) == params:
+                return job
+        return None
+
+    def get_job(self, db: Session, job_id: int) -> Optional[PredictionJob]:
+        """
+        ID'ye göre iş getirir
+        """
+        return db.query(PredictionJob).filter(PredictionJob.id == job_id).first()
+
+    def list_jobs(self, db: Session, status: Optional[str] = None, limit: int = 20) -> List[PredictionJob]:
+        """
+        Son işleri (isteğe bağlı olarak duruma göre filtrelenmiş) getirir
+        """
+        query = db.query(PredictionJob)
+        if status:
+            query = query.filter(PredictionJob.status == status)
+        return query.order_by(PredictionJob.id.desc()).limit(limit).all()
+
+    def claim_next_job(self, db: Session, worker_id: str) -> Optional[PredictionJob]:
+        """
+        Kuyruktaki en eski bekleyen işi bu worker için ayırır.
+
+        PostgreSQL'de satır kilidi (FOR UPDATE SKIP LOCKED) kullanılır; SQLite'ta
+        durum koşullu UPDATE ile aynı işin iki worker tarafından alınması engellenir.
+
+        Args:
+            db: Veritabanı oturumu
+            worker_id: İşi alan worker'ın kimliği
+
+        Returns:
+            Optional[PredictionJob]: Alınan iş veya kuyruk boşsa None
+        """
+        query = db.query(PredictionJob.id).filter(
+            PredictionJob.status == JOB_STATUS_PENDING
+        ).order_by(PredictionJob.created_at, PredictionJob.id)
+
+        if db.bind.dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+
+        candidate = query.first()
+        if not candidate:
+            db.rollback()
+            return None
+
+        now = datetime.now()
+        updated = db.query(PredictionJob).filter(
+            PredictionJob.id == candidate.id,
+            PredictionJob.status == JOB_STATUS_PENDING
+        ).update({
+            PredictionJob.status: JOB_STATUS_RUNNING,
+            PredictionJob.worker_id: worker_id,
+            PredictionJob.started_at: now,
+            PredictionJob.heartbeat_at: now,
+            PredictionJob.attempts: PredictionJob.attempts + 1
+        }, synchronize_session=False)
+        db.commit()
+
+        if updated != 1:
+            # Başka bir worker işi bizden önce aldı
+            return None
+
+        job = self.get_job(db, candidate.id)
+        self.logger.info(f"İş #{job.id} worker {worker_id} tarafından alındı")
+        return job
+
+    def set_items(self, db: Session, job_id: int, symbols: List[str]) -> None:
+        """
+        İşin kapsadığı sembolleri belirler (semboller iş çalışırken belirleniyorsa kullanılır)
+        """
+        job = self.get_job(db, job_id)
+        if not job:
+            return
+
+        progress = dict(job.progress or {})
+        for symbol in symbols:
+            progress.setdefault(symbol, ITEM_STATUS_PENDING)
+
+        job.progress = progress
+        job.total_items = len(progress)
+        job.heartbeat_at = datetime.now()
+        db.commit()
+
+    def update_progress(self, db: Session, job_id: int, symbol: str, item_status: str) -> None:
+        """
+        Tek bir sembolün ilerleme durumunu günceller ve iş sayaçlarını yeniden hesaplar.
+        Her çağrı aynı zamanda worker'ın canlı olduğunu gösteren heartbeat olarak da kullanılır.
+
+        Args:
+            db: Veritabanı oturumu
+            job_id: İş ID'si
+            symbol: Hisse sembolü
+            item_status: Sembolün yeni durumu
+        """
+        try:
+            job = self.get_job(db, job_id)
+            if not job:
+                return
+
+            # JSON sütunundaki değişikliğin algılanması için yeni sözlük atanır
+            progress = dict(job.progress or {})
+            progress[symbol] = item_status
+
+            job.progress = progress
+            job.total_items = len(progress)
+            job.completed_items = sum(1 for s in progress.values() if s in (ITEM_STATUS_DONE, ITEM_STATUS_SKIPPED))
+            job.failed_items = sum(1 for s in progress.values() if s == ITEM_STATUS_FAILED)
+            job.heartbeat_at = datetime.now()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"İş #{job_id} ilerleme güncelleme hatası: {str(e)}")
+
+    def complete_job(self, db: Session, job_id: int, result: Optional[Dict[str, Any]] = None) -> None:
+        """
+        İşi başarıyla tamamlandı olarak işaretler
+        """
+        job = self.get_job(db, job_id)
+        if not job:
+            return
+
+        job.status = JOB_STATUS_COMPLETED
+        job.result = result or {}
+        job.finished_at = datetime.now()
+        job.heartbeat_at = job.finished_at
+        db.commit()
+        self.logger.info(f"İş #{job_id} tamamlandı")
+
+    def fail_job(self, db: Session, job_id: int, error: str) -> None:
+        """
+        İşi başarısız olarak işaretler
+        """
+        db.rollback()
+        job = self.get_job(db, job_id)
+        if not job:
+            return
+
+        job.status = JOB_STATUS_FAILED
+        job.error = error
+        job.finished_at = datetime.now()
+        db.commit()
+        self.logger.error(f"İş #{job_id} başarısız: {error}")
+
+    def requeue_stale_jobs(self, db: Session, stale_after_seconds: Optional[int] = None) -> int:
+        """
+        Worker'ı çökmüş (uzun süredir heartbeat göndermeyen) işleri yeniden kuyruğa alır.
+        Deneme sayısı sınırı aşılan işler başarısız olarak işaretlenir.
+
+        Returns:
+            int: Yeniden kuyruğa alınan iş sayısı
+        """
+        stale_after_seconds = stale_after_seconds or settings.JOB_STALE_TIMEOUT_SECONDS
+        threshold = datetime.now() - timedelta(seconds=stale_after_seconds)
+
+        try:
+            stale_jobs = db.query(PredictionJob).filter(
+                PredictionJob.status == JOB_STATUS_RUNNING,
+                PredictionJob.heartbeat_at < threshold
+            ).all()
+
+            requeued = 0
+            for job in stale_jobs:
+                if (job.attempts or 0) >= settings.JOB_MAX_ATTEMPTS:
+                    job.status = JOB_STATUS_FAILED
+                    job.error = "Worker yanıt vermedi, deneme sınırı aşıldı"
+                    job.finished_at = datetime.now()
+                else:
+                    job.status = JOB_STATUS_PENDING
+                    job.worker_id = None
+                    requeued += 1
+
+            db.commit()
+            if stale_jobs:
+                self.logger.warning(f"{len(stale_jobs)} yanıtsız iş bulundu, {requeued} tanesi yeniden kuyruğa alındı")
+            return requeued
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"Yanıtsız işleri kontrol ederken hata: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            return 0
@@ -0,0 +1,377 @@
+import logging
+import os
+import socket
+import time
+import traceback
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.prediction_job import (
+    PredictionJob, JOB_TYPE_PREDICT, JOB_TYPE_REFRESH_MARKET, JOB_TYPE_BACKTEST, JOB_TYPE_CLUSTER, JOB_TYPE_TUNE,
+    JOB_TYPE_FEATURES, JOB_TYPE_ARCHIVE,
+    ITEM_STATUS_RUNNING, ITEM_STATUS_DONE, ITEM_STATUS_FAILED
+)
+from app.models.base_stock import BaseStock
+from app.models.prediction_stock import PredictionStock
+from app.services.job_service import JobService
+from app.services.base_stock_service import BaseStockService
+from app.services.prediction_history_service import PredictionHistoryService
+from app.services.ensemble_service import EnsembleService
+from app.services.snapshot_service import SnapshotService
+from app.services.prediction_archive_service import PredictionArchiveService
+
+class JobWorker:
+    """
+    Kuyruktaki tahmin ve piyasa yenileme işlerini çalıştıran worker.
+
+    API sürecinden bağımsız olarak (örn. `python worker.py`) çalıştırılır;
+    birden fazla worker aynı kuyruğu güvenle paylaşabilir.
+    """
+
+    def __init__(self, poll_interval: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.job_service = JobService()
+        self.base_service = BaseStockService()
+        self.history_service = PredictionHistoryService()
+        self.ensemble_service = EnsembleService()
+        self.snapshot_service = SnapshotService()
+        self.archive_service = PredictionArchiveService()
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL_SECONDS
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.is_running = False
+
+        # Tahmin servisi ilk tahmin işinde oluşturulur
+        self._prediction_service = None
+
+    @property
+    def prediction_service(self):
+        if self._prediction_service is None:
+            from app.services.prediction_service import PredictionService
+            self._prediction_service = PredictionService()
+        return self._prediction_service
+
+    def run_forever(self):
+        """
+        Worker döngüsü: kuyrukta iş varsa çalıştırır, yoksa bekler.
+        """
+        self.logger.info(f"Worker başlatıldı: {self.worker_id}")
+        self.is_running = True
+        self.ensure_snapshots()
+        last_stale_check = 0.0
+
+        while self.is_running:
+            try:
+                # Çökmüş worker'ların işlerini periyodik olarak yeniden kuyruğa al
+                if time.time() - last_stale_check > self.poll_interval * 12:
+                    db = SessionLocal()
+                    try:
+                        self.job_service.requeue_stale_jobs(db)
+                    finally:
+                        db.close()
+                    last_stale_check = time.time()
+
+                if not self.run_once():
+                    time.sleep(self.poll_interval)
+            except Exception as e:
+                self.logger.error(f"Worker döngüsü hatası: {str(e)}")
+                self.logger.error(traceback.format_exc())
+                time.sleep(self.poll_interval)
+
+        self.logger.info(f"Worker durduruldu: {self.worker_id}")
+
+    def ensure_snapshots(self):
+        """
+        Dashboard okuma modeli boşsa (ilk kurulum) mevcut hisse, teknik analiz ve
+        tahmin kayıtlarından doldurur; sonraki güncellemeler aşama sonlarında yapılır.
+        """
+        db = SessionLocal()
+        try:
+            if self.snapshot_service.is_empty(db) and db.query(BaseStock.id).first():
+                self.snapshot_service.rebuild(db, self.prediction_service.build_prediction_responses)
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"Anlık görüntüler oluşturulamadı: {str(e)}")
+        finally:
+            db.close()
+
+    def stop(self):
+        """
+        Worker döngüsünü mevcut iş bittikten sonra durdurur
+        """
+        self.is_running = False
+
+    def run_once(self) -> bool:
+        """
+        Kuyruktan tek bir iş alır ve çalıştırır.
+
+        Returns:
+            bool: Bir iş çalıştırıldıysa True, kuyruk boşsa False
+        """
+        db = SessionLocal()
+        try:
+            job = self.job_service.claim_next_job(db, self.worker_id)
+            if not job:
+                return False
+
+            started = time.time()
+            try:
+                result = self._execute(db, job)
+                result["elapsed_seconds"] = round(time.time() - started, 2)
+                self.job_service.complete_job(db, job.id, result)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.job_service.fail_job(db, job.id, str(e))
+            return True
+        finally:
+            db.close()
+
+    def _execute(self, db, job: PredictionJob) -> Dict[str, Any]:
+        """
+        İş tipine göre ilgili işlemi çalıştırır
+        """
+        self.logger.info(f"İş #{job.id} çalıştırılıyor ({job.job_type})")
+
+        if job.job_type == JOB_TYPE_PREDICT:
+            return self._run_predict(db, job)
+        elif job.job_type == JOB_TYPE_REFRESH_MARKET:
+            return self._run_refresh_market(db, job)
+        elif job.job_type == JOB_TYPE_BACKTEST:
+            return self._run_backtest(db, job)
+        elif job.job_type == JOB_TYPE_CLUSTER:
+            return self._run_cluster(db, job)
+        elif job.job_type == JOB_TYPE_TUNE:
+            return self._run_tune(db, job)
+        elif job.job_type == JOB_TYPE_FEATURES:
+            return self._run_feature_importance(db, job)
+        elif job.job_type == JOB_TYPE_ARCHIVE:
+            return self._run_compact_archive(db, job)
+        else:
+            raise ValueError(f"Desteklenmeyen iş tipi: {job.job_type}")
+
+    def _progress_callback(self, db, job_id: int):
+        return lambda symbol, status: self.job_service.update_progress(db, job_id, symbol, status)
+
+    def _run_predict(self, db, job: PredictionJob) -> Dict[str, Any]:
+        """
+        Belirtilen (veya tüm seçili) hisseler için tahmin yapar
+        """
+        params = job.params or {}
+        symbols = params.get("symbols")
+
+        if not symbols:
+            selected_stocks = self.base_service.get_selected_stocks(db) or []
+            symbols = [stock.symbol for stock in selected_stocks]
+            self.job_service.set_items(db, job.id, symbols)
+
+        if not symbols:
+            self.logger.warning(f"İş #{job.id}: tahmin yapılacak hisse bulunamadı")
+            return {"predicted": 0, "symbols": []}
+
+        # Yeniden kuyruğa alınan iş, önceki denemede kaydedilen tahminleri bu günlükten bilir
+        journal_path = None
+        if settings.WRITE_BEHIND_ENABLED and settings.WRITE_BEHIND_CRASH_SAFE:
+            journal_path = os.path.join(settings.WRITE_BEHIND_JOURNAL_DIR, f"job-{job.id}-predictions.jsonl")
+
+        summary = {}
+        predictions = self.prediction_service.predict_with_hourly_data(
+            db,
+            symbols,
+            days=params.get("days", 45),
+            model_type=params.get("model_type", "all"),
+            force=params.get("force", False),
+            retrain=params.get("retrain", False),
+            progress_callback=self._progress_callback(db, job.id),
+            summary=summary,
+            journal_path=journal_path
+        )
+
+        if journal_path and os.path.exists(journal_path):
+            os.remove(journal_path)
+
+        return {
+            "predicted": len(predictions),
+            "symbols": [p.get("symbol") for p in predictions if p],
+            "trained": summary.get("trained", 0),
+            "skipped_trainings": summary.get("skipped_no_drift", 0),
+            "reused": summary.get("reused", 0)
+        }
+
+    def _run_backtest(self, db, job: PredictionJob) -> Dict[str, Any]:
+        """
+        Model yapılandırmalarını belirtilen (veya tüm seçili) hisseler üzerinde walk-forward değerlendirir
+        """
+        from app.services.backtest_service import BacktestService
+
+        params = job.params or {}
+        symbols = params.get("symbols")
+
+        if not symbols:
+            selected_stocks = self.base_service.get_selected_stocks(db) or []
+            symbols = [stock.symbol for stock in selected_stocks]
+            self.job_service.set_items(db, job.id, symbols)
+
+        if not symbols:
+            self.logger.warning(f"İş #{job.id}: değerlendirilecek hisse bulunamadı")
+            return {"configs": [], "symbols": []}
+
+        backtest_service = BacktestService(folds=params.get("folds"), horizons=params.get("horizons"))
+        return backtest_service.run(
+            symbols,
+            configs=params.get("configs"),
+            days=params.get("days") or 90,
+            progress_callback=self._progress_callback(db, job.id)
+        )
+
+    def _run_cluster(self, db, job: PredictionJob) -> Dict[str, Any]:
+        """
+        Seçili ve daha önce tahmin edilmiş hisseleri davranışlarına göre yeniden kümeler
+        """
+        params = job.params or {}
+        symbols = params.get("symbols")
+
+        if not symbols:
+            selected = [stock.symbol for stock in (self.base_service.get_selected_stocks(db) or [])]
+            predicted = [row.symbol for row in db.query(PredictionStock.symbol).all()]
+            symbols = sorted(set(selected) | set(predicted))
+            self.job_service.set_items(db, job.id, symbols)
+
+        if not symbols:
+            self.logger.warning(f"İş #{job.id}: kümelenecek hisse bulunamadı")
+            return {"symbols": 0, "clusters": {}}
+
+        report = self._progress_callback(db, job.id)
+        frames = {}
+        for symbol in symbols:
+            report(symbol, ITEM_STATUS_RUNNING)
+            # Haftalık kümeleme güncel veriyle yapılır
+            self.prediction_service.stock_dataframes.pop(symbol, None)
+            df = self.prediction_service.fetch_and_prepare_dataframe(symbol, days=params.get("days", 45))
+            if df.empty:
+                report(symbol, ITEM_STATUS_FAILED)
+                continue
+            frames[symbol] = df
+            report(symbol, ITEM_STATUS_DONE)
+
+        result = self.prediction_service.cluster_service.recompute(db, frames)
+        # Zincirdeki sonraki iş (ör. pazar günü hiperparametre araması) modelleri eğitecekse atlanır
+        if result["symbols"] and params.get("train_cluster_models", True):
+            result["models"] = self._train_cluster_models(db)
+        return result
+
+    def _train_cluster_models(self, db) -> Optional[Dict[str, Any]]:
+        """
+        Küme ortak modellerini sembol süre sınırı dışında eğitip kaydeder; tahmin işleri
+        bu modelleri yalnızca yükler
+        """
+        if not settings.CLUSTER_ROUTING_ENABLED:
+            return None
+        return self.prediction_service.train_cluster_models(db)
+
+    def _run_tune(self, db, job: PredictionJob) -> Dict[str, Any]:
+        """
+        Seçili hisseler için küme (kümesi yoksa sembol) bazında hiperparametre araması yapar
+        """
+        from app.services.baseline_models import DEEP_MODELS
+
+        params = job.params or {}
+        symbols = params.get("symbols")
+
+        if not symbols:
+            selected_stocks = self.base_service.get_selected_stocks(db) or []
+            symbols = [stock.symbol for stock in selected_stocks]
+            self.job_service.set_items(db, job.id, symbols)
+
+        if not symbols:
+            self.logger.warning(f"İş #{job.id}: araması yapılacak hisse bulunamadı")
+            return {"results": {}}
+
+        model_type = params.get("model_type") or "all"
+        model_types = DEEP_MODELS if model_type == "all" else [model_type]
+
+        results = self.prediction_service.tuning_service.run(
+            db,
+            symbols,
+            model_types,
+            days=params.get("days", 45),
+            progress_callback=self._progress_callback(db, job.id)
+        )
+        # Küme yapılandırmaları değişmiş olabilir; ortak modeller yeni yapılandırmayla eğitilir
+        # (zincirin son işi olarak çalışıyorsa önceki işlerin değişiklikleri için her durumda)
+        train = params.get("train_cluster_models", bool(results))
+        return {"results": results, "cluster_models": self._train_cluster_models(db) if train else None}
+
+    def _run_feature_importance(self, db, job: PredictionJob) -> Dict[str, Any]:
+        """
+        Seçili hisseler üzerinde permütasyon önemini hesaplar ve yeni özellik seti sürümü oluşturur
+        """
+        params = job.params or {}
+        symbols = params.get("symbols")
+
+        if not symbols:
+            selected_stocks = self.base_service.get_selected_stocks(db) or []
+            symbols = [stock.symbol for stock in selected_stocks][:settings.FEATURE_IMPORTANCE_MAX_SYMBOLS]
+            self.job_service.set_items(db, job.id, symbols)
+
+        if not symbols:
+            self.logger.warning(f"İş #{job.id}: analiz edilecek hisse bulunamadı")
+            return {"success": False, "symbols": 0}
+
+        result = self.prediction_service.feature_importance_service.analyze(
+            db,
+            symbols,
+            days=params.get("days", 45),
+            progress_callback=self._progress_callback(db, job.id)
+        )
+        # Önceki özellik setiyle eğitilen ortak modeller kullanılmaz; yeni setle yeniden eğitilir
+        # (zincirdeki sonraki iş modelleri eğitecekse atlanır)
+        if result.get("success") and params.get("train_cluster_models", True):
+            result["cluster_models"] = self._train_cluster_models(db)
+        return result
+
+    def _run_compact_archive(self, db, job: PredictionJob) -> Dict[str, Any]:
+        """
+        Tahmin arşivinde eski gün içi satırları günlüğe sıkıştırır ve saklama süresini uygular
+        """
+        params = job.params or {}
+        return self.archive_service.compact(
+            db,
+            raw_days=params.get("raw_days"),
+            retention_days=params.get("retention_days")
+        )
+
+    def _run_refresh_market(self, db, job: PredictionJob) -> Dict[str, Any]:
+        """
+        Tüm BIST hisselerini yeniden işler ve filtreler
+        """
+        params = job.params or {}
+        self.job_service.set_items(db, job.id, self.base_service.load_bist_symbols())
+
+        selected_stocks = self.base_service.process_all_stocks(db, progress_callback=self._progress_callback(db, job.id))
+        selected_symbols = [stock.symbol for stock in selected_stocks if stock]
+
+        # Yeni fiyatlarla vadesi dolan tahminleri çözümle
+        resolved = self.history_service.resolve_matured(db)
+
+        # Yeni sonuçları model ağırlıklarına artımlı olarak yansıt
+        weighted = self.ensemble_service.update_from_outcomes(db)
+
+        result = {
+            "selected": len(selected_symbols),
+            "symbols": selected_symbols,
+            "resolved_predictions": resolved,
+            "weighted_outcomes": weighted
+        }
+
+        # İstenirse piyasa yenilemesinin ardından tahmin işini kuyruğa ekle; süresi dolan
+        # tahminler drift kontrolünden geçer (drift kontrolünü yalnızca retrain atlar)
+        if params.get("run_predictions") and selected_symbols:
+            predict_job = self.job_service.submit_job(db, JOB_TYPE_PREDICT, {
+                "symbols": None,
+                "model_type": "all",
+                "days": params.get("days", 45),
+                "force": False
+            })
+            result["predict_job_id"] = predict_job.id
+
+        return result
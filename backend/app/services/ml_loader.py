@@ -0,0 +1,76 @@
+import logging
+import sys
+import time
+from functools import lru_cache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROCESS_ROLE_API = "api"
+PROCESS_ROLE_WORKER = "worker"
+PROCESS_ROLE_ALL = "all"
+
+def tensorflow_loaded() -> bool:
+    """
+    TensorFlow'un bu süreçte yüklenip yüklenmediğini döndürür
+    """
+    return "tensorflow" in sys.modules
+
+@lru_cache(maxsize=None)
+def load_tensorflow():
+    """
+    TensorFlow'u ilk ihtiyaç duyulduğunda yükler.
+
+    Yalnızca okuma yapan API süreçlerinde (PROCESS_ROLE=api) TensorFlow belleği
+    gereksiz yere işgal etmesin diye yükleme reddedilir; eğitim ve tahmin
+    işleri worker süreçlerinde çalıştırılmalıdır.
+
+    Returns:
+        module: tensorflow modülü
+    """
+    if settings.PROCESS_ROLE == PROCESS_ROLE_API:
+        raise RuntimeError("PROCESS_ROLE=api olan süreçte TensorFlow yüklenemez, model işleri worker'da çalıştırılmalı")
+
+    started = time.time()
+    import tensorflow as tf
+
+    # İş parçacığı havuzları ilk işlemden önce ayarlanmalıdır; eşzamanlı eğitilen
+    # modellerin çekirdekleri aşırı paylaşmaması için op içi havuz küçültülür
+    try:
+        if settings.TF_INTRA_OP_THREADS > 0:
+            tf.config.threading.set_intra_op_parallelism_threads(settings.TF_INTRA_OP_THREADS)
+        if settings.TF_INTER_OP_THREADS > 0:
+            tf.config.threading.set_inter_op_parallelism_threads(settings.TF_INTER_OP_THREADS)
+    except RuntimeError as e:
+        logger.warning(f"TensorFlow iş parçacığı ayarları uygulanamadı: {str(e)}")
+
+    # Önceki oturumlardan kalan grafikleri temizle
+    tf.keras.backend.clear_session()
+    logger.info(f"TensorFlow {time.time() - started:.1f} saniyede yüklendi")
+    return tf
+
+@lru_cache(maxsize=None)
+def time_budget_callback_class():
+    """
+    Süre sınırı callback sınıfını TensorFlow yüklendikten sonra oluşturur.
+    """
+    tf = load_tensorflow()
+
+    class TimeBudgetCallback(tf.keras.callbacks.Callback):
+        """
+        Verilen son zamana (time.monotonic) ulaşıldığında eğitimi epoch sonunda durduran callback.
+        Süre sınırına yaklaşan eğitimin o ana kadarki en iyi ağırlıklarla tamamlanmasını sağlar.
+        """
+
+        def __init__(self, deadline: float):
+            super().__init__()
+            self.deadline = deadline
+            self.stopped_epoch = None
+
+        def on_epoch_end(self, epoch, logs=None):
+            if time.monotonic() >= self.deadline:
+                self.stopped_epoch = epoch
+                self.model.stop_training = True
+
+    return TimeBudgetCallback
@@ -0,0 +1,129 @@
+import gc
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.ml_loader import load_tensorflow
+
+TemplateKey = Tuple[str, Tuple[int, int], int]
+
+class ModelTemplateRegistry:
+    """
+    Derlenmiş model mimarilerini (model tipi, girdi boyutu, çıkış sayısı) anahtarıyla
+    yeniden kullanan kayıt.
+
+    Her anahtar için model bir kez oluşturulup derlenir ve ilk ağırlıkları saklanır.
+    Her yeni eğitimden önce ağırlıklar bu ilk değerlere döndürülür ve optimizer
+    durumu (adım sayısı, moment değişkenleri) sıfırlanır; böylece derlenmiş eğitim
+    fonksiyonu yeniden izlenmez (retrace). Belirli sayıda eğitimden sonra boştaki
+    şablonlar bırakılıp Keras oturumu temizlenir.
+    """
+
+    def __init__(self, builder: Callable[[str, Tuple[int, int], int], Any],
+                 clear_every: Optional[int] = None, max_idle: Optional[int] = None):
+        """
+        Args:
+            builder: (model tipi, girdi boyutu, çıkış sayısı) -> derlenmiş model
+            clear_every: Kaç eğitimde bir Keras oturumunun temizleneceği
+            max_idle: Anahtar başına boşta tutulacak en fazla şablon sayısı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.builder = builder
+        self.clear_every = clear_every or settings.MODEL_TEMPLATE_CLEAR_EVERY
+        self.max_idle = max_idle or settings.MODEL_TEMPLATE_MAX_IDLE
+
+        self._lock = threading.Lock()
+        self._idle: Dict[TemplateKey, List[Any]] = {}
+        self._initial_weights: Dict[int, List[Any]] = {}
+        self._active = 0
+        self._releases_since_clear = 0
+
+        self.metrics = {
+            'builds': 0,
+            'reuses': 0,
+            'clears': 0
+        }
+
+    def _key(self, model_type: str, input_shape: Tuple[int, int], output_size: int) -> TemplateKey:
+        return (model_type.lower(), tuple(int(d) for d in input_shape), int(output_size))
+
+    def _reset(self, model):
+        """
+        Ağırlıkları ilk değerlerine döndürür ve optimizer durumunu sıfırlar
+        """
+        tf = load_tensorflow()
+        model.set_weights(self._initial_weights[id(model)])
+
+        optimizer = getattr(model, "optimizer", None)
+        if optimizer is None:
+            return
+        variables = optimizer.variables() if callable(getattr(optimizer, "variables", None)) else optimizer.variables
+        for variable in variables:
+            name = getattr(variable, "path", None) or variable.name
+            # Öğrenme katsayısı da optimizer değişkenidir, korunmalıdır
+            if "learning_rate" in name:
+                continue
+            variable.assign(tf.zeros(variable.shape, dtype=variable.dtype))
+
+    def acquire(self, model_type: str, input_shape: Tuple[int, int], output_size: int = 1):
+        """
+        Eğitime hazır (ağırlıkları sıfırlanmış) bir model döndürür.
+        Boşta şablon yoksa yeni bir model oluşturulur.
+
+        Keras katman adları global sayaçtan üretildiğinden yeni şablonlar aynı anda
+        yalnızca tek bir thread'de oluşturulur.
+        """
+        key = self._key(model_type, input_shape, output_size)
+        with self._lock:
+            self._active += 1
+            pool = self._idle.get(key)
+            if pool:
+                model = pool.pop()
+                self.metrics['reuses'] += 1
+            else:
+                try:
+                    model = self.builder(*key)
+                except Exception:
+                    self._active -= 1
+                    raise
+                self._initial_weights[id(model)] = model.get_weights()
+                self.metrics['builds'] += 1
+                return model
+
+        try:
+            self._reset(model)
+        except Exception:
+            with self._lock:
+                self._active -= 1
+                self._initial_weights.pop(id(model), None)
+            raise
+        return model
+
+    def release(self, model_type: str, input_shape: Tuple[int, int], output_size: int, model):
+        """
+        Eğitimi ve tahmini biten modeli havuza geri koyar; gerekiyorsa oturumu temizler
+        """
+        key = self._key(model_type, input_shape, output_size)
+        with self._lock:
+            self._active -= 1
+            self._releases_since_clear += 1
+
+            pool = self._idle.setdefault(key, [])
+            if len(pool) < self.max_idle:
+                pool.append(model)
+            else:
+                self._initial_weights.pop(id(model), None)
+
+            if self._releases_since_clear >= self.clear_every and self._active == 0:
+                self._clear_locked()
+
+    def _clear_locked(self):
+        self._idle.clear()
+        self._initial_weights.clear()
+        self._releases_since_clear = 0
+        load_tensorflow().keras.backend.clear_session()
+        gc.collect()
+        self.metrics['clears'] += 1
+        self.logger.info(f"Model şablonları temizlendi ve Keras oturumu sıfırlandı ({self.metrics})")
+
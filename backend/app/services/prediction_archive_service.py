@@ -0,0 +1,221 @@
+import logging
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+from sqlalchemy import bindparam, delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.prediction_archive import (
+    PredictionArchive, ARCHIVE_GRANULARITY_RAW, ARCHIVE_GRANULARITY_DAILY
+)
+from app.services.baseline_models import DEEP_MODELS
+
+# Aylık bölüm adı: prediction_archive_y2026m10
+PARTITION_PATTERN = re.compile(r"_y(\d{4})m(\d{2})$")
+
+class PredictionArchiveService:
+    """
+    Tahmin arşivini (prediction_archive) yöneten servis.
+
+    Her tahmin yazması arşive, prediction_stocks güncellemesiyle aynı işlemde
+    yeni bir satır ekler; sıcak tablo yalnızca son tahmini tuttuğu için okuma
+    endpoint'leri arşiv büyüdükçe yavaşlamaz. Saklama işi (compact) eski gün
+    içi satırları sembol başına günün son tahminine indirger ve saklama süresini
+    aşan satırları (PostgreSQL'de bütün aylık bölümleri) siler.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.table = PredictionArchive.__tablename__
+        self._partitions: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    def build_row(self, record: Dict[str, Any], created_at: datetime) -> Dict[str, Any]:
+        """
+        PredictionService.persist_predictions kaydından arşiv satırı oluşturur
+        """
+        columns = record["columns"]
+        predictions = (columns.get("prediction_data") or {}).get("predictions") or {}
+        row = {
+            "symbol": record["symbol"],
+            "created_at": created_at,
+            "granularity": ARCHIVE_GRANULARITY_RAW,
+            "samples": 1,
+            "current_price": columns.get("current_price"),
+            "prediction_date": columns.get("prediction_date"),
+            "best_model": columns.get("best_model"),
+            "model_tier": columns.get("model_tier"),
+            "feature_set_version": columns.get("feature_set_version"),
+            "ensemble_predicted_price": columns.get("ensemble_predicted_price"),
+            "interval_lower": columns.get("interval_lower"),
+            "interval_upper": columns.get("interval_upper"),
+            # Eğitim yapılandırmaları gibi büyük alanlar arşive yazılmaz
+            "predictions": {name: [float(value) for value in values] for name, values in predictions.items()},
+            "model_weights": columns.get("model_weights")
+        }
+        for name in DEEP_MODELS:
+            row[f"{name}_predicted_price"] = columns.get(f"{name}_predicted_price")
+        return row
+
+    def append(self, db: Session, records: List[Dict[str, Any]], created_at: Optional[datetime] = None) -> int:
+        """
+        Tahmin kayıtlarını arşive ekler. Commit çağırana bırakılır; satırlar
+        prediction_stocks güncellemesiyle aynı işlemde yazılır.
+
+        Args:
+            db: Veritabanı oturumu
+            records: persist_predictions kayıtları
+            created_at: Tahmin zamanı (varsayılan: şimdi)
+
+        Returns:
+            int: Eklenen satır sayısı
+        """
+        created_at = created_at or datetime.now()
+        # Aynı partide bir sembol birden fazla kez varsa sonuncusu arşivlenir
+        rows = list({record["symbol"]: self.build_row(record, created_at) for record in records}.values())
+        if not rows:
+            return 0
+
+        if db.get_bind().dialect.name == "postgresql":
+            self.ensure_partitions(db, created_at, created_at)
+        db.execute(insert(PredictionArchive), rows)
+        return len(rows)
+
+    def ensure_partitions(self, db: Session, start: datetime, end: datetime):
+        """
+        [start, end] aralığını kapsayan aylık bölümleri (yoksa) ayrı bir işlemde oluşturur;
+        böylece yazma işlemi geri alınsa da bölüm önbelleği geçerli kalır
+        """
+        months = [month for month in pd.period_range(start, end, freq="M")
+                  if (month.year, month.month) not in self._partitions]
+        if not months:
+            return
+
+        with self._lock, db.get_bind().connect() as conn:
+            for month in months:
+                lower = month.start_time.strftime("%Y-%m-%d")
+                upper = (month + 1).start_time.strftime("%Y-%m-%d")
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {self.table}_y{month.year}m{month.month:02d} "
+                    f"PARTITION OF {self.table} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+                ))
+            conn.commit()
+            self._partitions.update((month.year, month.month) for month in months)
+
+    def compact(self, db: Session, raw_days: Optional[int] = None, retention_days: Optional[int] = None,
+                now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Saklama işi: süresi dolan satırları siler, raw_days günden eski gün içi
+        satırları sembol ve gün başına tek satıra (günün son tahmini) indirger.
+        Her ay ayrı bir işlemde sıkıştırılır.
+
+        Args:
+            db: Veritabanı oturumu
+            raw_days: Gün içi satırların olduğu gibi saklandığı gün sayısı
+            retention_days: Arşivin saklandığı gün sayısı (0 ise süresiz)
+            now: Referans zamanı (varsayılan: şimdi)
+
+        Returns:
+            Dict[str, int]: Sıkıştırılan sembol-gün, silinen gün içi satır, süresi dolan
+                satır ve silinen bölüm sayıları
+        """
+        raw_days = settings.PREDICTION_ARCHIVE_RAW_DAYS if raw_days is None else raw_days
+        retention_days = settings.PREDICTION_ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+        today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        result = {"compacted_days": 0, "removed_rows": 0, "expired_rows": 0, "dropped_partitions": 0}
+
+        if retention_days:
+            result.update(self._expire(db, today - timedelta(days=retention_days)))
+
+        raw_cutoff = today - timedelta(days=raw_days)
+        oldest = db.scalar(
+            select(func.min(PredictionArchive.created_at)).where(
+                PredictionArchive.granularity == ARCHIVE_GRANULARITY_RAW,
+                PredictionArchive.created_at < raw_cutoff
+            )
+        )
+        if oldest is None:
+            self.logger.info(f"Tahmin arşivi: sıkıştırılacak satır yok ({result})")
+            return result
+
+        keep = (
+            update(PredictionArchive.__table__)
+            .where(
+                PredictionArchive.symbol == bindparam("b_symbol"),
+                PredictionArchive.created_at == bindparam("b_created_at")
+            )
+            .values(granularity=ARCHIVE_GRANULARITY_DAILY, samples=bindparam("b_samples"))
+        )
+        for month in pd.period_range(oldest, raw_cutoff - timedelta(microseconds=1), freq="M"):
+            start = max(month.start_time.to_pydatetime(), oldest)
+            end = min((month + 1).start_time.to_pydatetime(), raw_cutoff)
+            in_range = (
+                PredictionArchive.granularity == ARCHIVE_GRANULARITY_RAW,
+                PredictionArchive.created_at >= start,
+                PredictionArchive.created_at < end
+            )
+            try:
+                # Sembol ve gün başına son tahmin günlük satır olarak kalır, diğerleri silinir
+                groups = db.execute(
+                    select(
+                        PredictionArchive.symbol,
+                        func.max(PredictionArchive.created_at),
+                        func.sum(PredictionArchive.samples)
+                    )
+                    .where(*in_range)
+                    .group_by(PredictionArchive.symbol, func.date(PredictionArchive.created_at))
+                ).all()
+                if not groups:
+                    continue
+                db.execute(keep, [
+                    {"b_symbol": symbol, "b_created_at": created_at, "b_samples": samples}
+                    for symbol, created_at, samples in groups
+                ])
+                removed = db.execute(delete(PredictionArchive).where(*in_range)).rowcount
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            result["compacted_days"] += len(groups)
+            result["removed_rows"] += removed or 0
+
+        self.logger.info(f"Tahmin arşivi sıkıştırıldı: {result}")
+        return result
+
+    def _expire(self, db: Session, cutoff: datetime) -> Dict[str, int]:
+        """
+        cutoff'tan eski satırları siler. PostgreSQL'de tamamen eski kalan aylık
+        bölümler satır satır silinmek yerine bölüm olarak kaldırılır.
+        """
+        dropped = 0
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                partitions = db.scalars(text(
+                    "SELECT c.relname FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "JOIN pg_class p ON p.oid = i.inhparent "
+                    "WHERE p.relname = :table"
+                ), {"table": self.table}).all()
+                for name in partitions:
+                    match = PARTITION_PATTERN.search(name)
+                    if not match:
+                        continue
+                    year, month = int(match.group(1)), int(match.group(2))
+                    upper = datetime(year + month // 12, month % 12 + 1, 1)
+                    if upper <= cutoff:
+                        db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+                        self._partitions.discard((year, month))
+                        dropped += 1
+
+            expired = db.execute(
+                delete(PredictionArchive).where(PredictionArchive.created_at < cutoff)
+            ).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return {"expired_rows": expired or 0, "dropped_partitions": dropped}
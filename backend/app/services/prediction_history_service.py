@@ -0,0 +1,224 @@
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import select, update, insert, func, case, cast, and_, Integer
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.price_bar import PriceBar
+from app.models.prediction_history import PredictionHistory
+
+class PredictionHistoryService:
+    """
+    Tahminlerin gerçekleşen fiyatlarla karşılaştırılmasını yöneten servis.
+
+    Her tahmin oluşturulduğu anda model bazında PredictionHistory tablosuna yazılır.
+    Günlük veri güncellemesinden sonra vadesi dolan tüm tahminler tek bir toplu
+    UPDATE ile çözümlenir; model doğrulukları indeksli sorgularla okunur.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def snapshot_prediction(self, db: Session, symbol: str, predictions: Dict[str, List[float]],
+                            base_price: Optional[float], prediction_date: datetime,
+                            model_tier: Optional[str] = None) -> int:
+        """
+        Bir sembolün tüm model tahminlerini geçmiş tablosuna kaydeder.
+
+        Args:
+            db: Veritabanı oturumu
+            symbol: Hisse senedi sembolü
+            predictions: Model adı -> tahmin edilen fiyatlar
+            base_price: Tahmin anındaki fiyat
+            prediction_date: Tahminin vadesi
+            model_tier: Tahmini üreten model katmanı
+
+        Returns:
+            int: Eklenen kayıt sayısı
+        """
+        return self.snapshot_predictions(db, [{
+            "symbol": symbol,
+            "predictions": predictions,
+            "base_price": base_price,
+            "prediction_date": prediction_date,
+            "model_tier": model_tier
+        }])
+
+    def snapshot_predictions(self, db: Session, entries: List[Dict], commit: bool = True) -> int:
+        """
+        Birden fazla sembolün tahminlerini tek INSERT ifadesiyle geçmiş tablosuna kaydeder.
+
+        Args:
+            db: Veritabanı oturumu
+            entries: symbol, predictions, base_price, prediction_date ve model_tier alanlarını içeren kayıtlar
+            commit: False ise commit çağırana bırakılır (toplu yazmalarda tek işlem)
+
+        Returns:
+            int: Eklenen kayıt sayısı
+        """
+        now = datetime.now()
+        rows = [
+            {
+                "symbol": entry["symbol"],
+                "prediction_date": entry["prediction_date"],
+                "prediction_price": float(values[0]),
+                "base_price": entry["base_price"],
+                "model_used": model_name,
+                "model_tier": entry.get("model_tier"),
+                "created_at": now
+            }
+            for entry in entries
+            for model_name, values in entry["predictions"].items()
+            if values
+        ]
+
+        if not rows:
+            return 0
+
+        db.execute(insert(PredictionHistory), rows)
+        if commit:
+            db.commit()
+        return len(rows)
+
+    def resolve_matured(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Vadesi dolmuş ve henüz çözümlenmemiş tüm tahminleri, vadeden sonraki ilk
+        kayıtlı barın (price_bars) kapanışına göre tek bir SQL UPDATE ile çözümler.
+        Saatlik bar varsa o, yoksa vade gününe ait (yoksa sonraki ilk) günlük bar
+        kullanılır; vadeden sonra bar yazılmamış tahminler çözümlenmeden bekler.
+
+        Args:
+            db: Veritabanı oturumu
+            now: Referans zamanı (varsayılan: şimdi)
+
+        Returns:
+            int: Çözümlenen tahmin sayısı
+        """
+        now = now or datetime.now()
+        matured_at = self._to_utc(db, PredictionHistory.prediction_date)
+        # Günlük barlar yerel gece yarısıyla (UTC'de önceki günün akşamı) damgalanır; işlem günü
+        # karşılaştırması için vade gününün yerel başlangıcı kullanılır
+        matured_day = self._to_utc(db, PredictionHistory.prediction_date, start_of_day=True)
+
+        def first_close(timeframe: str, since):
+            # (symbol, timeframe, ts) birincil anahtarı üzerinde ilişkili alt sorgu
+            return (
+                select(PriceBar.close)
+                .where(
+                    PriceBar.symbol == PredictionHistory.symbol,
+                    PriceBar.timeframe == timeframe,
+                    PriceBar.ts >= since
+                )
+                .order_by(PriceBar.ts)
+                .limit(1)
+                .scalar_subquery()
+            )
+
+        actual = func.coalesce(first_close("1h", matured_at), first_close("1d", matured_day))
+
+        # Başarı: tahmin edilen ve gerçekleşen hareket aynı yönde
+        is_successful = case(
+            ((PredictionHistory.prediction_price - PredictionHistory.base_price) * (actual - PredictionHistory.base_price) > 0, True),
+            else_=False
+        )
+        accuracy = 100.0 - func.abs(PredictionHistory.prediction_price - actual) * 100.0 / actual
+        accuracy_percent = case((accuracy < 0, 0.0), else_=accuracy)
+
+        result = db.execute(
+            update(PredictionHistory)
+            .where(
+                PredictionHistory.resolved_at.is_(None),
+                PredictionHistory.prediction_date <= now,
+                actual.isnot(None)
+            )
+            .values(
+                actual_price=actual,
+                is_successful=is_successful,
+                accuracy_percent=accuracy_percent,
+                resolved_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        resolved = result.rowcount or 0
+        self.logger.info(f"{resolved} tahmin gerçekleşen fiyatlarla çözümlendi")
+        return resolved
+
+    @staticmethod
+    def _to_utc(db: Session, column, start_of_day: bool = False):
+        """
+        Yerel saatli tarih sütununu price_bars.ts ile karşılaştırılabilir
+        (saat dilimsiz UTC) SQL ifadesine çevirir; start_of_day ise sütunun
+        yerel gün başlangıcı çevrilir
+        """
+        offset = datetime.now().astimezone().utcoffset() or timedelta(0)
+        if db.get_bind().dialect.name == "sqlite":
+            modifiers = (["start of day"] if start_of_day else []) + ([f"{-int(offset.total_seconds())} seconds"] if offset else [])
+            return func.datetime(column, *modifiers) if modifiers else column
+        if start_of_day:
+            column = func.date_trunc("day", column)
+        return column - offset if offset else column
+
+    def rolling_accuracy(self, db: Session, window_days: Optional[int] = None,
+                         symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Son `window_days` gün içinde çözümlenen tahminler için model bazlı doğruluk.
+
+        Args:
+            db: Veritabanı oturumu
+            window_days: Kayan pencere uzunluğu (gün)
+            symbol: Yalnızca belirli bir sembol için hesaplamak isteniyorsa
+
+        Returns:
+            List[Dict]: Model adı, tahmin sayısı, yön başarısı (%), ortalama doğruluk (%) ve MAPE
+        """
+        window_days = window_days or settings.PREDICTION_ACCURACY_WINDOW_DAYS
+        since = datetime.now() - timedelta(days=window_days)
+
+        abs_pct_error = func.abs(PredictionHistory.prediction_price - PredictionHistory.actual_price) * 100.0 / PredictionHistory.actual_price
+
+        query = (
+            select(
+                PredictionHistory.model_used,
+                func.count(PredictionHistory.id).label("count"),
+                func.avg(cast(PredictionHistory.is_successful, Integer)).label("success_rate"),
+                func.avg(PredictionHistory.accuracy_percent).label("accuracy"),
+                func.avg(abs_pct_error).label("mape")
+            )
+            .where(and_(PredictionHistory.resolved_at.isnot(None), PredictionHistory.resolved_at >= since))
+            .group_by(PredictionHistory.model_used)
+        )
+        if symbol:
+            query = query.where(PredictionHistory.symbol == symbol)
+
+        return [
+            {
+                "model": row.model_used,
+                "count": row.count,
+                "success_rate": round(float(row.success_rate or 0) * 100, 2),
+                "accuracy": round(float(row.accuracy or 0), 2),
+                "mape": round(float(row.mape or 0), 4),
+                "window_days": window_days
+            }
+            for row in db.execute(query)
+        ]
+
+    def best_model(self, db: Session, symbol: Optional[str] = None, min_count: int = 5) -> Optional[str]:
+        """
+        Kayan pencerede en yüksek yön başarısına sahip modeli döndürür (model seçimi için).
+
+        Args:
+            db: Veritabanı oturumu
+            symbol: Sembol bazında seçim yapılacaksa
+            min_count: Değerlendirmeye alınacak en az çözümlenmiş tahmin sayısı
+
+        Returns:
+            str: Model adı veya yeterli geçmiş yoksa None
+        """
+        candidates = [row for row in self.rolling_accuracy(db, symbol=symbol) if row["count"] >= min_count]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda row: (row["success_rate"], row["accuracy"]))["model"]
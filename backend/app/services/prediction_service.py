@@ -1,29 +1,51 @@
-from typing import List, Dict, Tuple, Any, Optional
+from __future__ import annotations
+
+from typing import List, Dict, Tuple, Any, Optional, Callable, TYPE_CHECKING
 import numpy as np
 import pandas as pd
 import yfinance as yf
 import logging
+import os
+import shutil
+import tempfile
 import traceback
-from datetime import datetime, timedelta, time
+import time
+from datetime import datetime, timedelta
 import pytz
 from sqlalchemy.orm import Session
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout, GRU, Attention, MultiHeadAttention, LayerNormalization
-from tensorflow.keras.optimizers import Adam
-from sklearn.preprocessing import MinMaxScaler
 import ta
 from ta.trend import MACD
 from ta.momentum import RSIIndicator, StochasticOscillator
 from ta.volatility import BollingerBands, AverageTrueRange
-from tensorflow.keras.callbacks import EarlyStopping
-from sklearn.metrics import mean_squared_error, mean_absolute_error
-import json
 import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 
 from app.models.base_stock import BaseStock
 from app.models.prediction_stock import PredictionStock
+from app.models.prediction_job import ITEM_STATUS_RUNNING, ITEM_STATUS_DONE, ITEM_STATUS_FAILED, ITEM_STATUS_SKIPPED
 from app.services.base_stock_service import BaseStockService
+from app.core.config import settings
+from app.core import serialization
+from app.services.ml_loader import load_tensorflow, time_budget_callback_class
+from app.services.baseline_models import BaselineModelService, MODEL_TIER_BASELINE, MODEL_TIER_DEEP, DEEP_MODELS
+from app.services.feature_cache import FeatureCache, TrainingDataset
+from app.services.prediction_history_service import PredictionHistoryService
+from app.services.prediction_archive_service import PredictionArchiveService
+from app.services.ensemble_service import EnsembleService, ENSEMBLE_MODEL_NAME
+from app.services.drift_service import DriftService
+from app.services.cluster_service import ClusterService, CLUSTER_MODEL_NAME
+from app.services.model_templates import ModelTemplateRegistry
+from app.services.tuning_service import TuningService, default_training_config, DEFAULT_SEQUENCE_LENGTH
+from app.services.feature_importance_service import FeatureImportanceService
+from app.services.bar_store import BarStore
+from app.services.snapshot_service import SnapshotService
+from app.services.write_behind import WriteBehindBuffer
+from app.repositories import PredictionRepository
+
+# TensorFlow ve sklearn yalnızca eğitim/tahmin kod yollarında yüklenir
+if TYPE_CHECKING:
+    from tensorflow.keras.models import Sequential
+    from sklearn.preprocessing import MinMaxScaler
 
 class PredictionService:
     """
@@ -36,6 +58,28 @@ class PredictionService:
         """
         self.logger = logging.getLogger(__name__)
         self.base_service = BaseStockService()
+        self.baseline_service = BaselineModelService()
+        self.feature_cache = FeatureCache()
+        self.history_service = PredictionHistoryService()
+        self.archive_service = PredictionArchiveService()
+        self.ensemble_service = EnsembleService()
+        self.drift_service = DriftService()
+        self.cluster_service = ClusterService()
+        self.bar_store = BarStore()
+        self.repository = PredictionRepository()
+        self.snapshot_service = SnapshotService()
+        
+        # Derlenmiş model şablonları (model tipi, girdi boyutu, çıkış sayısı) başına yeniden kullanılır
+        self.model_templates = ModelTemplateRegistry(self.create_model)
+        
+        # Sembol/küme bazında aranmış eğitim yapılandırmaları
+        self.tuning_service = TuningService(self)
+        
+        # Permütasyon önemiyle budanmış, sürümlü üretim özellik seti
+        self.feature_importance_service = FeatureImportanceService(self)
+        
+        # Küme numarası -> diskten yüklenen ortak model ve eğitim bilgileri
+        self.cluster_models = {}
         
         # Veri önbelleği - hisse sembollerine göre DataFrame'leri saklamak için
         self.data_cache = {}
@@ -68,9 +112,7 @@ class PredictionService:
             'successful_predictions': 0,
             'failed_predictions': 0
         }
-        
-        # TensorFlow session'larının belleği boşaltma yöntemi
-        tf.keras.backend.clear_session()
+
     
     def fetch_hourly_data(self, symbol: str, days: int = 45) -> pd.DataFrame:
         """
@@ -124,6 +166,13 @@ class PredictionService:
                     # Veriyi önbelleğe al
                     self.data_cache[cache_key] = data
                     
+                    # Gerçek saatlik barları kalıcı bar tablosuna yaz
+                    if settings.BAR_STORE_ENABLED and not data.empty:
+                        try:
+                            self.bar_store.ingest(symbol, data, interval="1h")
+                        except Exception as e:
+                            self.logger.warning(f"{symbol} için saatlik barlar kaydedilemedi: {str(e)}")
+                    
                     if not data.empty:
                         self.logger.info(f"{symbol} için son veri tarihi: {data.index[-1]}")
                         self.logger.info(f"{symbol} için veri temizleme sonrası satır sayısı: {len(data)}")
@@ -654,7 +703,9 @@ class PredictionService:
             Dict: Her sembol için hazırlanan veri ve eğitilmiş modelleri içeren sözlük
         """
         results = {}
-        sequence_length = 10  # Önceki değer 15'ti, daha az veri gerektirmesi için küçültüldü
+        sequence_length = DEFAULT_SEQUENCE_LENGTH
+        lstm_config = default_training_config('lstm')
+        gru_config = default_training_config('gru')
         
         # Sonuçları depolamak için sözlük oluştur
         for symbol in symbols:
@@ -762,8 +813,8 @@ class PredictionService:
                         X_train, y_train, 
                         X_test, y_test, 
                         model_type='lstm',
-                        epochs=50, 
-                        batch_size=16
+                        epochs=lstm_config["epochs"], 
+                        batch_size=lstm_config["batch_size"]
                     )
                     
                     results[symbol]["models"]["lstm"] = lstm_model
@@ -781,8 +832,8 @@ class PredictionService:
                         X_train, y_train, 
                         X_test, y_test, 
                         model_type='gru',
-                        epochs=50, 
-                        batch_size=16
+                        epochs=gru_config["epochs"], 
+                        batch_size=gru_config["batch_size"]
                     )
                     
                     results[symbol]["models"]["gru"] = gru_model
@@ -830,12 +881,13 @@ class PredictionService:
         
         return results
 
-    def select_best_features(self, df: pd.DataFrame) -> List[str]:
+    def select_best_features(self, df: pd.DataFrame, pruned: bool = True) -> List[str]:
         """
         Tahmin için en iyi özellikleri seçer.
         
         Args:
             df: İşlenecek veri çerçevesi
+            pruned: True ise etkin özellik setinde budanan özellikler çıkarılır
             
         Returns:
             List[str]: Seçilen özellik isimleri listesi
@@ -874,6 +926,10 @@ class PredictionService:
                 elif 'close' in df.columns:
                     selected_features.append('close')
             
+            # Permütasyon önemi düşük olan özellikler üretim setinden çıkarılır
+            if pruned:
+                selected_features = self.feature_importance_service.apply(selected_features)
+            
             return selected_features
             
         except Exception as e:
@@ -899,6 +955,8 @@ class PredictionService:
             X_features = df[feature_columns].values
             
             # Normalizasyon
+            from sklearn.preprocessing import MinMaxScaler
+            
             scaler_X = MinMaxScaler()
             X_scaled = scaler_X.fit_transform(X_features)
             
@@ -973,51 +1031,134 @@ class PredictionService:
             # Hata durumunda uygun boyutlarda sıfır dizisi döndür
             return np.zeros((1, sequence_length, len(feature_columns)))
 
-    def predict_stock_with_dataframe(self, symbol: str, model_type: str = 'lstm') -> Dict[str, Any]:
+    def get_training_dataset(self, symbol: str, sequence_length: int = DEFAULT_SEQUENCE_LENGTH) -> Optional[TrainingDataset]:
+        """
+        Kaydedilmiş DataFrame için ölçeklenmiş eğitim veri setini döndürür.
+        Veri seti içerik özetine göre önbelleğe alındığından aynı veri sürümü için
+        tüm model tipleri aynı pencereleri kullanır.
+        
+        Args:
+            symbol: Hisse senedi sembolü
+            sequence_length: Pencere uzunluğu
+            
+        Returns:
+            TrainingDataset: Eğitim pencereleri, tahmin penceresi ve ölçekleyiciler (veri yetersizse None)
+        """
+        df = self.get_stock_dataframe(symbol)
+        
+        if df.empty:
+            self.logger.warning(f"{symbol} için DataFrame bulunamadı")
+            return None
+        
+        # Tahmin için kullanılacak özellikleri seç
+        feature_columns = self.select_best_features(df)
+        
+        if len(feature_columns) < 3:
+            self.logger.warning(f"{symbol} için yeterli özellik yok")
+            return None
+        
+        target_column = 'Close' if 'Close' in df.columns else 'close'
+        
+        # Son 24 saat eğitimden ayrılır, ölçekleyiciler bu satırlar hariç hesaplanır
+        return self.feature_cache.get_or_build(df, feature_columns, target_column, sequence_length, holdout=24)
+
+    def predict_stock_with_dataframe(self, symbol: str, model_type: str = 'lstm',
+                                     deadline: Optional[float] = None,
+                                     config: Optional[Dict[str, Any]] = None,
+                                     reuse: bool = False) -> Dict[str, Any]:
         """
         Kaydedilmiş DataFrame kullanarak hisse senedi tahmini yapar.
         
         Args:
             symbol: Hisse senedi sembolü
             model_type: Kullanılacak model tipi ('lstm', 'gru')
+            deadline: Eğitimin durdurulacağı son zaman (time.monotonic), None ise sınırsız
+            config: Eğitim yapılandırması (verilmezse model tipinin varsayılanı)
+            reuse: True ise kayıtlı model ağırlıkları varsa model yeniden eğitilmez
             
         Returns:
             Dict: Tahmin sonuçları
         """
-        try:
-            # DataFrame'i al
-            df = self.get_stock_dataframe(symbol)
-            
-            if df.empty:
-                self.logger.warning(f"{symbol} için DataFrame bulunamadı")
-                return {"success": False, "message": "DataFrame bulunamadı"}
-            
-            # Tahmin için kullanılacak özellikleri seç
-            feature_columns = self.select_best_features(df)
-            
-            if len(feature_columns) < 3:
-                self.logger.warning(f"{symbol} için yeterli özellik yok")
-                return {"success": False, "message": "Yeterli özellik yok"}
+        configs = {model_type: config} if config else None
+        return self.predict_stock_with_models(symbol, [model_type], deadline=deadline, configs=configs, reuse=reuse)[model_type]
+
+    def predict_stock_with_models(self, symbol: str, model_types: List[str],
+                                  deadline: Optional[float] = None,
+                                  configs: Optional[Dict[str, Dict[str, Any]]] = None,
+                                  reuse: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Veri setini bir kez hazırlar ve verilen model tiplerini aynı pencereler üzerinde eğitir.
+        Birden fazla model verildiğinde her model ayrı bir thread'de eşzamanlı eğitilir;
+        her modelin kendi early stopping ve süre sınırı callback'leri vardır. Pencere
+        uzunlukları farklı yapılandırmalar için veri seti uzunluk başına bir kez hazırlanır.
+        Tamamlanan eğitimlerin ağırlıkları sembol ve model tipine göre kaydedilir.
+        
+        Args:
+            symbol: Hisse senedi sembolü
+            model_types: Eğitilecek model tipleri
+            deadline: Eğitimin durdurulacağı son zaman (time.monotonic), None ise sınırsız
+            configs: Model tipi -> eğitim yapılandırması (verilmeyenler için varsayılan)
+            reuse: True ise kayıtlı ağırlıkları güncel olan modeller eğitilmeden tahmin yapar
+                (sonuçta reused: True), yalnızca kalanlar eğitilir
             
-            # Son 24 saati ayır
-            df_train = df.iloc[:-24].copy()
-            df_pred = df.iloc[-24:].copy()
+        Returns:
+            Dict: Model tipi -> tahmin sonuçları
+        """
+        results = {}
+        if reuse:
+            for mt, result in self.predict_stock_with_saved_models(symbol, model_types).items():
+                if result.get('success'):
+                    results[mt] = result
+            model_types = [mt for mt in model_types if mt not in results]
+            if not model_types:
+                return results
+        
+        configs = {mt: (configs or {}).get(mt) or default_training_config(mt) for mt in model_types}
+        
+        try:
+            # Veri setleri pencere uzunluğu başına bir kez alınır (aynı veri sürümü için önbellekten gelir)
+            datasets = {}
+            for mt in model_types:
+                sequence_length = configs[mt]["sequence_length"]
+                if sequence_length not in datasets:
+                    datasets[sequence_length] = self.get_training_dataset(symbol, sequence_length)
             
-            # Veriyi hazırla
-            sequence_length = 30  # 10'dan 30'a değiştirildi
-            target_column = 'Close' if 'Close' in df.columns else 'close'
+            if all(dataset is None for dataset in datasets.values()):
+                results.update({mt: {"success": False, "message": "Veri seti hazırlanamadı"} for mt in model_types})
+                return results
             
-            X, y, scaler_X, scaler_y = self.prepare_data(
-                df_train, 
-                df_train[target_column].values, 
-                sequence_length, 
-                feature_columns
-            )
+            df = self.get_stock_dataframe(symbol)
             
-            # Eğitim/test setlerini ayır
-            train_size = int(0.8 * len(X))
-            X_train, X_test = X[:train_size], X[train_size:]
-            y_train, y_test = y[:train_size], y[train_size:]
+            # Keras katman adları global sayaçtan üretildiğinden modeller ana thread'de alınır
+            models = {}
+            splits = {}
+            for mt in model_types:
+                dataset = datasets[configs[mt]["sequence_length"]]
+                if dataset is None:
+                    results[mt] = {"success": False, "message": "Veri seti hazırlanamadı"}
+                    continue
+                
+                # Eğitim/test setlerini ayır
+                train_size = int(0.8 * len(dataset.X))
+                X_train, X_test = dataset.X[:train_size], dataset.X[train_size:]
+                y_train, y_test = dataset.y[:train_size], dataset.y[train_size:]
+                input_shape = (X_train.shape[1], X_train.shape[2])
+                splits[mt] = (dataset, X_train, y_train, X_test, y_test, input_shape)
+                
+                try:
+                    models[mt] = self.acquire_model(mt, input_shape, learning_rate=configs[mt]["learning_rate"])
+                except Exception as e:
+                    self.logger.error(f"{symbol} için {mt} modeli oluşturulamadı: {str(e)}")
+                    results[mt] = {"success": False, "message": f"Tahmin hatası: {str(e)}"}
+        except Exception as e:
+            self.logger.error(f"{symbol} için tahmin hatası: {str(e)}")
+            results.update({mt: {"success": False, "message": f"Tahmin hatası: {str(e)}"} for mt in model_types})
+            return results
+        
+        def train_and_predict(model_type: str) -> Dict[str, Any]:
+            dataset, X_train, y_train, X_test, y_test, _ = splits[model_type]
+            scaler_y = dataset.scaler_y
+            target_column = dataset.scaler_params["target_column"]
             
             # Model eğit
             model, metrics = self.train_model(
@@ -1025,43 +1166,517 @@ class PredictionService:
                 X_train, y_train, 
                 X_test, y_test, 
                 model_type=model_type,
-                epochs=150,  # 50'den 150'ye değiştirildi
-                batch_size=20  # 16'dan 20'ye değiştirildi
+                epochs=configs[model_type]["epochs"],
+                batch_size=configs[model_type]["batch_size"],
+                deadline=deadline,
+                model=models[model_type]
             )
             
-            # Tahmin için X_pred oluştur
-            X_pred = self.prepare_data_for_prediction(
-                df, 
-                feature_columns, 
-                scaler_X, 
-                sequence_length
-            )
+            # Yarım kalan eğitim saklanmaz; drift olmayan sembollerde bu ağırlıklar yeniden kullanılır
+            if not metrics.get('stopped_by_time_budget'):
+                try:
+                    self._save_symbol_model(symbol, model_type, model, dataset, configs[model_type], metrics)
+                except Exception as e:
+                    self.logger.warning(f"{symbol} {model_type.upper()} model ağırlıkları kaydedilemedi: {str(e)}")
             
-            # Tahmin yap
-            raw_preds = model.predict(X_pred)
+            # Tahmin yap (tahmin penceresi veri setiyle birlikte hazırlanır)
+            raw_preds = model.predict(dataset.X_pred, verbose=0)
             predictions = scaler_y.inverse_transform(raw_preds.reshape(-1, 1)).flatten()
             
-            # Sonuçları hazırla
-            results = {
+            # Monte Carlo dropout ile tahmin aralıkları
+            try:
+                intervals = self.mc_dropout_intervals(model, dataset.X_pred, scaler_y)
+            except Exception as e:
+                self.logger.warning(f"{symbol} {model_type.upper()} tahmin aralığı hesaplanamadı: {str(e)}")
+                intervals = None
+            
+            return {
                 "success": True,
                 "message": "Tahmin başarılı",
                 "predicted_values": predictions.tolist(),
+                "intervals": intervals,
                 "metrics": metrics,
                 "last_price": df[target_column].iloc[-1],
-                "features_used": feature_columns,
-                "model_type": model_type
+                "features_used": dataset.feature_columns,
+                "model_type": model_type,
+                "config": configs[model_type]
+            }
+        
+        started = time.perf_counter()
+        try:
+            if len(models) == 1 or not settings.CONCURRENT_TRAINING:
+                futures = None
+                for mt in models:
+                    try:
+                        results[mt] = train_and_predict(mt)
+                    except Exception as e:
+                        self.logger.error(f"{symbol} için {mt} tahmin hatası: {str(e)}")
+                        results[mt] = {"success": False, "message": f"Tahmin hatası: {str(e)}"}
+            else:
+                with ThreadPoolExecutor(max_workers=len(models), thread_name_prefix=f"train-{symbol}") as executor:
+                    futures = {mt: executor.submit(train_and_predict, mt) for mt in models}
+                    for mt, future in futures.items():
+                        try:
+                            results[mt] = future.result()
+                        except Exception as e:
+                            self.logger.error(f"{symbol} için {mt} tahmin hatası: {str(e)}")
+                            results[mt] = {"success": False, "message": f"Tahmin hatası: {str(e)}"}
+        finally:
+            for mt, model in models.items():
+                self.release_model(mt, splits[mt][5], model)
+        
+        if len(models) > 1:
+            wall_seconds = time.perf_counter() - started
+            fit_seconds = [r["metrics"].get("fit_seconds", 0.0) for r in results.values() if r.get("success")]
+            self.logger.info(
+                f"{symbol} için {len(models)} model {'eşzamanlı' if futures else 'sırayla'} eğitildi: "
+                f"{wall_seconds:.1f} saniye (model süreleri toplamı {sum(fit_seconds):.1f} saniye)"
+            )
+        
+        return results
+
+    def _symbol_model_dir(self, symbol: str, model_type: str) -> str:
+        return os.path.join(settings.SYMBOL_MODEL_DIR, symbol, model_type)
+
+    def _save_symbol_model(self, symbol: str, model_type: str, model: Sequential, dataset: TrainingDataset,
+                           config: Dict[str, Any], metrics: Dict[str, Any]):
+        """
+        Sembol modelinin ağırlıklarını ve eğitim bilgilerini önce geçici dizine yazar,
+        sonra (sembol, model tipi) dizinine atomik olarak taşır
+        """
+        entry_dir = self._symbol_model_dir(symbol, model_type)
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(entry_dir))
+        try:
+            model.save_weights(os.path.join(tmp_dir, "model.weights.h5"))
+            meta = {
+                "model_type": model_type,
+                "input_shape": [dataset.X.shape[1], dataset.X.shape[2]],
+                "config": config,
+                "feature_columns": dataset.feature_columns,
+                "target_column": dataset.scaler_params["target_column"],
+                "feature_set_version": self.feature_importance_service.active_version,
+                "metrics": metrics,
+                "trained_at": datetime.now()
             }
+            with open(os.path.join(tmp_dir, "meta.json"), "wb") as f:
+                f.write(serialization.dumps_bytes(meta))
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.rename(tmp_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def predict_stock_with_saved_models(self, symbol: str, model_types: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Sembolün kayıtlı derin modelleriyle, yeniden eğitmeden güncel veri üzerinden tahmin yapar.
+        Kaydı olmayan veya başka bir özellik setiyle eğitilmiş modeller için başarısız sonuç döner.
+        
+        Args:
+            symbol: Hisse senedi sembolü
+            model_types: Kullanılacak model tipleri
             
-            return results
+        Returns:
+            Dict: Model tipi -> tahmin sonuçları (predict_stock_with_models ile aynı yapıda, reused: True)
+        """
+        df = self.get_stock_dataframe(symbol)
+        active_version = self.feature_importance_service.active_version
+        results = {}
+        for mt in model_types:
+            entry_dir = self._symbol_model_dir(symbol, mt)
+            try:
+                with open(os.path.join(entry_dir, "meta.json"), "rb") as f:
+                    entry = serialization.loads(f.read())
+            except (OSError, ValueError):
+                results[mt] = {"success": False, "message": "Kayıtlı model yok"}
+                continue
+            
+            if entry["feature_set_version"] != active_version or not set(entry["feature_columns"]) <= set(df.columns):
+                results[mt] = {"success": False, "message": "Kayıtlı model eski özellik setiyle eğitilmiş"}
+                continue
+            
+            input_shape = tuple(entry["input_shape"])
+            model = None
+            try:
+                dataset = self.feature_cache.get_or_build(df, entry["feature_columns"], entry["target_column"],
+                                                          entry["config"]["sequence_length"], holdout=24)
+                model = self.acquire_model(mt, input_shape, learning_rate=entry["config"]["learning_rate"])
+                model.load_weights(os.path.join(entry_dir, "model.weights.h5"))
+                
+                raw_preds = model.predict(dataset.X_pred, verbose=0)
+                predictions = dataset.scaler_y.inverse_transform(raw_preds.reshape(-1, 1)).flatten()
+                
+                try:
+                    intervals = self.mc_dropout_intervals(model, dataset.X_pred, dataset.scaler_y)
+                except Exception as e:
+                    self.logger.warning(f"{symbol} {mt.upper()} tahmin aralığı hesaplanamadı: {str(e)}")
+                    intervals = None
+                
+                results[mt] = {
+                    "success": True,
+                    "message": "Tahmin başarılı",
+                    "predicted_values": predictions.tolist(),
+                    "intervals": intervals,
+                    "metrics": entry["metrics"],
+                    "last_price": df[entry["target_column"]].iloc[-1],
+                    "features_used": entry["feature_columns"],
+                    "model_type": mt,
+                    "config": entry["config"],
+                    "reused": True
+                }
+                self.logger.info(f"{symbol} {mt.upper()} modeli yeniden eğitilmeden kullanıldı "
+                                 f"(eğitim: {entry['trained_at']})")
+            except Exception as e:
+                self.logger.warning(f"{symbol} için kayıtlı {mt.upper()} modeli kullanılamadı: {str(e)}")
+                results[mt] = {"success": False, "message": f"Tahmin hatası: {str(e)}"}
+            finally:
+                if model is not None:
+                    self.release_model(mt, input_shape, model)
+        return results
+
+    def train_cluster_models(self, db: Session) -> Dict[str, Any]:
+        """
+        Tüm kümelerin ortak modellerini süre sınırı olmadan eğitir ve diske kaydeder.
+        Küme işi (cluster) yeniden kümelemeden sonra çağırır; tahminler modeli yalnızca
+        yükler. Önceki kümelemelere ait modeller silinir.
+        
+        Args:
+            db: Veritabanı oturumu
+            
+        Returns:
+            Dict: Küme numarası -> üye ve örnek sayısı, MSE (eğitilemeyen kümeler için hata)
+        """
+        self.feature_importance_service.load_active(db)
+        results = {}
+        current = set()
+        for cluster_id, members in self.cluster_service.get_clusters(db).items():
+            computed_at = self.cluster_service.get_assignment(db, members[0]).computed_at
+            current.add(self._cluster_model_dir(cluster_id, computed_at))
+            try:
+                entry = self._train_cluster_model(db, cluster_id, members[:settings.CLUSTER_MAX_MEMBERS], computed_at)
+            except Exception as e:
+                self.logger.error(f"Küme {cluster_id} ortak modeli eğitilemedi: {str(e)}")
+                self.logger.error(traceback.format_exc())
+                entry = None
+            if entry is None:
+                results[str(cluster_id)] = {"error": "Ortak model eğitilemedi"}
+                continue
+            self._save_cluster_model(entry)
+            results[str(cluster_id)] = {
+                "members": entry["metrics"]["members"],
+                "train_samples": entry["metrics"]["train_samples"],
+                "mse": entry["metrics"]["mse"]
+            }
+        
+        # Eski kümelemelerin modelleri artık hiçbir atamayla eşleşmez
+        if os.path.isdir(settings.CLUSTER_MODEL_DIR):
+            for cluster_dir in os.listdir(settings.CLUSTER_MODEL_DIR):
+                cluster_path = os.path.join(settings.CLUSTER_MODEL_DIR, cluster_dir)
+                for entry_dir in os.listdir(cluster_path) if os.path.isdir(cluster_path) else []:
+                    if os.path.join(cluster_path, entry_dir) not in current:
+                        shutil.rmtree(os.path.join(cluster_path, entry_dir), ignore_errors=True)
+        return results
+
+    def _train_cluster_model(self, db: Session, cluster_id: int, members: List[str],
+                             computed_at: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Kümedeki tüm sembollerin pencerelerini birleştirerek ortak modeli eğitir
+        """
+        # Üyelerin güncel verisi; ortak model için tüm üyelerde bulunan özellikler kullanılır
+        frames = {}
+        for member in members:
+            df = self.fetch_and_prepare_dataframe(member, days=45)
+            if not df.empty:
+                frames[member] = df
+        
+        if not frames:
+            return None
+        
+        feature_sets = [self.select_best_features(df) for df in frames.values()]
+        common = set.intersection(*(set(f) for f in feature_sets))
+        feature_columns = [column for column in feature_sets[0] if column in common]
+        if len(feature_columns) < 3:
+            self.logger.warning(f"Küme {cluster_id} için ortak özellik sayısı yetersiz")
+            return None
+        
+        model_type = settings.CLUSTER_MODEL_TYPE
+        config = self.tuning_service.resolve_cluster(db, cluster_id, model_type)
+        
+        # Her üyenin pencereleri kendi ölçekleyicisiyle [0, 1] aralığındadır; zaman sırasına göre bölünüp birleştirilir
+        train_parts, test_parts = [], []
+        for member, df in frames.items():
+            target_column = 'Close' if 'Close' in df.columns else 'close'
+            dataset = self.feature_cache.get_or_build(df, feature_columns, target_column, config["sequence_length"], holdout=24)
+            if len(dataset.X) < 10:
+                continue
+            train_size = int(0.8 * len(dataset.X))
+            train_parts.append((dataset.X[:train_size], dataset.y[:train_size]))
+            test_parts.append((dataset.X[train_size:], dataset.y[train_size:]))
+        
+        if not train_parts:
+            return None
+        
+        X_train = np.concatenate([x for x, _ in train_parts])
+        y_train = np.concatenate([y for _, y in train_parts])
+        X_test = np.concatenate([x for x, _ in test_parts])
+        y_test = np.concatenate([y for _, y in test_parts])
+        
+        input_shape = (X_train.shape[1], X_train.shape[2])
+        model, metrics = self.train_model(
+            f"küme-{cluster_id}",
+            X_train, y_train,
+            X_test, y_test,
+            model_type=model_type,
+            epochs=config["epochs"],
+            batch_size=config["batch_size"],
+            model=self.create_model(model_type, input_shape, learning_rate=config["learning_rate"])
+        )
+        if metrics.get('stopped_by_time_budget'):
+            # Yarım kalan eğitim saklanmaz
+            return None
+        metrics['members'] = len(train_parts)
+        metrics['train_samples'] = int(len(X_train))
+        
+        self.logger.info(f"Küme {cluster_id} ortak modeli {len(train_parts)} sembolün {len(X_train)} penceresiyle eğitildi")
+        return {
+            "cluster_id": cluster_id,
+            "model": model,
+            "model_type": model_type,
+            "input_shape": list(input_shape),
+            "config": config,
+            "feature_columns": feature_columns,
+            "feature_set_version": self.feature_importance_service.active_version,
+            "members": list(frames),
+            "metrics": metrics,
+            "computed_at": computed_at,
+            "trained_at": datetime.now()
+        }
+
+    def _cluster_model_dir(self, cluster_id: int, computed_at: datetime) -> str:
+        return os.path.join(settings.CLUSTER_MODEL_DIR, str(cluster_id), computed_at.strftime("%Y%m%dT%H%M%S%f"))
+
+    def _save_cluster_model(self, entry: Dict[str, Any]):
+        """
+        Ortak modelin ağırlıklarını ve eğitim bilgilerini önce geçici dizine yazar,
+        sonra (küme, kümeleme zamanı) dizinine atomik olarak taşır
+        """
+        entry_dir = self._cluster_model_dir(entry["cluster_id"], entry["computed_at"])
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(entry_dir))
+        try:
+            entry["model"].save_weights(os.path.join(tmp_dir, "model.weights.h5"))
+            meta = {key: value for key, value in entry.items() if key != "model"}
+            with open(os.path.join(tmp_dir, "meta.json"), "wb") as f:
+                f.write(serialization.dumps_bytes(meta))
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.rename(tmp_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        entry["saved_at"] = os.path.getmtime(os.path.join(entry_dir, "meta.json"))
+        self.cluster_models[entry["cluster_id"]] = entry
+
+    def _load_cluster_model(self, cluster_id: int, computed_at: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Küme işinin kaydettiği ortak modeli yükler (kayıt yoksa None)
+        """
+        entry_dir = self._cluster_model_dir(cluster_id, computed_at)
+        try:
+            meta_path = os.path.join(entry_dir, "meta.json")
+            saved_at = os.path.getmtime(meta_path)
+            with open(meta_path, "rb") as f:
+                entry = serialization.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        model = self.create_model(entry["model_type"], tuple(entry["input_shape"]),
+                                  learning_rate=entry["config"]["learning_rate"])
+        model.load_weights(os.path.join(entry_dir, "model.weights.h5"))
+        entry.update(model=model, computed_at=computed_at, saved_at=saved_at,
+                     trained_at=datetime.fromisoformat(entry["trained_at"]))
+        return entry
+
+    def get_cluster_model(self, db: Session, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Sembolün kümesine ait, küme işinde eğitilip kaydedilmiş ortak modeli döndürür.
+        Model burada eğitilmez; güncel kümeleme ve özellik seti için kayıt yoksa None döner.
+        
+        Args:
+            db: Veritabanı oturumu
+            symbol: Hisse senedi sembolü
+            
+        Returns:
+            Dict: model, özellikler, üyeler ve metrikler (sembolün kümesi veya modeli yoksa None)
+        """
+        assignment = self.cluster_service.get_assignment(db, symbol)
+        if assignment is None:
+            return None
+        
+        # Küme işi modeli yeniden kaydettiyse (ör. hiperparametre aramasından sonra) yeniden yüklenir
+        active_version = self.feature_importance_service.active_version
+        cached = self.cluster_models.get(assignment.cluster_id)
+        try:
+            saved_at = os.path.getmtime(os.path.join(self._cluster_model_dir(assignment.cluster_id, assignment.computed_at), "meta.json"))
+        except OSError:
+            saved_at = None
+        if (cached and cached["computed_at"] == assignment.computed_at and cached["saved_at"] == saved_at
+                and cached["feature_set_version"] == active_version):
+            return cached
+        
+        entry = self._load_cluster_model(assignment.cluster_id, assignment.computed_at)
+        if entry is None:
+            self.logger.warning(f"Küme {assignment.cluster_id} için kayıtlı ortak model yok, küme işi çalıştırılmalı")
+            return None
+        if entry["feature_set_version"] != active_version:
+            self.logger.warning(f"Küme {assignment.cluster_id} ortak modeli eski özellik setiyle "
+                                f"(v{entry['feature_set_version']}) eğitilmiş, kullanılmıyor")
+            return None
+        
+        self.cluster_models[assignment.cluster_id] = entry
+        return entry
+
+    def predict_stock_with_cluster_model(self, db: Session, symbol: str) -> Dict[str, Any]:
+        """
+        Sembolün tahminini kümesinin kayıtlı ortak modeliyle yapar.
+        
+        Args:
+            db: Veritabanı oturumu
+            symbol: Hisse senedi sembolü
+            
+        Returns:
+            Dict: Tahmin sonuçları (predict_stock_with_models ile aynı yapıda)
+        """
+        try:
+            entry = self.get_cluster_model(db, symbol)
+            if entry is None:
+                return {"success": False, "message": "Sembol için küme modeli yok"}
+            
+            df = self.get_stock_dataframe(symbol)
+            if df.empty:
+                df = self.fetch_and_prepare_dataframe(symbol, days=45)
+            target_column = 'Close' if 'Close' in df.columns else 'close'
+            dataset = self.feature_cache.get_or_build(df, entry["feature_columns"], target_column, entry["config"]["sequence_length"], holdout=24)
+            scaler_y = dataset.scaler_y
+            
+            raw_preds = entry["model"].predict(dataset.X_pred, verbose=0)
+            predictions = scaler_y.inverse_transform(raw_preds.reshape(-1, 1)).flatten()
+            
+            try:
+                intervals = self.mc_dropout_intervals(entry["model"], dataset.X_pred, scaler_y)
+            except Exception as e:
+                self.logger.warning(f"{symbol} küme modeli tahmin aralığı hesaplanamadı: {str(e)}")
+                intervals = None
+            
+            metrics = dict(entry["metrics"])
+            metrics['cluster_id'] = entry["cluster_id"]
+            
+            return {
+                "success": True,
+                "message": "Tahmin başarılı",
+                "predicted_values": predictions.tolist(),
+                "intervals": intervals,
+                "metrics": metrics,
+                "last_price": df[target_column].iloc[-1],
+                "features_used": entry["feature_columns"],
+                "model_type": CLUSTER_MODEL_NAME,
+                "config": entry["config"]
+            }
             
         except Exception as e:
-            self.logger.error(f"{symbol} için tahmin hatası: {str(e)}")
+            self.logger.error(f"{symbol} için küme modeli tahmin hatası: {str(e)}")
             return {"success": False, "message": f"Tahmin hatası: {str(e)}"}
 
+    def mc_dropout_intervals(self, model: Sequential, X_pred: np.ndarray, scaler_y: MinMaxScaler,
+                             samples: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Monte Carlo dropout ile tahmin aralıklarını hesaplar.
+        
+        Son pencere K kez çoğaltılarak tek bir toplu ileri geçişte dropout açık
+        (training=True) olarak modelden geçirilir; ufuk adımı başına örneklerin
+        yüzdelikleri tahmin aralığını verir.
+        
+        Args:
+            model: Eğitilmiş model
+            X_pred: Tahmin penceresi (1, zaman, özellik)
+            scaler_y: Hedef ölçekleyici
+            samples: Örnek sayısı (varsayılan: MC_DROPOUT_SAMPLES)
+            
+        Returns:
+            Dict: Örnek sayısı, ortalama, standart sapma ve yüzdelik adı -> ufuk adımı başına fiyatlar
+        """
+        tf = load_tensorflow()
+        samples = samples or settings.MC_DROPOUT_SAMPLES
+        quantiles = [float(q) for q in settings.MC_DROPOUT_QUANTILES.split(",") if q.strip()]
+        
+        X_tiled = np.repeat(np.asarray(X_pred[-1:], dtype=np.float32), samples, axis=0)
+        raw = np.asarray(model(tf.convert_to_tensor(X_tiled), training=True)).reshape(samples, -1)
+        prices = scaler_y.inverse_transform(raw.reshape(-1, 1)).reshape(samples, -1)
+        
+        values = np.quantile(prices, quantiles, axis=0)
+        return {
+            "samples": samples,
+            "mean": prices.mean(axis=0).tolist(),
+            "std": prices.std(axis=0).tolist(),
+            "quantiles": {f"q{int(round(q * 100)):02d}": values[i].tolist() for i, q in enumerate(quantiles)}
+        }
+
+    def predict_stock_with_baselines(self, symbol: str) -> Dict[str, Any]:
+        """
+        Kaydedilmiş DataFrame üzerinde hızlı model katmanını (naive, mevsimsel naive,
+        ridge, gradient boosting) eğitir ve tahmin yapar.
+        
+        Args:
+            symbol: Hisse senedi sembolü
+            
+        Returns:
+            Dict: Model bazlı tahminler ve doğrulama metrikleri
+        """
+        try:
+            # Derin modellerle aynı pencereler ve bölme kullanılır
+            dataset = self.get_training_dataset(symbol, sequence_length=30)
+            
+            if dataset is None:
+                return {"success": False, "message": "Veri seti hazırlanamadı"}
+            
+            X, y, scaler_y = dataset.X, dataset.y, dataset.scaler_y
+            df = self.get_stock_dataframe(symbol)
+            target_column = dataset.scaler_params["target_column"]
+            
+            train_size = int(0.8 * len(X))
+            X_train, X_test = X[:train_size], X[train_size:]
+            y_train, y_test = y[:train_size], y[train_size:]
+            
+            X_pred = dataset.X_pred
+            recent_targets = scaler_y.transform(
+                df[target_column].values[-self.baseline_service.season_length:].reshape(-1, 1)
+            ).flatten()
+            
+            started = time.perf_counter()
+            results = self.baseline_service.fit_predict(X_train, y_train, X_test, y_test, X_pred, recent_targets)
+            self.logger.info(f"{symbol} hızlı model katmanı {time.perf_counter() - started:.3f} saniyede eğitildi")
+            
+            predictions = {}
+            metrics = {}
+            for name, result in results.items():
+                values = np.array(result['predicted_values']).reshape(-1, 1)
+                predictions[name] = scaler_y.inverse_transform(values).flatten().tolist()
+                metrics[name] = result['metrics']
+            
+            return {
+                "success": bool(predictions),
+                "predictions": predictions,
+                "metrics": metrics
+            }
+            
+        except Exception as e:
+            self.logger.error(f"{symbol} için hızlı model hatası: {str(e)}")
+            return {"success": False, "message": f"Hızlı model hatası: {str(e)}"}
+
     def train_model(self, symbol: str, X_train: np.ndarray, y_train: np.ndarray, 
                     X_test: np.ndarray, y_test: np.ndarray, 
                     model_type: str = 'lstm', epochs: int = 150, 
-                    batch_size: int = 20) -> Tuple[Sequential, Dict[str, float]]:
+                    batch_size: int = 20, deadline: Optional[float] = None,
+                    model: Optional[Sequential] = None, patience: int = 30) -> Tuple[Sequential, Dict[str, float]]:
         """
         Belirtilen model tipini eğitir ve test eder.
         
@@ -1074,48 +1689,57 @@ class PredictionService:
             model_type: Model tipi ('lstm', 'gru', veya 'attention')
             epochs: Eğitim devresi sayısı (150)
             batch_size: Toplu işleme boyutu (20)
+            deadline: Eğitimin epoch sonunda durdurulacağı son zaman (time.monotonic)
+            model: Önceden oluşturulmuş model (verilmezse model tipine göre oluşturulur)
+            patience: Early stopping sabrı (epoch)
             
         Returns:
             Tuple[Sequential, Dict]: Eğitilmiş model ve başarı metrikleri
         """
         self.logger.info(f"{symbol} için {model_type.upper()} modeli eğitiliyor")
         
-        input_shape = (X_train.shape[1], X_train.shape[2])
-        
         # Model oluştur
-        if model_type.lower() == 'lstm':
-            model = self.create_lstm_model(input_shape)
-        elif model_type.lower() == 'gru':
-            model = self.create_gru_model(input_shape)
-        elif model_type.lower() == 'attention':
-            model = self.create_attention_model(input_shape)
-        else:
-            raise ValueError(f"Desteklenmeyen model tipi: {model_type}")
+        if model is None:
+            model = self.create_model(model_type, (X_train.shape[1], X_train.shape[2]))
+        
+        from sklearn.metrics import mean_squared_error, mean_absolute_error
         
         # Early stopping callback'i oluştur - aşırı eğitimi önlemek için
-        early_stopping = EarlyStopping(
+        early_stopping = load_tensorflow().keras.callbacks.EarlyStopping(
             monitor='val_loss',
-            patience=30,  # Daha uzun süre bekle
+            patience=patience,
             verbose=1,
             restore_best_weights=True
         )
+        callbacks = [early_stopping]
+        
+        # Süre sınırı verildiyse eğitimi zamanında durdur
+        time_budget = None
+        if deadline is not None:
+            time_budget = time_budget_callback_class()(deadline)
+            callbacks.append(time_budget)
         
         # Modeli eğit
         try:
+            fit_started = time.perf_counter()
             history = model.fit(
                 X_train, y_train,
                 epochs=epochs,  # 150 epoch
                 batch_size=batch_size,  # 20 batch size
                 validation_data=(X_test, y_test),
                 verbose=0,
-                callbacks=[early_stopping]
+                callbacks=callbacks
             )
             
             # Eğitim sonuçlarını logla
             self.logger.info(f"{symbol} {model_type.upper()} eğitimi tamamlandı: {len(history.epoch)} epoch")
+            if time_budget is not None and time_budget.stopped_epoch is not None:
+                self.logger.warning(f"{symbol} {model_type.upper()} eğitimi süre sınırı nedeniyle {time_budget.stopped_epoch + 1}. epoch'ta durduruldu")
+            
+            fit_seconds = time.perf_counter() - fit_started
             
             # Test veri seti üzerinde değerlendir
-            y_pred = model.predict(X_test)
+            y_pred = model.predict(X_test, verbose=0)
             
             # Metrikler
             mse = mean_squared_error(y_test, y_pred)
@@ -1130,7 +1754,9 @@ class PredictionService:
                 'accuracy': float(direction_accuracy),
                 'epochs': len(history.epoch),
                 'final_loss': float(history.history['loss'][-1]),
-                'final_val_loss': float(history.history['val_loss'][-1])
+                'final_val_loss': float(history.history['val_loss'][-1]),
+                'stopped_by_time_budget': time_budget is not None and time_budget.stopped_epoch is not None,
+                'fit_seconds': round(fit_seconds, 3)
             }
             
             self.logger.info(f"{symbol} {model_type.upper()} metrikleri - MSE: {mse:.6f}, MAE: {mae:.6f}, Accuracy: {direction_accuracy:.4f}")
@@ -1141,16 +1767,69 @@ class PredictionService:
             self.logger.error(f"{symbol} {model_type.upper()} eğitim hatası: {str(e)}")
             raise
 
-    def create_lstm_model(self, input_shape: Tuple[int, int]) -> Sequential:
+    def acquire_model(self, model_type: str, input_shape: Tuple[int, int], output_size: int = 1,
+                      learning_rate: Optional[float] = None) -> Sequential:
+        """
+        Eğitime hazır bir model döndürür. MODEL_TEMPLATES_ENABLED açıksa aynı mimari ve
+        girdi boyutu için derlenmiş şablon, ağırlıkları ve optimizer durumu sıfırlanarak
+        yeniden kullanılır; iş bitince release_model ile geri verilmelidir.
+        """
+        learning_rate = learning_rate or default_training_config(model_type)["learning_rate"]
+        if not settings.MODEL_TEMPLATES_ENABLED:
+            return self.create_model(model_type, input_shape, output_size, learning_rate=learning_rate)
+        
+        model = self.model_templates.acquire(model_type, input_shape, output_size)
+        # Öğrenme katsayısı optimizer değişkenidir; şablonu yeniden derlemeden güncellenir
+        model.optimizer.learning_rate = learning_rate
+        return model
+    
+    def release_model(self, model_type: str, input_shape: Tuple[int, int], model: Sequential, output_size: int = 1):
+        """
+        acquire_model ile alınan modeli şablon havuzuna geri verir
+        """
+        if settings.MODEL_TEMPLATES_ENABLED:
+            self.model_templates.release(model_type, input_shape, output_size, model)
+    
+    def create_model(self, model_type: str, input_shape: Tuple[int, int], output_size: int = 1,
+                     learning_rate: Optional[float] = None) -> Sequential:
+        """
+        Model tipine göre derin öğrenme modeli oluşturur.
+        
+        Args:
+            model_type: Model tipi ('lstm', 'gru', veya 'attention')
+            input_shape: Girdi verisi boyutu (sequence_length, features)
+            output_size: Çıkış sayısı
+            learning_rate: Öğrenme katsayısı (verilmezse model tipinin varsayılanı)
+            
+        Returns:
+            Sequential: Eğitime hazır model
+        """
+        if model_type.lower() == 'lstm':
+            return self.create_lstm_model(input_shape, output_size, learning_rate)
+        elif model_type.lower() == 'gru':
+            return self.create_gru_model(input_shape, output_size, learning_rate)
+        elif model_type.lower() == 'attention':
+            return self.create_attention_model(input_shape, output_size, learning_rate)
+        raise ValueError(f"Desteklenmeyen model tipi: {model_type}")
+
+    def create_lstm_model(self, input_shape: Tuple[int, int], output_size: int = 1,
+                          learning_rate: Optional[float] = None) -> Sequential:
         """
         LSTM tabanlı sinir ağı modeli oluşturur.
         
         Args:
             input_shape: Girdi verisi boyutu (sequence_length, features)
+            output_size: Çıkış sayısı (çok ufuklu tahmin için ufuk sayısı)
+            learning_rate: Öğrenme katsayısı (verilmezse model tipinin varsayılanı)
             
         Returns:
             Sequential: Eğitime hazır LSTM modeli
         """
+        load_tensorflow()
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense, Dropout
+        from tensorflow.keras.optimizers import Adam
+        
         try:
             # Model oluştur
             model = Sequential()
@@ -1162,10 +1841,10 @@ class PredictionService:
             model.add(Dropout(0.2))
             model.add(LSTM(32, return_sequences=False))
             model.add(Dropout(0.2))
-            model.add(Dense(1))  # Tek bir tahmin için bir nöron
+            model.add(Dense(output_size))  # Her tahmin ufku için bir nöron
             
-            # Modeli derle - öğrenme katsayısı 0.0001
-            model.compile(optimizer=Adam(learning_rate=0.0001), loss='mse', metrics=['mae'])
+            # Modeli derle
+            model.compile(optimizer=Adam(learning_rate=learning_rate or default_training_config('lstm')["learning_rate"]), loss='mse', metrics=['mae'])
             
             return model
             
@@ -1175,20 +1854,28 @@ class PredictionService:
             # Daha basit bir model döndür
             fallback_model = Sequential()
             fallback_model.add(LSTM(20, input_shape=input_shape, return_sequences=False))
-            fallback_model.add(Dense(1))
+            fallback_model.add(Dense(output_size))
             fallback_model.compile(optimizer='adam', loss='mse')
             return fallback_model
 
-    def create_gru_model(self, input_shape: Tuple[int, int]) -> Sequential:
+    def create_gru_model(self, input_shape: Tuple[int, int], output_size: int = 1,
+                         learning_rate: Optional[float] = None) -> Sequential:
         """
         GRU tabanlı sinir ağı modeli oluşturur.
         
         Args:
             input_shape: Girdi verisi boyutu (sequence_length, features)
+            output_size: Çıkış sayısı (çok ufuklu tahmin için ufuk sayısı)
+            learning_rate: Öğrenme katsayısı (verilmezse model tipinin varsayılanı)
             
         Returns:
             Sequential: Eğitime hazır GRU modeli
         """
+        load_tensorflow()
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import GRU, Dense, Dropout
+        from tensorflow.keras.optimizers import Adam
+        
         try:
             # Model oluştur
             model = Sequential()
@@ -1198,10 +1885,10 @@ class PredictionService:
             model.add(Dropout(0.2))
             model.add(GRU(30, return_sequences=False))
             model.add(Dropout(0.2))
-            model.add(Dense(1))  # Tek bir tahmin için bir nöron
+            model.add(Dense(output_size))  # Her tahmin ufku için bir nöron
             
             # Modeli derle
-            model.compile(optimizer=Adam(learning_rate=0.001), loss='mse', metrics=['mae'])
+            model.compile(optimizer=Adam(learning_rate=learning_rate or default_training_config('gru')["learning_rate"]), loss='mse', metrics=['mae'])
             
             return model
             
@@ -1211,20 +1898,28 @@ class PredictionService:
             # Daha basit bir model döndür
             fallback_model = Sequential()
             fallback_model.add(GRU(20, input_shape=input_shape, return_sequences=False))
-            fallback_model.add(Dense(1))
+            fallback_model.add(Dense(output_size))
             fallback_model.compile(optimizer='adam', loss='mse')
             return fallback_model
 
-    def create_attention_model(self, input_shape: Tuple[int, int]) -> Sequential:
+    def create_attention_model(self, input_shape: Tuple[int, int], output_size: int = 1,
+                               learning_rate: Optional[float] = None) -> Sequential:
         """
         Attention mekanizması içeren sinir ağı modeli oluşturur.
         
         Args:
             input_shape: Girdi verisi boyutu (sequence_length, features)
+            output_size: Çıkış sayısı (çok ufuklu tahmin için ufuk sayısı)
+            learning_rate: Öğrenme katsayısı (verilmezse model tipinin varsayılanı)
             
         Returns:
             Sequential: Eğitime hazır attention modeli
         """
+        tf = load_tensorflow()
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import GRU, Dense, MultiHeadAttention, LayerNormalization
+        from tensorflow.keras.optimizers import Adam
+        
         try:
             # TensorFlow sürümüne göre farklı implementasyon
             # TF 2.4+ için MultiHeadAttention kullanıyoruz
@@ -1248,13 +1943,13 @@ class PredictionService:
             
             # Flatten ve tahmin
             x = tf.keras.layers.GlobalAveragePooling1D()(x)
-            outputs = tf.keras.layers.Dense(1)(x)
+            outputs = tf.keras.layers.Dense(output_size)(x)
             
             # Model oluştur
             model = tf.keras.Model(inputs=inputs, outputs=outputs)
             
             # Modeli derle
-            model.compile(optimizer=Adam(learning_rate=0.001), loss='mse', metrics=['mae'])
+            model.compile(optimizer=Adam(learning_rate=learning_rate or default_training_config('attention')["learning_rate"]), loss='mse', metrics=['mae'])
             
             return model
             
@@ -1264,11 +1959,13 @@ class PredictionService:
             # Daha basit bir GRU modeli döndür (fallback)
             fallback_model = Sequential()
             fallback_model.add(GRU(20, input_shape=input_shape, return_sequences=False))
-            fallback_model.add(Dense(1))
+            fallback_model.add(Dense(output_size))
             fallback_model.compile(optimizer='adam', loss='mse')
             return fallback_model
 
-    def predict_stock(self, db: Session, stock: BaseStock, model_type: str = 'all') -> Dict[str, Any]:
+    def predict_stock(self, db: Session, stock: BaseStock, model_type: str = 'all',
+                      time_budget: Optional[float] = None, writer: Optional[WriteBehindBuffer] = None,
+                      reuse_models: bool = False) -> Dict[str, Any]:
         """
         Verilen hisse senedi için tahmin yapar ve sonuçları veritabanına kaydeder.
         
@@ -1276,6 +1973,11 @@ class PredictionService:
             db: Veritabanı oturumu
             stock: Hisse senedi modeli
             model_type: Kullanılacak model tipi ('lstm', 'gru', 'attention' veya 'all')
+            time_budget: Sembol için ayrılan eğitim süresi (saniye), None ise sınırsız
+            writer: Verilirse sonuç bu tampona eklenir ve arka plandaki yazıcı tarafından
+                toplu olarak kaydedilir (persist_predictions); None ise hemen yazılır
+            reuse_models: True ise (veride drift yok) derin modeller kayıtlı ağırlıklarıyla
+                yeniden eğitilmeden kullanılır; kaydı olmayanlar eğitilir
             
         Returns:
             Dict: Tahmin sonuçları, PredictionStockResponse şemasıyla uyumlu
@@ -1283,6 +1985,7 @@ class PredictionService:
         try:
             symbol = stock.symbol
             self.logger.info(f"{symbol} için {model_type} modeli ile tahmin yapılıyor")
+            deadline = time.monotonic() + time_budget if time_budget else None
             
             # Önce veriyi hazırla
             df = self.fetch_and_prepare_dataframe(symbol, days=45)
@@ -1297,31 +2000,114 @@ class PredictionService:
             # Model tipine göre tahminleri yap
             predictions = {}
             metrics = {}
+            prediction_intervals = {}
+            training_configs = {}
             
-            # Kullanılan özellikler
+            # Kullanılan özellikler (etkin özellik seti sürümüne göre budanmış)
+            self.feature_importance_service.load_active(db)
+            feature_set_version = self.feature_importance_service.active_version
             feature_columns = self.select_best_features(df)
             
             # Eğitim ve tahmin penceresi boyutları
-            training_window = 30  # sequence_length değeri - 30'a çıkarıldı
+            training_window = DEFAULT_SEQUENCE_LENGTH
             prediction_window = 1  # Tek adım tahmin
             
-            if model_type.lower() == 'all':
-                # Tüm model tipleri için tahmin yap
-                model_types = ['lstm', 'gru', 'attention']
-                for mt in model_types:
-                    try:
-                        result = self.predict_stock_with_dataframe(symbol, mt)
+            model_tier = MODEL_TIER_DEEP
+            escalation_reason = None
+            training_started = time.perf_counter()
+            
+            run_deep_models = True
+            skipped_models = []
+            reused_models = []
+            if model_type.lower() in ('all', MODEL_TIER_BASELINE) and (settings.CASCADE_ENABLED or model_type.lower() == MODEL_TIER_BASELINE):
+                # Önce hızlı model katmanı; yeterliyse derin modeller hiç eğitilmez
+                baseline_result = self.predict_stock_with_baselines(symbol)
+                if baseline_result.get('success'):
+                    predictions.update(baseline_result['predictions'])
+                    metrics.update(baseline_result['metrics'])
+                
+                current_price_hint = float(stock.last_price) if getattr(stock, "last_price", None) else None
+                escalate, escalation_reason = self.baseline_service.should_escalate(
+                    baseline_result.get('metrics', {}), baseline_result.get('predictions', {}), current_price_hint
+                )
+                
+                if model_type.lower() == MODEL_TIER_BASELINE or not escalate:
+                    model_tier = MODEL_TIER_BASELINE
+                    run_deep_models = False
+                    self.logger.info(f"{symbol} için hızlı model katmanı kullanılıyor: {escalation_reason}")
+                else:
+                    self.logger.info(f"{symbol} için derin modellere geçiliyor: {escalation_reason}")
+            
+            if not run_deep_models:
+                # Hızlı model katmanı yeterli, derin modeller atlanır
+                pass
+            elif model_type.lower() == CLUSTER_MODEL_NAME or (
+                    model_type.lower() == 'all' and settings.CLUSTER_ROUTING_ENABLED
+                    and self.cluster_service.get_assignment(db, symbol) is not None):
+                # Sembol kümesinin ortak modeliyle tahmin
+                result = self.predict_stock_with_cluster_model(db, symbol)
+                if result.get('success'):
+                    if reuse_models:
+                        reused_models.append(CLUSTER_MODEL_NAME)
+                    predictions[CLUSTER_MODEL_NAME] = result.get('predicted_values', [])
+                    metrics[CLUSTER_MODEL_NAME] = result.get('metrics', {})
+                    training_configs[CLUSTER_MODEL_NAME] = result.get('config')
+                    if result.get('intervals'):
+                        prediction_intervals[CLUSTER_MODEL_NAME] = result['intervals']
+                elif model_type.lower() == 'all':
+                    # Küme modeli kullanılamıyorsa sembole özel derin modellere dön
+                    self.logger.warning(f"{symbol} için küme modeli kullanılamadı, sembol modelleri eğitiliyor")
+                    configs = {mt: self.tuning_service.resolve(db, symbol, mt) for mt in DEEP_MODELS}
+                    results = self.predict_stock_with_models(symbol, DEEP_MODELS, deadline=deadline, configs=configs,
+                                                             reuse=reuse_models)
+                    for mt, result in results.items():
                         if result.get('success'):
+                            if result.get('reused'):
+                                reused_models.append(mt)
                             predictions[mt] = result.get('predicted_values', [])
                             metrics[mt] = result.get('metrics', {})
-                    except Exception as e:
-                        self.logger.error(f"{symbol} için {mt} tahmin hatası: {str(e)}")
+                            training_configs[mt] = result.get('config')
+                            if result.get('intervals'):
+                                prediction_intervals[mt] = result['intervals']
+            elif model_type.lower() == 'all':
+                # Gerçekleşen hatalarda ağırlığı sıfıra yaklaşan modeller eğitilmez
+                model_types, skipped_models = self.ensemble_service.active_models(db, symbol, DEEP_MODELS)
+                if skipped_models:
+                    self.logger.info(f"{symbol} için düşük ağırlıklı modeller atlanıyor: {', '.join(skipped_models)}")
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.logger.warning(f"{symbol} için süre sınırı doldu, derin modeller atlanıyor")
+                    model_types = []
+                
+                # Veri seti bir kez hazırlanır, modeller eşzamanlı eğitilir (CONCURRENT_TRAINING)
+                configs = {mt: self.tuning_service.resolve(db, symbol, mt) for mt in model_types}
+                results = self.predict_stock_with_models(symbol, model_types, deadline=deadline, configs=configs,
+                                                         reuse=reuse_models) if model_types else {}
+                for mt, result in results.items():
+                    if result.get('success'):
+                        if result.get('reused'):
+                            reused_models.append(mt)
+                        predictions[mt] = result.get('predicted_values', [])
+                        metrics[mt] = result.get('metrics', {})
+                        training_configs[mt] = result.get('config')
+                        if result.get('intervals'):
+                            prediction_intervals[mt] = result['intervals']
             else:
                 # Sadece belirtilen model tipini kullan
-                result = self.predict_stock_with_dataframe(symbol, model_type.lower())
+                config = self.tuning_service.resolve(db, symbol, model_type.lower())
+                result = self.predict_stock_with_dataframe(symbol, model_type.lower(), deadline=deadline, config=config,
+                                                           reuse=reuse_models)
                 if result.get('success'):
+                    if result.get('reused'):
+                        reused_models.append(model_type.lower())
                     predictions[model_type.lower()] = result.get('predicted_values', [])
                     metrics[model_type.lower()] = result.get('metrics', {})
+                    training_configs[model_type.lower()] = result.get('config')
+                    if result.get('intervals'):
+                        prediction_intervals[model_type.lower()] = result['intervals']
+            
+            # Eğitilen derin modellerin son eğitim zamanını kaydet (kayıtlı ağırlıkla kullanılanlar hariç)
+            self.ensemble_service.mark_trained(db, symbol, [name for name in predictions
+                                                            if name in DEEP_MODELS and name not in reused_models])
             
             # En iyi modeli belirle (en düşük MSE değerine sahip model)
             best_model = None
@@ -1335,12 +2121,31 @@ class PredictionService:
                     best_mse = current_mse
                     best_mae = model_metrics.get('mae', 0)
             
-            # Volatilite hesapla (basit yöntem - tahminler arasındaki farkın standart sapması)
-            all_predictions = []
-            for preds in predictions.values():
-                all_predictions.extend(preds)
+            # Gerçekleşen hatalara göre ağırlıklı ensemble tahmini
+            model_states = self.ensemble_service.get_weights(db, symbol)
+            ensemble = self.ensemble_service.combine(predictions, model_states)
+            ensemble_pred = ensemble["predicted_values"][0] if ensemble else None
+            model_weights = ensemble["weights"] if ensemble else {}
+            
+            # Yeterli geçmiş varsa en iyi model, en yüksek ağırlıklı model olur
+            if ensemble and ensemble["leader"]:
+                best_model = ensemble["leader"]
+                best_mse = metrics.get(best_model, {}).get('mse', float('inf'))
+                best_mae = metrics.get(best_model, {}).get('mae', float('inf'))
+            
+            # Eğitim penceresi: en iyi modelin kullandığı pencere uzunluğu
+            if training_configs.get(best_model):
+                training_window = training_configs[best_model]["sequence_length"]
             
-            volatility = np.std(all_predictions) if len(all_predictions) > 1 else 0.0
+            # Volatilite: model tahminlerinin ensemble etrafındaki ağırlıklı dağılımı
+            volatility = ensemble["dispersion"] if ensemble else 0.0
+            
+            # Ensemble tahmin aralığı: model yüzdeliklerinin ağırlıklı ortalaması
+            interval_lower, interval_upper = None, None
+            if prediction_intervals and ensemble:
+                combined_interval = self.combine_intervals(prediction_intervals, ensemble["weights"])
+                prediction_intervals[ENSEMBLE_MODEL_NAME] = combined_interval
+                interval_lower, interval_upper = self.interval_bounds(combined_interval)
             
             # Her model için değişim yüzdeleri hesapla
             current_price = float(stock.last_price) if hasattr(stock, "last_price") else None
@@ -1351,127 +2156,90 @@ class PredictionService:
                     avg_pred = np.mean(preds)
                     price_changes[model_name] = ((avg_pred - current_price) / current_price) * 100
             
-            # Tahmin sonuçlarını veritabanına kaydet
-            try:
-                # Mevcut tahmini kontrol et
-                existing_prediction = db.query(PredictionStock).filter(PredictionStock.symbol == symbol).first()
-                
-                # Tüm model sonuçları birleştirilerek tahmin sonuçları
-                combined_results = {
-                    "predictions": predictions,
-                    "metrics": metrics,
-                    "last_updated": datetime.now().isoformat(),
-                    "symbol": symbol,
-                    "models_used": list(predictions.keys()),
-                    "best_model": best_model,
-                    "best_mse": best_mse,
-                    "best_mae": best_mae,
-                    "volatility": volatility,
-                    "price_changes": price_changes,
-                    "features_used": feature_columns,
-                    "training_window": training_window,
-                    "prediction_window": prediction_window,
-                    "prediction_date": (datetime.now() + timedelta(days=1)).isoformat()
-                }
-                
-                # Sonuçları JSON olarak sakla
-                json_results = json.dumps(combined_results)
-                
-                if existing_prediction:
-                    # Mevcut tahmini güncelle
-                    existing_prediction.prediction_data = json_results
-                    existing_prediction.last_updated = datetime.now()
-                    
-                    # Diğer sütunları da güncelle
-                    existing_prediction.lstm_predicted_price = predictions.get('lstm', [0])[0] if 'lstm' in predictions and predictions['lstm'] else None
-                    existing_prediction.lstm_change_percent = price_changes.get('lstm', 0) if 'lstm' in price_changes else None
-                    existing_prediction.lstm_mse = metrics.get('lstm', {}).get('mse', 0) if 'lstm' in metrics else None
-                    existing_prediction.lstm_mae = metrics.get('lstm', {}).get('mae', 0) if 'lstm' in metrics else None
-                    
-                    existing_prediction.gru_predicted_price = predictions.get('gru', [0])[0] if 'gru' in predictions and predictions['gru'] else None
-                    existing_prediction.gru_change_percent = price_changes.get('gru', 0) if 'gru' in price_changes else None
-                    existing_prediction.gru_mse = metrics.get('gru', {}).get('mse', 0) if 'gru' in metrics else None
-                    existing_prediction.gru_mae = metrics.get('gru', {}).get('mae', 0) if 'gru' in metrics else None
-                    
-                    existing_prediction.attention_predicted_price = predictions.get('attention', [0])[0] if 'attention' in predictions and predictions['attention'] else None
-                    existing_prediction.attention_change_percent = price_changes.get('attention', 0) if 'attention' in price_changes else None
-                    existing_prediction.attention_mse = metrics.get('attention', {}).get('mse', 0) if 'attention' in metrics else None
-                    existing_prediction.attention_mae = metrics.get('attention', {}).get('mae', 0) if 'attention' in metrics else None
-                    
-                    existing_prediction.current_price = current_price
-                    existing_prediction.prediction_date = datetime.now() + timedelta(days=1)
-                    existing_prediction.volatility = volatility
-                    
-                    existing_prediction.features_used = feature_columns
-                    existing_prediction.training_window = training_window
-                    existing_prediction.prediction_window = prediction_window
-                    
-                    existing_prediction.best_model = best_model
-                    existing_prediction.best_mse = best_mse
-                    existing_prediction.best_mae = best_mae
-                    
-                    existing_prediction.updated_at = datetime.now()
-                    
-                    db.commit()
-                    self.logger.info(f"{symbol} için mevcut tahmin güncellendi")
-                else:
-                    # Yeni tahmin oluştur
-                    new_prediction = PredictionStock(
-                        symbol=symbol,
-                        base_stock_id=stock.id,
-                        prediction_data=json_results,
-                        last_updated=datetime.now(),
-                        
-                        # Tahmin değerleri - LSTM
-                        lstm_predicted_price=predictions.get('lstm', [0])[0] if 'lstm' in predictions and predictions['lstm'] else None,
-                        lstm_change_percent=price_changes.get('lstm', 0) if 'lstm' in price_changes else None,
-                        lstm_mse=metrics.get('lstm', {}).get('mse', 0) if 'lstm' in metrics else None,
-                        lstm_mae=metrics.get('lstm', {}).get('mae', 0) if 'lstm' in metrics else None,
-                        
-                        # Tahmin değerleri - GRU
-                        gru_predicted_price=predictions.get('gru', [0])[0] if 'gru' in predictions and predictions['gru'] else None,
-                        gru_change_percent=price_changes.get('gru', 0) if 'gru' in price_changes else None,
-                        gru_mse=metrics.get('gru', {}).get('mse', 0) if 'gru' in metrics else None,
-                        gru_mae=metrics.get('gru', {}).get('mae', 0) if 'gru' in metrics else None,
-                        
-                        # Tahmin değerleri - Attention
-                        attention_predicted_price=predictions.get('attention', [0])[0] if 'attention' in predictions and predictions['attention'] else None,
-                        attention_change_percent=price_changes.get('attention', 0) if 'attention' in price_changes else None,
-                        attention_mse=metrics.get('attention', {}).get('mse', 0) if 'attention' in metrics else None,
-                        attention_mae=metrics.get('attention', {}).get('mae', 0) if 'attention' in metrics else None,
-                        
-                        # Ortak değerler
-                        current_price=current_price,
-                        prediction_date=datetime.now() + timedelta(days=1),
-                        volatility=volatility,
-                        
-                        # Model detayları
-                        features_used=feature_columns,
-                        training_window=training_window,
-                        prediction_window=prediction_window,
-                        
-                        # En iyi model
-                        best_model=best_model,
-                        best_mse=best_mse,
-                        best_mae=best_mae,
-                        
-                        # Zaman damgaları
-                        created_at=datetime.now(),
-                        updated_at=datetime.now()
-                    )
-                    
-                    db.add(new_prediction)
-                    db.commit()
-                    self.logger.info(f"{symbol} için yeni tahmin kaydı oluşturuldu")
-                
-            except Exception as e:
-                db.rollback()
-                self.logger.error(f"{symbol} için veritabanı kayıt hatası: {str(e)}")
-                self.logger.error(traceback.format_exc())
+            # Tüm model sonuçları birleştirilerek tahmin sonuçları
+            # (JSON(B) sütununa sözlük olarak yazılır; NumPy değerleri orjson ile doğrudan serileştirilir)
+            combined_results = {
+                "predictions": predictions,
+                "metrics": metrics,
+                "last_updated": datetime.now().isoformat(),
+                "symbol": symbol,
+                "models_used": list(predictions.keys()),
+                "best_model": best_model,
+                "best_mse": best_mse,
+                "best_mae": best_mae,
+                "volatility": volatility,
+                "price_changes": price_changes,
+                "features_used": feature_columns,
+                "feature_set_version": feature_set_version,
+                "training_window": training_window,
+                "prediction_window": prediction_window,
+                "prediction_date": (datetime.now() + timedelta(days=1)).isoformat(),
+                "model_tier": model_tier,
+                "escalation_reason": escalation_reason,
+                "ensemble_prediction": ensemble_pred,
+                "model_weights": model_weights,
+                "prediction_intervals": prediction_intervals,
+                "skipped_models": skipped_models,
+                "reused_models": reused_models,
+                "training_configs": training_configs,
+                "training_seconds": round(time.perf_counter() - training_started, 3)
+            }
+            
+            columns = {
+                "prediction_data": combined_results,
+                "current_price": current_price,
+                "prediction_date": datetime.now() + timedelta(days=1),
+                "volatility": volatility,
+                "interval_lower": interval_lower,
+                "interval_upper": interval_upper,
+                "ensemble_predicted_price": float(ensemble_pred) if ensemble_pred is not None else None,
+                "model_weights": model_weights,
+                "features_used": feature_columns,
+                "feature_set_version": feature_set_version,
+                "training_window": training_window,
+                "prediction_window": prediction_window,
+                "best_model": best_model,
+                "best_mse": best_mse,
+                "best_mae": best_mae,
+                "model_tier": model_tier
+            }
+            for name in DEEP_MODELS:
+                columns[f"{name}_predicted_price"] = predictions[name][0] if predictions.get(name) else None
+                columns[f"{name}_change_percent"] = price_changes.get(name)
+                columns[f"{name}_mse"] = metrics[name].get('mse', 0) if name in metrics else None
+                columns[f"{name}_mae"] = metrics[name].get('mae', 0) if name in metrics else None
+            
+            # Tahminleri sonradan gerçekleşen fiyatla karşılaştırmak için geçmişe kaydedilecek değerler
+            history_predictions = dict(predictions)
+            if ensemble_pred is not None:
+                history_predictions[ENSEMBLE_MODEL_NAME] = [ensemble_pred]
+            
+            record = {
+                "symbol": symbol,
+                "base_stock_id": stock.id,
+                "columns": columns,
+                "history_predictions": history_predictions,
+                # Derin modeller eğitildiyse drift referansı bu eğitimin verisiyle yenilenir
+                "drift_frame": df if model_tier == MODEL_TIER_DEEP and any(
+                    name in DEEP_MODELS + [CLUSTER_MODEL_NAME] and name not in reused_models for name in predictions
+                ) else None
+            }
+            
+            # Tahmin sonuçlarını veritabanına kaydet; tampon verildiyse yazma arka planda toplu yapılır
+            prediction_ids = {}
+            if writer is not None:
+                writer.put(record)
+            else:
+                try:
+                    prediction_ids = self.persist_predictions(db, [record])
+                except Exception as e:
+                    db.rollback()
+                    self.logger.error(f"{symbol} için veritabanı kayıt hatası: {str(e)}")
+                    self.logger.error(traceback.format_exc())
             
             # API yanıtını hazırla - PredictionStockResponse şemasıyla uyumlu
-            # Mevcut bir tahmin kaydı varsa ID'sini kullan, yoksa -1 ile doldur
-            prediction_id = existing_prediction.id if 'existing_prediction' in locals() and existing_prediction else -1
+            # Kayıt henüz yazılmadıysa (write-behind) ID -1 ile doldurulur
+            prediction_id = prediction_ids.get(symbol, -1)
             base_stock_id = stock.id if hasattr(stock, "id") else -1
             
             # Bireysel model tahminleri için değerleri ayarla
@@ -1520,6 +2288,16 @@ class PredictionService:
                 "best_model": best_model or "none",
                 "best_mse": best_mse if best_mse != float('inf') else 0.0,
                 "best_mae": best_mae if best_mae != float('inf') else 0.0,
+                "model_tier": model_tier,
+                
+                # Ensemble
+                "ensemble_predicted_price": ensemble_pred,
+                "model_weights": model_weights,
+                
+                # Monte Carlo dropout tahmin aralıkları
+                "interval_lower": interval_lower,
+                "interval_upper": interval_upper,
+                "prediction_intervals": prediction_intervals or None,
                 
                 # Ortak değerler
                 "volatility": volatility,
@@ -1527,6 +2305,7 @@ class PredictionService:
                 
                 # Model detayları
                 "features_used": feature_columns,
+                "feature_set_version": feature_set_version,
                 "training_window": training_window,
                 "prediction_window": prediction_window,
                 
@@ -1548,6 +2327,102 @@ class PredictionService:
             self.logger.error(traceback.format_exc())
             return None
     
+    def persist_predictions(self, db: Session, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        predict_stock'un ürettiği tahmin kayıtlarını toplu olarak yazar: mevcut tahminler
+        tek sorguda okunur, tahminler (sembol başına son tahmin), geçmiş satırları ve
+        arşiv satırları tek commit ile kaydedilir. Write-behind yazıcısı tarafından
+        kendi oturumuyla da çağrılır.
+        
+        Args:
+            db: Veritabanı oturumu
+            records: Sembol, BaseStock ID'si, sütun değerleri, geçmiş tahminleri ve
+                (derin modeller eğitildiyse) drift referansı verisi
+            
+        Returns:
+            Dict[str, int]: Sembol -> tahmin kaydı ID'si
+        """
+        now = datetime.now()
+        existing = {
+            prediction.symbol: prediction
+            for prediction in db.query(PredictionStock).filter(
+                PredictionStock.symbol.in_([record["symbol"] for record in records])
+            )
+        }
+        
+        written = {}
+        for record in records:
+            symbol = record["symbol"]
+            prediction = existing.get(symbol)
+            if prediction is None:
+                prediction = PredictionStock(symbol=symbol, base_stock_id=record["base_stock_id"], created_at=now)
+                db.add(prediction)
+                existing[symbol] = prediction
+            for column, value in record["columns"].items():
+                setattr(prediction, column, value)
+            prediction.last_updated = now
+            prediction.updated_at = now
+            written[symbol] = prediction
+        
+        self.history_service.snapshot_predictions(db, [
+            {
+                "symbol": record["symbol"],
+                "predictions": record["history_predictions"],
+                "base_price": record["columns"]["current_price"],
+                "prediction_date": record["columns"]["prediction_date"],
+                "model_tier": record["columns"]["model_tier"]
+            }
+            for record in records
+        ], commit=False)
+        if settings.PREDICTION_ARCHIVE_ENABLED:
+            self.archive_service.append(db, records, created_at=now)
+        db.commit()
+        self.logger.info(f"{len(records)} sembolün tahmini kaydedildi")
+        
+        for record in records:
+            if record.get("drift_frame") is not None:
+                self.drift_service.save_reference(db, record["symbol"], record["drift_frame"],
+                                                  record["columns"]["features_used"])
+        
+        return {symbol: prediction.id for symbol, prediction in written.items()}
+    
+    def combine_intervals(self, intervals: Dict[str, Dict[str, Any]], weights: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Model bazlı tahmin aralıklarını ensemble ağırlıklarıyla birleştirir (yüzdelik ortalaması).
+        
+        Args:
+            intervals: Model adı -> mc_dropout_intervals çıktısı
+            weights: Model adı -> ensemble ağırlığı
+            
+        Returns:
+            Dict: Birleşik yüzdelikler
+        """
+        models = [name for name in intervals if name != ENSEMBLE_MODEL_NAME]
+        raw = np.array([weights.get(name, 0.0) for name in models], dtype=float)
+        model_weights = raw / raw.sum() if raw.sum() > 0 else np.full(len(models), 1.0 / len(models))
+        
+        combined = {}
+        for key in intervals[models[0]]["quantiles"]:
+            horizon = min(len(intervals[name]["quantiles"][key]) for name in models)
+            matrix = np.array([intervals[name]["quantiles"][key][:horizon] for name in models], dtype=float)
+            combined[key] = (model_weights @ matrix).tolist()
+        
+        return {
+            "samples": sum(intervals[name]["samples"] for name in models),
+            "models": models,
+            "quantiles": combined
+        }
+    
+    def interval_bounds(self, interval: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Tahmin aralığının ilk ufuk adımı için en düşük ve en yüksek yüzdeliklerini döndürür
+        """
+        quantiles = interval.get("quantiles") or {}
+        if not quantiles:
+            return None, None
+        keys = sorted(quantiles)
+        return quantiles[keys[0]][0], quantiles[keys[-1]][0]
+    
     def get_prediction_by_symbol(self, db: Session, symbol: str) -> Dict[str, Any]:
         """
         Belirli bir sembol için mevcut tahmin bilgilerini döndürür
@@ -1560,8 +2435,8 @@ class PredictionService:
             Dict: Tahmin sonuçları, PredictionStockResponse şemasıyla uyumlu
         """
         try:
-            # Tahmin kaydını bul
-            prediction = db.query(PredictionStock).filter(PredictionStock.symbol == symbol).first()
+            # Tahmin kaydını hissesiyle birlikte tek sorguda bul
+            prediction = self.repository.get_by_symbol(db, symbol)
             
             if not prediction:
                 self.logger.warning(f"{symbol} için tahmin bulunamadı")
@@ -1574,7 +2449,43 @@ class PredictionService:
             self.logger.error(f"{symbol} için tahmin getirme hatası: {str(e)}")
             return None
     
-    def predict_with_hourly_data(self, db: Session, symbols: List[str], days: int = 45) -> List[Dict[str, Any]]:
+    def get_predictions_for_symbols(self, db: Session, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Sembol listesinin mevcut tahminlerini sembol sayısından bağımsız olarak iki sorguda döndürür
+
+        Args:
+            db: Veritabanı oturumu
+            symbols: Hisse senedi sembolleri
+
+        Returns:
+            Dict[str, Dict]: Sembol -> PredictionStockResponse şemasıyla uyumlu yanıt (tahmini olmayanlar yer almaz)
+        """
+        return self.build_prediction_responses(self.repository.get_predictions_for_symbols(db, symbols))
+
+    def build_prediction_responses(self, records: List[PredictionStock]) -> Dict[str, Dict[str, Any]]:
+        """
+        Önceden yüklenmiş tahmin kayıtlarını API yanıtlarına dönüştürür. İlişkili
+        BaseStock kaydı sorguda birlikte yüklenmiş olmalıdır (async oturumlar tembel yükleme yapamaz).
+        
+        Args:
+            records: Tahmin kayıtları
+            
+        Returns:
+            Dict[str, Dict]: Sembol -> PredictionStockResponse şemasıyla uyumlu yanıt (geçersiz kayıtlar atlanır)
+        """
+        responses = {}
+        for record in records:
+            response = self._prepare_prediction_response(record)
+            if response:
+                responses[record.symbol] = response
+        return responses
+    
+    def predict_with_hourly_data(self, db: Session, symbols: List[str], days: int = 45,
+                                 model_type: str = 'all', force: bool = False, retrain: bool = False,
+                                 progress_callback: Optional[Callable[[str, str], None]] = None,
+                                 supervised: Optional[bool] = None,
+                                 summary: Optional[Dict[str, Any]] = None,
+                                 journal_path: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Filtrelenen hisseler için saatlik veri kullanarak tahmin yapar.
         
@@ -1582,64 +2493,160 @@ class PredictionService:
             db: Veritabanı oturumu
             symbols: Tahmin yapılacak hisse senedi sembolleri listesi
             days: Kaç günlük veri kullanılacağı
+            model_type: Kullanılacak model tipi ('lstm', 'gru', 'attention' veya 'all')
+            force: True ise süresi dolmamış tahminler de yenilenir (eğitim yine drift kontrolüne bağlıdır)
+            retrain: True ise drift kontrolü atlanır ve derin modeller her sembol için yeniden eğitilir
+            progress_callback: Her sembolün durumu değiştiğinde (sembol, durum) ile çağrılır
+            supervised: True ise her sembol süre sınırı uygulanan ayrı bir alt süreçte eğitilir
+                (None ise SUPERVISED_TRAINING ayarı kullanılır)
+            summary: Verilirse eğitilen, drift olmadığı için derin eğitimi atlanıp hızlı model
+                katmanıyla yenilenen ve mevcut tahmini kullanılan sembol sayılarıyla doldurulur
+            journal_path: Write-behind günlüğü; yeniden denenen bir işte bu günlüğe göre
+                zaten kaydedilmiş semboller yeniden eğitilmez
             
         Returns:
             List[Dict]: Tahmin sonuçlarını içeren sözlük listesi
         """
+        if supervised is None:
+            supervised = settings.SUPERVISED_TRAINING
+        
+        supervisor = None
+        if supervised:
+            from app.services.training_supervisor import TrainingSupervisor
+            supervisor = TrainingSupervisor()
+        
+        def report(symbol: str, status: str):
+            if progress_callback:
+                progress_callback(symbol, status)
+        
+        # Alt süreçler kendi sonuçlarını yazar; aksi halde sonuçlar arka planda toplu kaydedilir
+        # ve sembol ancak commit edildikten sonra tamamlandı sayılır
+        writer = None
+        if supervisor is None and settings.WRITE_BEHIND_ENABLED:
+            writer = WriteBehindBuffer("predictions", self.persist_predictions, journal_path=journal_path)
+        pending_results = {}
+        
+        results = []
+        failed_symbols = []
+        counts = {"trained": 0, "skipped_no_drift": 0, "reused": 0}
+        no_drift_symbols = set()  # Derin eğitimi atlanıp hızlı katmanla yenilenenler
+        
+        def drain():
+            written, failed = writer.pop_completed()
+            for symbol in written:
+                prediction = pending_results.pop(symbol, None)
+                if prediction:
+                    results.append(prediction)
+                counts["skipped_no_drift" if symbol in no_drift_symbols else "trained"] += 1
+                report(symbol, ITEM_STATUS_DONE)
+            for symbol in failed:
+                pending_results.pop(symbol, None)
+                self.logger.warning(f"{symbol} için tahmin kaydedilemedi")
+                failed_symbols.append(symbol)
+                report(symbol, ITEM_STATUS_FAILED)
+        
         try:
             self.logger.info(f"Toplam {len(symbols)} hisse için saatlik veri ile tahmin yapılıyor")
             
-            results = []
-            failed_symbols = []
+            # Önceki denemede kalıcı olarak kaydedilen tahminler yeniden eğitilmez
+            durable = WriteBehindBuffer.read_journal(journal_path) & set(symbols)
+            if durable:
+                self.logger.info(f"Önceki denemede kaydedilen {len(durable)} tahmin yeniden kullanılacak")
+            
+            # Veritabanındaki mevcut tahminler (tek seferde)
+            existing_predictions = self.get_predictions_for_symbols(db, symbols)
+            
+            # Özellik seti sürümü değişen tahminler drift olmasa da yeniden eğitilir
+            self.feature_importance_service.load_active(db)
+            feature_set_version = self.feature_importance_service.active_version
+            
+            # Yenilenecek tahminler için drift kontrolü (tüm semboller tek seferde)
+            drift_results = {}
+            if settings.DRIFT_GATING_ENABLED and not retrain:
+                renewed = [s for s, p in existing_predictions.items()
+                           if p and s not in durable and (force or self._is_prediction_expired(p))]
+                frames = {}
+                for symbol in renewed:
+                    # Güncel veriyle karşılaştırmak için süreç içi DataFrame önbelleği yenilenir
+                    self.stock_dataframes.pop(symbol, None)
+                    df = self.fetch_and_prepare_dataframe(symbol, days=days)
+                    if not df.empty:
+                        frames[symbol] = df
+                drift_results = self.drift_service.evaluate(db, frames)
             
             # Her sembol için tahmin yap
             for i, symbol in enumerate(symbols):
                 try:
                     self.logger.info(f"Hisse {i+1}/{len(symbols)}: {symbol} için tahmin yapılıyor")
+                    report(symbol, ITEM_STATUS_RUNNING)
                     
                     # Önce veritabanında tahmin var mı kontrol et
-                    existing_prediction = self.get_prediction_by_symbol(db, symbol)
-                    if existing_prediction and not self._is_prediction_expired(existing_prediction):
+                    existing_prediction = existing_predictions.get(symbol)
+                    if existing_prediction and (symbol in durable or (
+                            not force and not self._is_prediction_expired(existing_prediction))):
                         self.logger.info(f"{symbol} için mevcut tahmin kullanılıyor")
                         results.append(existing_prediction)
+                        counts["reused"] += 1
+                        report(symbol, ITEM_STATUS_SKIPPED)
                         continue
                     
+                    # Süresi dolmuş ama veride kayma yoksa yeniden eğitme
+                    drift = drift_results.get(symbol)
+                    if drift and existing_prediction and existing_prediction.get("feature_set_version") != feature_set_version:
+                        drift["drifted"] = True
+                        drift["reasons"].append(f"Özellik seti sürümü değişti (v{feature_set_version})")
+                    no_drift = bool(existing_prediction and drift and not drift["drifted"])
+                    if no_drift:
+                        self.logger.info(f"{symbol} için drift yok (PSI={drift['psi']}, KS={drift['ks']}), "
+                                         f"derin modeller yeniden eğitilmeden kayıtlı ağırlıklarıyla kullanılacak")
+                    elif drift:
+                        self.logger.info(f"{symbol} yeniden eğitilecek: {', '.join(drift['reasons'])}")
+                    
                     # BaseStock kaydını al
                     stock = db.query(BaseStock).filter(BaseStock.symbol == symbol).first()
                     
                     if not stock:
                         self.logger.warning(f"{symbol} sembolü için BaseStock kaydı bulunamadı")
                         failed_symbols.append(symbol)
+                        report(symbol, ITEM_STATUS_FAILED)
                         continue
                     
-                    # Tahmin yapmak için zaman aşımı kontrolü ekleyelim
-                    import signal
+                    # Drift yoksa hızlı model katmanı kararı yine uygulanır; derin modellere geçilirse
+                    # kayıtlı ağırlıklar kullanılır, kaydı olmayan modeller eğitilir
+                    if supervisor is not None:
+                        # Sembol alt süreçte eğitilir; süreyi aşarsa alt süreç sonlandırılır
+                        outcome = supervisor.run_symbol(symbol, model_type, reuse_models=no_drift)
+                        prediction = outcome.get("prediction")
+                        if outcome.get("timed_out"):
+                            self.logger.error(f"{symbol} için tahmin zaman aşımına uğradı")
+                    else:
+                        # Alt süreç kullanılmıyorsa yalnızca epoch bazlı süre sınırı uygulanır
+                        prediction = self.predict_stock(db, stock, model_type=model_type,
+                                                        time_budget=settings.SYMBOL_TIME_BUDGET_SECONDS,
+                                                        writer=writer, reuse_models=no_drift)
                     
-                    def timeout_handler(signum, frame):
-                        raise TimeoutError(f"{symbol} için tahmin zaman aşımına uğradı")
-                        
-                    # 30 saniye zaman aşımı
-                    signal.signal(signal.SIGALRM, timeout_handler)
-                    signal.alarm(30)
+                    if no_drift:
+                        if not prediction:
+                            # Yeni tahmin üretilemezse eski tahmin vadesi geçmiş olarak döndürülür
+                            self.logger.warning(f"{symbol} için tahmin yenilenemedi, eski tahmin kullanılıyor")
+                            results.append(dict(existing_prediction, stale=True))
+                            counts["reused"] += 1
+                            report(symbol, ITEM_STATUS_SKIPPED)
+                            continue
+                        no_drift_symbols.add(symbol)
                     
-                    try:
-                        # Tahmin yap
-                        prediction = self.predict_stock(db, stock, model_type='all')
-                        
-                        if prediction:
-                            self.logger.info(f"{symbol} için tahmin başarıyla yapıldı")
-                            results.append(prediction)
-                        else:
-                            self.logger.warning(f"{symbol} için tahmin yapılamadı")
-                            failed_symbols.append(symbol)
-                        
-                        # Zaman aşımını iptal et
-                        signal.alarm(0)
-                    except TimeoutError as e:
-                        # Zaman aşımını iptal et
-                        signal.alarm(0)
-                        self.logger.error(f"{str(e)}")
+                    if prediction and writer is not None:
+                        # Tamamlandı bilgisi yazıcı commit ettiğinde verilir
+                        pending_results[symbol] = prediction
+                    elif prediction:
+                        self.logger.info(f"{symbol} için tahmin başarıyla yapıldı")
+                        results.append(prediction)
+                        counts["skipped_no_drift" if symbol in no_drift_symbols else "trained"] += 1
+                        report(symbol, ITEM_STATUS_DONE)
+                    else:
+                        self.logger.warning(f"{symbol} için tahmin yapılamadı")
                         failed_symbols.append(symbol)
+                        report(symbol, ITEM_STATUS_FAILED)
                     
                     # API limitlerine takılmamak için kısa bir bekleme
                     time.sleep(2)
@@ -1647,18 +2654,47 @@ class PredictionService:
                 except Exception as e:
                     self.logger.error(f"{symbol} için tahmin hatası: {str(e)}")
                     failed_symbols.append(symbol)
-                    continue
+                    report(symbol, ITEM_STATUS_FAILED)
+                finally:
+                    if writer is not None:
+                        drain()
+            
+            if writer is not None:
+                # Kalan sonuçlar yazılmadan özet ve okuma modeli güncellenmez
+                writer.close()
+                drain()
+                self.logger.info(f"Yazma tamponu istatistikleri: {writer.metrics}")
             
             self.logger.info(f"Toplam {len(results)}/{len(symbols)} hisse için tahmin tamamlandı")
             if failed_symbols:
                 self.logger.warning(f"Tahmin yapılamayan hisseler: {', '.join(failed_symbols)}")
             
+            if supervisor is not None:
+                self.logger.info(f"Alt süreç istatistikleri: {supervisor.metrics}")
+            
+            if counts["skipped_no_drift"]:
+                self.logger.info(f"Drift olmadığı için {counts['skipped_no_drift']} sembolün derin model eğitimi atlandı")
+            if summary is not None:
+                summary.update(counts)
+                summary["failed"] = len(failed_symbols)
+            
+            # Dashboard okuma modelinin tahmin bölümü (alt süreçte yazılanlar dahil, tek sorguyla)
+            predicted_symbols = [p.get("symbol") for p in results if p and p.get("symbol")]
+            if predicted_symbols:
+                self.snapshot_service.safe_update(db, self.snapshot_service.update_predictions,
+                                                  self.get_predictions_for_symbols(db, predicted_symbols))
+            
             return results
             
         except Exception as e:
             self.logger.error(f"Saatlik veri ile toplu tahmin hatası: {str(e)}")
             self.logger.error(traceback.format_exc())
             return []
+        finally:
+            if writer is not None:
+                writer.close()
+            if supervisor is not None:
+                supervisor.close()
     
     def _is_prediction_expired(self, prediction: Dict[str, Any]) -> bool:
         """
@@ -1709,65 +2745,37 @@ class PredictionService:
             # Sembolü al
             symbol = prediction_record.symbol
             
-            # JSON verisini parse et
-            try:
-                prediction_data = json.loads(prediction_record.prediction_data)
-            except:
-                self.logger.error(f"{symbol} için tahmin verisi geçersiz JSON formatında")
-                return None
+            # JSON(B) sütunu sürücü tarafından sözlük olarak çözülür; metin sütunlu eski şemada metin gelir
+            prediction_data = prediction_record.prediction_data
+            if isinstance(prediction_data, (str, bytes)):
+                try:
+                    prediction_data = serialization.loads(prediction_data)
+                except ValueError:
+                    self.logger.error(f"{symbol} için tahmin verisi geçersiz JSON formatında")
+                    return None
+            prediction_data = prediction_data or {}
             
             # API yanıtını hazırla
             stock = prediction_record.base_stock  # İlişkili BaseStock kaydı
             current_price = prediction_record.current_price or 0.0
             
-            # Prediction Data'dan değerleri çıkar
+            # İç içe yapılar JSON verisinden, sık okunan alanlar tipli sütunlardan alınır
             predictions = prediction_data.get("predictions", {})
             metrics = prediction_data.get("metrics", {})
-            price_changes = prediction_data.get("price_changes", {})
-            
-            # Özellikler, eğer yoksa varsayılan değerler kullan
-            best_model = prediction_data.get("best_model", "none")
-            best_mse = prediction_data.get("best_mse", 0.0)
-            best_mae = prediction_data.get("best_mae", 0.0)
-            volatility = prediction_data.get("volatility", 0.0)
-            features_used = prediction_data.get("features_used", [])
-            training_window = prediction_data.get("training_window", 10)
-            prediction_window = prediction_data.get("prediction_window", 1)
-            
-            # Tahmin tarihi
-            prediction_date_str = prediction_data.get("prediction_date")
-            try:
-                prediction_date = datetime.fromisoformat(prediction_date_str) if prediction_date_str else datetime.now() + timedelta(days=1)
-            except:
-                prediction_date = datetime.now() + timedelta(days=1)
             
-            # Bireysel model tahminleri
-            lstm_pred = predictions.get('lstm', [0])[0] if 'lstm' in predictions and predictions['lstm'] else None
-            gru_pred = predictions.get('gru', [0])[0] if 'gru' in predictions and predictions['gru'] else None
-            attention_pred = predictions.get('attention', [0])[0] if 'attention' in predictions and predictions['attention'] else None
+            best_model = prediction_record.best_model or prediction_data.get("best_model", "none")
+            best_mse = prediction_record.best_mse if prediction_record.best_mse is not None else 0.0
+            best_mae = prediction_record.best_mae if prediction_record.best_mae is not None else 0.0
+            volatility = prediction_record.volatility if prediction_record.volatility is not None else 0.0
+            features_used = prediction_record.features_used or []
+            training_window = prediction_record.training_window or 10
+            prediction_window = prediction_record.prediction_window or 1
+            prediction_date = prediction_record.prediction_date or datetime.now() + timedelta(days=1)
+            last_updated = prediction_record.last_updated or datetime.now()
             
-            # Değişim yüzdeleri
-            lstm_change = price_changes.get('lstm', 0) if 'lstm' in price_changes else None
-            gru_change = price_changes.get('gru', 0) if 'gru' in price_changes else None
-            attention_change = price_changes.get('attention', 0) if 'attention' in price_changes else None
-            
-            # Metrikler
-            lstm_mse = metrics.get('lstm', {}).get('mse', 0) if 'lstm' in metrics else None
-            lstm_mae = metrics.get('lstm', {}).get('mae', 0) if 'lstm' in metrics else None
-            gru_mse = metrics.get('gru', {}).get('mse', 0) if 'gru' in metrics else None
-            gru_mae = metrics.get('gru', {}).get('mae', 0) if 'gru' in metrics else None
-            attention_mse = metrics.get('attention', {}).get('mse', 0) if 'attention' in metrics else None
-            attention_mae = metrics.get('attention', {}).get('mae', 0) if 'attention' in metrics else None
-            
-            # Son güncelleme zamanı
-            last_updated = prediction_data.get("last_updated")
-            if last_updated:
-                try:
-                    last_updated = datetime.fromisoformat(last_updated)
-                except:
-                    last_updated = prediction_record.last_updated if hasattr(prediction_record, "last_updated") else datetime.now()
-            else:
-                last_updated = prediction_record.last_updated if hasattr(prediction_record, "last_updated") else datetime.now()
+            ensemble_predicted_price = prediction_record.ensemble_predicted_price
+            if ensemble_predicted_price is None:
+                ensemble_predicted_price = prediction_data.get("ensemble_prediction")
             
             response = {
                 "id": prediction_record.id,
@@ -1776,34 +2784,46 @@ class PredictionService:
                 "current_price": current_price,
                 
                 # LSTM tahminleri
-                "lstm_predicted_price": lstm_pred,
-                "lstm_change_percent": lstm_change,
-                "lstm_mse": lstm_mse,
-                "lstm_mae": lstm_mae,
+                "lstm_predicted_price": prediction_record.lstm_predicted_price,
+                "lstm_change_percent": prediction_record.lstm_change_percent,
+                "lstm_mse": prediction_record.lstm_mse,
+                "lstm_mae": prediction_record.lstm_mae,
                 
                 # GRU tahminleri
-                "gru_predicted_price": gru_pred,
-                "gru_change_percent": gru_change,
-                "gru_mse": gru_mse,
-                "gru_mae": gru_mae,
+                "gru_predicted_price": prediction_record.gru_predicted_price,
+                "gru_change_percent": prediction_record.gru_change_percent,
+                "gru_mse": prediction_record.gru_mse,
+                "gru_mae": prediction_record.gru_mae,
                 
                 # Attention tahminleri
-                "attention_predicted_price": attention_pred,
-                "attention_change_percent": attention_change,
-                "attention_mse": attention_mse,
-                "attention_mae": attention_mae,
+                "attention_predicted_price": prediction_record.attention_predicted_price,
+                "attention_change_percent": prediction_record.attention_change_percent,
+                "attention_mse": prediction_record.attention_mse,
+                "attention_mae": prediction_record.attention_mae,
                 
                 # En iyi model bilgileri
                 "best_model": best_model,
                 "best_mse": best_mse,
                 "best_mae": best_mae,
+                "model_tier": prediction_record.model_tier or prediction_data.get("model_tier", MODEL_TIER_DEEP),
+                
+                # Ensemble
+                "ensemble_predicted_price": ensemble_predicted_price,
+                "model_weights": prediction_record.model_weights or prediction_data.get("model_weights"),
+                
+                # Monte Carlo dropout tahmin aralıkları
+                "interval_lower": prediction_record.interval_lower,
+                "interval_upper": prediction_record.interval_upper,
+                "prediction_intervals": prediction_data.get("prediction_intervals") or None,
                 
                 # Ortak değerler
                 "volatility": volatility,
                 "prediction_date": prediction_date,
+                "stale": prediction_date < datetime.now(),
                 
                 # Model detayları
                 "features_used": features_used,
+                "feature_set_version": prediction_record.feature_set_version,
                 "training_window": training_window,
                 "prediction_window": prediction_window,
                 
@@ -1815,7 +2835,7 @@ class PredictionService:
                 "metrics": metrics,
                 "models_used": prediction_data.get("models_used", []),
                 "success": True,
-                "last_updated": last_updated.isoformat() if isinstance(last_updated, datetime) else last_updated
+                "last_updated": last_updated.isoformat()
             }
             
             return response
@@ -3,15 +3,18 @@ import asyncio
 import schedule
 import time
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Dict, Any, Optional
 
 from app.db.session import SessionLocal
 from app.services.base_stock_service import BaseStockService
-from app.services.prediction_service import PredictionService
+from app.services.job_service import JobService
+from app.services.feature_cache import FeatureCache
+from app.services.prediction_history_service import PredictionHistoryService
 from app.models.base_stock import BaseStock
 from app.models.prediction_stock import PredictionStock
+from app.models.prediction_job import JOB_TYPE_PREDICT, JOB_TYPE_REFRESH_MARKET, JOB_TYPE_CLUSTER, JOB_TYPE_TUNE, JOB_TYPE_FEATURES, JOB_TYPE_ARCHIVE
 
 class SchedulerService:
     """
@@ -22,7 +25,8 @@ class SchedulerService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.base_service = BaseStockService()
-        self.prediction_service = PredictionService()
+        self.job_service = JobService()
+        self.history_service = PredictionHistoryService()
         self.is_running = False
         self.thread = None
     
@@ -45,6 +49,20 @@ class SchedulerService:
         # Pazartesi günleri 09:00'da haftalık rapor oluştur
         schedule.every().monday.at("09:00").do(self.generate_weekly_report)
         
+        # Pazar günleri sırasıyla özellik önemi, kümeleme ve hiperparametre araması; işler kuyrukta
+        # bu sırayla çalışır ve küme ortak modelleri yalnızca zincirin sonunda bir kez eğitilir
+        # 12:00'de özellik önemini yeniden hesapla (kümeleme ve arama budanmış setle yapılır)
+        schedule.every().sunday.at("12:00").do(self.analyze_features)
+        
+        # 13:00'te sembol kümelerini yeniden hesapla
+        schedule.every().sunday.at("13:00").do(self.recompute_clusters)
+        
+        # 14:00'te yeni kümeler için hiperparametre araması yap ve ortak modelleri eğit
+        schedule.every().sunday.at("14:00").do(self.tune_hyperparameters)
+        
+        # Hergün 03:00'te tahmin arşivini sıkıştır
+        schedule.every().day.at("03:00").do(self.compact_prediction_archive)
+        
         # Ayrı bir thread'de çalıştır
         self.thread = threading.Thread(target=self._run_scheduler)
         self.thread.daemon = True  # Ana program sonlandığında thread'i de sonlandır
@@ -101,12 +119,15 @@ class SchedulerService:
             # Veritabanı oturumu oluştur
             db = SessionLocal()
             
-            # Tüm hisseleri işle ve filtrele
-            selected_stocks = self.base_service.process_all_stocks(db)
+            # Tüm hisseleri işleme ve filtreleme işini kuyruğa ekle (worker tarafından çalıştırılır)
+            job = self.job_service.submit_job(db, JOB_TYPE_REFRESH_MARKET, {"run_predictions": False, "days": 45})
             
-            self.logger.info(f"Günlük güncelleme tamamlandı. {len(selected_stocks)} hisse seçildi.")
+            self.logger.info(f"Günlük güncelleme işi kuyruğa eklendi: #{job.id}")
             
             db.close()
+            
+            # Eski veri sürümlerine ait eğitim veri setlerini temizle
+            FeatureCache().prune()
             return True
             
         except Exception as e:
@@ -148,14 +169,14 @@ class SchedulerService:
             self.logger.info(f"TAHMİN BAŞLATILIYOR: {len(selected_symbols)} hisse seçildi")
             self.logger.info(f"TAHMİN EDİLECEK SEMBOLLER: {', '.join(selected_symbols)}")
             
-            # Hisseler için tahminler yap
-            predictions = self.prediction_service.predict_with_hourly_data(db, selected_symbols, days=days_for_prediction)
-            
-            if predictions:
-                self.logger.info(f"Toplam {len(predictions)} hisse için tahmin yapıldı")
-                self._report_predictions(predictions)
-            else:
-                self.logger.warning("Hiçbir hisse için tahmin yapılamadı")
+            # Hisseler için tahmin işini kuyruğa ekle (worker tarafından çalıştırılır)
+            job = self.job_service.submit_job(db, JOB_TYPE_PREDICT, {
+                "symbols": selected_symbols,
+                "model_type": "all",
+                "days": days_for_prediction,
+                "force": False
+            })
+            self.logger.info(f"Tahmin işi kuyruğa eklendi: #{job.id}")
             
             db.close()
             return True
@@ -164,6 +185,67 @@ class SchedulerService:
             self.logger.error(f"Tahmin işlemi hatası: {str(e)}")
             return False
     
+    def recompute_clusters(self):
+        """
+        Sembol kümelerini yeniden hesaplama işini kuyruğa ekler
+        """
+        try:
+            db = SessionLocal()
+            # Ortak modeller aynı günün hiperparametre araması işinde eğitilir
+            job = self.job_service.submit_job(db, JOB_TYPE_CLUSTER, {"symbols": None, "days": 45, "train_cluster_models": False})
+            self.logger.info(f"Kümeleme işi kuyruğa eklendi: #{job.id}")
+            db.close()
+            return True
+        except Exception as e:
+            self.logger.error(f"Kümeleme işi oluşturma hatası: {str(e)}")
+            return False
+    
+    def analyze_features(self):
+        """
+        Özellik önemi analizi işini kuyruğa ekler
+        """
+        try:
+            db = SessionLocal()
+            # Ortak modeller aynı günün hiperparametre araması işinde eğitilir
+            job = self.job_service.submit_job(db, JOB_TYPE_FEATURES, {"symbols": None, "days": 45, "train_cluster_models": False})
+            self.logger.info(f"Özellik önemi işi kuyruğa eklendi: #{job.id}")
+            db.close()
+            return True
+        except Exception as e:
+            self.logger.error(f"Özellik önemi işi oluşturma hatası: {str(e)}")
+            return False
+    
+    def tune_hyperparameters(self):
+        """
+        Seçili hisseler için hiperparametre araması işini kuyruğa ekler
+        """
+        try:
+            db = SessionLocal()
+            # Zincirin son işi: arama sonuç vermese de önceki işlerin değişiklikleri için ortak modeller eğitilir
+            job = self.job_service.submit_job(db, JOB_TYPE_TUNE, {
+                "symbols": None, "model_type": "all", "days": 45, "train_cluster_models": True
+            })
+            self.logger.info(f"Hiperparametre araması işi kuyruğa eklendi: #{job.id}")
+            db.close()
+            return True
+        except Exception as e:
+            self.logger.error(f"Hiperparametre araması işi oluşturma hatası: {str(e)}")
+            return False
+    
+    def compact_prediction_archive(self):
+        """
+        Tahmin arşivi sıkıştırma ve saklama işini kuyruğa ekler
+        """
+        try:
+            db = SessionLocal()
+            job = self.job_service.submit_job(db, JOB_TYPE_ARCHIVE, {})
+            self.logger.info(f"Tahmin arşivi sıkıştırma işi kuyruğa eklendi: #{job.id}")
+            db.close()
+            return True
+        except Exception as e:
+            self.logger.error(f"Tahmin arşivi sıkıştırma işi oluşturma hatası: {str(e)}")
+            return False
+    
     def generate_weekly_report(self):
         """
         Haftalık performans raporu oluştur
@@ -174,46 +256,20 @@ class SchedulerService:
             # Veritabanı oturumu oluştur
             db = SessionLocal()
             
-            # Geçen hafta tahmin edilen hisseleri al
-            week_ago = datetime.now() - timedelta(days=7)
-            predictions = db.query(PredictionStock).filter(PredictionStock.prediction_date >= week_ago).all()
+            # Geçen hafta vadesi dolup çözümlenen tahminlerin model bazlı doğruluğu
+            model_rows = self.history_service.rolling_accuracy(db, window_days=7)
             
-            # Başarılı ve başarısız tahminleri hesapla
-            success_count = 0
-            fail_count = 0
-            
-            for pred in predictions:
-                # Gerçekleşen fiyatı al (şu anki fiyat)
-                base_stock = pred.base_stock
-                current_price = base_stock.last_price
-                
-                # Tahmin edilen fiyat
-                if pred.best_model == "lstm":
-                    predicted_price = pred.lstm_predicted_price
-                    change_percent = pred.lstm_change_percent
-                elif pred.best_model == "gru":
-                    predicted_price = pred.gru_predicted_price
-                    change_percent = pred.gru_change_percent
-                else:
-                    predicted_price = pred.attention_predicted_price
-                    change_percent = pred.attention_change_percent
-                
-                # Tahmin başarılı mı?
-                if change_percent > 0 and current_price > pred.current_price:
-                    success_count += 1
-                elif change_percent < 0 and current_price < pred.current_price:
-                    success_count += 1
-                else:
-                    fail_count += 1
+            total = sum(row["count"] for row in model_rows)
+            success_count = int(round(sum(row["count"] * row["success_rate"] / 100 for row in model_rows)))
+            fail_count = total - success_count
             
             # Başarı oranını hesapla
-            total = success_count + fail_count
             success_rate = (success_count / total * 100) if total > 0 else 0
             
             self.logger.info(f"Haftalık rapor: Toplam {total} tahmin, {success_count} başarılı (%{success_rate:.2f})")
             
             # Raporu kaydet ve bildirim gönder
-            self._save_weekly_report(success_count, fail_count, success_rate)
+            self._save_weekly_report(success_count, fail_count, success_rate, model_rows)
             
             db.close()
             return True
@@ -236,8 +292,9 @@ class SchedulerService:
         self.logger.info("-" * 50)
         
         for pred in predictions:
-            symbol = pred.base_stock.symbol
-            current = pred.current_price
+            # Sembol tahmin kaydında tutulur; ilişkili hisseyi yüklemeye gerek yok
+            symbol = pred.symbol
+            current = pred.current_price or 0
             
             # LSTM tahminleri
             lstm_price = pred.lstm_predicted_price if pred.lstm_predicted_price else 0
@@ -248,7 +305,7 @@ class SchedulerService:
             gru_change = pred.gru_change_percent if pred.gru_change_percent else 0
             
             # En iyi model
-            best_model = pred.best_model.upper()
+            best_model = (pred.best_model or "-").upper()
             
             self.logger.info(f"Sembol: {symbol}")
             self.logger.info(f"Mevcut Fiyat: {current:.2f} TL")
@@ -257,11 +314,16 @@ class SchedulerService:
             self.logger.info(f"En İyi Model: {best_model}")
             self.logger.info("-" * 50)
     
-    def _save_weekly_report(self, success_count: int, fail_count: int, success_rate: float):
+    def _save_weekly_report(self, success_count: int, fail_count: int, success_rate: float,
+                            model_rows: Optional[List[Dict[str, Any]]] = None):
         """
         Haftalık raporu kaydet
         """
         report_date = datetime.now().strftime("%Y-%m-%d")
+        model_lines = "\n".join(
+            f"        {row['model'].upper()}: {row['count']} tahmin, yön başarısı %{row['success_rate']:.2f}, MAPE %{row['mape']:.2f}"
+            for row in (model_rows or [])
+        )
         report_text = f"""
         HAFTALIK TAHMİN PERFORMANS RAPORU
         Tarih: {report_date}
@@ -270,6 +332,9 @@ class SchedulerService:
         Başarılı Tahmin: {success_count}
         Başarısız Tahmin: {fail_count}
         Başarı Oranı: %{success_rate:.2f}
+        
+        Model Bazlı Sonuçlar:
+{model_lines}
         """
         
         # Raporu dosyaya kaydet (ileride veritabanına da kaydedilebilir)
@@ -0,0 +1,243 @@
+import logging
+import traceback
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core import serialization
+from app.models.base_stock import BaseStock
+from app.models.prediction_stock import PredictionStock
+from app.models.stock_snapshot import StockSnapshot
+from app.models.technical_stock import TechnicalStock
+from app.repositories import SnapshotRepository
+from app.schemas import PredictionStockResponse
+from app.schemas.converters import convert_to_response, convert_to_technical_response
+
+# Tek INSERT ... ON CONFLICT ifadesinde yazılan en fazla satır
+SNAPSHOT_UPSERT_CHUNK_SIZE = 200
+
+class SnapshotService:
+    """
+    Dashboard okuma modelini (stock_snapshots) güncel tutan servis.
+
+    Piyasa taraması, teknik analiz ve tahmin aşamaları sonunda yalnızca kendi
+    bölümlerini, aşamada yazılan semboller için toplu olarak günceller. Bölümler
+    endpoint'lerin döndürdüğü yanıt şemalarıyla JSON'a çevrilir; /api/snapshot
+    bu metinleri yeniden çözmeden birleştirir.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.repository = SnapshotRepository()
+
+    def update_stocks(self, db: Session, stocks: Iterable[BaseStock]) -> int:
+        """
+        Hisse bölümünü ve filtre alanlarını günceller (piyasa taraması sonrası)
+
+        Args:
+            db: Veritabanı oturumu
+            stocks: Yazılmış BaseStock kayıtları
+
+        Returns:
+            int: Güncellenen anlık görüntü sayısı
+        """
+        now = datetime.now()
+        rows = []
+        for stock in stocks:
+            try:
+                stock_json = convert_to_response(stock).model_dump_json()
+            except Exception as e:
+                self.logger.warning(f"{stock.symbol} anlık görüntüsü oluşturulamadı: {str(e)}")
+                continue
+            rows.append({
+                "symbol": stock.symbol,
+                "is_selected": bool(stock.is_selected),
+                "sector": stock.sector,
+                "last_price": stock.last_price,
+                "change_percent": stock.change_percent,
+                "rsi": stock.rsi,
+                "relative_volume": stock.relative_volume,
+                "stock_json": stock_json,
+                "stock_updated_at": stock.updated_at or now,
+                "updated_at": now
+            })
+        return self._upsert(db, rows)
+
+    def update_technicals(self, db: Session, technicals: Iterable[TechnicalStock]) -> int:
+        """
+        Teknik analiz bölümünü günceller. İlişkili BaseStock kaydı yüklenmiş olmalıdır.
+
+        Args:
+            db: Veritabanı oturumu
+            technicals: Yazılmış TechnicalStock kayıtları
+
+        Returns:
+            int: Güncellenen anlık görüntü sayısı
+        """
+        now = datetime.now()
+        rows = []
+        for technical in technicals:
+            if not technical.base_stock:
+                continue
+            try:
+                technical_json = convert_to_technical_response(technical).model_dump_json()
+            except Exception as e:
+                self.logger.warning(f"{technical.base_stock.symbol} teknik anlık görüntüsü oluşturulamadı: {str(e)}")
+                continue
+            rows.append({
+                "symbol": technical.base_stock.symbol,
+                "technical_json": technical_json,
+                "technical_updated_at": technical.updated_at or now,
+                "updated_at": now
+            })
+        return self._upsert(db, rows)
+
+    def update_predictions(self, db: Session, responses: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Tahmin bölümünü günceller (tahmin aşaması sonrası)
+
+        Args:
+            db: Veritabanı oturumu
+            responses: Sembol -> PredictionService.build_prediction_responses çıktısı
+
+        Returns:
+            int: Güncellenen anlık görüntü sayısı
+        """
+        now = datetime.now()
+        rows = []
+        for symbol, response in responses.items():
+            try:
+                prediction = PredictionStockResponse(**response)
+            except Exception as e:
+                self.logger.warning(f"{symbol} tahmin anlık görüntüsü oluşturulamadı: {str(e)}")
+                continue
+            best_model = prediction.best_model
+            rows.append({
+                "symbol": symbol,
+                "best_model": best_model,
+                "predicted_change_percent": self._predicted_change_percent(response, best_model),
+                "prediction_json": prediction.model_dump_json(),
+                "prediction_updated_at": now,
+                "updated_at": now
+            })
+        return self._upsert(db, rows)
+
+    @staticmethod
+    def _predicted_change_percent(response: Dict[str, Any], best_model: str):
+        """
+        En iyi modelin ilk ufuk tahmininden beklenen değişim (%). Ensemble, küme ve
+        temel modellerin ayrı değişim alanı olmadığından fiyat yanıttan hesaplanır;
+        model fiyatı yoksa ensemble tahmini kullanılır.
+        """
+        current_price = response.get("current_price")
+        horizon = (response.get("predictions") or {}).get(best_model) or []
+        predicted_price = horizon[0] if horizon else response.get(f"{best_model}_predicted_price")
+        if predicted_price is None:
+            predicted_price = response.get("ensemble_predicted_price")
+        if predicted_price is None or not current_price:
+            return None
+        return (float(predicted_price) - current_price) / current_price * 100
+
+    def rebuild(self, db: Session, prediction_formatter) -> int:
+        """
+        Tüm anlık görüntüleri kaynak tablolardan yeniden oluşturur (ilk kurulum / onarım).
+        Her tablo tek sorguyla okunur.
+
+        Args:
+            db: Veritabanı oturumu
+            prediction_formatter: PredictionStock kayıtlarını yanıtlara çeviren fonksiyon
+                (PredictionService.build_prediction_responses)
+
+        Returns:
+            int: Hisse bölümü yazılan anlık görüntü sayısı
+        """
+        stocks = db.scalars(select(BaseStock)).all()
+        count = self.update_stocks(db, stocks)
+        self.update_technicals(db, db.scalars(
+            select(TechnicalStock).options(selectinload(TechnicalStock.base_stock))
+        ).all())
+        self.update_predictions(db, prediction_formatter(db.scalars(
+            select(PredictionStock).options(selectinload(PredictionStock.base_stock))
+        ).all()))
+        self.logger.info(f"{count} hisse için anlık görüntü yeniden oluşturuldu")
+        return count
+
+    def is_empty(self, db: Session) -> bool:
+        return not db.scalar(select(func.count(StockSnapshot.id)))
+
+    def safe_update(self, db: Session, update, *args) -> int:
+        """
+        Okuma modelini günceller; hata işlem hattı aşamasını başarısız saymaz
+        (bir sonraki aşama / yenileme anlık görüntüyü yeniden yazar)
+        """
+        try:
+            return update(db, *args)
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"Anlık görüntü güncelleme hatası: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            return 0
+
+    @staticmethod
+    def render(rows: Sequence) -> bytes:
+        """
+        payload_query satırlarından JSON dizisi üretir. Bölümler zaten JSON olduğu
+        için yalnızca birleştirilir; eksik bölümler null yazılır.
+        """
+        parts = []
+        for symbol, stock_json, technical_json, prediction_json, updated_at in rows:
+            parts.append(
+                f'{{"symbol":{serialization.dumps(symbol)},'
+                f'"stock":{stock_json or "null"},'
+                f'"technical":{technical_json or "null"},'
+                f'"prediction":{prediction_json or "null"},'
+                f'"updated_at":{serialization.dumps(updated_at)}}}'
+            )
+        return ("[" + ",".join(parts) + "]").encode()
+
+    def _upsert(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Satırları sembole göre ekler veya yalnızca verilen sütunları günceller;
+        parça başına tek ifade ve tek commit
+        """
+        if not rows:
+            return 0
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            dialect_insert = None
+
+        for i in range(0, len(rows), SNAPSHOT_UPSERT_CHUNK_SIZE):
+            chunk = rows[i:i + SNAPSHOT_UPSERT_CHUNK_SIZE]
+            try:
+                if dialect_insert is not None:
+                    stmt = dialect_insert(StockSnapshot)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[StockSnapshot.symbol],
+                        set_={column: stmt.excluded[column] for column in chunk[0] if column != "symbol"}
+                    )
+                    db.execute(stmt, chunk)
+                else:
+                    existing = {
+                        snapshot.symbol: snapshot
+                        for snapshot in db.scalars(self.repository.by_symbols_query([row["symbol"] for row in chunk]))
+                    }
+                    for row in chunk:
+                        snapshot = existing.get(row["symbol"])
+                        if snapshot is None:
+                            db.add(StockSnapshot(**row))
+                        else:
+                            for column, value in row.items():
+                                setattr(snapshot, column, value)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+        return len(rows)
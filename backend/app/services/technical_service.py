@@ -6,10 +6,11 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import ta  # Technical Analysis kütüphanesi
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 
 from app.models.base_stock import BaseStock
 from app.models.technical_stock import TechnicalStock
+from app.repositories import TechnicalRepository
+from app.services.snapshot_service import SnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,8 @@ class TechnicalService:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.repository = TechnicalRepository()
+        self.snapshot_service = SnapshotService()
     
     def analyze_selected_stocks(self, db: Session) -> List[TechnicalStock]:
         """
@@ -35,21 +38,35 @@ class TechnicalService:
             List[TechnicalStock]: Analiz edilen teknik hisse nesnelerinin listesi
         """
         # Seçilmiş hisseleri al
-        selected_stocks = db.query(BaseStock).filter(BaseStock.selected == True).all()
+        selected_stocks = db.query(BaseStock).filter(BaseStock.is_selected == True).all()
         
         if not selected_stocks:
             self.logger.warning("Seçilmiş hisse bulunamadı.")
             return []
         
         self.logger.info(f"{len(selected_stocks)} seçilmiş hisse analiz ediliyor...")
+        return self.analyze_stocks(db, selected_stocks)
+    
+    def analyze_stocks(self, db: Session, stocks: List[BaseStock]) -> List[TechnicalStock]:
+        """
+        Verilen hisseler için teknik analiz yapar ve sonunda dashboard okuma
+        modelinin teknik bölümünü toplu olarak günceller.
         
+        Args:
+            db: Veritabanı oturumu
+            stocks: Analiz edilecek hisseler
+            
+        Returns:
+            List[TechnicalStock]: Analiz edilen teknik hisse nesnelerinin listesi
+        """
         analyzed_stocks = []
-        for stock in selected_stocks:
+        for stock in stocks:
             technical = self.analyze_stock(db, stock)
             if technical:
                 analyzed_stocks.append(technical)
         
         self.logger.info(f"{len(analyzed_stocks)} hisse için teknik analiz tamamlandı.")
+        self.snapshot_service.safe_update(db, self.snapshot_service.update_technicals, analyzed_stocks)
         return analyzed_stocks
     
     def analyze_stock(self, db: Session, stock: BaseStock) -> Optional[TechnicalStock]:
@@ -148,9 +165,9 @@ class TechnicalService:
             db: Veritabanı oturumu
             
         Returns:
-            List[TechnicalStock]: Teknik analiz sonuçlarının listesi
+            List[TechnicalStock]: Teknik analiz sonuçlarının listesi (hisseleri birlikte yüklenmiş)
         """
-        return db.query(TechnicalStock).order_by(desc(TechnicalStock.updated_at)).all()
+        return self.repository.get_all_with_stock(db)
     
     def get_technical_by_symbol(self, db: Session, symbol: str) -> Optional[TechnicalStock]:
         """
@@ -161,18 +178,10 @@ class TechnicalService:
             symbol: Teknik analiz sonuçları istenilen hisse senedi sembolü
             
         Returns:
-            Optional[TechnicalStock]: Teknik analiz sonuçları
+            Optional[TechnicalStock]: Teknik analiz sonuçları (hissesi birlikte yüklenmiş)
         """
-        # Önce sembole göre hisseyi bul
-        stock = db.query(BaseStock).filter(BaseStock.symbol == symbol).first()
-        
-        if not stock:
-            return None
-        
-        # Hissenin teknik analizini bul
-        return db.query(TechnicalStock).filter(
-            TechnicalStock.base_stock_id == stock.id
-        ).first()
+        # Hisse ve teknik analiz tek JOIN sorgusuyla
+        return self.repository.get_by_symbol(db, symbol)
     
     def _get_historical_data(self, stock: BaseStock) -> Optional[pd.DataFrame]:
         """
@@ -0,0 +1,191 @@
+import logging
+import multiprocessing
+import time
+import traceback
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+
+def _training_worker_main(conn, time_budget: float):
+    """
+    Eğitim alt sürecinin ana döngüsü. Ana süreçten (sembol, model tipi) görevleri alır,
+    tahmini yapar ve sonucu aynı bağlantı üzerinden geri gönderir.
+
+    Bu fonksiyon ayrı bir süreçte çalışır; bu yüzden veritabanı oturumu ve tahmin
+    servisi burada yeniden oluşturulur.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    logger = logging.getLogger(__name__)
+
+    from app.db.session import SessionLocal
+    from app import models  # Modellerin metadata'ya kaydedilmesi için
+    from app.models.base_stock import BaseStock
+    from app.services.prediction_service import PredictionService
+
+    prediction_service = PredictionService()
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+
+        if task is None:
+            break
+
+        symbol, model_type, reuse_models = task
+        db = SessionLocal()
+        try:
+            stock = db.query(BaseStock).filter(BaseStock.symbol == symbol).first()
+            if not stock:
+                conn.send({"success": False, "message": f"{symbol} için BaseStock kaydı bulunamadı", "prediction": None})
+                continue
+
+            prediction = prediction_service.predict_stock(db, stock, model_type=model_type, time_budget=time_budget,
+                                                          reuse_models=reuse_models)
+            conn.send({"success": prediction is not None, "message": None, "prediction": prediction})
+        except Exception as e:
+            logger.error(f"{symbol} için eğitim alt sürecinde hata: {str(e)}")
+            logger.error(traceback.format_exc())
+            conn.send({"success": False, "message": str(e), "prediction": None})
+        finally:
+            db.close()
+
+class TrainingSupervisor:
+    """
+    Her sembolün eğitimini ayrı bir alt süreçte çalıştıran ve süre sınırını aşan
+    alt süreci sonlandırıp yenisini başlatan denetleyici.
+
+    SIGALRM yalnızca ana thread'de çalışır ve TensorFlow'un C++ kodunu kesemez;
+    alt süreç ise her durumda sonlandırılabilir. Böylece takılan bir sembol tüm
+    gece çalışmasını durduramaz.
+    """
+
+    def __init__(self, time_budget: Optional[float] = None, grace_period: Optional[float] = None,
+                 max_tasks_per_worker: Optional[int] = None):
+        """
+        Args:
+            time_budget: Sembol başına eğitim süresi (saniye). Eğitim bu süre dolunca epoch sonunda durdurulur.
+            grace_period: Süre dolduktan sonra alt süreç sonlandırılmadan önce beklenecek ek süre (saniye)
+            max_tasks_per_worker: Bellek birikmesini önlemek için alt sürecin kaç görevden sonra yenileneceği
+        """
+        self.logger = logging.getLogger(__name__)
+        self.time_budget = time_budget or settings.SYMBOL_TIME_BUDGET_SECONDS
+        self.grace_period = grace_period or settings.SYMBOL_HARD_TIMEOUT_GRACE_SECONDS
+        self.max_tasks_per_worker = max_tasks_per_worker or settings.TRAINING_WORKER_MAX_TASKS
+
+        # TensorFlow fork sonrası güvenli olmadığından alt süreçler spawn ile başlatılır
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._tasks_done = 0
+
+        self.metrics = {
+            'completed': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'recycled': 0
+        }
+
+    def _start_worker(self):
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_training_worker_main,
+            args=(child_conn, self.time_budget),
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._tasks_done = 0
+        self.logger.info(f"Eğitim alt süreci başlatıldı (pid={self._process.pid})")
+
+    def _stop_worker(self, force: bool = False):
+        if self._process is None:
+            return
+
+        if force:
+            self.logger.warning(f"Eğitim alt süreci sonlandırılıyor (pid={self._process.pid})")
+            self._process.terminate()
+            self._process.join(5)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        else:
+            try:
+                self._conn.send(None)
+            except Exception:
+                pass
+            self._process.join(10)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+        self._process = None
+        self._conn = None
+
+    def run_symbol(self, symbol: str, model_type: str = 'all', reuse_models: bool = False) -> Dict[str, Any]:
+        """
+        Tek bir sembol için tahmini alt süreçte çalıştırır ve süre sınırını uygular.
+
+        Args:
+            symbol: Hisse senedi sembolü
+            model_type: Kullanılacak model tipi
+            reuse_models: True ise kayıtlı derin model ağırlıkları yeniden eğitilmeden kullanılır
+
+        Returns:
+            Dict: success, timed_out, message ve prediction alanlarını içeren sonuç
+        """
+        if self._process is None or not self._process.is_alive():
+            self._start_worker()
+
+        hard_timeout = self.time_budget + self.grace_period
+        started = time.time()
+
+        try:
+            self._conn.send((symbol, model_type, reuse_models))
+
+            if not self._conn.poll(hard_timeout):
+                # Süre aşıldı: alt süreci sonlandır, bir sonraki görevde yenisi başlatılır
+                self._stop_worker(force=True)
+                self.metrics['timed_out'] += 1
+                self.logger.error(f"{symbol} için eğitim {hard_timeout:.0f} saniyelik süre sınırını aştı, alt süreç sonlandırıldı")
+                return {"success": False, "timed_out": True, "message": "Süre sınırı aşıldı", "prediction": None}
+
+            result = self._conn.recv()
+        except (EOFError, BrokenPipeError, OSError) as e:
+            # Alt süreç beklenmedik şekilde kapandı (örn. bellek yetersizliği)
+            self._stop_worker(force=True)
+            self.metrics['failed'] += 1
+            self.logger.error(f"{symbol} için eğitim alt süreci beklenmedik şekilde sonlandı: {str(e)}")
+            return {"success": False, "timed_out": False, "message": f"Alt süreç sonlandı: {str(e)}", "prediction": None}
+
+        self._tasks_done += 1
+        if result.get("success"):
+            self.metrics['completed'] += 1
+        else:
+            self.metrics['failed'] += 1
+
+        self.logger.info(f"{symbol} alt süreçte {time.time() - started:.1f} saniyede işlendi")
+
+        # Belirli sayıda görevden sonra alt süreci yenile (TensorFlow bellek birikmesine karşı)
+        if self._tasks_done >= self.max_tasks_per_worker:
+            self._stop_worker()
+            self.metrics['recycled'] += 1
+
+        result["timed_out"] = False
+        return result
+
+    def close(self):
+        """
+        Alt süreci kapatır
+        """
+        self._stop_worker()
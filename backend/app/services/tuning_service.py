@@ -0,0 +1,411 @@
+import logging
+import math
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.prediction_job import ITEM_STATUS_RUNNING, ITEM_STATUS_DONE, ITEM_STATUS_FAILED
+from app.models.tuned_config import TunedConfig
+
+# Yapılandırma kapsamları
+TUNING_SCOPE_SYMBOL = "symbol"
+TUNING_SCOPE_CLUSTER = "cluster"
+
+# Aranan yapılandırma yoksa kullanılan varsayılan eğitim yapılandırmaları
+DEFAULT_SEQUENCE_LENGTH = 30
+DEFAULT_TRAINING_CONFIGS = {
+    "lstm": {"sequence_length": DEFAULT_SEQUENCE_LENGTH, "epochs": 150, "batch_size": 20, "learning_rate": 0.0001},
+    "gru": {"sequence_length": DEFAULT_SEQUENCE_LENGTH, "epochs": 150, "batch_size": 20, "learning_rate": 0.001},
+    "attention": {"sequence_length": DEFAULT_SEQUENCE_LENGTH, "epochs": 150, "batch_size": 20, "learning_rate": 0.001},
+}
+
+# Küme modelleri birleştirilmiş (daha büyük) veriyle eğitildiğinden daha büyük toplu işleme boyutu kullanır
+DEFAULT_CLUSTER_BATCH_SIZE = 64
+
+# Model tipi başına aranan hiperparametre uzayı
+SEARCH_SPACE = {
+    "sequence_length": [10, 15, 30, 45],
+    "batch_size": [16, 32, 64],
+    "learning_rate": [0.0001, 0.0003, 0.001, 0.003],
+}
+
+def default_training_config(model_type: str) -> Dict[str, Any]:
+    """
+    Model tipinin varsayılan eğitim yapılandırmasının bir kopyasını döndürür
+    """
+    config = DEFAULT_TRAINING_CONFIGS.get(model_type.lower(), DEFAULT_TRAINING_CONFIGS["lstm"])
+    return dict(config, source="default")
+
+def successive_halving_plan(trials: int, max_epochs: int, eta: int) -> List[Tuple[int, int]]:
+    """
+    Ardışık yarılama turlarını hesaplar: her turda yapılandırmaların 1/eta'sı kalır,
+    kalanların epoch bütçesi eta katına çıkar; son turda tek yapılandırma tam bütçeyle eğitilir.
+
+    Returns:
+        List[Tuple[int, int]]: Tur başına (yapılandırma sayısı, epoch bütçesi)
+    """
+    rounds = int(math.floor(math.log(max(trials, 1), eta) + 1e-9)) + 1
+    return [
+        (max(1, trials // eta ** i), max(1, int(round(max_epochs / eta ** (rounds - 1 - i)))))
+        for i in range(rounds)
+    ]
+
+# Alt süreç başına tahmin servisi (model oluşturma ve eğitim için)
+_prediction_service = None
+
+def _get_prediction_service():
+    global _prediction_service
+    if _prediction_service is None:
+        from app.services.prediction_service import PredictionService
+        _prediction_service = PredictionService()
+    return _prediction_service
+
+def _init_trial_worker(intra_op_threads: int):
+    """
+    Deneme süreçlerinde TensorFlow iş parçacığı havuzlarını süreç sayısına göre küçültür
+    """
+    settings.TF_INTRA_OP_THREADS = intra_op_threads
+    settings.TF_INTER_OP_THREADS = 1
+
+def _trial_task(model_type: str, config: Dict[str, Any], epochs: int,
+                data: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> Dict[str, Any]:
+    """
+    Tek bir yapılandırmayı verilen epoch bütçesiyle eğitir ve doğrulama hatasını döndürür
+    """
+    service = _get_prediction_service()
+    X_train, y_train, X_val, y_val = data
+
+    model = service.create_model(model_type, (X_train.shape[1], X_train.shape[2]), learning_rate=config["learning_rate"])
+    _, metrics = service.train_model(
+        f"ayar-{model_type}",
+        X_train, y_train,
+        X_val, y_val,
+        model_type=model_type,
+        epochs=epochs,
+        batch_size=config["batch_size"],
+        patience=max(3, epochs // 5),
+        model=model
+    )
+    return {"val_loss": metrics["mse"], "epochs": metrics["epochs"], "fit_seconds": metrics["fit_seconds"]}
+
+class TuningService:
+    """
+    Derin modellerin eğitim hiperparametrelerini (pencere uzunluğu, toplu işleme boyutu,
+    öğrenme katsayısı, epoch) ardışık yarılama ile arayan ve kazanan yapılandırmayı
+    sembol veya küme bazında saklayan servis.
+
+    Kötü yapılandırmalar birkaç epoch sonra elenir; her turun denemeleri paralel alt
+    süreçlerde çalışır. Varsayılan ayarlarla (9 deneme, eta=3) toplam bütçe tek bir
+    tam eğitimin yaklaşık üç katıdır.
+    """
+
+    def __init__(self, prediction_service=None, max_workers: Optional[int] = None):
+        """
+        Args:
+            prediction_service: Veri hazırlama ve küme atamaları için tahmin servisi
+            max_workers: Paralel deneme süreci sayısı (1 ise aynı süreçte çalışır)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.prediction_service = prediction_service
+        self.max_workers = max_workers or settings.TUNING_MAX_WORKERS
+        self._configs: Optional[Dict[Tuple[str, str, str], Dict[str, Any]]] = None
+        self._loaded_at = 0.0
+
+    def _load(self, db: Session) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        if self._configs is None or time.time() - self._loaded_at > settings.TUNED_CONFIG_CACHE_SECONDS:
+            self._configs = {
+                (record.scope, record.scope_key, record.model_type): {
+                    "sequence_length": record.sequence_length,
+                    "epochs": record.epochs,
+                    "batch_size": record.batch_size,
+                    "learning_rate": record.learning_rate
+                }
+                for record in db.query(TunedConfig).all()
+            }
+            self._loaded_at = time.time()
+        return self._configs
+
+    def resolve(self, db: Session, symbol: str, model_type: str) -> Dict[str, Any]:
+        """
+        Sembolün eğitim yapılandırmasını döndürür: önce sembole, sonra kümesine ait
+        aranmış yapılandırma, yoksa model tipinin varsayılanı.
+
+        Args:
+            db: Veritabanı oturumu
+            symbol: Hisse senedi sembolü
+            model_type: Model tipi
+
+        Returns:
+            Dict: sequence_length, epochs, batch_size, learning_rate ve kaynak ('symbol', 'cluster', 'default')
+        """
+        model_type = model_type.lower()
+        if not settings.TUNED_CONFIGS_ENABLED:
+            return default_training_config(model_type)
+
+        configs = self._load(db)
+        config = configs.get((TUNING_SCOPE_SYMBOL, symbol, model_type))
+        if config is not None:
+            return dict(config, source=TUNING_SCOPE_SYMBOL)
+
+        assignment = self.prediction_service.cluster_service.get_assignment(db, symbol) if self.prediction_service else None
+        if assignment is not None:
+            config = configs.get((TUNING_SCOPE_CLUSTER, str(assignment.cluster_id), model_type))
+            if config is not None:
+                return dict(config, source=TUNING_SCOPE_CLUSTER)
+
+        return default_training_config(model_type)
+
+    def resolve_cluster(self, db: Session, cluster_id: int, model_type: str) -> Dict[str, Any]:
+        """
+        Kümenin ortak modeli için eğitim yapılandırmasını döndürür
+        """
+        model_type = model_type.lower()
+        if settings.TUNED_CONFIGS_ENABLED:
+            config = self._load(db).get((TUNING_SCOPE_CLUSTER, str(cluster_id), model_type))
+            if config is not None:
+                return dict(config, source=TUNING_SCOPE_CLUSTER)
+        return dict(default_training_config(model_type), batch_size=DEFAULT_CLUSTER_BATCH_SIZE)
+
+    def sample_configs(self, model_type: str, trials: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Arama uzayından tekrarsız yapılandırmalar seçer; varsayılan yapılandırma her zaman
+        adaylar arasındadır, böylece kazanan doğrulamada varsayılandan kötü olmaz.
+        """
+        default = default_training_config(model_type)
+        grid = [
+            {"sequence_length": s, "batch_size": b, "learning_rate": lr}
+            for s in SEARCH_SPACE["sequence_length"]
+            for b in SEARCH_SPACE["batch_size"]
+            for lr in SEARCH_SPACE["learning_rate"]
+            if (s, b, lr) != (default["sequence_length"], default["batch_size"], default["learning_rate"])
+        ]
+        rng = np.random.default_rng(settings.TUNING_SEED if seed is None else seed)
+        picked = rng.choice(len(grid), size=min(trials - 1, len(grid)), replace=False)
+
+        baseline = {key: default[key] for key in ("sequence_length", "batch_size", "learning_rate")}
+        return [baseline] + [grid[i] for i in sorted(picked)]
+
+    def _build_data(self, frames: Dict[str, pd.DataFrame],
+                    sequence_lengths: List[int]) -> Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Her pencere uzunluğu için eğitim/doğrulama dizilerini hazırlar. Birden fazla sembol
+        verildiğinde (küme) ortak özellikler kullanılır ve pencereler zaman sırasına göre
+        bölünüp birleştirilir.
+        """
+        service = self.prediction_service
+        feature_sets = [service.select_best_features(df) for df in frames.values()]
+        common = set.intersection(*(set(f) for f in feature_sets))
+        feature_columns = [column for column in feature_sets[0] if column in common]
+        if len(feature_columns) < 3:
+            raise ValueError("Ortak özellik sayısı yetersiz")
+
+        data = {}
+        for sequence_length in sequence_lengths:
+            parts = []
+            for df in frames.values():
+                target_column = 'Close' if 'Close' in df.columns else 'close'
+                dataset = service.feature_cache.get_or_build(df, feature_columns, target_column, sequence_length, holdout=24)
+                if len(dataset.X) < 10:
+                    continue
+                train_size = int(0.8 * len(dataset.X))
+                parts.append((dataset.X[:train_size], dataset.y[:train_size], dataset.X[train_size:], dataset.y[train_size:]))
+            if parts:
+                data[sequence_length] = tuple(np.concatenate([np.asarray(part[i]) for part in parts]) for i in range(4))
+        return data
+
+    def _run_round(self, model_type: str, candidates: List[Dict[str, Any]], epochs: int,
+                   data: Dict[int, Tuple[np.ndarray, ...]], executor: Optional[ProcessPoolExecutor]) -> List[float]:
+        """
+        Bir turun tüm denemelerini çalıştırır; başarısız denemelerin hatası sonsuz sayılır
+        """
+        def failed(config: Dict[str, Any], error: Exception) -> float:
+            self.logger.warning(f"{model_type.upper()} denemesi başarısız ({config}): {str(error)}")
+            return float('inf')
+
+        scores = []
+        if executor is None:
+            for config in candidates:
+                try:
+                    scores.append(_trial_task(model_type, config, epochs, data[config["sequence_length"]])["val_loss"])
+                except Exception as e:
+                    scores.append(failed(config, e))
+            return scores
+
+        futures = [executor.submit(_trial_task, model_type, config, epochs, data[config["sequence_length"]]) for config in candidates]
+        for config, future in zip(candidates, futures):
+            try:
+                scores.append(future.result()["val_loss"])
+            except Exception as e:
+                scores.append(failed(config, e))
+        return scores
+
+    def tune(self, db: Session, scope: str, scope_key: str, frames: Dict[str, pd.DataFrame],
+             model_types: List[str]) -> Dict[str, Any]:
+        """
+        Verilen sembol(ler)in verisiyle her model tipi için ardışık yarılama araması yapar
+        ve kazanan yapılandırmaları kaydeder.
+
+        Args:
+            db: Veritabanı oturumu
+            scope: TUNING_SCOPE_SYMBOL veya TUNING_SCOPE_CLUSTER
+            scope_key: Sembol adı veya küme numarası
+            frames: Sembol -> göstergeleri hesaplanmış saatlik veri
+            model_types: Aranacak model tipleri
+
+        Returns:
+            Dict: Model tipi -> kazanan yapılandırma, doğrulama hatası ve bütçe bilgileri
+        """
+        started = time.perf_counter()
+        candidates_by_model = {mt: self.sample_configs(mt, settings.TUNING_TRIALS) for mt in model_types}
+        sequence_lengths = sorted({c["sequence_length"] for configs in candidates_by_model.values() for c in configs})
+        data = self._build_data(frames, sequence_lengths)
+
+        executor = None
+        if self.max_workers > 1:
+            threads = max(1, (multiprocessing.cpu_count() or 1) // self.max_workers)
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_trial_worker,
+                initargs=(threads,)
+            )
+
+        results = {}
+        try:
+            for model_type in model_types:
+                candidates = [c for c in candidates_by_model[model_type] if c["sequence_length"] in data]
+                if not candidates:
+                    results[model_type] = {"success": False, "message": "Yeterli veri yok"}
+                    continue
+
+                max_epochs = default_training_config(model_type)["epochs"]
+                plan = successive_halving_plan(len(candidates), max_epochs, settings.TUNING_ETA)
+                rounds = []
+                total_epochs = 0
+                scores = []
+
+                for round_index, (keep, epochs) in enumerate(plan):
+                    candidates = candidates[:keep]
+                    scores = self._run_round(model_type, candidates, epochs, data, executor)
+                    total_epochs += len(candidates) * epochs
+
+                    order = np.argsort(scores, kind="stable")
+                    candidates = [candidates[i] for i in order]
+                    scores = [scores[i] for i in order]
+                    rounds.append({"configs": len(order), "epochs": epochs, "best_val_loss": scores[0]})
+                    self.logger.info(
+                        f"{scope} {scope_key} {model_type.upper()} tur {round_index + 1}/{len(plan)}: "
+                        f"{len(order)} yapılandırma x {epochs} epoch, en iyi doğrulama hatası {scores[0]:.6f}"
+                    )
+
+                if not math.isfinite(scores[0]):
+                    results[model_type] = {"success": False, "message": "Tüm denemeler başarısız"}
+                    continue
+
+                winner = dict(candidates[0], epochs=plan[-1][1])
+                self.save(db, scope, scope_key, model_type, winner, scores[0], len(candidates_by_model[model_type]), total_epochs, rounds)
+                results[model_type] = {
+                    "success": True,
+                    "config": winner,
+                    "val_loss": round(float(scores[0]), 8),
+                    "trials": len(candidates_by_model[model_type]),
+                    "total_epochs": total_epochs,
+                    "budget_multiple": round(total_epochs / max_epochs, 2)
+                }
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.logger.info(f"{scope} {scope_key} hiperparametre araması tamamlandı - {time.perf_counter() - started:.1f} saniye")
+        return results
+
+    def save(self, db: Session, scope: str, scope_key: str, model_type: str, config: Dict[str, Any],
+             val_loss: float, trials: int, total_epochs: int, rounds: List[Dict[str, Any]]):
+        """
+        Kazanan yapılandırmayı kapsam ve model tipi için kaydeder (varsa günceller)
+        """
+        record = db.query(TunedConfig).filter(
+            TunedConfig.scope == scope,
+            TunedConfig.scope_key == scope_key,
+            TunedConfig.model_type == model_type
+        ).first()
+        if record is None:
+            record = TunedConfig(scope=scope, scope_key=scope_key, model_type=model_type)
+            db.add(record)
+
+        record.sequence_length = int(config["sequence_length"])
+        record.epochs = int(config["epochs"])
+        record.batch_size = int(config["batch_size"])
+        record.learning_rate = float(config["learning_rate"])
+        record.val_loss = float(val_loss)
+        record.trials = trials
+        record.total_epochs = total_epochs
+        record.search = {"rounds": rounds}
+        record.tuned_at = datetime.now()
+        db.commit()
+        self._configs = None
+
+    def run(self, db: Session, symbols: List[str], model_types: List[str], days: int = 45,
+            progress_callback: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """
+        Sembolleri kümelerine göre gruplayıp arama yapar: kümesi olan semboller için
+        küme başına (en fazla TUNING_MAX_MEMBERS üyenin verisiyle) tek arama, kümesi
+        olmayanlar için sembol başına arama yapılır.
+
+        Args:
+            db: Veritabanı oturumu
+            symbols: Semboller
+            model_types: Aranacak model tipleri
+            days: Kaç günlük saatlik veri kullanılacağı
+            progress_callback: Her sembolün durumu değiştiğinde (sembol, durum) ile çağrılır
+
+        Returns:
+            Dict: Kapsam -> model tipi bazında arama sonuçları
+        """
+        def report(symbol: str, status: str):
+            if progress_callback:
+                progress_callback(symbol, status)
+
+        service = self.prediction_service
+        service.feature_importance_service.load_active(db)
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for symbol in symbols:
+            assignment = service.cluster_service.get_assignment(db, symbol)
+            if assignment is not None:
+                groups.setdefault((TUNING_SCOPE_CLUSTER, str(assignment.cluster_id)), []).append(symbol)
+            else:
+                groups.setdefault((TUNING_SCOPE_SYMBOL, symbol), []).append(symbol)
+
+        results = {}
+        for (scope, scope_key), members in groups.items():
+            for symbol in members:
+                report(symbol, ITEM_STATUS_RUNNING)
+            try:
+                frames = {}
+                for symbol in members[:settings.TUNING_MAX_MEMBERS]:
+                    df = service.fetch_and_prepare_dataframe(symbol, days=days)
+                    if not df.empty:
+                        frames[symbol] = df
+                if not frames:
+                    raise ValueError("Veri hazırlanamadı")
+
+                results[f"{scope}:{scope_key}"] = self.tune(db, scope, scope_key, frames, model_types)
+                status = ITEM_STATUS_DONE
+            except Exception as e:
+                self.logger.error(f"{scope} {scope_key} hiperparametre araması hatası: {str(e)}")
+                self.logger.debug(traceback.format_exc())
+                results[f"{scope}:{scope_key}"] = {"success": False, "message": str(e)}
+                status = ITEM_STATUS_FAILED
+
+            for symbol in members:
+                report(symbol, status)
+
+        return results
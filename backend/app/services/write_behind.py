@@ -0,0 +1,312 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Yazıcı iş parçacığına gönderilen kontrol işaretleri
+_FLUSH = object()
+_STOP = object()
+
+class WriteBehindBuffer:
+    """
+    Hesaplama ile veritabanı yazması arasında sınırlı kapasiteli tampon.
+
+    Hesaplama döngüsü sonuçları put() ile ekler ve hemen sonraki sembole geçer;
+    ayrı bir yazıcı iş parçacığı sonuçları batch_size dolana veya max_delay
+    saniye geçene kadar biriktirip kendi oturumuyla toplu olarak yazar. Tampon
+    dolduğunda put() bekler (geri basınç), böylece bellek kullanımı sınırlı kalır.
+
+    Başarısız partiler üstel beklemeyle yeniden denenir; denemeler tükenirse
+    hatalı kaydı ayırmak için kayıtlar tek tek yazılır. Kalıcı olarak yazılan ve
+    yazılamayan anahtarlar pop_completed() ile alınır; ilerleme yalnızca commit
+    edilmiş kayıtlara göre raporlanmalıdır.
+
+    Çökme güvenli kipte süreç kapanırken tampon boşaltılır. Günlük dosyası
+    verilirse commit edilen her parti bu dosyaya (JSONL) eklenir; yeniden
+    denenen bir iş zaten yazılmış kayıtları bu dosyayla atlayabilir (read_journal).
+    collect_results açıksa yazma fonksiyonunun parti başına döndürdüğü değerler
+    pop_results() ile alınır (ör. yazıcı oturumunda RETURNING ile okunan kayıtlar).
+    """
+
+    def __init__(self, name: str, write_batch: Callable[[Session, List[Any]], Any],
+                 key: Optional[Callable[[Any], str]] = None,
+                 batch_size: Optional[int] = None,
+                 max_delay: Optional[float] = None,
+                 max_pending: Optional[int] = None,
+                 max_retries: Optional[int] = None,
+                 retry_backoff: Optional[float] = None,
+                 crash_safe: Optional[bool] = None,
+                 journal_path: Optional[str] = None,
+                 session_factory: Optional[Callable[[], Session]] = None,
+                 collect_results: bool = False):
+        """
+        Args:
+            name: Loglarda ve günlükte kullanılan tampon adı
+            write_batch: Bir partiyi verilen oturumla yazıp commit eden fonksiyon
+            key: Kaydın anahtarını döndüren fonksiyon (varsayılan: item["symbol"])
+            batch_size: Tek seferde yazılan en fazla kayıt
+            max_delay: Eksik bir partinin yazılmadan önce en fazla bekleme süresi (saniye)
+            max_pending: Tamponda bekleyebilecek en fazla kayıt
+            max_retries: Başarısız bir parti için yeniden deneme sayısı
+            retry_backoff: İlk yeniden denemeden önceki bekleme (her denemede iki katına çıkar)
+            crash_safe: True ise süreç kapanırken (atexit) tampon boşaltılır
+            journal_path: Commit edilen anahtarların eklendiği günlük dosyası (None ise tutulmaz)
+            session_factory: Yazıcı oturumlarını açan fabrika (varsayılan: SessionLocal)
+            collect_results: True ise write_batch'in döndürdüğü değerler pop_results() için saklanır
+        """
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.write_batch = write_batch
+        self.key = key or (lambda item: item["symbol"])
+        self.batch_size = max(1, batch_size or settings.WRITE_BEHIND_BATCH_SIZE)
+        self.max_delay = settings.WRITE_BEHIND_MAX_DELAY_SECONDS if max_delay is None else max_delay
+        self.max_retries = settings.WRITE_BEHIND_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = settings.WRITE_BEHIND_RETRY_BACKOFF_SECONDS if retry_backoff is None else retry_backoff
+        self.crash_safe = settings.WRITE_BEHIND_CRASH_SAFE if crash_safe is None else crash_safe
+        self.journal_path = journal_path
+        self.collect_results = collect_results
+
+        if session_factory is None:
+            from app.db.session import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+
+        self._queue = queue.Queue(maxsize=max(1, max_pending or settings.WRITE_BEHIND_MAX_PENDING))
+        self._lock = threading.Lock()
+        self._written: List[str] = []
+        self._failed: List[str] = []
+        self._results: List[Any] = []
+        self._closed = False
+        self._metrics = {
+            "queued": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "retries": 0,
+            "max_batch": 0,
+            "producer_wait_seconds": 0.0,
+            "write_seconds": 0.0
+        }
+
+        if self.journal_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+            self._journal("start")
+        if self.crash_safe:
+            atexit.register(self.close)
+
+        self._thread = threading.Thread(target=self._run, name=f"write-behind-{name}", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "WriteBehindBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def put(self, item: Any):
+        """
+        Kaydı yazma tamponuna ekler; tampon doluysa yer açılana kadar bekler
+        """
+        if self._closed:
+            raise RuntimeError(f"{self.name} yazma tamponu kapatıldı")
+        started = time.perf_counter()
+        self._queue.put(item)
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._metrics["queued"] += 1
+            self._metrics["producer_wait_seconds"] += waited
+
+    def flush(self):
+        """
+        Tampondaki tüm kayıtlar yazılana (veya yazılamadığı kesinleşene) kadar bekler
+        """
+        if self._closed:
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self):
+        """
+        Tamponu boşaltır ve yazıcı iş parçacığını durdurur
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.crash_safe:
+            atexit.unregister(self.close)
+
+        metrics = self.metrics
+        if self.journal_path:
+            self._journal("close", written=metrics["written"], failed=metrics["failed"])
+        self.logger.info(
+            f"{self.name} yazma tamponu kapatıldı: {metrics['written']} kayıt {metrics['batches']} partide yazıldı, "
+            f"{metrics['failed']} hata, üretici bekleme {metrics['producer_wait_seconds']:.2f} sn, "
+            f"yazma {metrics['write_seconds']:.2f} sn"
+        )
+
+    def pop_completed(self) -> Tuple[List[str], List[str]]:
+        """
+        Son çağrıdan bu yana kalıcı olarak yazılan ve yazılamayan anahtarları döndürür
+
+        Returns:
+            Tuple[List[str], List[str]]: (yazılan anahtarlar, yazılamayan anahtarlar)
+        """
+        with self._lock:
+            written, self._written = self._written, []
+            failed, self._failed = self._failed, []
+        return written, failed
+
+    def pop_results(self) -> List[Any]:
+        """
+        Son çağrıdan bu yana commit edilen partiler için write_batch'in döndürdüğü değerler
+        (collect_results kapalıysa boş)
+
+        Returns:
+            List[Any]: Parti başına dönüş değerleri
+        """
+        with self._lock:
+            results, self._results = self._results, []
+        return results
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._metrics, pending=self._queue.qsize())
+
+    @staticmethod
+    def read_journal(path: str) -> Set[str]:
+        """
+        Günlükteki kalıcı olarak yazılmış anahtarları okur
+
+        Args:
+            path: Günlük dosyası
+
+        Returns:
+            Set[str]: Yazılmış anahtarlar (dosya yoksa boş)
+        """
+        keys = set()
+        if not path or not os.path.exists(path):
+            return keys
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Çökme sırasında yarım kalan son satır
+                    continue
+                if entry.get("event") == "written":
+                    keys.update(entry.get("keys", []))
+        return keys
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+
+            batch = [item]
+            controls = 0
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _FLUSH or item is _STOP:
+                    controls += 1
+                    stopping = item is _STOP
+                    break
+                batch.append(item)
+
+            try:
+                self._write(batch)
+            finally:
+                for _ in range(len(batch) + controls):
+                    self._queue.task_done()
+
+    def _write(self, batch: List[Any]):
+        """
+        Partiyi yeniden denemelerle yazar; başarısız olursa kayıtları tek tek dener
+        """
+        for attempt in range(self.max_retries + 1):
+            if self._try_write(batch):
+                return
+            if attempt < self.max_retries:
+                with self._lock:
+                    self._metrics["retries"] += 1
+                time.sleep(self.retry_backoff * (2 ** attempt))
+
+        if len(batch) > 1:
+            self.logger.warning(f"{self.name}: {len(batch)} kayıtlık parti yazılamadı, kayıtlar tek tek deneniyor")
+            for item in batch:
+                if not self._try_write([item]):
+                    self._completed([], [self.key(item)])
+        else:
+            self._completed([], [self.key(batch[0])])
+
+    def _try_write(self, batch: List[Any]) -> bool:
+        started = time.perf_counter()
+        try:
+            with self.session_factory() as db:
+                try:
+                    result = self.write_batch(db, batch)
+                except Exception:
+                    db.rollback()
+                    raise
+        except Exception as e:
+            self.logger.error(f"{self.name}: {len(batch)} kayıt yazılamadı: {str(e)}")
+            self.logger.debug(traceback.format_exc())
+            return False
+
+        keys = [self.key(item) for item in batch]
+        with self._lock:
+            self._metrics["batches"] += 1
+            self._metrics["max_batch"] = max(self._metrics["max_batch"], len(batch))
+            self._metrics["write_seconds"] += time.perf_counter() - started
+            if self.collect_results:
+                self._results.append(result)
+        if self.journal_path:
+            self._journal("written", keys=keys)
+        self._completed(keys, [])
+        return True
+
+    def _completed(self, written: List[str], failed: List[str]):
+        with self._lock:
+            self._written.extend(written)
+            self._failed.extend(failed)
+            self._metrics["written"] += len(written)
+            self._metrics["failed"] += len(failed)
+
+    def _journal(self, event: str, **fields):
+        entry = {"buffer": self.name, "event": event, "at": datetime.now().isoformat(), **fields}
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            self.logger.warning(f"{self.name} yazma günlüğü güncellenemedi: {str(e)}")
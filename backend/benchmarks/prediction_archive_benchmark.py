@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Tahmin arşivi (prediction_archive) benchmark'ı.
+
+Geçici bir SQLite veritabanına hisseler ve son tahminleri yazılır. Sıcak okuma
+yolu (/api/stocks/filtered-predictions ve /api/stocks/prediction/{symbol})
+arşiv boşken ve arşive --days gün boyunca günde --runs tahmin eklendikten
+sonra ölçülür; ardından sembol aralık sorgusu ve saklama işi (gün içi
+satırların günlüğe sıkıştırılması) ölçülür.
+
+Çalıştırmak için (backend dizininde):
+    python benchmarks/prediction_archive_benchmark.py
+    python benchmarks/prediction_archive_benchmark.py --symbols 500 --days 120 --runs 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def timed(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Tahmin arşivi benchmark'ı")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90, help="Arşivlenen gün sayısı")
+    parser.add_argument("--runs", type=int, default=6, help="Gün başına tahmin çalıştırması")
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'archive.db')}"
+    os.environ.pop("DATABASE_READ_URL", None)
+    os.environ["PROCESS_ROLE"] = "api"
+    sys.path.insert(0, BACKEND_DIR)
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, insert, select
+
+    import app.models  # noqa: F401 - tüm tabloları kaydeder
+    from app.db.session import Base, SessionLocal, engine
+    from app.main import app
+    from app.models import BaseStock, PredictionArchive, PredictionStock
+    from app.services.prediction_archive_service import PredictionArchiveService
+
+    Base.metadata.create_all(engine)
+    now = datetime.now().replace(microsecond=0)
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    with SessionLocal() as db:
+        for i, symbol in enumerate(symbols):
+            stock = BaseStock(symbol=symbol, name=symbol, last_price=10.0 + i, is_selected=True, updated_at=now)
+            db.add(stock)
+            db.flush()
+            db.add(PredictionStock(
+                symbol=symbol, base_stock_id=stock.id, current_price=10.0 + i,
+                prediction_data={"predictions": {"lstm": [10.5 + i] * 7}, "models_used": ["lstm"]},
+                lstm_predicted_price=10.5 + i, best_model="lstm", best_mse=0.01, best_mae=0.05, volatility=0.8,
+                features_used=["close"], training_window=60, prediction_window=7,
+                prediction_date=now + timedelta(days=1), last_updated=now, updated_at=now
+            ))
+        db.commit()
+
+    with TestClient(app) as client:
+        def hot_reads():
+            client.get("/api/stocks/filtered-predictions").raise_for_status()
+            client.get(f"/api/stocks/prediction/{symbols[len(symbols) // 2]}").raise_for_status()
+
+        def range_query():
+            client.get(f"/api/stocks/prediction/{symbols[len(symbols) // 2]}/archive",
+                       params={"start": (now - timedelta(days=60)).isoformat(), "limit": 10000}).raise_for_status()
+
+        hot_reads()  # Isınma: bağlantı havuzu ve sorgu önbelleği
+        p50_empty, p95_empty = timed(hot_reads, args.iterations)
+
+        # Arşive günde args.runs tahmin: gün içinde eşit aralıklı
+        step = timedelta(hours=24 / args.runs)
+        with engine.begin() as conn:
+            for day in range(args.days):
+                conn.execute(insert(PredictionArchive), [
+                    {"symbol": symbol, "created_at": now - timedelta(days=day + 1) + run * step,
+                     "granularity": "raw", "samples": 1, "current_price": 10.0, "best_model": "lstm",
+                     "lstm_predicted_price": 10.5, "predictions": {"lstm": [10.5] * 7}}
+                    for symbol in symbols
+                    for run in range(args.runs)
+                ])
+        with SessionLocal() as db:
+            archived = db.scalar(select(func.count()).select_from(PredictionArchive))
+
+        p50_full, p95_full = timed(hot_reads, args.iterations)
+        p50_range, p95_range = timed(range_query, args.iterations)
+
+        print(f"{args.symbols} sembol, arşivde {archived} tahmin ({args.days} gün x {args.runs} çalıştırma)\n")
+        print(f"{'sıcak okuma (arşiv boş)':<32} p50 {p50_empty:>8.2f} ms   p95 {p95_empty:>8.2f} ms")
+        print(f"{'sıcak okuma (arşiv dolu)':<32} p50 {p50_full:>8.2f} ms   p95 {p95_full:>8.2f} ms")
+        print(f"{'arşiv aralığı (60 gün, sembol)':<32} p50 {p50_range:>8.2f} ms   p95 {p95_range:>8.2f} ms")
+
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            result = PredictionArchiveService().compact(db, raw_days=30, retention_days=0)
+            elapsed = time.perf_counter() - started
+            remaining = db.scalar(select(func.count()).select_from(PredictionArchive))
+        print(f"\nsıkıştırma: {archived} -> {remaining} satır, {result['compacted_days']} sembol-gün, "
+              f"{elapsed:.2f} sn")
+
+    tmp.cleanup()
+
+if __name__ == "__main__":
+    main()
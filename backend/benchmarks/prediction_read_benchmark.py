@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+Tahmin listesi okuma gecikmesi benchmark'ı.
+
+Geçici bir SQLite veritabanına gerçekçi boyutta tahmin verisi (model başına
+çok adımlı tahminler, metrikler, tahmin aralıkları, özellik listesi) yazılır ve
+ölçülür:
+  - `/api/stocks/filtered-predictions` uçtan uca gecikmesi (TestClient)
+  - kayıtların yüklenmesi (sorgu + JSON çözümü) ve yanıtların hazırlanması
+  - yanıt listesinin standart `json` ve `orjson` ile kodlanması
+
+`prediction_data` sütunu metin ise (eski şema) veri `json.dumps` ile yazılır;
+böylece betik önceki sürümün çalışma ağacına kopyalanarak önce/sonra
+karşılaştırması yapılabilir.
+
+Çalıştırmak için (backend dizininde):
+    python benchmarks/prediction_read_benchmark.py
+    python benchmarks/prediction_read_benchmark.py --symbols 500 --iterations 50
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS = ["lstm", "gru", "attention", "ridge", "gbm"]
+
+def payload(symbol: str, price: float, rng) -> dict:
+    """
+    Tahmin işinin yazdığı birleşik sonuçlarla aynı yapıda örnek veri
+    """
+    predictions = {m: (price * (1 + rng.normal(0, 0.02, 7))).tolist() for m in MODELS}
+    return {
+        "predictions": predictions,
+        "metrics": {m: {"mse": float(rng.random()), "mae": float(rng.random())} for m in MODELS},
+        "last_updated": datetime.now().isoformat(),
+        "symbol": symbol,
+        "models_used": MODELS,
+        "best_model": "lstm",
+        "best_mse": 0.01,
+        "best_mae": 0.05,
+        "volatility": 0.8,
+        "price_changes": {m: float(rng.normal(0, 2)) for m in MODELS},
+        "features_used": [f"feature_{i}" for i in range(40)],
+        "training_window": 60,
+        "prediction_window": 7,
+        "prediction_date": (datetime.now() + timedelta(days=1)).isoformat(),
+        "model_tier": "deep",
+        "ensemble_prediction": price * 1.01,
+        "model_weights": {m: 1 / len(MODELS) for m in MODELS},
+        "prediction_intervals": {
+            m: {"lower": (np.array(predictions[m]) * 0.97).tolist(), "upper": (np.array(predictions[m]) * 1.03).tolist()}
+            for m in MODELS
+        },
+        "training_configs": {m: {"sequence_length": 60, "units": 64, "dropout": 0.2} for m in MODELS}
+    }
+
+def seed(SessionLocal, n_symbols: int):
+    from sqlalchemy import Text
+    from app.models import BaseStock, PredictionStock
+
+    text_column = isinstance(PredictionStock.__table__.c.prediction_data.type, Text)
+    rng = np.random.default_rng(42)
+    with SessionLocal() as db:
+        for i in range(n_symbols):
+            price = 10.0 + i
+            stock = BaseStock(symbol=f"SYM{i:04d}", name=f"SYM{i:04d}", last_price=price, is_selected=True)
+            db.add(stock)
+            db.flush()
+            data = payload(stock.symbol, price, rng)
+            db.add(PredictionStock(
+                symbol=stock.symbol, base_stock_id=stock.id, current_price=price,
+                prediction_data=json.dumps(data) if text_column else data,
+                lstm_predicted_price=data["predictions"]["lstm"][0], lstm_change_percent=data["price_changes"]["lstm"],
+                lstm_mse=0.01, lstm_mae=0.05, best_model="lstm", best_mse=0.01, best_mae=0.05, volatility=0.8,
+                features_used=data["features_used"], training_window=60, prediction_window=7,
+                prediction_date=datetime.now() + timedelta(days=1), last_updated=datetime.now(),
+                updated_at=datetime.now()
+            ))
+        db.commit()
+    return "metin (json.dumps)" if text_column else "JSON"
+
+def timed(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+def report(name: str, result):
+    print(f"{name:<42} p50 {result[0]:>8.2f} ms   p95 {result[1]:>8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Tahmin listesi okuma gecikmesi")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'predictions.db')}"
+    os.environ.pop("DATABASE_READ_URL", None)
+    os.environ["PROCESS_ROLE"] = "api"
+    sys.path.insert(0, BACKEND_DIR)
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy.orm import selectinload
+
+    import app.models  # noqa: F401 - tüm tabloları kaydeder
+    from app.db.session import Base, SessionLocal, engine
+    from app.main import app
+    from app.models import PredictionStock
+    from app.api.routes.stocks import prediction_service
+
+    Base.metadata.create_all(engine)
+    storage = seed(SessionLocal, args.symbols)
+    logging.disable(logging.CRITICAL)
+    print(f"{args.symbols} tahmin, prediction_data: {storage}\n")
+
+    def load():
+        with SessionLocal() as db:
+            return db.query(PredictionStock).options(selectinload(PredictionStock.base_stock)).all()
+
+    def load_and_prepare():
+        with SessionLocal() as db:
+            records = db.query(PredictionStock).options(selectinload(PredictionStock.base_stock)).all()
+            return list(prediction_service.build_prediction_responses(records).values())
+
+    with TestClient(app) as client:
+        assert len(client.get("/api/stocks/filtered-predictions").json()) == args.symbols
+        report("GET /api/stocks/filtered-predictions", timed(lambda: client.get("/api/stocks/filtered-predictions"), args.iterations))
+
+    report("kayıt yükleme (sorgu + JSON çözümü)", timed(load, args.iterations))
+    report("yükleme + yanıt hazırlama", timed(load_and_prepare, args.iterations))
+
+    responses = load_and_prepare()
+    report("yanıt kodlama: json.dumps", timed(lambda: json.dumps(responses, default=str).encode(), args.iterations))
+    try:
+        import orjson
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        report("yanıt kodlama: orjson", timed(lambda: orjson.dumps(responses, option=option), args.iterations))
+    except ImportError:
+        pass
+
+    tmp.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Liste endpoint'lerinin sonuç sayısından bağımsız sayıda SQL sorgusu
+çalıştırdığını doğrulayan kontrol (N+1 regresyon kontrolü).
+
+Geçici bir SQLite veritabanına önce N, sonra 3N seçili hisse (teknik analiz ve
+tahmin kayıtlarıyla) yazılır; her endpoint iki veri boyutunda da çağrılır ve
+senkron ile async motorlarda çalışan sorgular sayılır. Sorgu sayısı veri
+boyutuyla değişen bir endpoint varsa çıkış kodu 1 olur.
+
+Çalıştırmak için (backend dizininde):
+    python benchmarks/query_count_check.py
+    python benchmarks/query_count_check.py --symbols 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (endpoint, liste mi) - tekil endpoint'ler yalnızca raporlanır
+ENDPOINTS = [
+    ("/api/technical/all", True),
+    ("/api/technical/signals/trend", True),
+    ("/api/technical/signals/momentum", True),
+    ("/api/stocks/filtered-symbols", True),
+    ("/api/stocks/filtered-predictions", True),
+    ("/api/stocks/filtered?min_rsi=0&max_rsi=100&min_rel_volume=0&limit=1000", True),
+    ("/api/dashboard/real-prediction-history?limit=100", True),
+    ("/api/snapshot", True),
+    ("/api/snapshot?selected_only=true&has_prediction=true", True),
+    ("/api/technical/SYM0000", False),
+    ("/api/technical/support-resistance/SYM0000", False),
+    ("/api/stocks/prediction/SYM0000", False),
+    ("/api/stocks/prediction/SYM0000/archive", False),
+    ("/api/stocks/SYM0000", False),
+]
+
+def seed(SessionLocal, start: int, stop: int):
+    """
+    [start, stop) aralığındaki semboller için hisse, teknik analiz ve tahmin kayıtları yazar
+    """
+    from app.models import BaseStock, PredictionStock, TechnicalStock
+
+    with SessionLocal() as db:
+        for i in range(start, stop):
+            stock = BaseStock(symbol=f"SYM{i:04d}", name=f"SYM{i:04d}", last_price=10.0 + i, rsi=55.0,
+                              relative_volume=2.0, crossed_pivot=True, is_selected=True)
+            db.add(stock)
+            db.flush()
+            db.add(TechnicalStock(
+                base_stock_id=stock.id, macd=0.2, macd_signal=0.1, sma_50=9.0, sma_200=8.0, adx=25.0,
+                support_levels=[9.0], resistance_levels=[20.0 + i], fib_retracement={},
+                trend_signals={"uptrend": True}, momentum_signals={"macd_bullish": True},
+                volatility_signals={}, updated_at=datetime.now()
+            ))
+            db.add(PredictionStock(
+                symbol=stock.symbol, base_stock_id=stock.id, current_price=stock.last_price,
+                lstm_predicted_price=stock.last_price * 1.05, lstm_mse=0.01, best_model="lstm", prediction_date=datetime.now(),
+                prediction_data=json.dumps({"predictions": {"lstm": [stock.last_price * 1.05]}, "best_model": "lstm"}),
+                updated_at=datetime.now()
+            ))
+        db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Liste endpoint'leri için sorgu sayısı kontrolü")
+    parser.add_argument("--symbols", type=int, default=10, help="İlk ölçümdeki hisse sayısı (ikinci ölçüm 3 katı)")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'queries.db')}"
+    os.environ.pop("DATABASE_READ_URL", None)
+    os.environ["PROCESS_ROLE"] = "api"
+    sys.path.insert(0, BACKEND_DIR)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    import app.models  # noqa: F401 - tüm tabloları kaydeder
+    from app.db.session import Base, SessionLocal, engine, get_async_sessionmaker
+    from app.main import app
+
+    Base.metadata.create_all(engine)
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async_engine = get_async_sessionmaker().kw["bind"]
+    for target in {engine, async_engine.sync_engine}:
+        event.listen(target, "before_cursor_execute", count)
+
+    def measure(client) -> dict:
+        counts = {}
+        for path, _ in ENDPOINTS:
+            statements.clear()
+            response = client.get(path)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{path}: HTTP {response.status_code} {response.text[:200]}")
+            counts[path] = len(statements)
+        return counts
+
+    failed = []
+    with TestClient(app) as client:
+        seed(SessionLocal, 0, args.symbols)
+        small = measure(client)
+        seed(SessionLocal, args.symbols, args.symbols * 3)
+        large = measure(client)
+
+    print(f"{'endpoint':<72} {args.symbols:>6} {args.symbols * 3:>6}")
+    for path, is_list in ENDPOINTS:
+        status = ""
+        if small[path] != large[path]:
+            status = "  <- N+1" if is_list else "  <- değişken"
+            failed.append(path)
+        print(f"{path:<72} {small[path]:>6} {large[path]:>6}{status}")
+
+    tmp.cleanup()
+    if failed:
+        print(f"\nSorgu sayısı veri boyutuyla değişen {len(failed)} endpoint var")
+        sys.exit(1)
+    print("\nTüm endpoint'ler sabit sayıda sorgu çalıştırıyor")
+
+if __name__ == "__main__":
+    main()
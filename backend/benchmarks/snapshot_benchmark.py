@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Dashboard okuma modeli (stock_snapshots) benchmark'ı.
+
+Geçici bir SQLite veritabanına seçili hisseler, teknik analizleri ve tahminleri
+yazılır, okuma modeli bu kayıtlardan oluşturulur ve bir dashboard yüklemesi
+iki yoldan ölçülür:
+  - hisse, teknik analiz ve tahmin endpoint'lerinin ayrı ayrı çağrılıp
+    kartların istemcide birleştirilmesi (/api/stocks/filtered, /api/technical/all,
+    /api/stocks/filtered-predictions)
+  - tek istek: /api/snapshot?selected_only=true
+
+Her yol için gecikme ve çalışan SQL sorgusu sayısı raporlanır.
+
+Çalıştırmak için (backend dizininde):
+    python benchmarks/snapshot_benchmark.py
+    python benchmarks/snapshot_benchmark.py --symbols 500 --iterations 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS = ["lstm", "gru", "attention"]
+
+STITCHED = [
+    "/api/stocks/filtered?min_rsi=0&max_rsi=100&min_rel_volume=0&limit=10000",
+    "/api/technical/all",
+    "/api/stocks/filtered-predictions",
+]
+SNAPSHOT = "/api/snapshot?selected_only=true"
+
+def seed(SessionLocal, n_symbols: int):
+    """
+    Seçili hisseler için hisse, teknik analiz ve tahmin kayıtları yazar
+    """
+    from app.models import BaseStock, PredictionStock, TechnicalStock
+
+    now = datetime.now()
+    with SessionLocal() as db:
+        for i in range(n_symbols):
+            price = 10.0 + i
+            stock = BaseStock(symbol=f"SYM{i:04d}", name=f"SYM{i:04d}", last_price=price, rsi=55.0,
+                              relative_volume=2.0, change_percent=1.5, crossed_pivot=True, is_selected=True,
+                              updated_at=now)
+            db.add(stock)
+            db.flush()
+            db.add(TechnicalStock(
+                base_stock_id=stock.id, macd=0.2, macd_signal=0.1, sma_50=price * 0.9, sma_200=price * 0.8, adx=25.0,
+                support_levels=[price * 0.95, price * 0.9], resistance_levels=[price * 1.05, price * 1.1],
+                fib_retracement={"0.382": price * 0.97, "0.618": price * 0.95},
+                trend_signals={"uptrend": True}, momentum_signals={"macd_bullish": True},
+                volatility_signals={"high_volatility": False}, created_at=now, updated_at=now
+            ))
+            db.add(PredictionStock(
+                symbol=stock.symbol, base_stock_id=stock.id, current_price=price,
+                prediction_data={
+                    "predictions": {m: [price * (1 + 0.01 * d) for d in range(7)] for m in MODELS},
+                    "metrics": {m: {"mse": 0.01, "mae": 0.05} for m in MODELS},
+                    "models_used": MODELS
+                },
+                lstm_predicted_price=price * 1.02, lstm_change_percent=2.0, lstm_mse=0.01, lstm_mae=0.05,
+                gru_predicted_price=price * 1.01, gru_change_percent=1.0, gru_mse=0.02, gru_mae=0.06,
+                best_model="lstm", best_mse=0.01, best_mae=0.05, volatility=0.8,
+                features_used=[f"feature_{f}" for f in range(40)], training_window=60, prediction_window=7,
+                prediction_date=now + timedelta(days=1), last_updated=now, updated_at=now
+            ))
+        db.commit()
+
+def timed(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard okuma modeli benchmark'ı")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'snapshot.db')}"
+    os.environ.pop("DATABASE_READ_URL", None)
+    os.environ["PROCESS_ROLE"] = "api"
+    sys.path.insert(0, BACKEND_DIR)
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    import app.models  # noqa: F401 - tüm tabloları kaydeder
+    from app.db.session import Base, SessionLocal, engine, get_async_sessionmaker
+    from app.main import app
+    from app.api.routes.stocks import prediction_service
+    from app.services.snapshot_service import SnapshotService
+
+    Base.metadata.create_all(engine)
+    seed(SessionLocal, args.symbols)
+    with SessionLocal() as db:
+        SnapshotService().rebuild(db, prediction_service.build_prediction_responses)
+    logging.disable(logging.CRITICAL)
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    for target in {engine, get_async_sessionmaker().kw["bind"].sync_engine}:
+        event.listen(target, "before_cursor_execute", count)
+
+    with TestClient(app) as client:
+        def stitched():
+            for path in STITCHED:
+                client.get(path).raise_for_status()
+
+        def snapshot():
+            client.get(SNAPSHOT).raise_for_status()
+
+        assert len(client.get(SNAPSHOT).json()) == args.symbols
+        print(f"{args.symbols} seçili hisse\n")
+        for name, fn in (("ayrı endpoint'ler (3 istek)", stitched), ("GET /api/snapshot", snapshot)):
+            statements.clear()
+            fn()
+            queries = len(statements)
+            p50, p95 = timed(fn, args.iterations)
+            print(f"{name:<34} p50 {p50:>8.2f} ms   p95 {p95:>8.2f} ms   {queries} sorgu")
+
+    tmp.cleanup()
+
+if __name__ == "__main__":
+    main()
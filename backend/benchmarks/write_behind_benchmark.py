@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Write-behind yazma tamponu benchmark'ı.
+
+Geçici bir SQLite veritabanına hisseler yazılır ve tahmin döngüsü iki yoldan
+çalıştırılır:
+  - senkron: her sembolün hesaplamasından sonra sonuç hemen yazılır ve commit
+    edilir (PredictionService.persist_predictions, sembol başına bir çağrı)
+  - write-behind: sonuçlar WriteBehindBuffer'a eklenir, arka plandaki yazıcı
+    partiler halinde yazar
+
+Hesaplama (--compute-ms) ve her commit'in ağ/disk gecikmesi (--commit-ms)
+benzetilir. Toplam süre, hesaplama döngüsünün yazmayı beklediği süre ve
+commit sayısı raporlanır.
+
+Çalıştırmak için (backend dizininde):
+    python benchmarks/write_behind_benchmark.py
+    python benchmarks/write_behind_benchmark.py --symbols 200 --compute-ms 20 --commit-ms 40
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def build_record(symbol: str, base_stock_id: int, price: float):
+    """
+    predict_stock'un ürettiğiyle aynı biçimde bir tahmin kaydı
+    """
+    predictions = {m: [price * (1 + 0.01 * d) for d in range(7)] for m in ("lstm", "gru", "attention")}
+    columns = {
+        "prediction_data": {"predictions": predictions, "models_used": list(predictions)},
+        "current_price": price,
+        "prediction_date": datetime.now() + timedelta(days=1),
+        "volatility": 0.8,
+        "features_used": [f"feature_{f}" for f in range(40)],
+        "training_window": 60,
+        "prediction_window": 7,
+        "best_model": "lstm",
+        "best_mse": 0.01,
+        "best_mae": 0.05,
+        "model_tier": "deep"
+    }
+    for name, values in predictions.items():
+        columns[f"{name}_predicted_price"] = values[0]
+        columns[f"{name}_change_percent"] = 1.0
+        columns[f"{name}_mse"] = 0.01
+        columns[f"{name}_mae"] = 0.05
+    return {"symbol": symbol, "base_stock_id": base_stock_id, "columns": columns,
+            "history_predictions": predictions, "drift_frame": None}
+
+def main():
+    parser = argparse.ArgumentParser(description="Write-behind yazma tamponu benchmark'ı")
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--compute-ms", type=float, default=20.0, help="Sembol başına benzetilen hesaplama")
+    parser.add_argument("--commit-ms", type=float, default=30.0, help="Commit başına benzetilen gecikme")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'write_behind.db')}"
+    os.environ.pop("DATABASE_READ_URL", None)
+    os.environ["PROCESS_ROLE"] = "api"
+    sys.path.insert(0, BACKEND_DIR)
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    from sqlalchemy import event
+
+    import app.models  # noqa: F401 - tüm tabloları kaydeder
+    from app.db.session import Base, SessionLocal, engine
+    from app.models import BaseStock
+    from app.services.prediction_service import PredictionService
+    from app.services.write_behind import WriteBehindBuffer
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        for i in range(args.symbols):
+            db.add(BaseStock(symbol=f"SYM{i:04d}", name=f"SYM{i:04d}", last_price=10.0 + i))
+        db.commit()
+        stocks = [(stock.symbol, stock.id, stock.last_price) for stock in db.query(BaseStock).order_by(BaseStock.id)]
+
+    # Uzak veritabanındaki commit gecikmesi
+    commits = []
+    def slow_commit(conn):
+        commits.append(1)
+        time.sleep(args.commit_ms / 1000)
+    event.listen(engine, "commit", slow_commit)
+
+    service = PredictionService()
+
+    def compute(symbol, base_stock_id, price):
+        time.sleep(args.compute_ms / 1000)
+        return build_record(symbol, base_stock_id, price)
+
+    def synchronous():
+        waited = 0.0
+        with SessionLocal() as db:
+            for stock in stocks:
+                record = compute(*stock)
+                started = time.perf_counter()
+                service.persist_predictions(db, [record])
+                waited += time.perf_counter() - started
+        return waited
+
+    def write_behind():
+        writer = WriteBehindBuffer("benchmark", service.persist_predictions, batch_size=args.batch_size,
+                                   crash_safe=False)
+        for stock in stocks:
+            writer.put(compute(*stock))
+        started = time.perf_counter()
+        writer.close()
+        written, failed = writer.pop_completed()
+        assert len(written) == len(stocks) and not failed
+        return writer.metrics["producer_wait_seconds"] + time.perf_counter() - started
+
+    print(f"{args.symbols} sembol, hesaplama {args.compute_ms:.0f} ms, commit gecikmesi {args.commit_ms:.0f} ms\n")
+    for name, fn in (("senkron yazma", synchronous), (f"write-behind (parti {args.batch_size})", write_behind)):
+        commits.clear()
+        started = time.perf_counter()
+        waited = fn()
+        elapsed = time.perf_counter() - started
+        print(f"{name:<26} toplam {elapsed:>7.2f} sn   yazma beklemesi {waited:>6.2f} sn   {len(commits)} commit")
+
+    tmp.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+import app.models  # noqa: F401 - autogenerate için tüm modelleri kaydeder
+from app.db.session import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+# Aynı anda başlayan API / worker süreçlerinin yükseltmeleri sıraya girer
+MIGRATION_LOCK_KEY = 741852963
+
+def run_migrations_offline():
+    """
+    SQL betiği üretir (alembic upgrade head --sql)
+    """
+    context.configure(url=settings.DATABASE_URL, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_with_connection(connection):
+    context.configure(connection=connection, target_metadata=target_metadata,
+                      render_as_batch=connection.dialect.name == "sqlite")
+    with context.begin_transaction():
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        context.run_migrations()
+
+def run_migrations_online():
+    # Uygulama içinden (run_migrations) çağrıldığında mevcut bağlantı kullanılır
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_with_connection(connection)
+        return
+
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    with engine.begin() as connection:
+        run_with_connection(connection)
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
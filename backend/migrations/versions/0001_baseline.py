@@ -0,0 +1,180 @@
+"""İlk şema: hisse, teknik analiz, tahmin, tahmin geçmişi ve kullanıcı tabloları
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+Tablolar önceden create_all ile oluşturulmuşsa atlanır; böylece mevcut
+veritabanları da bu revizyondan itibaren yükseltilebilir.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations import create_table_if_missing, create_index_if_missing, drop_index_if_exists
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    create_table_if_missing(
+        "base_stocks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(), nullable=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("sector", sa.String(), nullable=True),
+        sa.Column("last_price", sa.Float(), nullable=True),
+        sa.Column("open_price", sa.Float(), nullable=True),
+        sa.Column("high_price", sa.Float(), nullable=True),
+        sa.Column("low_price", sa.Float(), nullable=True),
+        sa.Column("previous_close", sa.Float(), nullable=True),
+        sa.Column("volume", sa.Float(), nullable=True),
+        sa.Column("relative_volume", sa.Float(), nullable=True),
+        sa.Column("change_percent", sa.Float(), nullable=True),
+        sa.Column("rsi", sa.Float(), nullable=True),
+        sa.Column("pivot_r1", sa.Float(), nullable=True),
+        sa.Column("pivot_r2", sa.Float(), nullable=True),
+        sa.Column("pivot_r3", sa.Float(), nullable=True),
+        sa.Column("pivot_s1", sa.Float(), nullable=True),
+        sa.Column("pivot_s2", sa.Float(), nullable=True),
+        sa.Column("pivot_s3", sa.Float(), nullable=True),
+        sa.Column("pivot_pp", sa.Float(), nullable=True),
+        sa.Column("above_pivot", sa.Boolean(), nullable=True),
+        sa.Column("crossed_pivot", sa.Boolean(), nullable=True),
+        sa.Column("is_selected", sa.Boolean(), nullable=True),
+        sa.Column("passed_rsi_filter", sa.Boolean(), nullable=True),
+        sa.Column("passed_volume_filter", sa.Boolean(), nullable=True),
+        sa.Column("passed_pivot_filter", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    create_index_if_missing("ix_base_stocks_id", "base_stocks", ["id"])
+    create_index_if_missing("ix_base_stocks_symbol", "base_stocks", ["symbol"], unique=True)
+
+    create_table_if_missing(
+        "prediction_stocks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("base_stock_id", sa.Integer(), nullable=True),
+        sa.Column("symbol", sa.String(), nullable=True),
+        sa.Column("prediction_data", sa.Text(), nullable=True),
+        sa.Column("last_updated", sa.DateTime(), nullable=True),
+        sa.Column("lstm_predicted_price", sa.Float(), nullable=True),
+        sa.Column("lstm_change_percent", sa.Float(), nullable=True),
+        sa.Column("lstm_mse", sa.Float(), nullable=True),
+        sa.Column("lstm_mae", sa.Float(), nullable=True),
+        sa.Column("gru_predicted_price", sa.Float(), nullable=True),
+        sa.Column("gru_change_percent", sa.Float(), nullable=True),
+        sa.Column("gru_mse", sa.Float(), nullable=True),
+        sa.Column("gru_mae", sa.Float(), nullable=True),
+        sa.Column("attention_predicted_price", sa.Float(), nullable=True),
+        sa.Column("attention_change_percent", sa.Float(), nullable=True),
+        sa.Column("attention_mse", sa.Float(), nullable=True),
+        sa.Column("attention_mae", sa.Float(), nullable=True),
+        sa.Column("current_price", sa.Float(), nullable=True),
+        sa.Column("prediction_date", sa.DateTime(), nullable=True),
+        sa.Column("volatility", sa.Float(), nullable=True),
+        sa.Column("features_used", sa.JSON(), nullable=True),
+        sa.Column("training_window", sa.Integer(), nullable=True),
+        sa.Column("prediction_window", sa.Integer(), nullable=True),
+        sa.Column("best_model", sa.String(), nullable=True),
+        sa.Column("best_mse", sa.Float(), nullable=True),
+        sa.Column("best_mae", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["base_stock_id"], ["base_stocks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("base_stock_id")
+    )
+    create_index_if_missing("ix_prediction_stocks_id", "prediction_stocks", ["id"])
+    create_index_if_missing("ix_prediction_stocks_symbol", "prediction_stocks", ["symbol"], unique=True)
+
+    create_table_if_missing(
+        "technical_stocks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("base_stock_id", sa.Integer(), nullable=True),
+        sa.Column("macd", sa.Float(), nullable=True),
+        sa.Column("macd_signal", sa.Float(), nullable=True),
+        sa.Column("macd_hist", sa.Float(), nullable=True),
+        sa.Column("adx", sa.Float(), nullable=True),
+        sa.Column("dmi_plus", sa.Float(), nullable=True),
+        sa.Column("dmi_minus", sa.Float(), nullable=True),
+        sa.Column("stoch_k", sa.Float(), nullable=True),
+        sa.Column("stoch_d", sa.Float(), nullable=True),
+        sa.Column("cci", sa.Float(), nullable=True),
+        sa.Column("mfi", sa.Float(), nullable=True),
+        sa.Column("bb_upper", sa.Float(), nullable=True),
+        sa.Column("bb_middle", sa.Float(), nullable=True),
+        sa.Column("bb_lower", sa.Float(), nullable=True),
+        sa.Column("atr", sa.Float(), nullable=True),
+        sa.Column("sma_50", sa.Float(), nullable=True),
+        sa.Column("sma_200", sa.Float(), nullable=True),
+        sa.Column("ema_20", sa.Float(), nullable=True),
+        sa.Column("support_levels", sa.JSON(), nullable=True),
+        sa.Column("resistance_levels", sa.JSON(), nullable=True),
+        sa.Column("fib_retracement", sa.JSON(), nullable=True),
+        sa.Column("trend_signals", sa.JSON(), nullable=True),
+        sa.Column("momentum_signals", sa.JSON(), nullable=True),
+        sa.Column("volatility_signals", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["base_stock_id"], ["base_stocks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("base_stock_id")
+    )
+    create_index_if_missing("ix_technical_stocks_id", "technical_stocks", ["id"])
+
+    create_table_if_missing(
+        "prediction_history",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("prediction_date", sa.DateTime(), nullable=False),
+        sa.Column("prediction_price", sa.Float(), nullable=False),
+        sa.Column("actual_price", sa.Float(), nullable=True),
+        sa.Column("model_used", sa.String(), nullable=False),
+        sa.Column("is_successful", sa.Boolean(), nullable=True),
+        sa.Column("accuracy_percent", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    create_index_if_missing("ix_prediction_history_id", "prediction_history", ["id"])
+
+    create_table_if_missing(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("display_name", sa.String(), nullable=True),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+        sa.UniqueConstraint("username")
+    )
+    create_index_if_missing("ix_users_id", "users", ["id"])
+
+    create_table_if_missing(
+        "user_favorites",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    create_index_if_missing("ix_user_favorites_id", "user_favorites", ["id"])
+
+def downgrade() -> None:
+    for table, index in (("user_favorites", "ix_user_favorites_id"), ("users", "ix_users_id"),
+                         ("prediction_history", "ix_prediction_history_id"),
+                         ("technical_stocks", "ix_technical_stocks_id"),
+                         ("prediction_stocks", "ix_prediction_stocks_symbol"),
+                         ("prediction_stocks", "ix_prediction_stocks_id"),
+                         ("base_stocks", "ix_base_stocks_symbol"), ("base_stocks", "ix_base_stocks_id")):
+        drop_index_if_exists(index, table)
+    for table in ("user_favorites", "users", "prediction_history", "technical_stocks", "prediction_stocks", "base_stocks"):
+        op.drop_table(table)
@@ -0,0 +1,205 @@
+"""İş kuyruğu, model yönetimi ve bar deposu tabloları; tahmin tablolarına eklenen sütunlar
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+create_all yeni tabloları oluşturur ancak mevcut tablolara sütun eklemez. Bu
+revizyon ilk şemadan sonra eklenen tabloları ve sütunları tamamlar ve
+PostgreSQL'de `prediction_data` metin sütununu JSONB'ye çevirir.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.db.migrations import (
+    add_column_if_missing, create_index_if_missing, create_table_if_missing,
+    drop_column_if_exists, drop_index_if_exists, has_table, is_offline
+)
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREDICTION_STOCK_COLUMNS = [
+    ("ensemble_predicted_price", sa.Float),
+    ("model_weights", sa.JSON),
+    ("interval_lower", sa.Float),
+    ("interval_upper", sa.Float),
+    ("feature_set_version", sa.Integer),
+    ("model_tier", sa.String)
+]
+
+PREDICTION_HISTORY_COLUMNS = [
+    ("base_price", sa.Float),
+    ("model_tier", sa.String),
+    ("resolved_at", sa.DateTime)
+]
+
+NEW_TABLES = ["prediction_jobs", "model_weights", "drift_references", "symbol_clusters",
+              "tuned_configs", "feature_sets", "price_bars"]
+
+def upgrade() -> None:
+    for name, column_type in PREDICTION_STOCK_COLUMNS:
+        add_column_if_missing("prediction_stocks", sa.Column(name, column_type(), nullable=True))
+    for name, column_type in PREDICTION_HISTORY_COLUMNS:
+        add_column_if_missing("prediction_history", sa.Column(name, column_type(), nullable=True))
+
+    create_index_if_missing("ix_prediction_history_unresolved", "prediction_history", ["prediction_date"],
+                            postgresql_where=sa.text("resolved_at IS NULL"),
+                            sqlite_where=sa.text("resolved_at IS NULL"))
+    create_index_if_missing("ix_prediction_history_model_resolved", "prediction_history", ["model_used", "resolved_at"])
+    create_index_if_missing("ix_prediction_history_symbol_date", "prediction_history", ["symbol", "prediction_date"])
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        column_type = None if is_offline() else next(
+            c["type"] for c in sa.inspect(bind).get_columns("prediction_stocks") if c["name"] == "prediction_data"
+        )
+        if not isinstance(column_type, postgresql.JSONB):
+            # Eski json.dumps çıktısındaki NaN / Infinity değerleri JSONB'de geçersizdir
+            op.execute(
+                "ALTER TABLE prediction_stocks ALTER COLUMN prediction_data TYPE JSONB "
+                r"USING regexp_replace(prediction_data, '-?\mInfinity\M|\mNaN\M', 'null', 'g')::jsonb"
+            )
+
+    create_table_if_missing(
+        "prediction_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_type", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("progress", sa.JSON(), nullable=True),
+        sa.Column("total_items", sa.Integer(), nullable=True),
+        sa.Column("completed_items", sa.Integer(), nullable=True),
+        sa.Column("failed_items", sa.Integer(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("worker_id", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    create_index_if_missing("ix_prediction_jobs_id", "prediction_jobs", ["id"])
+    create_index_if_missing("ix_prediction_jobs_job_type", "prediction_jobs", ["job_type"])
+    create_index_if_missing("ix_prediction_jobs_status", "prediction_jobs", ["status"])
+
+    create_table_if_missing(
+        "model_weights",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("model_name", sa.String(), nullable=False),
+        sa.Column("ewma_error", sa.Float(), nullable=True),
+        sa.Column("weight", sa.Float(), nullable=True),
+        sa.Column("observations", sa.Integer(), nullable=True),
+        sa.Column("last_resolved_at", sa.DateTime(), nullable=True),
+        sa.Column("last_trained_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("symbol", "model_name", name="uq_model_weights_symbol_model")
+    )
+    create_index_if_missing("ix_model_weights_id", "model_weights", ["id"])
+    create_index_if_missing("ix_model_weights_symbol", "model_weights", ["symbol"])
+
+    create_table_if_missing(
+        "drift_references",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("trained_at", sa.DateTime(), nullable=False),
+        sa.Column("feature_columns", sa.JSON(), nullable=True),
+        sa.Column("bin_edges", sa.JSON(), nullable=True),
+        sa.Column("proportions", sa.JSON(), nullable=True),
+        sa.Column("price_min", sa.Float(), nullable=True),
+        sa.Column("price_max", sa.Float(), nullable=True),
+        sa.Column("reference_error", sa.Float(), nullable=True),
+        sa.Column("rows", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    create_index_if_missing("ix_drift_references_id", "drift_references", ["id"])
+    create_index_if_missing("ix_drift_references_symbol", "drift_references", ["symbol"], unique=True)
+
+    create_table_if_missing(
+        "symbol_clusters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("cluster_id", sa.Integer(), nullable=False),
+        sa.Column("features", sa.JSON(), nullable=True),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    create_index_if_missing("ix_symbol_clusters_id", "symbol_clusters", ["id"])
+    create_index_if_missing("ix_symbol_clusters_symbol", "symbol_clusters", ["symbol"], unique=True)
+    create_index_if_missing("ix_symbol_clusters_cluster", "symbol_clusters", ["cluster_id"])
+
+    create_table_if_missing(
+        "tuned_configs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("scope", sa.String(), nullable=False),
+        sa.Column("scope_key", sa.String(), nullable=False),
+        sa.Column("model_type", sa.String(), nullable=False),
+        sa.Column("sequence_length", sa.Integer(), nullable=False),
+        sa.Column("epochs", sa.Integer(), nullable=False),
+        sa.Column("batch_size", sa.Integer(), nullable=False),
+        sa.Column("learning_rate", sa.Float(), nullable=False),
+        sa.Column("val_loss", sa.Float(), nullable=True),
+        sa.Column("trials", sa.Integer(), nullable=True),
+        sa.Column("total_epochs", sa.Integer(), nullable=True),
+        sa.Column("search", sa.JSON(), nullable=True),
+        sa.Column("tuned_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("scope", "scope_key", "model_type", name="uq_tuned_configs_scope_model")
+    )
+    create_index_if_missing("ix_tuned_configs_id", "tuned_configs", ["id"])
+
+    create_table_if_missing(
+        "feature_sets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("columns", sa.JSON(), nullable=False),
+        sa.Column("dropped", sa.JSON(), nullable=True),
+        sa.Column("importances", sa.JSON(), nullable=True),
+        sa.Column("symbols", sa.Integer(), nullable=True),
+        sa.Column("baseline_loss", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    create_index_if_missing("ix_feature_sets_id", "feature_sets", ["id"])
+    create_index_if_missing("ix_feature_sets_version", "feature_sets", ["version"], unique=True)
+
+    # PostgreSQL'de aylık bölümlenmiş; bölümleri BarStore yazma sırasında oluşturur
+    create_table_if_missing(
+        "price_bars",
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("timeframe", sa.String(length=4), nullable=False),
+        sa.Column("ts", sa.DateTime(), nullable=False),
+        sa.Column("open", sa.Float(), nullable=False),
+        sa.Column("high", sa.Float(), nullable=False),
+        sa.Column("low", sa.Float(), nullable=False),
+        sa.Column("close", sa.Float(), nullable=False),
+        sa.Column("volume", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("symbol", "timeframe", "ts"),
+        postgresql_partition_by="RANGE (ts)"
+    )
+
+def downgrade() -> None:
+    for table in reversed(NEW_TABLES):
+        if is_offline() or has_table(table):
+            op.drop_table(table)
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE prediction_stocks ALTER COLUMN prediction_data TYPE TEXT USING prediction_data::text")
+
+    for index in ("ix_prediction_history_symbol_date", "ix_prediction_history_model_resolved",
+                  "ix_prediction_history_unresolved"):
+        drop_index_if_exists(index, "prediction_history")
+    for name, _ in PREDICTION_HISTORY_COLUMNS:
+        drop_column_if_exists("prediction_history", name)
+    for name, _ in PREDICTION_STOCK_COLUMNS:
+        drop_column_if_exists("prediction_stocks", name)
@@ -0,0 +1,51 @@
+"""Sık çalışan sorgular için indeksler
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+- base_stocks: seçili hisseler için kısmi indeks (is_selected = true)
+- prediction_stocks / technical_stocks: updated_at sıralaması, prediction_date aralığı
+- user_favorites: (user_id, symbol) benzersiz indeksi; önce yinelenen favoriler temizlenir
+- prediction_jobs: bekleyen işin alınması (status, created_at, id)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations import create_index_if_missing, drop_index_if_exists, has_index
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_prediction_stocks_updated_at", "prediction_stocks", ["updated_at"]),
+    ("ix_prediction_stocks_prediction_date", "prediction_stocks", ["prediction_date"]),
+    ("ix_technical_stocks_updated_at", "technical_stocks", ["updated_at"]),
+    ("ix_prediction_jobs_status_created", "prediction_jobs", ["status", "created_at", "id"]),
+]
+
+def upgrade() -> None:
+    # Sorgular `is_selected == True` ile üretilir: PostgreSQL'de "= true", SQLite'ta "= 1"
+    create_index_if_missing("ix_base_stocks_selected", "base_stocks", ["symbol"],
+                            postgresql_where=sa.text("is_selected = true"),
+                            sqlite_where=sa.text("is_selected = 1"))
+
+    for name, table, columns in INDEXES:
+        create_index_if_missing(name, table, columns)
+
+    if not has_index("user_favorites", "uq_user_favorites_user_symbol"):
+        op.execute(
+            "DELETE FROM user_favorites WHERE id NOT IN "
+            "(SELECT MIN(id) FROM user_favorites GROUP BY user_id, symbol)"
+        )
+        op.create_index("uq_user_favorites_user_symbol", "user_favorites", ["user_id", "symbol"], unique=True)
+
+def downgrade() -> None:
+    drop_index_if_exists("uq_user_favorites_user_symbol", "user_favorites")
+    for name, table, _ in reversed(INDEXES):
+        drop_index_if_exists(name, table)
+    drop_index_if_exists("ix_base_stocks_selected", "base_stocks")
@@ -0,0 +1,51 @@
+"""Dashboard okuma modeli: stock_snapshots
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+Tablo boş oluşturulur; worker ilk açılışta mevcut kayıtlardan doldurur.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations import create_index_if_missing, create_table_if_missing, has_table, is_offline
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    create_table_if_missing(
+        "stock_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("is_selected", sa.Boolean(), nullable=True),
+        sa.Column("sector", sa.String(), nullable=True),
+        sa.Column("last_price", sa.Float(), nullable=True),
+        sa.Column("change_percent", sa.Float(), nullable=True),
+        sa.Column("rsi", sa.Float(), nullable=True),
+        sa.Column("relative_volume", sa.Float(), nullable=True),
+        sa.Column("best_model", sa.String(), nullable=True),
+        sa.Column("predicted_change_percent", sa.Float(), nullable=True),
+        sa.Column("stock_json", sa.Text(), nullable=True),
+        sa.Column("technical_json", sa.Text(), nullable=True),
+        sa.Column("prediction_json", sa.Text(), nullable=True),
+        sa.Column("stock_updated_at", sa.DateTime(), nullable=True),
+        sa.Column("technical_updated_at", sa.DateTime(), nullable=True),
+        sa.Column("prediction_updated_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    create_index_if_missing("ix_stock_snapshots_id", "stock_snapshots", ["id"])
+    create_index_if_missing("ix_stock_snapshots_symbol", "stock_snapshots", ["symbol"], unique=True)
+    create_index_if_missing("ix_stock_snapshots_selected", "stock_snapshots", ["symbol"],
+                            postgresql_where=sa.text("is_selected = true"),
+                            sqlite_where=sa.text("is_selected = 1"))
+
+def downgrade() -> None:
+    if is_offline() or has_table("stock_snapshots"):
+        op.drop_table("stock_snapshots")
@@ -0,0 +1,91 @@
+"""Yalnızca ekleme yapılan tahmin arşivi: prediction_archive
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+PostgreSQL'de tablo created_at üzerinden aylık bölümlenir; sonraki bölümleri
+PredictionArchiveService yazma sırasında oluşturur. Arşiv, prediction_stocks'taki
+mevcut son tahminlerle başlatılır.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.db.migrations import create_index_if_missing, create_table_if_missing, has_table, is_offline
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ARCHIVE_COLUMNS = (
+    "symbol, created_at, granularity, samples, current_price, prediction_date, best_model, model_tier, "
+    "feature_set_version, lstm_predicted_price, gru_predicted_price, attention_predicted_price, "
+    "ensemble_predicted_price, interval_lower, interval_upper, predictions, model_weights"
+)
+
+def upgrade() -> None:
+    json_type = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+    create_table_if_missing(
+        "prediction_archive",
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("granularity", sa.String(length=4), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("current_price", sa.Float(), nullable=True),
+        sa.Column("prediction_date", sa.DateTime(), nullable=True),
+        sa.Column("best_model", sa.String(), nullable=True),
+        sa.Column("model_tier", sa.String(), nullable=True),
+        sa.Column("feature_set_version", sa.Integer(), nullable=True),
+        sa.Column("lstm_predicted_price", sa.Float(), nullable=True),
+        sa.Column("gru_predicted_price", sa.Float(), nullable=True),
+        sa.Column("attention_predicted_price", sa.Float(), nullable=True),
+        sa.Column("ensemble_predicted_price", sa.Float(), nullable=True),
+        sa.Column("interval_lower", sa.Float(), nullable=True),
+        sa.Column("interval_upper", sa.Float(), nullable=True),
+        sa.Column("predictions", json_type, nullable=True),
+        sa.Column("model_weights", json_type, nullable=True),
+        sa.PrimaryKeyConstraint("symbol", "created_at"),
+        postgresql_partition_by="RANGE (created_at)"
+    )
+    create_index_if_missing("ix_prediction_archive_created_at", "prediction_archive", ["created_at"])
+
+    # Mevcut son tahminler arşivin ilk satırları olur
+    taken_at = "COALESCE(last_updated, updated_at)"
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(f"""
+            DO $$
+            DECLARE m date;
+            BEGIN
+                FOR m IN
+                    SELECT generate_series(date_trunc('month', min({taken_at})),
+                                           date_trunc('month', max({taken_at})), interval '1 month')::date
+                    FROM prediction_stocks
+                LOOP
+                    EXECUTE 'CREATE TABLE IF NOT EXISTS prediction_archive_y' || to_char(m, 'YYYY')
+                        || 'm' || to_char(m, 'MM') || ' PARTITION OF prediction_archive FOR VALUES FROM ('
+                        || quote_literal(m) || ') TO (' || quote_literal((m + interval '1 month')::date) || ')';
+                END LOOP;
+            END $$
+        """)
+        predictions = "prediction_data -> 'predictions'"
+        model_weights = "model_weights::jsonb"
+    else:
+        predictions = "json_extract(prediction_data, '$.predictions')"
+        model_weights = "model_weights"
+
+    op.execute(
+        f"INSERT INTO prediction_archive ({ARCHIVE_COLUMNS}) "
+        f"SELECT symbol, {taken_at}, 'raw', 1, current_price, prediction_date, best_model, model_tier, "
+        f"feature_set_version, lstm_predicted_price, gru_predicted_price, attention_predicted_price, "
+        f"ensemble_predicted_price, interval_lower, interval_upper, {predictions}, {model_weights} "
+        f"FROM prediction_stocks WHERE symbol IS NOT NULL AND {taken_at} IS NOT NULL "
+        f"ON CONFLICT DO NOTHING"
+    )
+
+def downgrade() -> None:
+    if is_offline() or has_table("prediction_archive"):
+        op.drop_table("prediction_archive")
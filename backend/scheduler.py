@@ -10,6 +10,7 @@ import requests
 import schedule
 import time
 from datetime import datetime
+from urllib.parse import urljoin
 
 # Loglama yapılandırması
 logging.basicConfig(
@@ -28,9 +29,40 @@ BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000/api")
 FILTERED_SYMBOLS_URL = f"{BASE_URL}/stocks/filtered-symbols?refresh=true"
 FILTERED_PREDICTIONS_URL = f"{BASE_URL}/stocks/filtered-predictions?run_predictions=true"
 
+def wait_for_job(status_url, description, timeout=3600, poll_interval=15):
+    """
+    Kuyruğa eklenen işin tamamlanmasını bekler
+    
+    Args:
+        status_url: İş durumunun sorgulanacağı URL
+        description: İşin açıklaması (loglama için)
+        timeout: En fazla kaç saniye bekleneceği
+        poll_interval: Durum sorgulama aralığı (saniye)
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            response = requests.get(status_url, timeout=30)
+            if response.status_code == 200:
+                job = response.json()
+                logger.info(f"{description} - İş #{job['id']}: {job['status']} "
+                            f"({job['completed_items']}/{job['total_items']} tamamlandı, {job['failed_items']} hatalı)")
+                if job["status"] == "completed":
+                    return True
+                if job["status"] == "failed":
+                    logger.error(f"{description} - İş başarısız: {job.get('error')}")
+                    return False
+        except Exception as e:
+            logger.warning(f"İş durumu sorgulanamadı: {description} - {str(e)}")
+        time.sleep(poll_interval)
+    
+    logger.error(f"{description} - İş {timeout} saniye içinde tamamlanmadı")
+    return False
+
 def call_api(url, description):
     """
-    Belirtilen URL'ye GET isteği gönderir ve sonucu loglar
+    Belirtilen URL'ye GET isteği gönderir ve sonucu loglar.
+    API işi kuyruğa ekleyip 202 döndürürse işin tamamlanması beklenir.
     
     Args:
         url: İstek yapılacak URL
@@ -38,8 +70,12 @@ def call_api(url, description):
     """
     logger.info(f"API çağrısı yapılıyor: {description} - {url}")
     try:
-        response = requests.get(url, timeout=600)  # 10 dakika timeout
-        if response.status_code == 200:
+        response = requests.get(url, timeout=60)
+        if response.status_code == 202 and response.headers.get("Location"):
+            status_url = urljoin(url, response.headers["Location"])
+            logger.info(f"İş kuyruğa eklendi: {description} - {status_url}")
+            return wait_for_job(status_url, description)
+        elif response.status_code == 200:
             logger.info(f"API çağrısı başarılı: {description} - Durum Kodu: {response.status_code}")
             return True
         else:
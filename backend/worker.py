@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Arka plan iş kuyruğunu işleyen worker süreci.
+Tahmin ve piyasa yenileme işleri API sürecinde değil, bu süreçte çalıştırılır.
+Çalıştırmak için: python worker.py
+"""
+
+import logging
+import signal
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.db.session import engine, Base
+from app.db.migrations import run_migrations
+from app import models  # Modellerin metadata'ya kaydedilmesi için
+from app.services.job_worker import JobWorker
+from app.services.ml_loader import PROCESS_ROLE_WORKER
+from app.services.scheduler_service import SchedulerService
+from app.core.config import settings
+
+# Günlük ayarları
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.StreamHandler(),
+        logging.FileHandler("worker.log")
+    ]
+)
+logger = logging.getLogger(__name__)
+
+def main():
+    # Kuyruk tablosunun ve şemanın güncel olduğundan emin ol
+    if settings.DB_MIGRATE_ON_STARTUP:
+        run_migrations(engine)
+    else:
+        Base.metadata.create_all(bind=engine)
+
+    worker = JobWorker()
+
+    # API süreçleri zamanlayıcıyı çalıştırmadığında zamanlanmış işler worker'dan kuyruğa eklenir
+    scheduler_service = None
+    if settings.PROCESS_ROLE == PROCESS_ROLE_WORKER:
+        scheduler_service = SchedulerService()
+        scheduler_service.start()
+
+    # SIGTERM geldiğinde mevcut iş bittikten sonra dur
+    def handle_stop(signum, frame):
+        logger.info("Durdurma sinyali alındı, mevcut iş tamamlandıktan sonra worker kapanacak")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+
+    worker.run_forever()
+
+    if scheduler_service and scheduler_service.is_running:
+        scheduler_service.stop()
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,8 @@ const apiService = {
   getFilteredStocks: (params) => api.get('/stocks/filtered', { params }),
   getFilteredPredictions: (runPredictions = false) => api.get('/stocks/filtered-predictions', { params: { run_predictions: runPredictions } }),
   getPredictionBySymbol: (symbol, refresh = false, modelType = 'all') => api.get(`/stocks/prediction/${symbol}`, { params: { refresh, model_type: modelType } }),
+  // Geçmiş tahminler (start / end ISO tarih, granularity: 'raw' veya '1d')
+  getPredictionArchive: (symbol, params = {}) => api.get(`/stocks/prediction/${symbol}/archive`, { params }),
   getStockPrediction: (symbol, refresh = false, modelType = 'all') => api.get(`/stocks/prediction/${symbol}`, { params: { refresh, model_type: modelType } }),
   getPotentialRisers: (force = false) => api.get('/stocks/filtered-predictions', { params: { run_predictions: force, timeout: 60 } }),
   
@@ -54,6 +56,9 @@ const apiService = {
   
   // Teknik Göstergeler
   getTechnicalIndicators: (symbol) => api.get(`/dashboard/technical-indicators/${symbol}`),
+
+  // Dashboard kartları (hisse + teknik analiz + tahmin) tek istekte
+  getSnapshot: (params = {}) => api.get('/snapshot', { params, paramsSerializer: { indexes: null } }),
 };
 
 export default apiService; 
\ No newline at end of file